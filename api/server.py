@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+import backboard_client
 from api.routes import capture, recall, learn, team, status
 from services.config import FlowConfig
 from services.models import HealthResponse
@@ -19,10 +20,12 @@ load_dotenv()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown."""
-    # Startup: initialize config
+    # Startup: initialize config and the pooled Backboard client
     app.state.config = FlowConfig.from_env()
+    await backboard_client.open_client()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: close pooled connections
+    await backboard_client.close_client()
 
 
 app = FastAPI(
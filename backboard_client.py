@@ -2,14 +2,23 @@
 
 Provides persistent memory storage and semantic recall capabilities.
 Uses async HTTP with connection pooling and retry logic.
+Recall responses are cached on disk (see recall_cache.py).
+
+One pooled httpx.AsyncClient (keep-alive, HTTP/2 when h2 is installed) is
+shared per event loop. Long-running processes bracket their work with
+open_client()/close_client(); one-off callers get a client lazily and
+run_async() closes it when the coroutine finishes.
 """
 import os
 import asyncio
+import weakref
 from datetime import datetime
 from typing import Optional
 
 import httpx
 
+import recall_cache
+
 
 # ============ CONFIGURATION ============
 
@@ -19,6 +28,15 @@ TIMEOUT = 30.0
 MAX_RETRIES = 3
 BACKOFF_MULTIPLIER = 1  # seconds
 
+# Connection pool
+POOL_MAX_CONNECTIONS = int(os.environ.get("BACKBOARD_POOL_MAX_CONNECTIONS", "20"))
+POOL_MAX_KEEPALIVE = int(os.environ.get("BACKBOARD_POOL_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.environ.get("BACKBOARD_KEEPALIVE_EXPIRY", "30"))
+HTTP2 = os.environ.get("BACKBOARD_HTTP2", "true").lower() in ("1", "true", "yes")
+
+# Parallel requests per store_messages() batch
+BATCH_CONCURRENCY = int(os.environ.get("BACKBOARD_BATCH_CONCURRENCY", "4"))
+
 
 # ============ EXCEPTIONS ============
 
@@ -42,6 +60,120 @@ class BackboardRateLimitError(BackboardError):
     pass
 
 
+# ============ CLIENT POOL ============
+
+class _Pool:
+    """The shared client of one event loop and its open_client() count."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.refs = 0
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Pool]" = weakref.WeakKeyDictionary()
+_pool_stats = {"requests": 0, "connections_opened": 0, "clients_created": 0}
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 if requested and the h2 package is installed."""
+    if not HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+async def _trace(event_name: str, info: dict) -> None:
+    """httpcore trace hook: counts new TCP connections."""
+    if event_name == "connection.connect_tcp.complete":
+        _pool_stats["connections_opened"] += 1
+
+
+async def _install_trace(request: httpx.Request) -> None:
+    request.extensions["trace"] = _trace
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the shared client for the running event loop, creating it if needed.
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None or pool.client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            http2=_http2_enabled(),
+            event_hooks={"request": [_install_trace]},
+        )
+        _pool_stats["clients_created"] += 1
+        refs = pool.refs if pool else 0
+        pool = _pools[loop] = _Pool(client)
+        pool.refs = refs
+    return pool.client
+
+
+async def open_client() -> httpx.AsyncClient:
+    """
+    Open (or join) the shared client for this event loop.
+
+    Calls nest: the client stays open until every open_client() has been
+    matched by close_client().
+
+    Returns:
+        Pooled httpx.AsyncClient
+    """
+    client = get_client()
+    _pools[asyncio.get_running_loop()].refs += 1
+    return client
+
+
+async def close_client() -> None:
+    """Release the shared client; closes it when no opener still holds it."""
+    pool = _pools.get(asyncio.get_running_loop())
+    if pool is None:
+        return
+    if pool.refs > 0:
+        pool.refs -= 1
+        if pool.refs > 0:
+            return
+    _pools.pop(asyncio.get_running_loop(), None)
+    await pool.client.aclose()
+
+
+def get_pool_stats() -> dict:
+    """
+    Connection reuse metrics for this process.
+
+    Returns:
+        Dictionary with requests, connections_opened, reused (requests that
+        did not open a connection), reuse_rate, clients_created, http2
+        and the pool limits
+    """
+    requests = _pool_stats["requests"]
+    opened = _pool_stats["connections_opened"]
+    reused = max(requests - opened, 0)
+    return {
+        "requests": requests,
+        "connections_opened": opened,
+        "reused": reused,
+        "reuse_rate": round(reused / requests, 3) if requests else 0.0,
+        "clients_created": _pool_stats["clients_created"],
+        "http2": _http2_enabled(),
+        "max_connections": POOL_MAX_CONNECTIONS,
+        "max_keepalive": POOL_MAX_KEEPALIVE,
+    }
+
+
 # ============ HELPERS ============
 
 def _headers() -> dict:
@@ -63,32 +195,33 @@ async def _request_with_retry(
     Make an HTTP request with retry logic.
 
     Retries on 5xx errors with exponential backoff.
-    No retry on 4xx errors.
+    No retry on 4xx errors. Uses the shared pooled client.
     """
     last_exception = None
 
     for attempt in range(MAX_RETRIES):
         try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                response = await getattr(client, method)(url, **kwargs)
-
-                # Handle specific error codes
-                if response.status_code == 401:
-                    raise BackboardAuthError("Invalid API key")
-                elif response.status_code == 429:
-                    raise BackboardRateLimitError("Rate limit exceeded")
-                elif 400 <= response.status_code < 500:
-                    # Client errors - don't retry
-                    response.raise_for_status()
-                elif response.status_code >= 500:
-                    # Server errors - retry with backoff
-                    if attempt < MAX_RETRIES - 1:
-                        wait_time = BACKOFF_MULTIPLIER * (2 ** attempt)
-                        await asyncio.sleep(wait_time)
-                        continue
-                    response.raise_for_status()
-
-                return response
+            client = get_client()
+            _pool_stats["requests"] += 1
+            response = await getattr(client, method)(url, **kwargs)
+
+            # Handle specific error codes
+            if response.status_code == 401:
+                raise BackboardAuthError("Invalid API key")
+            elif response.status_code == 429:
+                raise BackboardRateLimitError("Rate limit exceeded")
+            elif 400 <= response.status_code < 500:
+                # Client errors - don't retry
+                response.raise_for_status()
+            elif response.status_code >= 500:
+                # Server errors - retry with backoff
+                if attempt < MAX_RETRIES - 1:
+                    wait_time = BACKOFF_MULTIPLIER * (2 ** attempt)
+                    await asyncio.sleep(wait_time)
+                    continue
+                response.raise_for_status()
+
+            return response
 
         except httpx.ConnectError as e:
             last_exception = BackboardConnectionError(f"Connection failed: {e}")
@@ -172,12 +305,12 @@ async def health_check() -> bool:
         True if service is reachable, False otherwise
     """
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f"{BASE_URL}/health",
-                headers=_headers()
-            )
-            return response.status_code == 200
+        response = await get_client().get(
+            f"{BASE_URL}/health",
+            headers=_headers(),
+            timeout=5.0
+        )
+        return response.status_code == 200
     except Exception:
         return False
 
@@ -221,9 +354,47 @@ async def store_message(
         headers=headers,
         data=form_data  # Use data= for form data, not json=
     )
+    # The thread's memory changed, so cached recalls for it are stale
+    await asyncio.to_thread(recall_cache.invalidate, thread_id)
     return response.json()
 
 
+async def store_messages(
+    messages: list[tuple[str, str, Optional[dict]]],
+    concurrency: Optional[int] = None
+) -> list:
+    """
+    Store many messages concurrently over the shared connection pool.
+
+    At most `concurrency` requests are in flight at once. One failed
+    message does not stop the others.
+
+    Args:
+        messages: (thread_id, content, metadata) tuples
+        concurrency: Maximum parallel requests (default: BATCH_CONCURRENCY)
+
+    Returns:
+        One entry per message, in order: the API response, or the
+        exception raised for that message
+    """
+    semaphore = asyncio.Semaphore(concurrency or BATCH_CONCURRENCY)
+
+    async def _store(thread_id: str, content: str, metadata: Optional[dict]):
+        async with semaphore:
+            return await store_message(thread_id, content, metadata)
+
+    results = await asyncio.gather(
+        *(_store(*message) for message in messages),
+        return_exceptions=True
+    )
+
+    # Per-message errors are returned; cancellation still propagates
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+    return results
+
+
 async def store_session(thread_id: str, session: dict) -> dict:
     """
     Store a session checkpoint.
@@ -290,19 +461,27 @@ async def store_learning(
 
 # ============ RECALL FUNCTIONS (With LLM) ============
 
-async def recall(thread_id: str, query: str) -> str:
+async def recall(thread_id: str, query: str, use_cache: bool = True) -> str:
     """
     Query memory with semantic recall.
 
     Uses memory="auto" to automatically retrieve relevant past context.
+    Responses are cached per (thread, normalized query) until the TTL
+    expires or a message is stored to the thread.
 
     Args:
         thread_id: Thread to search in
         query: Natural language query
+        use_cache: Serve and store responses in the recall cache
 
     Returns:
         LLM response with relevant context
     """
+    if use_cache:
+        cached = await asyncio.to_thread(recall_cache.get, thread_id, query)
+        if cached is not None:
+            return cached
+
     # Backboard API uses multipart/form-data with string values
     form_data = {
         "content": query,
@@ -319,7 +498,10 @@ async def recall(thread_id: str, query: str) -> str:
         headers=headers,
         data=form_data
     )
-    return response.json().get("content", "")
+    content = response.json().get("content", "")
+    if use_cache:
+        await asyncio.to_thread(recall_cache.put, thread_id, query, content)
+    return content
 
 
 async def get_restoration_context(thread_id: str, changes_summary: str) -> str:
@@ -404,7 +586,15 @@ Summarize relevant learnings from the team. Include who shared each insight."""
 def run_async(coro):
     """
     Helper to run async functions from sync context.
+
+    Closes the loop's pooled client afterwards, since the loop ends too.
     """
+    async def _run():
+        try:
+            return await coro
+        finally:
+            await close_client()
+
     try:
         loop = asyncio.get_running_loop()
     except RuntimeError:
@@ -414,7 +604,7 @@ def run_async(coro):
         # We're in an async context, create a new loop in a thread
         import concurrent.futures
         with concurrent.futures.ThreadPoolExecutor() as pool:
-            future = pool.submit(asyncio.run, coro)
+            future = pool.submit(asyncio.run, _run())
             return future.result()
     else:
-        return asyncio.run(coro)
+        return asyncio.run(_run())
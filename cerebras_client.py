@@ -2,17 +2,53 @@
 
 Provides fast LLM inference for context analysis and restoration message generation.
 Uses Llama 3.3 70B via Cerebras for 10-100x faster inference.
+
+Async callers use acomplete()/astream(), which share one pooled
+AsyncCerebras client per event loop (bracketed by open_client() and
+close_client() in long-running processes, like backboard_client). The sync
+complete()/stream() facades reuse one Cerebras client per process. Both
+paths apply per-call timeouts and retry rate limits, timeouts and 5xx
+responses with backoff, honouring Retry-After. Completions are served
+from the persistent completion cache (see completion_cache.py) unless a
+call site passes use_cache=False.
 """
 import os
 import json
-from typing import Optional
-from cerebras.cloud.sdk import Cerebras
+import time
+import asyncio
+import weakref
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
+from cerebras.cloud.sdk import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncCerebras,
+    AuthenticationError,
+    Cerebras,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    RateLimitError,
+)
+
+import completion_cache
 
 
 # ============ CONFIGURATION ============
 
 DEFAULT_MODEL = "zai-glm-4.7"
 
+# Per-call timeout in seconds (override per call with timeout=)
+TIMEOUT = float(os.environ.get("CEREBRAS_TIMEOUT", "60"))
+MAX_RETRIES = int(os.environ.get("CEREBRAS_MAX_RETRIES", "3"))
+BACKOFF_MULTIPLIER = 1  # seconds
+# Rate limits asking for a longer wait than this (e.g. a daily quota) are not retried
+MAX_RETRY_WAIT = float(os.environ.get("CEREBRAS_MAX_RETRY_WAIT", "30"))
+
+# Connection pool of the shared async client
+POOL_MAX_CONNECTIONS = int(os.environ.get("CEREBRAS_POOL_MAX_CONNECTIONS", "10"))
+POOL_MAX_KEEPALIVE = int(os.environ.get("CEREBRAS_POOL_MAX_KEEPALIVE", "5"))
+
 
 def _get_api_key() -> str:
     """Get API key from environment (lazy load to support dotenv)."""
@@ -46,20 +82,215 @@ def _get_client() -> Cerebras:
     return Cerebras(api_key=_get_api_key())
 
 
-def complete(
+_sync_client: Optional[Cerebras] = None
+_sync_client_key: Optional[str] = None
+
+
+def _get_sync_client() -> Cerebras:
+    """The process-wide sync client, rebuilt if the API key changes."""
+    global _sync_client, _sync_client_key
+    key = _get_api_key()
+    if _sync_client is None or _sync_client_key != key:
+        _sync_client = _get_client()
+        _sync_client_key = key
+    return _sync_client
+
+
+class _Pool:
+    """The shared async client of one event loop and its open_client() count."""
+
+    def __init__(self, client: AsyncCerebras, key: str):
+        self.client = client
+        self.key = key
+        self.refs = 0
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Pool]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncCerebras:
+    """
+    Get the shared async client for the running event loop, creating it if needed.
+
+    Returns:
+        Pooled AsyncCerebras client
+    """
+    key = _get_api_key()
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None or pool.key != key or pool.client.is_closed():
+        client = AsyncCerebras(
+            api_key=key,
+            timeout=TIMEOUT,
+            # Retries are ours (see _retry_delay), so they can honour Retry-After
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                ),
+            ),
+            # The SDK warms up with a throwaway blocking client; the pool keeps its own
+            warm_tcp_connection=False,
+        )
+        refs = pool.refs if pool else 0
+        pool = _pools[loop] = _Pool(client, key)
+        pool.refs = refs
+    return pool.client
+
+
+async def open_client() -> AsyncCerebras:
+    """
+    Open (or join) the shared async client for this event loop.
+
+    Calls nest: the client stays open until every open_client() has been
+    matched by close_client().
+
+    Returns:
+        Pooled AsyncCerebras client, or None if CEREBRAS_API_KEY is not set
+    """
+    try:
+        client = get_async_client()
+    except CerebrasAuthError:
+        return None
+    _pools[asyncio.get_running_loop()].refs += 1
+    return client
+
+
+async def close_client() -> None:
+    """Release the shared async client; closes it when no opener still holds it."""
+    pool = _pools.get(asyncio.get_running_loop())
+    if pool is None:
+        return
+    if pool.refs > 0:
+        pool.refs -= 1
+        if pool.refs > 0:
+            return
+    _pools.pop(asyncio.get_running_loop(), None)
+    await pool.client.close()
+
+
+# ============ HELPERS ============
+
+def _build_request(
+    prompt: str,
+    system: Optional[str],
+    json_mode: bool,
+    max_tokens: int,
+) -> dict:
+    """Arguments for chat.completions.create shared by every call path."""
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+
+    return {
+        "model": DEFAULT_MODEL,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "response_format": {"type": "json_object"} if json_mode else None,
+    }
+
+
+def _cache_key(request: dict) -> str:
+    """Completion cache key of a request built by _build_request()."""
+    messages = request["messages"]
+    system = messages[0]["content"] if len(messages) > 1 else None
+    return completion_cache.make_key(
+        request["model"], system, messages[-1]["content"],
+        request["max_tokens"], request["response_format"] is not None,
+    )
+
+
+def _response_text(response) -> str:
+    """Text of the first choice of a completion response."""
+    if hasattr(response, 'choices') and response.choices:
+        choices = response.choices
+        if len(choices) > 0:  # type: ignore[arg-type]
+            msg = choices[0].message
+            # Some models (like zai-glm-4.7) use reasoning field instead of content
+            return msg.content or getattr(msg, 'reasoning', '') or ""
+    return ""
+
+
+def _chunk_text(chunk) -> str:
+    """Content token(s) of one streamed chunk."""
+    choices = getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    return getattr(choices[0].delta, "content", None) or ""
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying a failed call.
+
+    Args:
+        error: Exception raised by the SDK
+        attempt: Zero-based attempt that failed
+
+    Returns:
+        Delay in seconds, or None if the call should not be retried
+    """
+    if attempt >= MAX_RETRIES - 1:
+        return None
+    if isinstance(error, RateLimitError):
+        headers = error.response.headers
+        try:
+            if "retry-after-ms" in headers:
+                wait = float(headers["retry-after-ms"]) / 1000
+            elif "retry-after" in headers:
+                wait = float(headers["retry-after"])
+            else:
+                wait = BACKOFF_MULTIPLIER * (2 ** attempt)
+        except ValueError:
+            wait = BACKOFF_MULTIPLIER * (2 ** attempt)
+        return wait if wait <= MAX_RETRY_WAIT else None
+    if isinstance(error, (APITimeoutError, APIConnectionError, InternalServerError)):
+        return BACKOFF_MULTIPLIER * (2 ** attempt)
+    return None
+
+
+def _map_error(error: Exception) -> CerebrasError:
+    """Translate an SDK (or transport) exception into a CerebrasError."""
+    if isinstance(error, CerebrasError):
+        return error
+    if isinstance(error, AuthenticationError):
+        return CerebrasAuthError(f"Authentication failed: {error}")
+    if isinstance(error, RateLimitError):
+        return CerebrasRateLimitError(f"Rate limit exceeded: {error}")
+    if isinstance(error, APITimeoutError):
+        return CerebrasError(f"Cerebras request timed out: {error}")
+
+    error_str = str(error).lower()
+    if "401" in error_str or "unauthorized" in error_str or "authentication" in error_str:
+        return CerebrasAuthError(f"Authentication failed: {error}")
+    elif "429" in error_str or "rate" in error_str:
+        return CerebrasRateLimitError(f"Rate limit exceeded: {error}")
+    else:
+        return CerebrasError(f"Cerebras API error: {error}")
+
+
+# ============ COMPLETION ============
+
+async def acomplete(
     prompt: str,
     system: Optional[str] = None,
     json_mode: bool = False,
-    max_tokens: int = 1000
+    max_tokens: int = 1000,
+    timeout: Optional[float] = None,
+    use_cache: bool = True,
 ) -> str:
     """
-    Generic completion function for custom prompts.
+    Async completion on the shared pooled client.
 
     Args:
         prompt: The user prompt to complete
         system: Optional system message
         json_mode: If True, request JSON-formatted response
         max_tokens: Maximum tokens in response (default: 1000)
+        timeout: Seconds allowed per attempt (default: TIMEOUT)
+        use_cache: Serve and store the response in the completion cache
 
     Returns:
         String response from the model
@@ -67,62 +298,194 @@ def complete(
     Raises:
         CerebrasError: On API errors
         CerebrasAuthError: On authentication failure
-        CerebrasRateLimitError: On rate limit exceeded
+        CerebrasRateLimitError: On rate limit exceeded after retries
     """
-    try:
-        client = _get_client()
+    request = _build_request(prompt, system, json_mode, max_tokens)
+    key = _cache_key(request) if use_cache else None
+    if key:
+        cached = await asyncio.to_thread(completion_cache.get, key)
+        if cached is not None:
+            return cached
+
+    attempt = 0
+    while True:
+        try:
+            response = await get_async_client().chat.completions.create(
+                **request, timeout=timeout or TIMEOUT,
+            )
+            text = _response_text(response)
+            break
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise _map_error(e) from e
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    if key:
+        await asyncio.to_thread(completion_cache.put, key, text)
+    return text
+
+
+async def astream(
+    prompt: str,
+    system: Optional[str] = None,
+    max_tokens: int = 1000,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a completion token by token (for SSE responses).
 
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+    Failures before the first token are retried like acomplete(); once
+    output has started, errors are raised to the consumer.
 
-        # Build create arguments
-        response_format = {"type": "json_object"} if json_mode else None
+    Args:
+        prompt: The user prompt to complete
+        system: Optional system message
+        max_tokens: Maximum tokens in response (default: 1000)
+        timeout: Seconds allowed per attempt (default: TIMEOUT)
 
-        response = client.chat.completions.create(
-            model=DEFAULT_MODEL,
-            messages=messages,  # type: ignore[arg-type]
-            max_tokens=max_tokens,
-            response_format=response_format,  # type: ignore[arg-type]
-        )
+    Yields:
+        Text fragments as the model produces them
 
-        if hasattr(response, 'choices') and response.choices:
-            choices = response.choices
-            if len(choices) > 0:  # type: ignore[arg-type]
-                msg = choices[0].message
-                # Some models (like zai-glm-4.7) use reasoning field instead of content
-                return msg.content or getattr(msg, 'reasoning', '') or ""
-        return ""
+    Raises:
+        CerebrasError: On API errors
+    """
+    request = _build_request(prompt, system, False, max_tokens)
+    attempt = 0
+    started = False
+    while True:
+        try:
+            stream = await get_async_client().chat.completions.create(
+                **request, stream=True, timeout=timeout or TIMEOUT,
+            )
+            async for chunk in stream:
+                text = _chunk_text(chunk)
+                if text:
+                    started = True
+                    yield text
+            return
+        except Exception as e:
+            delay = None if started else _retry_delay(e, attempt)
+            if delay is None:
+                raise _map_error(e) from e
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+def complete(
+    prompt: str,
+    system: Optional[str] = None,
+    json_mode: bool = False,
+    max_tokens: int = 1000,
+    timeout: Optional[float] = None,
+    use_cache: bool = True,
+) -> str:
+    """
+    Generic completion function for custom prompts.
+
+    Sync facade for callers without an event loop; async code should
+    await acomplete() instead.
+
+    Args:
+        prompt: The user prompt to complete
+        system: Optional system message
+        json_mode: If True, request JSON-formatted response
+        max_tokens: Maximum tokens in response (default: 1000)
+        timeout: Seconds allowed per attempt (default: TIMEOUT)
+        use_cache: Serve and store the response in the completion cache
 
-    except Exception as e:
-        error_str = str(e).lower()
-        if "401" in error_str or "unauthorized" in error_str or "authentication" in error_str:
-            raise CerebrasAuthError(f"Authentication failed: {e}")
-        elif "429" in error_str or "rate" in error_str:
-            raise CerebrasRateLimitError(f"Rate limit exceeded: {e}")
-        else:
-            raise CerebrasError(f"Cerebras API error: {e}")
+    Returns:
+        String response from the model
 
+    Raises:
+        CerebrasError: On API errors
+        CerebrasAuthError: On authentication failure
+        CerebrasRateLimitError: On rate limit exceeded
+    """
+    request = _build_request(prompt, system, json_mode, max_tokens)
+    key = _cache_key(request) if use_cache else None
+    if key:
+        cached = completion_cache.get(key)
+        if cached is not None:
+            return cached
+
+    attempt = 0
+    while True:
+        try:
+            response = _get_sync_client().chat.completions.create(
+                **request, timeout=timeout or TIMEOUT,
+            )
+            text = _response_text(response)
+            break
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise _map_error(e) from e
+            attempt += 1
+            time.sleep(delay)
+
+    if key:
+        completion_cache.put(key, text)
+    return text
+
+
+def stream(
+    prompt: str,
+    system: Optional[str] = None,
+    max_tokens: int = 1000,
+    timeout: Optional[float] = None,
+) -> Iterator[str]:
+    """
+    Sync streaming facade (for printing tokens in the CLI).
+
+    Args:
+        prompt: The user prompt to complete
+        system: Optional system message
+        max_tokens: Maximum tokens in response (default: 1000)
+        timeout: Seconds allowed per attempt (default: TIMEOUT)
 
-async def quick_answer(prompt: str, system: Optional[str] = None) -> str:
+    Yields:
+        Text fragments as the model produces them
+
+    Raises:
+        CerebrasError: On API errors
     """
-    Async wrapper for quick completions.
+    request = _build_request(prompt, system, False, max_tokens)
+    attempt = 0
+    started = False
+    while True:
+        try:
+            chunks = _get_sync_client().chat.completions.create(
+                **request, stream=True, timeout=timeout or TIMEOUT,
+            )
+            for chunk in chunks:
+                text = _chunk_text(chunk)
+                if text:
+                    started = True
+                    yield text
+            return
+        except Exception as e:
+            delay = None if started else _retry_delay(e, attempt)
+            if delay is None:
+                raise _map_error(e) from e
+            attempt += 1
+            time.sleep(delay)
+
+
+async def quick_answer(prompt: str, system: Optional[str] = None, use_cache: bool = True) -> str:
+    """
+    Async completion for quick answers.
 
     Args:
         prompt: The prompt to complete
         system: Optional system message
+        use_cache: Serve and store the response in the completion cache
 
     Returns:
         String response from the model
     """
-    import asyncio
-    # Run sync complete in thread pool to make it async
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None,
-        lambda: complete(prompt, system=system, max_tokens=2000)
-    )
+    return await acomplete(prompt, system=system, max_tokens=2000, use_cache=use_cache)
 
 
 def analyze_session_context(
@@ -188,25 +551,8 @@ Use null for hypothesis if not apparent. Use empty arrays [] for next_steps, dec
         }
 
 
-def generate_restoration_message(context: dict, changes: dict) -> str:
-    """
-    Generate a "welcome back" message for developers returning to work.
-
-    Args:
-        context: Previous session context with keys:
-            - summary: What they were working on
-            - hypothesis: Their approach
-            - files: Relevant files
-            - branch: Git branch
-            - learnings: Previous learnings
-        changes: What changed while away:
-            - elapsed: Time elapsed (human readable)
-            - commits: New commits (list)
-            - files_changed: Files modified by others
-
-    Returns:
-        Natural language restoration message (under 10 lines)
-    """
+def _restoration_prompt(context: dict, changes: dict) -> tuple[str, str]:
+    """(prompt, system) for the welcome-back message."""
     prompt = f"""Generate a concise "welcome back" summary for a developer returning to their coding session.
 
 PREVIOUS CONTEXT:
@@ -230,11 +576,55 @@ Generate a message with:
 Keep it under 10 lines. Be direct and useful, no fluff."""
 
     system = "You are a helpful coding assistant. Generate concise, actionable restoration messages for developers returning to their work."
+    return prompt, system
+
 
+def generate_restoration_message(context: dict, changes: dict) -> str:
+    """
+    Generate a "welcome back" message for developers returning to work.
+
+    Args:
+        context: Previous session context with keys:
+            - summary: What they were working on
+            - hypothesis: Their approach
+            - files: Relevant files
+            - branch: Git branch
+            - learnings: Previous learnings
+        changes: What changed while away:
+            - elapsed: Time elapsed (human readable)
+            - commits: New commits (list)
+            - files_changed: Files modified by others
+
+    Returns:
+        Natural language restoration message (under 10 lines)
+    """
+    prompt, system = _restoration_prompt(context, changes)
     try:
-        return complete(prompt, system=system, max_tokens=500)
+        # Always fresh: the message is about right now
+        return complete(prompt, system=system, max_tokens=500, use_cache=False)
     except CerebrasError:
         # Graceful fallback if Cerebras is unavailable
         summary = context.get('summary', 'your previous work')
         elapsed = changes.get('elapsed', 'some time')
         return f"Welcome back! You were working on: {summary}\nTime away: {elapsed}\nReady to continue where you left off."
+
+
+def stream_restoration_message(context: dict, changes: dict) -> Iterator[str]:
+    """
+    Stream the welcome-back message as the model writes it.
+
+    Same prompt as generate_restoration_message(), without its fallback:
+    errors are raised so the caller can substitute its own message.
+
+    Args:
+        context: Previous session context (see generate_restoration_message)
+        changes: What changed while away
+
+    Yields:
+        Text fragments of the message
+
+    Raises:
+        CerebrasError: On API errors
+    """
+    prompt, system = _restoration_prompt(context, changes)
+    yield from stream(prompt, system=system, max_tokens=500)
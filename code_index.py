@@ -0,0 +1,557 @@
+"""Repository-level index of code TLDRs.
+
+tldr_code.generate_code_tldr() parses one file per call and keeps nothing.
+CodeIndex keeps the parsed structure of every source file in a repository
+and only re-parses what changed:
+
+- Files whose (mtime, size) match the index are reused without being read
+- Files whose stat changed but whose content hash did not are reused too
+  (checkouts, touch, editors that rewrite unchanged files)
+- Changed and new files are parsed, in a process pool when there are many
+  (cold start on a large tree)
+
+The index is persisted per repository under ~/.flow-guardian/code_index/,
+and rendered file and repo maps are memoized in-process, so a warm
+whole-repo L1/L2/L3 map costs a directory stat walk plus string joins.
+
+CallGraph turns the per-file structures into a repo-wide symbol table
+(module.func, module.Class, module.Class.method) and resolves each call
+through the caller's imports, so L3 maps show calls across modules and
+recall can answer "where is X and who uses it".
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import tldr_code
+
+
+# ============ CONFIGURATION ============
+
+INDEX_DIR = Path.home() / ".flow-guardian" / "code_index"
+
+# Bump when the stored structure format changes; older indexes are rebuilt
+INDEX_VERSION = 2
+
+CODE_EXTENSIONS = {".py", ".js", ".jsx", ".ts", ".tsx"}
+IGNORED_DIRS = {
+    "node_modules", "__pycache__", "venv", "env", "dist", "build",
+    "site-packages", "target",
+}
+MAX_FILE_BYTES = 1024 * 1024
+
+# Files to parse before a process pool is worth its startup cost
+PARALLEL_THRESHOLD = int(os.environ.get("FLOW_GUARDIAN_CODE_INDEX_PARALLEL", "64"))
+
+# Callers / callees listed per symbol in recall results
+GRAPH_LIST_LIMIT = 8
+
+
+# ============ HELPERS ============
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _parse_file(path: str) -> dict:
+    """
+    Read and parse one file (runs in worker processes on a cold start).
+
+    Args:
+        path: Absolute file path
+
+    Returns:
+        Index entry: mtime_ns, size, hash and either a Python structure or
+        the rendered TLDR of another language
+    """
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    content = data.decode("utf-8", errors="replace")
+    entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": _content_hash(data)}
+    if path.endswith(".py"):
+        entry["structure"] = tldr_code.parse_python_structure(content)
+    else:
+        # The regex extractors ignore the level, so one rendering serves all
+        entry["text"] = tldr_code.generate_code_tldr(content, Path(path).name)
+    return entry
+
+
+def iter_code_files(root: Path):
+    """
+    Source files under root, skipping hidden, vendored and build directories.
+
+    Yields:
+        (relative posix path, os.stat_result)
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in IGNORED_DIRS)
+        for name in filenames:
+            if os.path.splitext(name)[1].lower() not in CODE_EXTENSIONS:
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_size <= MAX_FILE_BYTES:
+                yield Path(path).relative_to(root).as_posix(), stat
+
+
+# ============ CALL GRAPH ============
+
+def module_name(rel: str) -> str:
+    """
+    Dotted module name of a Python file ("pkg/mod.py" -> "pkg.mod").
+
+    Args:
+        rel: Path relative to the repository root (posix separators)
+
+    Returns:
+        Module name; packages are named after their directory and a leading
+        src/ layout directory is dropped
+    """
+    parts = rel[:-len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    if len(parts) > 1 and parts[0] == "src":
+        parts.pop(0)
+    return ".".join(parts)
+
+
+class CallGraph:
+    """Repo-wide symbol table and import-resolved call graph."""
+
+    def __init__(self, files: dict[str, dict]):
+        """
+        Args:
+            files: CodeIndex.files (relative path -> index entry)
+        """
+        # Qualified symbol -> {file, kind, line, signature}
+        self.symbols: dict[str, dict] = {}
+        self.calls: dict[str, set] = {}
+        self.called_by: dict[str, set] = {}
+        self._modules: dict[str, dict] = {}
+        self._packages: dict[str, str] = {}
+        self._by_name: dict[str, list[str]] = {}
+
+        for rel, entry in files.items():
+            structure = entry.get("structure")
+            if not structure or "error" in structure:
+                continue
+            module = module_name(rel)
+            self._modules[module] = structure
+            self._packages[module] = module if rel.endswith("__init__.py") else module.rpartition(".")[0]
+            for func in structure["functions"]:
+                self._add(f"{module}.{func['name']}", rel, "function", func)
+            for cls in structure["classes"]:
+                self._add(f"{module}.{cls['name']}", rel, "class", cls)
+                for method in cls["methods"]:
+                    self._add(f"{module}.{cls['name']}.{method['name']}", rel, "method", method)
+
+        for module, structure in self._modules.items():
+            for caller, refs in structure.get("call_refs", {}).items():
+                caller_symbol = f"{module}.{caller}"
+                if caller_symbol not in self.symbols:
+                    continue
+                class_name = caller.split(".")[0] if "." in caller else None
+                for ref in refs:
+                    callee = self._resolve(module, class_name, ref)
+                    if callee and callee != caller_symbol:
+                        self.calls.setdefault(caller_symbol, set()).add(callee)
+                        self.called_by.setdefault(callee, set()).add(caller_symbol)
+
+    def _add(self, symbol: str, rel: str, kind: str, info: dict) -> None:
+        self.symbols[symbol] = {
+            "file": rel,
+            "kind": kind,
+            "line": info.get("line"),
+            "signature": info.get("signature") or info["name"],
+        }
+        self._by_name.setdefault(info["name"].lower(), []).append(symbol)
+
+    def _absolute(self, module: str, target: str) -> str:
+        """Resolve a relative import target ("..pkg.name") against a module."""
+        level = len(target) - len(target.lstrip("."))
+        if not level:
+            return target
+        base = self._packages.get(module, "").split(".") if self._packages.get(module) else []
+        base = base[:len(base) - (level - 1)] if level > 1 else base
+        rest = target[level:]
+        return ".".join(base + ([rest] if rest else []))
+
+    def _canonical(self, candidate: str) -> Optional[str]:
+        """Follow package re-exports ("pkg.func" imported in pkg/__init__.py)."""
+        for _ in range(5):
+            if candidate in self.symbols:
+                return candidate
+            # Longest known module prefix, then look the next name up in its imports
+            parts = candidate.split(".")
+            for cut in range(len(parts) - 1, 0, -1):
+                module = ".".join(parts[:cut])
+                if module in self._modules:
+                    target = self._modules[module].get("import_map", {}).get(parts[cut])
+                    if target is None:
+                        return None
+                    candidate = ".".join([self._absolute(module, target)] + parts[cut + 1:])
+                    break
+            else:
+                return None
+        return None
+
+    def _resolve(self, module: str, class_name: Optional[str], ref: str) -> Optional[str]:
+        """Qualified symbol a dotted call name refers to, if it is in the repo."""
+        head, _, rest = ref.partition(".")
+        import_map = self._modules[module].get("import_map", {})
+        if head in ("self", "cls") and class_name and rest:
+            candidate = f"{module}.{class_name}.{rest}"
+        elif head in import_map:
+            target = self._absolute(module, import_map[head])
+            candidate = f"{target}.{rest}" if rest else target
+        elif f"{module}.{head}" in self.symbols:
+            candidate = f"{module}.{ref}"
+        else:
+            return None
+        return self._canonical(candidate)
+
+    def lookup(self, name: str) -> list[str]:
+        """
+        Symbols matching a name.
+
+        Args:
+            name: Qualified symbol, "Class.method", or bare name
+                (case-insensitive)
+
+        Returns:
+            Matching qualified symbols, sorted
+        """
+        if name in self.symbols:
+            return [name]
+        bare = name.rpartition(".")[2].lower()
+        return sorted(
+            symbol for symbol in self._by_name.get(bare, [])
+            if "." not in name or symbol.endswith(f".{name}")
+        )
+
+    def callees(self, symbol: str) -> list[str]:
+        """Repository symbols called by symbol."""
+        return sorted(self.calls.get(symbol, ()))
+
+    def callers(self, symbol: str) -> list[str]:
+        """Repository symbols that call symbol."""
+        return sorted(self.called_by.get(symbol, ()))
+
+    def describe(self, symbol: str) -> str:
+        """
+        Where a symbol is defined and how it is connected.
+
+        Args:
+            symbol: Qualified symbol
+
+        Returns:
+            Markdown block with location, signature, callers and callees
+        """
+        info = self.symbols[symbol]
+        lines = [
+            f"**Code:** `{symbol}` ({info['kind']}, {info['file']}:{info['line']})",
+            f"`{info['signature']}`",
+        ]
+        for label, related in (("Called by", self.callers(symbol)), ("Calls", self.callees(symbol))):
+            if related:
+                more = f" (+{len(related) - GRAPH_LIST_LIMIT} more)" if len(related) > GRAPH_LIST_LIMIT else ""
+                lines.append(f"{label}: {', '.join(related[:GRAPH_LIST_LIMIT])}{more}")
+        return "\n".join(lines)
+
+
+# ============ INDEX ============
+
+class CodeIndex:
+    """Per-file code structure of one repository, refreshed incrementally."""
+
+    def __init__(self, root: Path, index_file: Optional[Path] = None):
+        """
+        Args:
+            root: Repository root
+            index_file: Where to persist the index (default: under INDEX_DIR,
+                named after the root path)
+        """
+        self.root = Path(root).resolve()
+        if index_file is None:
+            digest = hashlib.sha1(str(self.root).encode("utf-8")).hexdigest()[:16]
+            index_file = INDEX_DIR / f"{digest}.json"
+        self.index_file = Path(index_file)
+        self.files: dict[str, dict] = {}
+        self.stats: dict = {}
+        self._loaded = False
+        self._rendered: dict[tuple[str, str], str] = {}
+        self._maps: dict[str, str] = {}
+        self._graph: Optional[CallGraph] = None
+
+    # ---- Persistence ----
+
+    def exists(self) -> bool:
+        """Whether this repository has been indexed before."""
+        return self.index_file.exists()
+
+    def load(self) -> None:
+        """Load the persisted index (an unreadable or outdated one is ignored)."""
+        self._loaded = True
+        try:
+            data = json.loads(self.index_file.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION and data.get("root") == str(self.root):
+            self.files = data.get("files", {})
+
+    def save(self) -> None:
+        """Persist the index atomically."""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(
+            {"version": INDEX_VERSION, "root": str(self.root), "files": self.files},
+            separators=(",", ":"),
+        ))
+        os.replace(tmp, self.index_file)
+
+    # ---- Refresh ----
+
+    def refresh(self, workers: Optional[int] = None) -> dict:
+        """
+        Bring the index up to date with the files on disk.
+
+        Args:
+            workers: Parser processes for large batches (default: CPU count)
+
+        Returns:
+            Dictionary with files, parsed, reused, rehashed, removed,
+            workers and seconds
+        """
+        started = time.perf_counter()
+        if not self._loaded:
+            self.load()
+
+        seen = set()
+        to_parse = []
+        reused = rehashed = 0
+        for rel, stat in iter_code_files(self.root):
+            seen.add(rel)
+            entry = self.files.get(rel)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                reused += 1
+                continue
+            if entry:
+                # Touched: only re-parse if the content really changed
+                try:
+                    digest = _content_hash((self.root / rel).read_bytes())
+                except OSError:
+                    continue
+                if digest == entry["hash"]:
+                    entry["mtime_ns"], entry["size"] = stat.st_mtime_ns, stat.st_size
+                    rehashed += 1
+                    continue
+            to_parse.append(rel)
+
+        removed = [rel for rel in self.files if rel not in seen]
+        for rel in removed:
+            del self.files[rel]
+
+        workers = workers or os.cpu_count() or 1
+        if len(to_parse) < PARALLEL_THRESHOLD:
+            workers = 1
+        paths = [str(self.root / rel) for rel in to_parse]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                entries = list(pool.map(_parse_file, paths, chunksize=16))
+        else:
+            entries = [_parse_file(path) for path in paths]
+        for rel, entry in zip(to_parse, entries):
+            self.files[rel] = entry
+
+        changed = set(to_parse) | set(removed)
+        if changed:
+            # L3 lists callers from other files, so any change can affect it
+            self._rendered = {
+                key: text for key, text in self._rendered.items()
+                if key[0] not in changed and key[1] != "L3"
+            }
+            self._maps.clear()
+            self._graph = None
+        if changed or rehashed:
+            self.save()
+
+        self.stats = {
+            "files": len(self.files),
+            "parsed": len(to_parse),
+            "reused": reused,
+            "rehashed": rehashed,
+            "removed": len(removed),
+            "workers": workers,
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+        return self.stats
+
+    # ---- Rendering ----
+
+    def file_tldr(self, rel: str, level: str = "L1") -> Optional[str]:
+        """
+        TLDR of one indexed file.
+
+        Args:
+            rel: Path relative to the root (posix separators)
+            level: L1 (signatures), L2 (+docstrings), L3 (+calls to and from
+                the rest of the repository)
+
+        Returns:
+            Rendered TLDR, or None if the file is not indexed
+        """
+        entry = self.files.get(rel)
+        if entry is None:
+            return None
+        key = (rel, level)
+        text = self._rendered.get(key)
+        if text is None:
+            if "structure" in entry and level == "L3":
+                text = tldr_code.format_python_structure(entry["structure"], rel, "L2")
+                text += self._graph_section(rel, entry["structure"])
+            elif "structure" in entry:
+                text = tldr_code.format_python_structure(entry["structure"], rel, level)
+            else:
+                text = entry["text"].replace(f"## {Path(rel).name}", f"## {rel}", 1)
+            self._rendered[key] = text
+        return text
+
+    def _graph_section(self, rel: str, structure: dict) -> str:
+        """L3 call graph of one file, resolved across the repository."""
+        if "error" in structure:
+            return ""
+        graph = self.call_graph(refresh=False)
+        module = module_name(rel)
+        symbols = [f"{module}.{func['name']}" for func in structure["functions"]]
+        for cls in structure["classes"]:
+            symbols.extend(f"{module}.{cls['name']}.{method['name']}" for method in cls["methods"])
+
+        def short(symbol: str) -> str:
+            return symbol[len(module) + 1:] if symbol.startswith(f"{module}.") else symbol
+
+        lines = []
+        for label, arrow, edges in (("Calls", "->", graph.callees), ("Called from", "<-", graph.callers)):
+            entries = [(symbol, edges(symbol)) for symbol in symbols]
+            entries = [(symbol, related) for symbol, related in entries if related]
+            if entries:
+                lines.append(f"**{label}:**")
+                for symbol, related in entries:
+                    lines.append(f"- {short(symbol)} {arrow} {', '.join(short(s) for s in related)}")
+                lines.append("")
+        return "\n".join(lines)
+
+    def call_graph(self, refresh: bool = True) -> CallGraph:
+        """
+        Repo-wide symbol table and call graph (rebuilt only after changes).
+
+        Args:
+            refresh: Pick up changed files first
+
+        Returns:
+            CallGraph over the indexed Python files
+        """
+        if refresh:
+            self.refresh()
+        elif not self._loaded:
+            self.load()
+        if self._graph is None:
+            self._graph = CallGraph(self.files)
+        return self._graph
+
+    def repo_map(self, level: str = "L1", refresh: bool = True) -> str:
+        """
+        Whole-repository code map.
+
+        Args:
+            level: L0 (file paths), L1 (signatures), L2 (+docstrings),
+                L3 (+call graph)
+            refresh: Pick up changed files first
+
+        Returns:
+            Per-file TLDRs in path order
+        """
+        if refresh:
+            self.refresh()
+        elif not self._loaded:
+            self.load()
+        text = self._maps.get(level)
+        if text is None:
+            paths = sorted(self.files)
+            if level == "L0":
+                text = "\n".join(paths)
+            else:
+                text = "\n".join(self.file_tldr(rel, level) for rel in paths)
+            self._maps[level] = text
+        return text
+
+
+_indexes: dict[Path, CodeIndex] = {}
+
+
+def get_index(root: Path) -> CodeIndex:
+    """
+    The process-wide index of a repository (kept warm between calls).
+
+    Args:
+        root: Repository root
+
+    Returns:
+        CodeIndex for root
+    """
+    root = Path(root).resolve()
+    index = _indexes.get(root)
+    if index is None:
+        index = _indexes[root] = CodeIndex(root)
+    return index
+
+
+def code_candidates(query: str, root: Optional[Path] = None, limit: int = 5) -> list[dict]:
+    """
+    Code symbols named in a recall query, as ranking candidates.
+
+    Only repositories that already have an index (e.g. from `flow map`) are
+    searched, so recall never pays for a cold index build.
+
+    Args:
+        query: Recall query; identifiers in it are looked up as symbols
+        root: Repository root (default: the current project root)
+        limit: Maximum candidates
+
+    Returns:
+        Candidate dicts (key, kind "code", content, files) for ranking.rank()
+    """
+    if root is None:
+        from handoff import find_project_root
+        root = find_project_root()
+    index = get_index(root)
+    if not index.exists():
+        return []
+    graph = index.call_graph()
+
+    symbols = []
+    for name in re.findall(r"[A-Za-z_][A-Za-z0-9_.]*[A-Za-z0-9_]", query):
+        if len(name) < 3:
+            continue
+        for symbol in graph.lookup(name):
+            if symbol not in symbols:
+                symbols.append(symbol)
+    # Most-used symbols first
+    symbols.sort(key=lambda symbol: -len(graph.called_by.get(symbol, ())))
+    return [
+        {
+            "key": f"code:{symbol}",
+            "kind": "code",
+            "content": graph.describe(symbol),
+            "files": [graph.symbols[symbol]["file"]],
+        }
+        for symbol in symbols[:limit]
+    ]
@@ -0,0 +1,160 @@
+"""Persistent content-addressed cache for Cerebras completions.
+
+The same prompts reach Cerebras again and again: TLDR summaries of an
+unchanged handoff or recall block, /suggestions over unchanged recent
+activity, issue detection on a session that was already analyzed.
+Completions are cached keyed on a hash of everything that determines the
+answer (model, system, prompt, max_tokens, json_mode).
+
+- Entries expire after TTL_SECONDS
+- The cache holds at most MAX_BYTES of responses; least recently used
+  entries are evicted first
+- Call sites opt out per call (cerebras_client's use_cache=False)
+
+Storage is a sqlite_cache database: one connection per thread, persistent
+hit/miss counters, and SQLite errors treated as misses.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+import sqlite_cache
+
+
+# ============ CONFIGURATION ============
+
+CACHE_FILE = Path.home() / ".flow-guardian" / "completion_cache.db"
+
+# Seconds a cached completion stays valid (0 disables the cache)
+TTL_SECONDS = int(os.environ.get("FLOW_GUARDIAN_COMPLETION_CACHE_TTL", str(7 * 24 * 3600)))
+MAX_BYTES = int(float(os.environ.get("FLOW_GUARDIAN_COMPLETION_CACHE_MB", "64")) * 1024 * 1024)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+"""
+
+
+# ============ HELPERS ============
+
+def make_key(
+    model: str,
+    system: Optional[str],
+    prompt: str,
+    max_tokens: int,
+    json_mode: bool,
+) -> str:
+    """
+    Content address of a completion request.
+
+    Args:
+        model: Model name
+        system: System message (None and "" are equivalent)
+        prompt: User prompt
+        max_tokens: Response token limit
+        json_mode: Whether a JSON response was requested
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps([model, system or "", prompt, max_tokens, bool(json_mode)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ============ CACHE OPERATIONS ============
+
+def get(key: str) -> Optional[str]:
+    """
+    Look up a cached completion.
+
+    Args:
+        key: Request key from make_key()
+
+    Returns:
+        Cached response, or None on a miss or expired entry
+    """
+    if TTL_SECONDS <= 0:
+        return None
+
+    def lookup(conn: sqlite3.Connection) -> Optional[str]:
+        now = time.time()
+        row = conn.execute("SELECT response, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row and now - row[1] < TTL_SECONDS:
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            sqlite_cache.bump(conn, "hits")
+            return row[0]
+        if row:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        sqlite_cache.bump(conn, "misses")
+        return None
+
+    return sqlite_cache.run(CACHE_FILE, _SCHEMA, lookup)
+
+
+def put(key: str, response: str) -> None:
+    """
+    Cache a completion, evicting least recently used entries beyond MAX_BYTES.
+
+    Args:
+        key: Request key from make_key()
+        response: Model response
+    """
+    if TTL_SECONDS <= 0 or not response:
+        return
+    size = len(response.encode("utf-8"))
+    if size > MAX_BYTES:
+        return
+
+    def store(conn: sqlite3.Connection) -> None:
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, response, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, response, size, now, now),
+        )
+        evicted = conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER "
+            "(ORDER BY accessed_at DESC, key ROWS UNBOUNDED PRECEDING) AS total FROM entries) "
+            "WHERE total > ?)",
+            (MAX_BYTES,),
+        ).rowcount
+        if evicted:
+            sqlite_cache.bump(conn, "evictions", evicted)
+
+    sqlite_cache.run(CACHE_FILE, _SCHEMA, store)
+
+
+def clear() -> None:
+    """Remove all entries and reset counters."""
+    sqlite_cache.run(CACHE_FILE, _SCHEMA, sqlite_cache.clear)
+
+
+def get_stats() -> dict:
+    """
+    Get cache statistics (across all processes).
+
+    Returns:
+        Dictionary with hits, misses, hit_rate, evictions, entries, bytes,
+        max_bytes and ttl_seconds
+    """
+    def read(conn: sqlite3.Connection) -> dict:
+        entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {**sqlite_cache.counters(conn), "entries": entries, "bytes": total}
+
+    stats = {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0}
+    stats.update(sqlite_cache.run(CACHE_FILE, _SCHEMA, read, default={}))
+    stats["hit_rate"] = sqlite_cache.hit_rate(stats)
+    stats["max_bytes"] = MAX_BYTES
+    stats["ttl_seconds"] = TTL_SECONDS
+    return stats
@@ -21,8 +21,8 @@ load_dotenv()
 # Import our modules
 import session_parser
 import cerebras_client
+import tokens
 import backboard_client
-from backboard_client import BackboardError
 
 
 # ============ CONFIGURATION ============
@@ -41,8 +41,8 @@ MIN_MESSAGES_BATCH = 5
 # Maximum time between extractions (seconds)
 MAX_EXTRACTION_INTERVAL = 300  # 5 minutes
 
-# Maximum conversation chunk size for Cerebras
-MAX_CHUNK_CHARS = 30000
+# Maximum conversation chunk size for Cerebras, in tokens (see tokens.py)
+MAX_CHUNK_TOKENS = int(os.environ.get("FLOW_GUARDIAN_CHUNK_TOKENS", "7500"))
 
 
 # ============ LOGGING ============
@@ -152,12 +152,15 @@ async def extract_insights(conversation_text: str) -> list[dict]:
         return []
 
     try:
-        prompt = EXTRACTION_PROMPT.format(conversation=conversation_text[:MAX_CHUNK_CHARS])
-        response = cerebras_client.complete(
+        conversation = tokens.truncate_to_tokens(conversation_text, MAX_CHUNK_TOKENS)
+        prompt = EXTRACTION_PROMPT.format(conversation=conversation)
+        response = await cerebras_client.acomplete(
             prompt=prompt,
             system="You are an expert at identifying key technical insights from conversations. Output valid JSON only.",
             json_mode=True,
-            max_tokens=2000
+            max_tokens=2000,
+            # New conversation text every time, so a cached answer would never be reused
+            use_cache=False,
         )
 
         # Parse JSON response with robust extraction
@@ -187,12 +190,14 @@ async def extract_insights(conversation_text: str) -> list[dict]:
 
 
 async def store_insights(insights: list[dict], session_id: str, cwd: str):
-    """Store extracted insights to Backboard."""
+    """Store extracted insights to Backboard, in parallel over the connection pool."""
     thread_id = os.environ.get("BACKBOARD_PERSONAL_THREAD_ID")
     if not thread_id:
         log("No BACKBOARD_PERSONAL_THREAD_ID, skipping cloud storage")
         return
 
+    messages = []
+    stored = []
     for insight in insights:
         category = insight.get("category", "learning")
         text = insight.get("insight", "")
@@ -200,21 +205,24 @@ async def store_insights(insights: list[dict], session_id: str, cwd: str):
         if not text:
             continue
 
-        try:
-            content = f"**{category.title()}** (auto-captured): {text}"
-            metadata = {
-                "type": f"auto_{category}",
-                "source": "daemon",
-                "session_id": session_id,
-                "cwd": cwd,
-                "timestamp": datetime.now().isoformat(),
-            }
-            await backboard_client.store_message(thread_id, content, metadata)
+        content = f"**{category.title()}** (auto-captured): {text}"
+        metadata = {
+            "type": f"auto_{category}",
+            "source": "daemon",
+            "session_id": session_id,
+            "cwd": cwd,
+            "timestamp": datetime.now().isoformat(),
+        }
+        messages.append((thread_id, content, metadata))
+        stored.append((category, text))
+
+    results = await backboard_client.store_messages(messages)
+    for (category, text), result in zip(stored, results):
+        if isinstance(result, Exception):
+            log(f"Failed to store insight: {result}")
+        else:
             log(f"Stored {category}: {text[:50]}...")
 
-        except BackboardError as e:
-            log(f"Failed to store insight: {e}")
-
 
 # ============ SESSION WATCHING ============
 
@@ -233,28 +241,22 @@ async def process_session(session_path: Path, state: dict) -> bool:
         "pending_messages": 0,
     })
 
-    last_line = session_state.get("last_line", 0)
     last_extraction = session_state.get("last_extraction")
     pending = session_state.get("pending_messages", 0)
 
-    # Get new conversation text
-    conversation, new_last_line = session_parser.get_conversation_text(
-        session_path,
-        since_line=last_line,
-        max_chars=MAX_CHUNK_CHARS
-    )
+    # Read only what was appended since the saved byte offset, off the loop
+    # so the other pool workers keep running
+    tailer = session_parser.tail_session(session_path, session_state)
+    new_messages = await asyncio.to_thread(tailer.read_new)
+    session_state.update(tailer.position())
+    state["sessions"][session_id] = session_state
 
-    if new_last_line <= last_line:
+    if not new_messages:
         return False  # No new messages
 
     # Count new messages
-    new_messages = new_last_line - last_line
-    pending += new_messages
-
-    # Update state
-    session_state["last_line"] = new_last_line
+    pending += len(new_messages)
     session_state["pending_messages"] = pending
-    state["sessions"][session_id] = session_state
 
     # Decide if we should extract
     time_since_extraction = float("inf")
@@ -278,22 +280,14 @@ async def process_session(session_path: Path, state: dict) -> bool:
     # Extract insights
     log(f"Session {session_id[:8]}: Extracting insights from {pending} messages...")
 
-    # Get more context for extraction (not just since last line)
-    full_conversation, _ = session_parser.get_conversation_text(
-        session_path,
-        since_line=max(0, new_last_line - 50),  # Get last 50 messages for context
-        max_chars=MAX_CHUNK_CHARS
-    )
+    # Context for extraction: the tailer's window of recent messages
+    full_conversation = tailer.context.text(max_tokens=MAX_CHUNK_TOKENS)
 
     insights = await extract_insights(full_conversation)
 
     if insights:
-        # Get cwd from session for metadata
-        cwd = None
-        for msg in session_parser.parse_session_messages(session_path, 0):
-            cwd = msg.get("cwd")
-            if cwd:
-                break
+        # cwd was captured by the tailer
+        cwd = tailer.metadata.get("cwd")
 
         await store_insights(insights, session_id, cwd or "unknown")
         log(f"Extracted {len(insights)} insights from session {session_id[:8]}")
@@ -329,30 +323,44 @@ async def watch_sessions():
 
     log("Daemon started, watching for Claude Code sessions...")
 
-    while True:
-        try:
-            # Find all project directories
-            if not session_parser.CLAUDE_PROJECTS_DIR.exists():
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
+    # Keep Backboard and Cerebras connections alive between extraction bursts
+    await backboard_client.open_client()
+    await cerebras_client.open_client()
+    try:
+        await _watch_loop(state)
+    finally:
+        await cerebras_client.close_client()
+        await backboard_client.close_client()
 
-            for project_dir in session_parser.CLAUDE_PROJECTS_DIR.iterdir():
-                if not project_dir.is_dir():
-                    continue
 
-                # Find most recent session
-                session_id = session_parser.get_active_session(project_dir)
-                if not session_id:
-                    continue
+async def _watch_loop(state: dict):
+    """Process sessions as they are appended to, forever."""
+    import session_watcher
+    import worker_pool
 
-                session_path = session_parser.get_session_path(project_dir, session_id)
-                if session_path.exists():
-                    await process_session(session_path, state)
+    async def handle(session_path: Path):
+        await process_session(session_path, state)
 
-        except Exception as e:
-            log(f"Error in watch loop: {e}")
+    watcher = session_watcher.SessionWatcher(poll_interval=POLL_INTERVAL)
+    backend = await watcher.start()
+    pool = worker_pool.SessionWorkerPool(
+        handle,
+        on_error=lambda path, e: log(f"Error processing {path.stem[:8]}: {e}"),
+    )
+    pool.start()
+    log(f"Watching sessions with {backend} ({pool.concurrency} extraction workers)")
 
-        await asyncio.sleep(POLL_INTERVAL)
+    # Catch up on sessions written to while the daemon was down
+    changed = watcher.recent_sessions()
+    try:
+        while True:
+            for session_path in sorted(changed):
+                pool.submit(session_path)
+
+            changed = await watcher.changes(timeout=POLL_INTERVAL)
+    finally:
+        await pool.stop()
+        await watcher.stop()
 
 
 # ============ DAEMON CONTROL ============
@@ -49,6 +49,8 @@ export interface RecallResponse {
     local: boolean;
     cloud: boolean;
   };
+  timed_out?: string[];
+  partial?: boolean;
 }
 
 class FlowGuardianAPI {
@@ -85,11 +87,11 @@ class FlowGuardianAPI {
     return res.json();
   }
 
-  async recall(query: string): Promise<RecallResponse> {
+  async recall(query: string, deadlineMs?: number): Promise<RecallResponse> {
     const res = await fetch(`${this.baseUrl}/recall`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ query }),
+      body: JSON.stringify({ query, deadline_ms: deadlineMs }),
     });
     if (!res.ok) throw new Error('Failed to recall context');
     return res.json();
@@ -128,9 +130,11 @@ class FlowGuardianAPI {
     page?: number;
     limit?: number;
     branch?: string;
-  }): Promise<{ sessions: Session[]; total: number; page: number }> {
+    cursor?: string;
+  }): Promise<{ sessions: Session[]; total: number; page: number; next_cursor: string | null }> {
     const searchParams = new URLSearchParams();
     if (params?.page) searchParams.set('page', String(params.page));
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
     if (params?.limit) searchParams.set('limit', String(params.limit));
     if (params?.branch) searchParams.set('branch', params.branch);
 
@@ -144,9 +148,11 @@ class FlowGuardianAPI {
     limit?: number;
     tag?: string;
     team?: boolean;
-  }): Promise<{ learnings: Learning[]; total: number }> {
+    cursor?: string;
+  }): Promise<{ learnings: Learning[]; total: number; next_cursor: string | null }> {
     const searchParams = new URLSearchParams();
     if (params?.page) searchParams.set('page', String(params.page));
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
     if (params?.limit) searchParams.set('limit', String(params.limit));
     if (params?.tag) searchParams.set('tag', params.tag);
     if (params?.team !== undefined) searchParams.set('team', String(params.team));
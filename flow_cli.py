@@ -14,12 +14,16 @@ load_dotenv()
 
 import click
 from rich.console import Console
+from rich.live import Live
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt
 
 import capture
+import git_utils
 import memory
+import ranking
 import restore
 import backboard_client
 from backboard_client import BackboardError, BackboardAuthError
@@ -218,8 +222,10 @@ def resume(session_id: Optional[str], pick: bool, raw: bool, copy_to_clipboard:
             console.print(output)
             return
 
-        # Generate restoration message
-        restoration_msg = restore.generate_restoration_message(session, changes)
+        # Generate the restoration message, showing it as it streams in
+        restoration_msg = _stream_resume_panel(
+            changes, conflicts, restore.stream_restoration_message(session, changes)
+        )
 
         if copy_to_clipboard:
             try:
@@ -233,8 +239,6 @@ def resume(session_id: Optional[str], pick: bool, raw: bool, copy_to_clipboard:
             except Exception:
                 console.print("[yellow]Could not copy to clipboard[/yellow]")
 
-        _display_resume_panel(session, changes, conflicts, restoration_msg)
-
     except Exception as e:
         console.print(f"[red]Error resuming session: {e}[/red]")
         sys.exit(1)
@@ -279,8 +283,8 @@ def _interactive_session_picker() -> Optional[dict]:
     return None
 
 
-def _display_resume_panel(session: dict, changes: dict, conflicts: list, message: str):
-    """Display a beautiful welcome back panel."""
+def _resume_panel(changes: dict, conflicts: list, message: str) -> Panel:
+    """Build the welcome back panel."""
     lines = []
 
     # Warnings
@@ -293,15 +297,27 @@ def _display_resume_panel(session: dict, changes: dict, conflicts: list, message
             lines.append(f"[yellow]Warning: {conflict}[/yellow]")
         lines.append("")
 
-    # Main message
-    lines.append(message)
+    # Main message (model output, so not parsed as markup; it may be cut mid-tag)
+    lines.append(escape(message))
 
-    panel = Panel(
+    return Panel(
         "\n".join(lines),
         title="[blue]Welcome Back[/blue]",
         border_style="blue"
     )
-    console.print(panel)
+
+
+def _stream_resume_panel(changes: dict, conflicts: list, chunks) -> str:
+    """Display the welcome back panel, filling in the message as it streams.
+
+    Returns the complete message.
+    """
+    message = ""
+    with Live(_resume_panel(changes, conflicts, message), console=console, refresh_per_second=12) as live:
+        for chunk in chunks:
+            message += chunk
+            live.update(_resume_panel(changes, conflicts, message))
+    return message
 
 
 # ============ LEARN COMMAND ============
@@ -401,7 +417,8 @@ def recall(query: str, tag: tuple, limit: int):
     """Search your stored learnings and context.
 
     Uses semantic search when Backboard.io is available,
-    falls back to keyword search locally.
+    falls back to the local hybrid ranker (keyword + vector
+    search, boosted for recency and the current branch).
 
     Examples:
         flow recall "authentication"
@@ -432,7 +449,15 @@ def recall(query: str, tag: tuple, limit: int):
 
         # Fall back to local search
         if not results:
-            results = memory.search_learnings(query, tags)[:limit]
+            results = ranking.rank(
+                query,
+                store=memory,
+                branch=git_utils.get_current_branch(),
+                tags=tags,
+                limit=limit,
+                include_recent=False,
+                extra=None if tags else _code_candidates(query),
+            )["results"]
 
         _display_recall_results(query, results, used_backboard)
 
@@ -441,6 +466,16 @@ def recall(query: str, tag: tuple, limit: int):
         sys.exit(1)
 
 
+def _code_candidates(query: str) -> dict:
+    """Code symbols named in the query, if this project has a code index."""
+    try:
+        import code_index
+        code = code_index.code_candidates(query)
+    except Exception:
+        return {}
+    return {"code": code} if code else {}
+
+
 def _display_recall_results(query: str, results: list, used_backboard: bool):
     """Display recall results."""
     if not results:
@@ -458,7 +493,7 @@ def _display_recall_results(query: str, results: list, used_backboard: bool):
         lines.append(f"Found {len(results)} relevant items:\n")
         for i, result in enumerate(results, 1):
             if isinstance(result, dict):
-                text = result.get("text", "")
+                text = result.get("content") or result.get("text", "")
                 tags = result.get("tags", [])
                 timestamp = result.get("timestamp", "")
 
@@ -640,6 +675,33 @@ def history(limit: int, show_all: bool, branch: Optional[str]):
         sys.exit(1)
 
 
+# ============ MIGRATE COMMAND ============
+
+@cli.command("migrate-storage")
+def migrate_storage():
+    """Copy local JSON memory into the SQLite storage engine.
+
+    One-shot: does nothing if the database already has data.
+    Enable the database afterwards with FLOW_GUARDIAN_STORAGE=sqlite.
+    """
+    try:
+        result = memory.migrate_to_sqlite()
+
+        if result.get("skipped"):
+            console.print("[yellow]SQLite storage already has data, nothing migrated.[/yellow]")
+            return
+
+        console.print(
+            f"[green]Migrated {result['sessions']} sessions and "
+            f"{result['learnings']} learnings to SQLite.[/green]"
+        )
+        console.print("[dim]Enable it with: FLOW_GUARDIAN_STORAGE=sqlite[/dim]")
+
+    except Exception as e:
+        console.print(f"[red]Error migrating storage: {e}[/red]")
+        sys.exit(1)
+
+
 # ============ DAEMON COMMAND GROUP ============
 
 @cli.group()
@@ -834,6 +896,45 @@ Be specific and actionable. This will be used to restore context in a new sessio
         sys.exit(1)
 
 
+# ============ MAP COMMAND ============
+
+@cli.command("map")
+@click.option("-l", "--level", default="L1", type=click.Choice(["L0", "L1", "L2", "L3"]),
+              help="Detail: L0 paths, L1 signatures, L2 +docstrings, L3 +call graph (default: L1)")
+@click.option("--project", "-p", help="Project path (default: current project root)")
+@click.option("--stats", "show_stats", is_flag=True, help="Show how much of the index was reused")
+def code_map(level: str, project: Optional[str], show_stats: bool):
+    """Print a code map of the whole project.
+
+    Built from the code index: only files changed since the last run are
+    parsed again, so repeated maps are near-instant.
+
+    Examples:
+        flow map
+        flow map --level L3      # with calls across modules
+        flow map --stats
+    """
+    import code_index
+    from handoff import find_project_root
+
+    try:
+        root = Path(project) if project else find_project_root()
+        index = code_index.get_index(root)
+        # Plain echo: Rich would wrap long signature lines
+        click.echo(index.repo_map(level))
+
+        if show_stats:
+            stats = index.stats
+            console.print(
+                f"[dim]{stats['files']} files: {stats['parsed']} parsed, "
+                f"{stats['reused'] + stats['rehashed']} reused, {stats['removed']} removed "
+                f"in {stats['seconds'] * 1000:.0f} ms[/dim]"
+            )
+    except Exception as e:
+        console.print(f"[red]Error building code map: {e}[/red]")
+        sys.exit(1)
+
+
 # ============ INJECT COMMAND ============
 
 @cli.command()
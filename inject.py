@@ -162,8 +162,9 @@ def _score_and_filter_results(
     """
     Score and filter recall results for relevance.
 
-    Applies local relevance scoring:
-    - Recency boost: Items from last 24h get priority
+    Results keep their incoming order as relevance and are re-scored by
+    the shared recall ranker (ranking.py):
+    - Recency decay: newer items get priority
     - Branch match: Same branch = higher relevance
     - File overlap: Matching files = higher relevance
 
@@ -175,56 +176,30 @@ def _score_and_filter_results(
     Returns:
         Scored and filtered list of results
     """
-    from datetime import timedelta
+    from ranking import fuse, rescore
 
     if not results:
         return []
 
-    # Get current context for matching
-    current_branch = handoff.get("branch") if handoff else None
-    current_files = set(handoff.get("files", [])) if handoff else set()
-    now = datetime.now(timezone.utc)
-
-    scored_results = []
-    for item in results:
-        score = 0.0
+    candidates = []
+    for position, item in enumerate(results):
         metadata = item.get("metadata", {})
-
-        # Recency boost (24h window)
-        timestamp_str = metadata.get("timestamp")
-        if timestamp_str:
-            try:
-                item_time = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                hours_ago = (now - item_time).total_seconds() / 3600
-                if hours_ago < 24:
-                    score += 0.3 * (1 - hours_ago / 24)  # Max 0.3 boost for recent items
-            except (ValueError, TypeError):
-                pass
-
-        # Branch match boost
-        item_branch = metadata.get("branch")
-        if item_branch and current_branch and item_branch == current_branch:
-            score += 0.3
-
-        # File overlap boost
-        item_files = set(metadata.get("files", []))
-        if item_files and current_files:
-            overlap = len(item_files & current_files)
-            if overlap > 0:
-                score += 0.2 * min(overlap / 3, 1.0)  # Max 0.2 boost for file overlap
-
-        # Type priority (learnings and decisions higher than context)
-        item_type = metadata.get("type", "context")
-        if item_type in ("learning", "learnings"):
-            score += 0.1
-        elif item_type in ("decision", "decisions"):
-            score += 0.1
-
-        scored_results.append((score, item))
-
-    # Sort by score (descending) and return top N
-    scored_results.sort(key=lambda x: x[0], reverse=True)
-    return [item for _, item in scored_results[:limit]]
+        candidates.append({
+            "key": str(position),
+            "kind": metadata.get("type", "context"),
+            "content": item.get("content", ""),
+            "timestamp": metadata.get("timestamp"),
+            "branch": metadata.get("branch"),
+            "files": metadata.get("files", []),
+            "item": item,
+        })
+
+    ranked = rescore(
+        fuse({"recall": candidates}),
+        branch=handoff.get("branch") if handoff else None,
+        files=handoff.get("files", []) if handoff else None,
+    )
+    return [candidate["item"] for candidate in ranked[:limit]]
 
 
 def categorize_recall(results: list) -> dict:
@@ -271,8 +246,9 @@ def _local_fallback(handoff: Optional[dict] = None, limit: int = 10) -> list:
     """
     Fall back to local memory when Backboard unavailable.
 
-    Searches local learnings and sessions, then applies
-    relevance scoring for better results.
+    Ranks local learnings and sessions with the shared hybrid ranker
+    (keyword + vector search, recency, branch and file overlap), always
+    including the latest session as a candidate.
 
     Args:
         handoff: Current handoff state for context matching
@@ -282,9 +258,8 @@ def _local_fallback(handoff: Optional[dict] = None, limit: int = 10) -> list:
         List of local memory results with metadata
     """
     try:
-        from memory import search_learnings, get_latest_session
-
-        results = []
+        import memory
+        from ranking import rank, session_candidate
 
         # Build search query from handoff
         query = ""
@@ -294,36 +269,42 @@ def _local_fallback(handoff: Optional[dict] = None, limit: int = 10) -> list:
             if handoff.get("now"):
                 query += handoff["now"] + " "
 
-        # Get recent learnings (search by query if available)
-        learnings = search_learnings(query.strip() or "", limit=limit)
-        for learning in learnings:
-            results.append({
-                "content": learning.get("text", ""),
-                "metadata": {
+        # Latest session context is always a candidate
+        extra = {}
+        session = memory.get_latest_session()
+        if session and session.get("context", {}).get("summary"):
+            extra["latest_session"] = [session_candidate(session)]
+
+        ranked = rank(
+            query.strip(),
+            store=memory,
+            branch=handoff.get("branch") if handoff else None,
+            files=handoff.get("files", []) if handoff else None,
+            limit=limit,
+            extra=extra,
+        )
+
+        results = []
+        for candidate in ranked["results"]:
+            record = candidate.get("record", {})
+            if candidate["kind"] == "learning":
+                metadata = {
                     "type": "learning",
-                    "timestamp": learning.get("timestamp"),
-                    "tags": learning.get("tags", []),
-                    **learning.get("metadata", {})
+                    "timestamp": candidate.get("timestamp"),
+                    "tags": candidate.get("tags", []),
+                    **record.get("metadata", {})
                 }
-            })
-
-        # Get latest session context
-        session = get_latest_session()
-        if session:
-            context = session.get("context", {})
-            if context.get("summary"):
-                results.append({
-                    "content": f"Previous session: {context.get('summary')}",
-                    "metadata": {
-                        "type": "context",
-                        "timestamp": session.get("timestamp"),
-                        "branch": session.get("git", {}).get("branch"),
-                        "files": context.get("files", []),
-                    }
-                })
-
-        # Apply relevance scoring
-        return _score_and_filter_results(results, handoff, limit)
+            else:
+                metadata = {
+                    "type": "context",
+                    "timestamp": candidate.get("timestamp"),
+                    "branch": candidate.get("branch"),
+                    "files": candidate.get("files", []),
+                }
+            metadata["score"] = candidate["score"]
+            results.append({"content": candidate["content"], "metadata": metadata})
+
+        return results
 
     except Exception as e:
         logger.debug(f"Local fallback failed: {e}")
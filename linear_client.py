@@ -589,6 +589,73 @@ async def search_documents(query: str = None, limit: int = 10) -> list[dict]:
         return []
 
 
+async def fetch_documents(
+    updated_since: Optional[str] = None,
+    project_id: Optional[str] = None,
+    page_size: int = 50,
+) -> list[dict]:
+    """
+    Fetch documents with full content, paging through all results.
+
+    Archived documents are included (with archivedAt set) so a local
+    mirror can drop them.
+
+    Args:
+        updated_since: Only documents updated at or after this ISO timestamp
+        project_id: Only documents of this project
+        page_size: Documents per request
+
+    Returns:
+        List of documents with id, title, content, url, createdAt, updatedAt
+        and archivedAt
+
+    Raises:
+        ValueError: LINEAR_API_KEY is not set
+        RuntimeError: Linear returned GraphQL errors
+        httpx.HTTPError: The request failed
+    """
+    gql_query = """
+    query SyncDocs($first: Int!, $after: String, $filter: DocumentFilter) {
+        documents(first: $first, after: $after, filter: $filter, includeArchived: true, orderBy: updatedAt) {
+            nodes {
+                id
+                title
+                content
+                url
+                createdAt
+                updatedAt
+                archivedAt
+            }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+        }
+    }
+    """
+    doc_filter = {}
+    if updated_since:
+        doc_filter["updatedAt"] = {"gte": updated_since}
+    if project_id:
+        doc_filter["project"] = {"id": {"eq": project_id}}
+
+    documents = []
+    after = None
+    while True:
+        variables = {"first": page_size, "after": after}
+        if doc_filter:
+            variables["filter"] = doc_filter
+        result = await linear_query(gql_query, variables)
+        if result.get("errors"):
+            raise RuntimeError(f"Linear GraphQL errors: {result['errors']}")
+        page = (result.get("data") or {}).get("documents") or {}
+        documents.extend(page.get("nodes") or [])
+        page_info = page.get("pageInfo") or {}
+        if not page_info.get("hasNextPage") or not page_info.get("endCursor"):
+            return documents
+        after = page_info["endCursor"]
+
+
 # CLI test
 if __name__ == "__main__":
     import asyncio
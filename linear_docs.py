@@ -0,0 +1,307 @@
+"""Local mirror of Linear documents for recall.
+
+linear_client.search_documents() downloads the first N project documents,
+full content included, on every recall and filters them by substring, so
+only those N were ever searchable. This module keeps a local copy instead:
+
+- Incremental sync: only documents updated since the last sync are fetched
+  (an updatedAt cursor), paging through the whole result; archived
+  documents are dropped
+- A full sync every FULL_SYNC_HOURS (or when LINEAR_PROJECT_ID changes)
+  catches documents deleted outright
+- Full-text BM25 index (search_index.SearchIndex) and, with numpy, an
+  embedding index (vector_index.VectorIndex) over title and content
+- search() answers recall queries locally; search_documents() falls back
+  to the live API until the first sync has completed
+
+The daemon (daemon and combined mode) refreshes the mirror every
+SYNC_INTERVAL seconds.
+
+Files (under ~/.flow-guardian/linear/):
+- docs.db: document payloads and their full-text index
+- vectors/: embedding index
+- sync.json: cursor, project and last sync times
+"""
+import asyncio
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from search_index import SearchIndex, tokenize
+from vector_index import VectorIndex
+
+
+# ============ CONFIGURATION ============
+
+LINEAR_DIR = Path.home() / ".flow-guardian" / "linear"
+DB_FILENAME = "docs.db"
+VECTORS_DIRNAME = "vectors"
+STATE_FILENAME = "sync.json"
+
+# Seconds between background syncs, and hours between full syncs
+SYNC_INTERVAL = float(os.environ.get("FLOW_GUARDIAN_LINEAR_SYNC_INTERVAL", "300"))
+FULL_SYNC_HOURS = float(os.environ.get("FLOW_GUARDIAN_LINEAR_FULL_SYNC_HOURS", "24"))
+
+# Also keep an embedding index for semantic matches (needs numpy)
+EMBED = os.environ.get("FLOW_GUARDIAN_LINEAR_EMBED", "true").lower() in ("1", "true", "yes")
+
+PAGE_SIZE = 50
+SNIPPET_CHARS = 500
+
+# Matches fetched from each index before fusing
+CANDIDATE_LIMIT = 20
+
+KIND = "linear"
+
+
+def _doc_key(doc_id: str) -> str:
+    return f"{KIND}:{doc_id}"
+
+
+def _snippet(content: str, query: str) -> str:
+    """Up to SNIPPET_CHARS of content, starting near the first query term."""
+    start = 0
+    lowered = content.lower()
+    for term in tokenize(query):
+        match = re.search(rf"\b{re.escape(term)}", lowered)
+        if match:
+            # Back up to the start of the line the term is on, within reason
+            start = max(lowered.rfind("\n", 0, match.start()) + 1, match.start() - SNIPPET_CHARS // 4)
+            break
+    return content[start:start + SNIPPET_CHARS]
+
+
+# ============ MIRROR ============
+
+class LinearDocMirror:
+    """Linear documents kept in local full-text and embedding indexes."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.index = SearchIndex(directory / DB_FILENAME)
+        self.vectors = VectorIndex(directory / VECTORS_DIRNAME)
+        self._sync_lock: Optional[asyncio.Lock] = None
+
+    # ---- State ----
+
+    def state(self) -> dict:
+        """Sync state: project_id, cursor, last_sync, last_full_sync, documents."""
+        try:
+            return json.loads((self.directory / STATE_FILENAME).read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self, state: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / STATE_FILENAME
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2))
+        tmp.replace(path)
+
+    def is_synced(self, project_id: Optional[str] = None) -> bool:
+        """True once a sync of this project's documents has completed."""
+        state = self.state()
+        return bool(state.get("last_sync")) and state.get("project_id") == (project_id or None)
+
+    def _needs_full_sync(self, state: dict, project_id: Optional[str]) -> bool:
+        if not state.get("last_full_sync") or state.get("project_id") != project_id:
+            return True
+        last_full = datetime.fromisoformat(state["last_full_sync"])
+        return (datetime.now(timezone.utc) - last_full).total_seconds() > FULL_SYNC_HOURS * 3600
+
+    # ---- Sync ----
+
+    async def sync(self, full: bool = False) -> dict:
+        """
+        Bring the mirror up to date with Linear.
+
+        Args:
+            full: Refetch every document and drop the ones that are gone
+                  (done automatically every FULL_SYNC_HOURS)
+
+        Returns:
+            Dictionary with full, fetched, updated, removed and documents
+        """
+        import linear_client
+
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        async with self._sync_lock:
+            project_id = os.environ.get("LINEAR_PROJECT_ID") or None
+            state = self.state()
+            reset = state.get("project_id") != project_id
+            # Vectors from another embedding model can't be searched or appended to
+            full = full or self._needs_full_sync(state, project_id) \
+                or (EMBED and not self.vectors.is_current())
+            started = datetime.now(timezone.utc).isoformat()
+
+            docs = await linear_client.fetch_documents(
+                updated_since=None if full else state.get("cursor"),
+                project_id=project_id,
+                page_size=PAGE_SIZE,
+            )
+            updated, removed = await asyncio.to_thread(self._apply, docs, full, reset)
+
+            cursor = None if full else state.get("cursor")
+            for doc in docs:
+                if doc.get("updatedAt") and (cursor is None or doc["updatedAt"] > cursor):
+                    cursor = doc["updatedAt"]
+            documents = self.index.doc_count(KIND)
+            state.update({
+                "project_id": project_id,
+                "cursor": cursor,
+                "last_sync": started,
+                "documents": documents,
+            })
+            if full:
+                state["last_full_sync"] = started
+            self._save_state(state)
+
+            return {
+                "full": full,
+                "fetched": len(docs),
+                "updated": updated,
+                "removed": removed,
+                "documents": documents,
+            }
+
+    def _apply(self, docs: list[dict], full: bool, reset: bool) -> tuple[int, int]:
+        """Write fetched documents to the indexes; returns (updated, removed)."""
+        if reset:
+            self.index.clear(KIND)
+        live = {}
+        archived = set()
+        for doc in docs:
+            if not doc.get("id"):
+                continue
+            key = _doc_key(doc["id"])
+            if doc.get("archivedAt"):
+                archived.add(key)
+                live.pop(key, None)
+            else:
+                live[key] = doc
+
+        indexed = set(self.index.doc_keys(KIND))
+        gone = (indexed - set(live)) if full else (archived & indexed)
+        self.index.remove_documents(gone)
+
+        items = []
+        changed = []
+        for key, doc in live.items():
+            payload = {
+                "id": doc["id"],
+                "title": doc.get("title") or "Untitled",
+                "content": doc.get("content") or "",
+                "url": doc.get("url"),
+                "created_at": doc.get("createdAt"),
+                "updated_at": doc.get("updatedAt"),
+            }
+            text = f"{payload['title']}\n{payload['content']}"
+            existing = None if full else self.index.get(key)
+            if existing is not None:
+                # The updatedAt cursor is inclusive, so the newest document
+                # comes back on every incremental sync
+                if (existing.get("updated_at") or "") >= (payload["updated_at"] or ""):
+                    continue
+            items.append((key, text, payload["updated_at"], payload))
+            if existing is None or (existing["title"], existing["content"]) != (payload["title"], payload["content"]):
+                changed.append(({"id": key}, text))
+        self.index.upsert_documents(KIND, items)
+
+        if EMBED:
+            # A full sync rewrites the append-only vectors, dropping stale rows;
+            # otherwise only new or edited text is embedded again
+            if full:
+                self.vectors.clear()
+            self.vectors.add_records(KIND, changed)
+        return len(items), len(gone)
+
+    # ---- Search ----
+
+    def search(self, query: str, limit: int = 5) -> list[dict]:
+        """
+        Find mirrored documents matching a query.
+
+        Keyword (BM25) and semantic matches are merged with reciprocal-rank
+        fusion.
+
+        Args:
+            query: Free-text query
+            limit: Maximum documents
+
+        Returns:
+            Documents like linear_client.search_documents(): id, title,
+            content snippet, url, updated_at
+        """
+        import ranking
+
+        lists = {
+            "keyword": [
+                {"key": _doc_key(payload["id"])}
+                for _, payload in self.index.search(query, KIND, limit=CANDIDATE_LIMIT)
+            ],
+        }
+        if EMBED and self.vectors.is_current():
+            lists["semantic"] = [
+                {"key": record["id"]}
+                for _, record in self.vectors.search(query, kind=KIND, limit=CANDIDATE_LIMIT)
+            ]
+
+        results = []
+        for candidate in ranking.fuse(lists, weights={"keyword": 1.0, "semantic": ranking.semantic_weight()}):
+            # Vectors are append-only; documents removed since are skipped here
+            payload = self.index.get(candidate["key"])
+            if payload is None:
+                continue
+            results.append({
+                "id": payload["id"],
+                "title": payload["title"],
+                "content": _snippet(payload["content"], query),
+                "url": payload["url"],
+                "updated_at": payload["updated_at"],
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    def get_stats(self) -> dict:
+        """Mirrored document count and last sync times."""
+        state = self.state()
+        return {
+            "documents": self.index.doc_count(KIND),
+            "last_sync": state.get("last_sync"),
+            "last_full_sync": state.get("last_full_sync"),
+        }
+
+
+_mirrors: dict[str, LinearDocMirror] = {}
+
+
+def get_mirror() -> LinearDocMirror:
+    """The mirror under LINEAR_DIR (one instance per directory)."""
+    mirror = _mirrors.get(str(LINEAR_DIR))
+    if mirror is None:
+        mirror = _mirrors[str(LINEAR_DIR)] = LinearDocMirror(LINEAR_DIR)
+    return mirror
+
+
+async def search_documents(query: str, limit: int = 5) -> list[dict]:
+    """
+    Search Linear documents, locally once the mirror has been synced.
+
+    Args:
+        query: Free-text query
+        limit: Maximum documents
+
+    Returns:
+        Documents with id, title, content snippet, url and updated_at
+    """
+    mirror = get_mirror()
+    if mirror.is_synced(os.environ.get("LINEAR_PROJECT_ID")):
+        return await asyncio.to_thread(mirror.search, query, limit)
+
+    import linear_client
+    return await linear_client.search_documents(query, limit=limit)
@@ -2,15 +2,34 @@
 
 Handles local file-based storage as a fallback when Backboard.io is unavailable.
 All data is stored in ~/.flow-guardian/ directory.
+
+Sessions and learnings go through a pluggable backend (see storage.py).
+Set FLOW_GUARDIAN_STORAGE=sqlite to use the SQLite engine; the JSON layout
+remains the default.
+
+Saved records are also fed to a keyword index (search_index.py) and a local
+vector index (vector_index.py) for offline semantic recall, and learnings to
+a tag index (tag_index.py) that the dashboard endpoints answer from.
 """
-import json
 import os
-import tempfile
-import shutil
+import sqlite3
+import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from search_index import SearchIndex
+from tag_index import TagIndex
+from vector_index import VectorIndex
+from storage import (
+    JSONBackend,
+    SQLiteBackend,
+    atomic_write_json,
+    get_cache_stats as _storage_cache_stats,
+    migrate_json_to_sqlite,
+    safe_read_json,
+)
+
 
 # ============ CONFIGURATION ============
 
@@ -19,6 +38,51 @@ SESSIONS_DIR = STORAGE_DIR / "sessions"
 CONFIG_FILE = STORAGE_DIR / "config.json"
 SESSIONS_INDEX = SESSIONS_DIR / "index.json"
 LEARNINGS_FILE = STORAGE_DIR / "learnings.json"
+DB_FILENAME = "memory.db"
+SEARCH_DB_FILENAME = "search.db"
+TAGS_DB_FILENAME = "tags.db"
+VECTORS_DIRNAME = "vectors"
+
+# Storage engine: "json" (default) or "sqlite"
+STORAGE_BACKEND = os.environ.get("FLOW_GUARDIAN_STORAGE", "json").lower()
+
+
+def get_backend(name: Optional[str] = None) -> JSONBackend | SQLiteBackend:
+    """
+    Get the storage backend for the current storage paths.
+
+    Args:
+        name: "json" or "sqlite" (defaults to STORAGE_BACKEND)
+
+    Returns:
+        Backend instance bound to STORAGE_DIR
+    """
+    name = name or STORAGE_BACKEND
+    if name == "sqlite":
+        return SQLiteBackend(STORAGE_DIR / DB_FILENAME)
+    return JSONBackend(SESSIONS_DIR, SESSIONS_INDEX, LEARNINGS_FILE)
+
+
+def get_search_index() -> SearchIndex:
+    """Get the full-text index for the current storage directory."""
+    return SearchIndex(STORAGE_DIR / SEARCH_DB_FILENAME)
+
+
+def get_tag_index() -> TagIndex:
+    """Get the tag index for the current storage directory."""
+    return TagIndex(STORAGE_DIR / TAGS_DB_FILENAME)
+
+
+_vector_indexes: dict[str, VectorIndex] = {}
+
+
+def get_vector_index() -> VectorIndex:
+    """Get the vector index for the current storage directory (kept per process)."""
+    directory = STORAGE_DIR / VECTORS_DIRNAME
+    index = _vector_indexes.get(str(directory))
+    if index is None:
+        index = _vector_indexes[str(directory)] = VectorIndex(directory)
+    return index
 
 
 # ============ INITIALIZATION ============
@@ -48,13 +112,11 @@ def init_storage() -> None:
             }
         })
 
-    # Initialize sessions index
-    if not SESSIONS_INDEX.exists():
-        _atomic_write(SESSIONS_INDEX, [])
-
-    # Initialize learnings file
-    if not LEARNINGS_FILE.exists():
-        _atomic_write(LEARNINGS_FILE, [])
+    # Initialize sessions index and learnings (JSON layout is always created
+    # so switching backends or migrating never finds a missing file)
+    JSONBackend(SESSIONS_DIR, SESSIONS_INDEX, LEARNINGS_FILE).init()
+    if STORAGE_BACKEND == "sqlite":
+        get_backend().init()
 
 
 # ============ ATOMIC FILE OPERATIONS ============
@@ -64,38 +126,14 @@ def _atomic_write(filepath: Path, data: dict | list) -> None:
     Atomically write data to a JSON file.
     Writes to a temp file first, then renames to prevent corruption.
     """
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-
-    # Write to temp file in same directory (ensures same filesystem for rename)
-    fd, temp_path = tempfile.mkstemp(
-        dir=filepath.parent,
-        prefix=".tmp_",
-        suffix=".json"
-    )
-    try:
-        with os.fdopen(fd, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-        # Atomic rename
-        shutil.move(temp_path, filepath)
-    except Exception:
-        # Clean up temp file on error
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-        raise
+    atomic_write_json(filepath, data)
 
 
 def _safe_read(filepath: Path, default: dict | list) -> dict | list:
     """
     Safely read a JSON file, returning default on error.
     """
-    try:
-        if filepath.exists():
-            with open(filepath, 'r') as f:
-                return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        # Log warning but don't crash
-        print(f"Warning: Could not read {filepath}: {e}")
-    return default
+    return safe_read_json(filepath, default)
 
 
 # ============ SESSION MANAGEMENT ============
@@ -121,26 +159,9 @@ def save_session(session: dict) -> str:
     session["timestamp"] = session.get("timestamp") or timestamp.isoformat()
     session["version"] = session.get("version", 1)
 
-    # Write session file
-    session_file = SESSIONS_DIR / f"{session_id}.json"
-    _atomic_write(session_file, session)
-
-    # Update index
-    index = _safe_read(SESSIONS_INDEX, [])
-    if not isinstance(index, list):
-        index = []
-
-    # Add to index (remove old entry if exists)
-    index = [s for s in index if s.get("id") != session_id]
-    index.insert(0, {
-        "id": session_id,
-        "timestamp": session["timestamp"],
-        "branch": session.get("git", {}).get("branch") or session.get("branch", "unknown"),
-        "summary": session.get("context", {}).get("summary") or session.get("summary", ""),
-        "file": f"{session_id}.json"
-    })
-
-    _atomic_write(SESSIONS_INDEX, index)
+    # Write session and update index (most recent first)
+    get_backend().save_session(session)
+    _update_search_index("session", session)
 
     return session_id
 
@@ -157,12 +178,7 @@ def load_session(session_id: str) -> Optional[dict]:
     """
     init_storage()
 
-    session_file = SESSIONS_DIR / f"{session_id}.json"
-    if session_file.exists():
-        result = _safe_read(session_file, {})
-        if isinstance(result, dict) and result:
-            return result
-    return None
+    return get_backend().load_session(session_id)
 
 
 def get_latest_session() -> Optional[dict]:
@@ -174,11 +190,11 @@ def get_latest_session() -> Optional[dict]:
     """
     init_storage()
 
-    index = _safe_read(SESSIONS_INDEX, [])
-    if not isinstance(index, list) or not index:
+    # Index is sorted with most recent first
+    index = get_backend().list_sessions(limit=1)
+    if not index:
         return None
 
-    # Index is sorted with most recent first
     latest = index[0]
     return load_session(latest.get("id", ""))
 
@@ -197,31 +213,120 @@ def list_sessions(limit: int = 10, branch: Optional[str] = None, full: bool = Fa
     """
     init_storage()
 
-    index = _safe_read(SESSIONS_INDEX, [])
-    if not isinstance(index, list):
-        return []
+    # Filter by branch and apply limit
+    sessions = get_backend().list_sessions(limit=limit, branch=branch)
+
+    # If full data requested, load them all in one batch
+    if full:
+        return _with_full_data(sessions)
+
+    return sessions
+
+
+def load_sessions(session_ids: list[str]) -> dict[str, dict]:
+    """
+    Load several sessions at once (one query with the SQLite backend).
+
+    Args:
+        session_ids: Session identifiers
+
+    Returns:
+        Dictionary of session ID to session data (missing sessions omitted)
+    """
+    init_storage()
 
-    # Filter by branch if specified
-    if branch:
-        index = [s for s in index if s.get("branch") == branch]
+    return get_backend().load_sessions(list(session_ids))
 
-    # Apply limit
-    sessions = index[:limit]
 
-    # If full data requested, load each session
+def _with_full_data(summaries: list[dict]) -> list[dict]:
+    """Replace session summaries with full records, keeping summaries for missing files."""
+    full_data = load_sessions([summary.get("id", "") for summary in summaries])
+    return [full_data.get(summary.get("id", ""), summary) for summary in summaries]
+
+
+# ============ PAGINATION ============
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decode a page cursor (the seq of the last record on the previous page)."""
+    if cursor is None or cursor == "":
+        return None
+    try:
+        before = int(cursor)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if before < 1:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return before
+
+
+def _page_result(rows: list[tuple[int, dict]], limit: int, total: int) -> dict:
+    """Shape limit + 1 fetched rows as a page with the cursor for the next one."""
+    items = [record for _, record in rows[:limit]]
+    next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor, "total": total}
+
+
+def page_sessions(
+    limit: int = 10,
+    branch: Optional[str] = None,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    full: bool = False,
+) -> dict:
+    """
+    One page of sessions, newest first.
+
+    Args:
+        limit: Sessions per page
+        branch: Filter by branch name (optional)
+        cursor: next_cursor of the previous page (None for the first page)
+        offset: Records to skip after the cursor (for page-number clients)
+        full: Return full session data instead of summaries
+
+    Returns:
+        Dictionary with items, next_cursor (None on the last page) and total
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    init_storage()
+
+    backend = get_backend()
+    rows = backend.page_sessions(limit + 1, branch=branch, before=_parse_cursor(cursor), offset=offset)
+    result = _page_result(rows, limit, backend.count_sessions(branch=branch))
     if full:
-        full_sessions = []
-        for summary in sessions:
-            session_id = summary.get("id", "")
-            full_data = load_session(session_id)
-            if full_data:
-                full_sessions.append(full_data)
-            else:
-                # Fallback to summary if full data not found
-                full_sessions.append(summary)
-        return full_sessions
+        result["items"] = _with_full_data(result["items"])
+    return result
 
-    return sessions
+
+def page_learnings(
+    limit: int = 10,
+    team: Optional[bool] = None,
+    tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> dict:
+    """
+    One page of learnings, newest first.
+
+    Args:
+        limit: Learnings per page
+        team: Only team (True) or personal (False) learnings (optional)
+        tag: Only learnings carrying this tag (optional)
+        cursor: next_cursor of the previous page (None for the first page)
+        offset: Records to skip after the cursor (for page-number clients)
+
+    Returns:
+        Dictionary with items, next_cursor (None on the last page) and total
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    init_storage()
+
+    backend = get_backend()
+    rows = backend.page_learnings(limit + 1, team=team, tag=tag, before=_parse_cursor(cursor), offset=offset)
+    return _page_result(rows, limit, backend.count_learnings(team=team, tag=tag))
 
 
 # ============ LEARNINGS MANAGEMENT ============
@@ -247,66 +352,159 @@ def save_learning(learning: dict) -> str:
     learning["timestamp"] = learning.get("timestamp") or timestamp.isoformat()
     learning["synced"] = learning.get("synced", False)
 
-    # Load existing learnings
-    learnings = _safe_read(LEARNINGS_FILE, [])
-    if not isinstance(learnings, list):
-        learnings = []
+    # Add new learning (most recent first)
+    get_backend().save_learning(learning)
+    _update_search_index("learning", learning)
 
-    # Add new learning at the beginning
-    learnings.insert(0, learning)
+    return learning_id
 
-    _atomic_write(LEARNINGS_FILE, learnings)
 
-    return learning_id
+def save_learnings(learnings: list[dict]) -> list[str]:
+    """
+    Save a batch of learnings in a single write.
+
+    Equivalent to calling save_learning for each item in order (the last
+    item ends up most recent), but the store, keyword index and vector
+    index are each written once.
+
+    Args:
+        learnings: Learning data dictionaries
+
+    Returns:
+        Learning IDs, in input order
+    """
+    init_storage()
+
+    if not learnings:
+        return []
+
+    timestamp = datetime.now()
+    id_prefix = f"learning_{timestamp.strftime('%Y-%m-%d_%H-%M-%S')}"
+    for learning in learnings:
+        # Items of one batch share a timestamp, so the id needs a unique suffix
+        learning["id"] = learning.get("id") or f"{id_prefix}_{uuid.uuid4().hex[:8]}"
+        learning["timestamp"] = learning.get("timestamp") or timestamp.isoformat()
+        learning["synced"] = learning.get("synced", False)
+
+    get_backend().save_learnings(learnings)
+    _update_search_index_batch(learnings)
+
+    return [learning["id"] for learning in learnings]
 
 
-def search_learnings(query: str, tags: Optional[list[str]] = None) -> list[dict]:
+def mark_synced(learning_ids: list[str]) -> int:
+    """
+    Flag learnings as stored to Backboard.
+
+    Args:
+        learning_ids: IDs of learnings whose remote write completed
+
+    Returns:
+        Number of learnings updated
+    """
+    init_storage()
+
+    if not learning_ids:
+        return 0
+    updated = get_backend().mark_learnings_synced(learning_ids)
+    if updated:
+        _touch_tag_index()
+    return updated
+
+
+def get_learning(learning_id: str) -> Optional[dict]:
+    """
+    Load a specific learning by ID.
+
+    Args:
+        learning_id: The learning identifier
+
+    Returns:
+        Learning dictionary or None if not found
+    """
+    init_storage()
+
+    return get_backend().get_learning(learning_id)
+
+
+def search_learnings(
+    query: str,
+    tags: Optional[list[str]] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
     """
     Search learnings by keyword and/or tags.
-    Uses simple keyword matching as fallback for semantic search.
+    Ranks with BM25 over the full-text index (see search_index.py).
+    An empty query returns all learnings, most recent first.
 
     Args:
         query: Search query string
         tags: Optional list of tags to filter by
+        limit: Maximum number of learnings (default: all matches)
 
     Returns:
         List of matching learnings, sorted by relevance score
     """
     init_storage()
 
-    learnings = _safe_read(LEARNINGS_FILE, [])
-    if not isinstance(learnings, list):
-        return []
+    def has_tags(learning: dict) -> bool:
+        return all(t in learning.get("tags", []) for t in tags)
 
-    query_lower = query.lower()
-    results = []
+    if not query.strip():
+        # A required tag narrows candidates through the backend's tag index
+        if not tags:
+            return get_backend().get_learnings(limit=limit)
+        learnings = [item for item in get_backend().get_learnings(tag=tags[0]) if has_tags(item)]
+        return learnings[:limit] if limit is not None else learnings
 
-    for learning in learnings:
-        score = 0
+    ensure_search_index()
+    results = get_search_index().search(query, "learning", limit=limit, where=has_tags if tags else None)
+    return [learning for _, learning in results]
+
+
+def search_sessions(query: str, limit: int = 10) -> list[dict]:
+    """
+    Search sessions by summary, branch, decisions, blockers and next steps.
+
+    Args:
+        query: Search query string
+        limit: Maximum number of sessions to return
 
-        # Score based on text match (check both "insight" and "text" fields)
-        text = (learning.get("insight", "") or learning.get("text", "")).lower()
-        if query_lower in text:
-            score += 2
+    Returns:
+        List of session summaries (id, timestamp, branch, summary, context),
+        best match first
+    """
+    init_storage()
 
-        # Score based on tag match
-        learning_tags = learning.get("tags", [])
-        if tags:
-            # Filter by required tags
-            if not all(t in learning_tags for t in tags):
-                continue
+    ensure_search_index()
+    return [session for _, session in get_search_index().search(query, "session", limit=limit)]
 
-        for tag in learning_tags:
-            if query_lower in tag.lower():
-                score += 1
 
-        if score > 0:
-            results.append((score, learning))
+def semantic_search(query: str, kind: Optional[str] = None, limit: int = 10) -> list[dict]:
+    """
+    Search learnings and/or sessions by embedding similarity.
+    Matches related wording that keyword search misses. Returns an empty
+    list when numpy is not installed.
 
-    # Sort by score descending, then by timestamp descending
-    results.sort(key=lambda x: (x[0], x[1].get("timestamp", "")), reverse=True)
+    Args:
+        query: Search query string
+        kind: "learning", "session", or None for both
+        limit: Maximum number of results
 
-    return [learning for _, learning in results]
+    Returns:
+        List of learnings / session summaries, most similar first.
+        Each result carries its cosine similarity under "similarity".
+    """
+    init_storage()
+
+    index = get_vector_index()
+    if not index.available:
+        return []
+    ensure_vector_index()
+    return [
+        {**record, "similarity": round(similarity, 4)}
+        for similarity, record in index.search(query, kind=kind, limit=limit)
+    ]
 
 
 def get_all_learnings(team: Optional[bool] = None) -> list[dict]:
@@ -323,14 +521,22 @@ def get_all_learnings(team: Optional[bool] = None) -> list[dict]:
     """
     init_storage()
 
-    learnings = _safe_read(LEARNINGS_FILE, [])
-    if not isinstance(learnings, list):
-        return []
+    return get_backend().get_learnings(team=team)
 
-    if team is None:
-        return learnings
 
-    return [item for item in learnings if item.get("team", False) == team]
+def get_recent_learnings(limit: int = 10) -> list[dict]:
+    """
+    Get the most recent learnings without loading the rest.
+
+    Args:
+        limit: Maximum number of learnings
+
+    Returns:
+        List of learning dictionaries, newest first
+    """
+    init_storage()
+
+    return get_backend().get_learnings(limit=limit)
 
 
 # ============ CONFIG MANAGEMENT ============
@@ -387,18 +593,215 @@ def get_stats() -> dict:
     """
     init_storage()
 
-    index = _safe_read(SESSIONS_INDEX, [])
-    learnings = _safe_read(LEARNINGS_FILE, [])
-
-    sessions_count = len(index) if isinstance(index, list) else 0
-    learnings_list = learnings if isinstance(learnings, list) else []
-
-    personal_learnings = len([item for item in learnings_list if not item.get("team", False)])
-    team_learnings = len([item for item in learnings_list if item.get("team", False)])
+    backend = get_backend()
+    sessions_count = backend.count_sessions()
+    team_learnings = backend.count_learnings(team=True)
+    total_learnings = backend.count_learnings()
 
     return {
         "sessions_count": sessions_count,
-        "personal_learnings": personal_learnings,
+        "personal_learnings": total_learnings - team_learnings,
         "team_learnings": team_learnings,
-        "total_learnings": len(learnings_list),
+        "total_learnings": total_learnings,
     }
+
+
+def get_cache_stats() -> dict:
+    """
+    Get read cache statistics for this process.
+
+    Returns:
+        Dictionary with hits, misses, hit_rate and cached file count
+    """
+    return _storage_cache_stats()
+
+
+# ============ SEARCH INDEX ============
+
+def _update_search_index(kind: str, record: dict) -> None:
+    """Add a saved record to the full-text and vector indexes without failing the save."""
+    try:
+        index = get_search_index()
+        if kind == "session":
+            index.add_session(record)
+        else:
+            index.add_learning(record)
+    except sqlite3.Error as e:
+        # ensure_search_index() rebuilds on the next search
+        print(f"Warning: Could not update search index: {e}")
+
+    try:
+        vectors = get_vector_index()
+        if kind == "session":
+            vectors.add_session(record)
+        else:
+            vectors.add_learning(record)
+    except (OSError, ValueError) as e:
+        # ensure_vector_index() rebuilds on the next search
+        print(f"Warning: Could not update vector index: {e}")
+
+    try:
+        if kind == "session":
+            get_tag_index().touch()
+        else:
+            get_tag_index().add_learning(record)
+    except sqlite3.Error as e:
+        # ensure_tag_index() rebuilds on the next dashboard request
+        print(f"Warning: Could not update tag index: {e}")
+
+
+def _update_search_index_batch(learnings: list[dict]) -> None:
+    """Add a batch of saved learnings to both indexes without failing the save."""
+    try:
+        get_search_index().add_learnings(learnings)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not update search index: {e}")
+
+    try:
+        get_vector_index().add_learnings(learnings)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not update vector index: {e}")
+
+    try:
+        get_tag_index().add_learnings(learnings)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not update tag index: {e}")
+
+
+def _touch_tag_index() -> None:
+    """Bump the tag index generation after a write that changes no tags."""
+    try:
+        get_tag_index().touch()
+    except sqlite3.Error as e:
+        print(f"Warning: Could not update tag index: {e}")
+
+
+def ensure_search_index() -> None:
+    """
+    Rebuild the full-text index if it is out of sync with the store.
+
+    Happens once for stores written before the index existed, after a
+    backend switch, or if an incremental update failed.
+    """
+    backend = get_backend()
+    index = get_search_index()
+    if (index.doc_count("learning") == backend.count_learnings()
+            and index.doc_count("session") == backend.count_sessions()):
+        return
+
+    entries = backend.list_sessions()
+    full_data = backend.load_sessions([entry.get("id", "") for entry in entries])
+    sessions = [full_data.get(entry.get("id", ""), entry) for entry in entries]
+    index.rebuild(backend.get_learnings(), sessions)
+
+
+def ensure_vector_index() -> None:
+    """
+    Re-embed the store if the vector index is missing records or was built
+    with a different embedding model.
+    """
+    backend = get_backend()
+    index = get_vector_index()
+    counts = index.counts()
+    if (index.is_current()
+            and counts["learning"] == backend.count_learnings()
+            and counts["session"] == backend.count_sessions()):
+        return
+
+    entries = backend.list_sessions()
+    full_data = backend.load_sessions([entry.get("id", "") for entry in entries])
+    sessions = [full_data.get(entry.get("id", ""), entry) for entry in entries]
+    index.rebuild(backend.get_learnings(), sessions)
+
+
+def ensure_tag_index() -> TagIndex:
+    """
+    Rebuild the tag index if it is out of sync with the store.
+
+    Returns:
+        The (now current) tag index
+    """
+    backend = get_backend()
+    index = get_tag_index()
+    if index.doc_count() != backend.count_learnings():
+        index.rebuild(backend.get_learnings())
+    return index
+
+
+def data_version() -> str:
+    """
+    Token that changes whenever learnings or sessions change.
+
+    Lets callers cache payloads derived from the store (and serve them with
+    an ETag) without re-reading it.
+
+    Returns:
+        Opaque version string
+    """
+    init_storage()
+
+    index = ensure_tag_index()
+    return f"{index.generation()}.{get_backend().count_sessions()}"
+
+
+def get_top_tags(limit: int = 10) -> list[tuple[str, int]]:
+    """
+    Most used learning tags, from the tag index.
+
+    Args:
+        limit: Maximum tags
+
+    Returns:
+        (tag, learning count) pairs, most used first
+    """
+    init_storage()
+
+    return ensure_tag_index().top_tags(limit)
+
+
+def get_tag_learning_ids(tag: str, limit: Optional[int] = None) -> list[str]:
+    """
+    Learnings carrying a tag, from the tag index postings.
+
+    Args:
+        tag: Tag to look up
+        limit: Maximum ids (default: all)
+
+    Returns:
+        Learning ids, newest first
+    """
+    init_storage()
+
+    return ensure_tag_index().learning_ids(tag, limit)
+
+
+def get_top_tag_pairs(limit: int = 10) -> list[tuple[str, str, int]]:
+    """
+    Tags most often used together, from the tag co-occurrence matrix.
+
+    Args:
+        limit: Maximum pairs
+
+    Returns:
+        (tag, tag, learning count) triples, most frequent first
+    """
+    init_storage()
+
+    return ensure_tag_index().top_pairs(limit)
+
+
+# ============ MIGRATION ============
+
+def migrate_to_sqlite() -> dict:
+    """
+    One-shot migration of the JSON layout into the SQLite database.
+
+    The JSON files are left in place. Set FLOW_GUARDIAN_STORAGE=sqlite
+    afterwards to read from the database.
+
+    Returns:
+        Dictionary with migrated session and learning counts
+    """
+    init_storage()
+
+    return migrate_json_to_sqlite(get_backend("json"), get_backend("sqlite"))
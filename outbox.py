@@ -0,0 +1,473 @@
+"""Durable outbox for remote writes (Backboard messages, Linear documents).
+
+Storing a learning or capturing context used to await Backboard inline, so
+every write paid a network round trip (plus retries) before returning. Now
+the local save happens first and the remote write is recorded here, in
+SQLite, and the call returns immediately. An OutboxWorker running in the
+long-lived processes (API, daemon, MCP) drains the queue in the background:
+
+- Jobs are claimed in batches under a lease, so two processes draining the
+  same outbox never send a job twice while it is in flight
+- Backboard jobs in a batch are sent concurrently over the pooled client
+- Failures retry with exponential backoff; after MAX_ATTEMPTS a job is kept
+  with status "failed" for inspection instead of retrying forever
+- A 429 pauses the whole queue for RATE_LIMIT_PAUSE seconds
+- When every job for a learning has been sent, the learning is flagged
+  synced in local storage
+
+Jobs survive restarts: anything enqueued while no worker is running is sent
+by the next one that starts.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+
+# ============ CONFIGURATION ============
+
+OUTBOX_FILE = Path.home() / ".flow-guardian" / "outbox.db"
+
+BATCH_SIZE = int(os.environ.get("FLOW_GUARDIAN_OUTBOX_BATCH", "20"))
+DRAIN_INTERVAL = float(os.environ.get("FLOW_GUARDIAN_OUTBOX_INTERVAL", "5"))
+
+# Retry policy
+MAX_ATTEMPTS = 8
+BASE_BACKOFF = 2.0  # seconds, doubled per attempt
+MAX_BACKOFF = 600.0
+RATE_LIMIT_PAUSE = 60.0
+
+# A claimed job is invisible to other drainers for this long
+LEASE_SECONDS = 120.0
+
+# Job kinds
+BACKBOARD_MESSAGE = "backboard_message"
+LINEAR_DOCUMENT = "linear_document"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    target TEXT,
+    payload TEXT NOT NULL,
+    learning_id TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs(status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_learning ON jobs(learning_id);
+
+CREATE TABLE IF NOT EXISTS state (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+# ============ HELPERS ============
+
+def _connect() -> sqlite3.Connection:
+    OUTBOX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(OUTBOX_FILE), timeout=5.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _set_state(conn: sqlite3.Connection, name: str, value: float) -> None:
+    conn.execute("INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)", (name, value))
+
+
+def _bump(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+    conn.execute(
+        "INSERT INTO state (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        (name, amount),
+    )
+
+
+def backoff(attempts: int) -> float:
+    """Seconds to wait before retry number `attempts` (1-based)."""
+    return min(BASE_BACKOFF * (2 ** max(attempts - 1, 0)), MAX_BACKOFF)
+
+
+# ============ QUEUE OPERATIONS ============
+
+def enqueue(kind: str, target: Optional[str], payload: dict, learning_id: Optional[str] = None) -> int:
+    """
+    Record a pending remote write.
+
+    Args:
+        kind: BACKBOARD_MESSAGE or LINEAR_DOCUMENT
+        target: Backboard thread id (unused for Linear documents)
+        payload: Job data ({"content", "metadata"} or {"title", "content"})
+        learning_id: Local learning to flag synced once the write lands
+
+    Returns:
+        Job ID
+    """
+    return enqueue_many([{"kind": kind, "target": target, "payload": payload, "learning_id": learning_id}])[0]
+
+
+def enqueue_many(jobs: list[dict]) -> list[int]:
+    """
+    Record several pending remote writes in one transaction.
+
+    Args:
+        jobs: Dicts with kind, target, payload and optional learning_id
+
+    Returns:
+        Job IDs, in input order
+    """
+    if not jobs:
+        return []
+    now = time.time()
+    conn = _connect()
+    try:
+        with conn:
+            return [
+                conn.execute(
+                    "INSERT INTO jobs (kind, target, payload, learning_id, created_at, next_attempt_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job["kind"], job.get("target"), json.dumps(job["payload"], default=str),
+                     job.get("learning_id"), now, now),
+                ).lastrowid
+                for job in jobs
+            ]
+    finally:
+        conn.close()
+
+
+def claim(limit: int = BATCH_SIZE) -> list[dict]:
+    """
+    Lease the oldest due jobs.
+
+    Claimed jobs are pushed LEASE_SECONDS into the future, so a crashed
+    drainer's jobs become due again instead of being lost.
+
+    Args:
+        limit: Maximum jobs to claim
+
+    Returns:
+        Jobs (id, kind, target, payload, learning_id, attempts), oldest first.
+        Empty while the queue is paused after a rate limit.
+    """
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.isolation_level = None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            paused = conn.execute("SELECT value FROM state WHERE name = 'paused_until'").fetchone()
+            if paused and paused[0] > now:
+                conn.execute("COMMIT")
+                return []
+            rows = conn.execute(
+                "SELECT id, kind, target, payload, learning_id, attempts FROM jobs "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET next_attempt_at = ? WHERE id = ?",
+                [(now + LEASE_SECONDS, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    return [
+        {"id": id_, "kind": kind, "target": target, "payload": json.loads(payload),
+         "learning_id": learning_id, "attempts": attempts}
+        for id_, kind, target, payload, learning_id, attempts in rows
+    ]
+
+
+def complete(job_ids: list[int]) -> list[str]:
+    """
+    Remove jobs whose remote write succeeded.
+
+    Args:
+        job_ids: IDs of completed jobs
+
+    Returns:
+        Learning IDs that no longer have any outstanding job
+    """
+    if not job_ids:
+        return []
+    placeholders = ",".join("?" * len(job_ids))
+    conn = _connect()
+    try:
+        with conn:
+            learning_ids = {
+                row[0] for row in conn.execute(
+                    f"SELECT DISTINCT learning_id FROM jobs WHERE id IN ({placeholders}) "
+                    "AND learning_id IS NOT NULL",
+                    job_ids,
+                )
+            }
+            conn.execute(f"DELETE FROM jobs WHERE id IN ({placeholders})", job_ids)
+            _bump(conn, "sent", len(job_ids))
+            return sorted(
+                learning_id for learning_id in learning_ids
+                if not conn.execute(
+                    "SELECT 1 FROM jobs WHERE learning_id = ? LIMIT 1", (learning_id,)
+                ).fetchone()
+            )
+    finally:
+        conn.close()
+
+
+def retry(job: dict, error: str, delay: Optional[float] = None, count_attempt: bool = True) -> str:
+    """
+    Schedule a failed job for another attempt.
+
+    Args:
+        job: Job from claim()
+        error: Error description
+        delay: Seconds until the retry (default: exponential backoff)
+        count_attempt: False for rate limits, which are not the job's fault
+
+    Returns:
+        "pending", or "failed" once the job has used MAX_ATTEMPTS
+    """
+    attempts = job["attempts"] + (1 if count_attempt else 0)
+    status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+    wait = delay if delay is not None else backoff(attempts)
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, time.time() + wait, error[:500], job["id"]),
+            )
+            if status == "failed":
+                _bump(conn, "failed")
+    finally:
+        conn.close()
+    return status
+
+
+def pause(seconds: float) -> None:
+    """Stop handing out jobs for `seconds` (the remote side is rate limiting)."""
+    conn = _connect()
+    try:
+        with conn:
+            _set_state(conn, "paused_until", time.time() + seconds)
+    finally:
+        conn.close()
+
+
+def requeue_failed() -> int:
+    """
+    Give jobs that exhausted their attempts a fresh start.
+
+    Returns:
+        Number of jobs requeued
+    """
+    conn = _connect()
+    try:
+        with conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'failed'",
+                (time.time(),),
+            ).rowcount
+    finally:
+        conn.close()
+
+
+def clear() -> None:
+    """Remove all jobs and reset state."""
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute("DELETE FROM jobs")
+            conn.execute("DELETE FROM state")
+    finally:
+        conn.close()
+
+
+def get_stats() -> dict:
+    """
+    Get outbox statistics (across all processes).
+
+    Returns:
+        Dictionary with depth (pending jobs), failed (jobs that gave up),
+        drain_lag_seconds (age of the oldest pending job), sent,
+        last_drain_at and paused_for_seconds
+    """
+    stats = {"depth": 0, "failed": 0, "drain_lag_seconds": 0.0, "sent": 0,
+             "last_drain_at": None, "paused_for_seconds": 0.0}
+    now = time.time()
+    try:
+        conn = _connect()
+        try:
+            for status, count, oldest in conn.execute(
+                "SELECT status, COUNT(*), MIN(created_at) FROM jobs GROUP BY status"
+            ):
+                if status == "pending":
+                    stats["depth"] = count
+                    stats["drain_lag_seconds"] = round(max(now - oldest, 0.0), 3)
+                elif status == "failed":
+                    stats["failed"] = count
+            state = dict(conn.execute("SELECT name, value FROM state").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return stats
+    stats["sent"] = int(state.get("sent", 0))
+    if state.get("last_drain_at"):
+        stats["last_drain_at"] = state["last_drain_at"]
+    stats["paused_for_seconds"] = round(max(state.get("paused_until", 0.0) - now, 0.0), 3)
+    return stats
+
+
+# ============ DRAIN ============
+
+async def _send_linear(job: dict):
+    import linear_client
+
+    doc = await linear_client.create_or_update_document(
+        title=job["payload"]["title"],
+        content=job["payload"]["content"],
+    )
+    if not doc:
+        raise RuntimeError("Linear document write failed")
+    return doc
+
+
+async def drain_once(limit: int = BATCH_SIZE) -> dict:
+    """
+    Send one batch of due jobs.
+
+    Args:
+        limit: Maximum jobs to send
+
+    Returns:
+        Dictionary with claimed, sent, retried and failed counts
+    """
+    import backboard_client
+    import memory
+
+    jobs = claim(limit)
+    result = {"claimed": len(jobs), "sent": 0, "retried": 0, "failed": 0}
+    if not jobs:
+        return result
+
+    backboard_jobs = [job for job in jobs if job["kind"] == BACKBOARD_MESSAGE]
+    other_jobs = [job for job in jobs if job["kind"] != BACKBOARD_MESSAGE]
+
+    outcomes = []
+    if backboard_jobs:
+        responses = await backboard_client.store_messages([
+            (job["target"], job["payload"]["content"], job["payload"].get("metadata"))
+            for job in backboard_jobs
+        ])
+        outcomes.extend(zip(backboard_jobs, responses))
+    for job in other_jobs:
+        try:
+            if job["kind"] == LINEAR_DOCUMENT:
+                outcome = await _send_linear(job)
+            else:
+                outcome = ValueError(f"Unknown outbox job kind: {job['kind']}")
+        except Exception as e:
+            outcome = e
+        outcomes.append((job, outcome))
+
+    done = []
+    rate_limited = False
+    for job, outcome in outcomes:
+        if not isinstance(outcome, Exception):
+            done.append(job["id"])
+        elif isinstance(outcome, backboard_client.BackboardRateLimitError):
+            rate_limited = True
+            retry(job, str(outcome), delay=RATE_LIMIT_PAUSE, count_attempt=False)
+            result["retried"] += 1
+        elif retry(job, f"{type(outcome).__name__}: {outcome}") == "failed":
+            result["failed"] += 1
+        else:
+            result["retried"] += 1
+
+    if rate_limited:
+        pause(RATE_LIMIT_PAUSE)
+
+    synced = complete(done)
+    if synced:
+        memory.mark_synced(synced)
+    result["sent"] = len(done)
+
+    conn = _connect()
+    try:
+        with conn:
+            _set_state(conn, "last_drain_at", time.time())
+    finally:
+        conn.close()
+    return result
+
+
+class OutboxWorker:
+    """Background task that keeps draining the outbox.
+
+    start()/stop() nest like backboard_client.open_client(): the task runs
+    until every start() has been matched by stop(), so the API and daemon
+    of a combined process share one worker.
+    """
+
+    def __init__(self, interval: float = DRAIN_INTERVAL, batch_size: int = BATCH_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._refs = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start (or join) the drain task on the running event loop."""
+        self._refs += 1
+        if not self.running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Release the worker; cancels the drain task when no starter holds it."""
+        self._refs = max(self._refs - 1, 0)
+        if self._refs or self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def wake(self) -> None:
+        """Drain now instead of waiting for the next interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                result = await drain_once(self.batch_size)
+                self.last_error = None
+                if result["sent"] and result["claimed"] >= self.batch_size:
+                    continue  # more may be waiting
+            except Exception as e:
+                self.last_error = str(e)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
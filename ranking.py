@@ -0,0 +1,342 @@
+"""Hybrid recall ranking for Flow Guardian.
+
+One pipeline shared by the HTTP /recall endpoint, the MCP flow_recall tool,
+the CLI recall command and session-start injection.
+
+Stages:
+1. candidates: ranked lists from the local indexes (BM25 keyword and vector
+   search over learnings and sessions, plus the most recent learnings), and
+   any extra lists the caller passes in (Backboard, Linear docs, code
+   symbols from code_index)
+2. fuse: weighted reciprocal-rank fusion across the lists, normalized to 0-1
+3. rescore: recency decay, branch match, file overlap and type boosts,
+   computed over all candidates at once with numpy when it is installed
+
+rank() returns the results plus per-stage timings in milliseconds.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+# ============ CONFIGURATION ============
+
+# Reciprocal-rank fusion constant (standard value from the RRF paper)
+RRF_K = 60
+
+# Candidates taken from each local list before fusion
+CANDIDATE_LIMIT = 50
+
+# Relative trust in each candidate list
+LIST_WEIGHTS = {
+    "keyword": 1.0,
+    "keyword_sessions": 1.0,
+    "semantic": 0.8,
+    "recent": 0.3,
+    "linear": 0.9,
+    "backboard": 0.7,
+    "code": 0.6,
+}
+DEFAULT_LIST_WEIGHT = 1.0
+
+# "semantic" weight when the vector index uses its built-in hashed
+# embeddings, which only match spelling (see vector_index)
+HASHED_SEMANTIC_WEIGHT = 0.4
+
+# Rescore boosts, added to the normalized fusion score (0-1)
+RECENCY_WEIGHT = 0.2
+RECENCY_HALF_LIFE_HOURS = 72.0
+BRANCH_WEIGHT = 0.2
+FILES_WEIGHT = 0.1
+FILES_SATURATION = 3  # overlapping files for the full boost
+TYPE_BOOSTS = {
+    "learning": 0.05,
+    "learnings": 0.05,
+    "decision": 0.05,
+    "decisions": 0.05,
+}
+
+
+# ============ CANDIDATES ============
+
+def learning_candidate(learning: dict) -> dict:
+    """Normalize a stored learning into a ranking candidate."""
+    return {
+        "key": f"learning:{learning.get('id')}:{learning.get('timestamp')}",
+        "kind": "learning",
+        "content": learning.get("insight") or learning.get("text", ""),
+        "timestamp": learning.get("timestamp"),
+        "tags": learning.get("tags", []),
+        "branch": learning.get("branch"),
+        "files": learning.get("files", []),
+        "record": learning,
+    }
+
+
+def session_candidate(session: dict) -> dict:
+    """Normalize a session summary (id, branch, summary, context) into a candidate."""
+    context = session.get("context", {}) or {}
+    branch = session.get("branch") or session.get("git", {}).get("branch", "")
+    summary = session.get("summary") or context.get("summary", "")
+
+    content_parts = [f"**Session:** {summary}", f"Branch: {branch}"]
+    if context.get("decisions"):
+        content_parts.append(f"Decisions: {', '.join(context['decisions'][:3])}")
+    if context.get("blockers"):
+        content_parts.append(f"Blockers: {', '.join(context['blockers'][:3])}")
+    if context.get("next_steps"):
+        content_parts.append(f"Next steps: {', '.join(context['next_steps'][:3])}")
+
+    return {
+        "key": f"session:{session.get('id')}",
+        "kind": "session",
+        "content": "\n".join(content_parts),
+        "timestamp": session.get("timestamp"),
+        "tags": [],
+        "branch": branch or None,
+        "files": context.get("files", []),
+        "record": session,
+    }
+
+
+def local_candidates(
+    query: str,
+    store,
+    tags: Optional[list[str]] = None,
+    include_recent: bool = True,
+) -> dict[str, list[dict]]:
+    """
+    Ranked candidate lists from the local indexes.
+
+    Args:
+        query: Free-text query
+        store: Storage module exposing search_learnings, search_sessions,
+               semantic_search and get_recent_learnings (normally memory)
+        tags: Only return learnings carrying all of these tags
+        include_recent: Add the newest learnings as a low-weight list
+
+    Returns:
+        Dictionary of list name -> candidates, best first
+    """
+    def tagged(learnings):
+        if not tags:
+            return list(learnings)
+        return [item for item in learnings if all(t in item.get("tags", []) for t in tags)]
+
+    lists: dict[str, list[dict]] = {}
+    lists["keyword"] = [
+        learning_candidate(item) for item in store.search_learnings(query, tags, limit=CANDIDATE_LIMIT)
+    ]
+    # BM25 scores are per-corpus, so sessions are their own list
+    if query.strip() and not tags:
+        lists["keyword_sessions"] = [
+            session_candidate(item) for item in store.search_sessions(query, limit=CANDIDATE_LIMIT)
+        ]
+
+    if query.strip():
+        semantic = [
+            (item.get("similarity", 0.0), learning_candidate(item))
+            for item in tagged(store.semantic_search(query, kind="learning", limit=CANDIDATE_LIMIT))
+        ]
+        if not tags:
+            semantic += [
+                (item.get("similarity", 0.0), session_candidate(item))
+                for item in store.semantic_search(query, kind="session", limit=CANDIDATE_LIMIT)
+            ]
+        semantic.sort(key=lambda x: x[0], reverse=True)
+        lists["semantic"] = [candidate for _, candidate in semantic]
+
+    if include_recent:
+        lists["recent"] = [learning_candidate(item) for item in tagged(store.get_recent_learnings(10))]
+
+    return lists
+
+
+# ============ FUSION ============
+
+def semantic_weight() -> float:
+    """Weight of the "semantic" list for the active embedding model."""
+    import vector_index
+    return LIST_WEIGHTS["semantic"] if vector_index.is_semantic() else HASHED_SEMANTIC_WEIGHT
+
+
+def fuse(ranked_lists: dict[str, list[dict]], weights: Optional[dict[str, float]] = None) -> list[dict]:
+    """
+    Merge ranked lists with weighted reciprocal-rank fusion.
+
+    Each candidate scores sum(weight / (RRF_K + rank)) over the lists it
+    appears in; scores are normalized so the best candidate gets 1.0.
+
+    Args:
+        ranked_lists: List name -> candidates (dicts with a "key"), best first
+        weights: Per-list weights (defaults to LIST_WEIGHTS, with
+                 semantic_weight() for "semantic")
+
+    Returns:
+        Unique candidates with "relevance" and "signals" set, best first
+    """
+    weights = weights or {**LIST_WEIGHTS, "semantic": semantic_weight()}
+    merged: dict[str, dict] = {}
+    for name, candidates in ranked_lists.items():
+        weight = weights.get(name, DEFAULT_LIST_WEIGHT)
+        for rank, candidate in enumerate(candidates, 1):
+            entry = merged.get(candidate["key"])
+            if entry is None:
+                entry = merged[candidate["key"]] = {**candidate, "relevance": 0.0, "signals": []}
+            if name not in entry["signals"]:
+                entry["relevance"] += weight / (RRF_K + rank)
+                entry["signals"].append(name)
+
+    fused = sorted(merged.values(), key=lambda c: c["relevance"], reverse=True)
+    if fused and fused[0]["relevance"] > 0:
+        top = fused[0]["relevance"]
+        for candidate in fused:
+            candidate["relevance"] = candidate["relevance"] / top
+    return fused
+
+
+# ============ RESCORE ============
+
+def _epoch(timestamp) -> Optional[float]:
+    """Parse an ISO timestamp to epoch seconds (naive values are local time)."""
+    if not timestamp or not isinstance(timestamp, str):
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def rescore(
+    candidates: list[dict],
+    branch: Optional[str] = None,
+    files: Optional[list[str]] = None,
+    now: Optional[datetime] = None,
+) -> list[dict]:
+    """
+    Apply context boosts to fused candidates and sort by final score.
+
+    score = relevance
+            + RECENCY_WEIGHT * 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+            + BRANCH_WEIGHT * (candidate branch == current branch)
+            + FILES_WEIGHT * min(overlapping files / FILES_SATURATION, 1)
+            + TYPE_BOOSTS[kind]
+
+    Args:
+        candidates: Candidates from fuse() (need "relevance")
+        branch: Current git branch
+        files: Files currently being worked on
+        now: Reference time (defaults to now)
+
+    Returns:
+        Candidates with "score" set, best first
+    """
+    if not candidates:
+        return []
+
+    now_epoch = (now or datetime.now(timezone.utc)).timestamp()
+    current_files = set(files or [])
+
+    relevance = [c.get("relevance", 0.0) for c in candidates]
+    epochs = [_epoch(c.get("timestamp")) for c in candidates]
+    ages = [now_epoch - e if e is not None else None for e in epochs]
+    branch_match = [bool(branch) and c.get("branch") == branch for c in candidates]
+    overlap = [len(current_files & set(c.get("files") or [])) if current_files else 0 for c in candidates]
+    type_boost = [TYPE_BOOSTS.get(c.get("kind"), 0.0) for c in candidates]
+
+    if HAS_NUMPY:
+        age_hours = np.array([a if a is not None else np.inf for a in ages], dtype=np.float64) / 3600
+        recency = np.exp2(-np.clip(age_hours, 0, None) / RECENCY_HALF_LIFE_HOURS)
+        scores = (
+            np.array(relevance)
+            + RECENCY_WEIGHT * recency
+            + BRANCH_WEIGHT * np.array(branch_match, dtype=np.float64)
+            + FILES_WEIGHT * np.minimum(np.array(overlap) / FILES_SATURATION, 1.0)
+            + np.array(type_boost)
+        ).tolist()
+    else:
+        scores = []
+        for rel, age, same_branch, shared, boost in zip(relevance, ages, branch_match, overlap, type_boost):
+            recency = 0.0 if age is None else 0.5 ** (max(age, 0) / 3600 / RECENCY_HALF_LIFE_HOURS)
+            scores.append(
+                rel
+                + RECENCY_WEIGHT * recency
+                + BRANCH_WEIGHT * same_branch
+                + FILES_WEIGHT * min(shared / FILES_SATURATION, 1.0)
+                + boost
+            )
+
+    for candidate, score in zip(candidates, scores):
+        candidate["score"] = round(score, 4)
+
+    return sorted(candidates, key=lambda c: c["score"], reverse=True)
+
+
+# ============ PIPELINE ============
+
+def rank(
+    query: str,
+    store=None,
+    branch: Optional[str] = None,
+    files: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    limit: int = 10,
+    extra: Optional[dict[str, list[dict]]] = None,
+    include_recent: bool = True,
+    local: Optional[dict[str, list[dict]]] = None,
+) -> dict:
+    """
+    Run the full recall pipeline: candidates -> fuse -> rescore.
+
+    Args:
+        query: Free-text query
+        store: Storage module (defaults to memory)
+        branch: Current git branch, for the branch boost
+        files: Files being worked on, for the file-overlap boost
+        tags: Only return learnings carrying all of these tags
+        limit: Maximum results
+        extra: Additional ranked candidate lists (e.g. {"backboard": [...]}).
+               Candidates need "key" and "content"; "kind", "timestamp",
+               "branch" and "files" are used when present.
+        include_recent: Add the newest learnings as a low-weight list
+        local: Lists already fetched with local_candidates(), to re-rank
+               with new extra lists without searching the store again
+
+    Returns:
+        Dictionary with:
+        - results: candidates with score, relevance and signals, best first
+        - timings_ms: milliseconds spent in candidates, fuse and rescore
+    """
+    if store is None:
+        import memory as store
+
+    timings = {}
+    started = time.perf_counter()
+
+    if local is None:
+        lists = local_candidates(query, store, tags=tags, include_recent=include_recent)
+    else:
+        lists = dict(local)
+    lists.update(extra or {})
+    timings["candidates"] = (time.perf_counter() - started) * 1000
+
+    stage = time.perf_counter()
+    fused = fuse(lists)
+    timings["fuse"] = (time.perf_counter() - stage) * 1000
+
+    stage = time.perf_counter()
+    ranked = rescore(fused, branch=branch, files=files)[:limit]
+    timings["rescore"] = (time.perf_counter() - stage) * 1000
+
+    timings["total"] = (time.perf_counter() - started) * 1000
+    return {
+        "results": ranked,
+        "timings_ms": {name: round(ms, 3) for name, ms in timings.items()},
+    }
@@ -0,0 +1,156 @@
+"""Persistent cache for Backboard recall responses.
+
+Backboard recall is an LLM-backed network call that takes seconds, and the
+same queries repeat (every SessionStart hook, repeated /recall queries).
+Responses are cached keyed on (thread_id, normalized query).
+
+- Entries expire after TTL_SECONDS
+- At most MAX_ENTRIES are kept; least recently used are evicted first
+- Storing a message to a thread invalidates that thread's entries
+
+Storage is a sqlite_cache database, like completion_cache.
+"""
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+import sqlite_cache
+
+
+# ============ CONFIGURATION ============
+
+CACHE_FILE = Path.home() / ".flow-guardian" / "recall_cache.db"
+
+# Seconds a cached response stays valid (0 disables the cache)
+TTL_SECONDS = int(os.environ.get("FLOW_GUARDIAN_RECALL_CACHE_TTL", "600"))
+MAX_ENTRIES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    thread_id TEXT NOT NULL,
+    query_key TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, query_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+"""
+
+
+# ============ HELPERS ============
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: lowercased with whitespace collapsed."""
+    return " ".join(query.lower().split())
+
+
+# ============ CACHE OPERATIONS ============
+
+def get(thread_id: str, query: str) -> Optional[str]:
+    """
+    Look up a cached recall response.
+
+    Args:
+        thread_id: Backboard thread the recall ran against
+        query: Recall query
+
+    Returns:
+        Cached response, or None on a miss or expired entry
+    """
+    if TTL_SECONDS <= 0:
+        return None
+    key = normalize_query(query)
+
+    def lookup(conn: sqlite3.Connection) -> Optional[str]:
+        now = time.time()
+        row = conn.execute(
+            "SELECT response, created_at FROM entries WHERE thread_id = ? AND query_key = ?",
+            (thread_id, key),
+        ).fetchone()
+        if row and now - row[1] < TTL_SECONDS:
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE thread_id = ? AND query_key = ?",
+                (now, thread_id, key),
+            )
+            sqlite_cache.bump(conn, "hits")
+            return row[0]
+        if row:
+            conn.execute("DELETE FROM entries WHERE thread_id = ? AND query_key = ?", (thread_id, key))
+        sqlite_cache.bump(conn, "misses")
+        return None
+
+    return sqlite_cache.run(CACHE_FILE, _SCHEMA, lookup)
+
+
+def put(thread_id: str, query: str, response: str) -> None:
+    """
+    Cache a recall response, evicting least recently used entries.
+
+    Args:
+        thread_id: Backboard thread the recall ran against
+        query: Recall query
+        response: Response content
+    """
+    if TTL_SECONDS <= 0 or not response:
+        return
+
+    def store(conn: sqlite3.Connection) -> None:
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(thread_id, query_key, response, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (thread_id, normalize_query(query), response, now, now),
+        )
+        conn.execute(
+            "DELETE FROM entries WHERE (thread_id, query_key) IN ("
+            "SELECT thread_id, query_key FROM entries "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (MAX_ENTRIES,),
+        )
+
+    sqlite_cache.run(CACHE_FILE, _SCHEMA, store)
+
+
+def invalidate(thread_id: str) -> int:
+    """
+    Drop every cached response for a thread (its memory just changed).
+
+    Args:
+        thread_id: Backboard thread that received a new message
+
+    Returns:
+        Number of entries removed
+    """
+    def drop(conn: sqlite3.Connection) -> int:
+        removed = conn.execute("DELETE FROM entries WHERE thread_id = ?", (thread_id,)).rowcount
+        sqlite_cache.bump(conn, "invalidations", removed)
+        return removed
+
+    return sqlite_cache.run(CACHE_FILE, _SCHEMA, drop, default=0)
+
+
+def clear() -> None:
+    """Remove all entries and reset counters."""
+    sqlite_cache.run(CACHE_FILE, _SCHEMA, sqlite_cache.clear)
+
+
+def get_stats() -> dict:
+    """
+    Get cache statistics (across all processes).
+
+    Returns:
+        Dictionary with hits, misses, hit_rate, invalidations, entries
+        and ttl_seconds
+    """
+    def read(conn: sqlite3.Connection) -> dict:
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {**sqlite_cache.counters(conn), "entries": entries}
+
+    stats = {"hits": 0, "misses": 0, "invalidations": 0, "entries": 0}
+    stats.update(sqlite_cache.run(CACHE_FILE, _SCHEMA, read, default={}))
+    stats["hit_rate"] = sqlite_cache.hit_rate(stats)
+    stats["ttl_seconds"] = TTL_SECONDS
+    return stats
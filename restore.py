@@ -3,7 +3,7 @@
 Handles change detection and restoration message generation.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 
 import cerebras_client
 from git_utils import run_git_command, is_git_repo, get_current_branch as _get_current_branch
@@ -227,8 +227,40 @@ def generate_restoration_message(session: dict, changes: dict) -> str:
     Returns:
         Natural language restoration message
     """
-    # Build context from session
-    context = {
+    try:
+        return cerebras_client.generate_restoration_message(_restoration_context(session), changes)
+    except cerebras_client.CerebrasError:
+        # Fallback message
+        return _build_fallback_message(session, changes)
+
+
+def stream_restoration_message(session: dict, changes: dict) -> Iterator[str]:
+    """
+    Generate the "welcome back" message, yielding it as Cerebras writes it.
+
+    Falls back to the basic message if Cerebras fails before producing any
+    text; a failure mid-message ends the stream with what was written.
+
+    Args:
+        session: Session checkpoint data
+        changes: Changes detected since checkpoint
+
+    Yields:
+        Text fragments of the restoration message
+    """
+    started = False
+    try:
+        for text in cerebras_client.stream_restoration_message(_restoration_context(session), changes):
+            started = True
+            yield text
+    except cerebras_client.CerebrasError:
+        if not started:
+            yield _build_fallback_message(session, changes)
+
+
+def _restoration_context(session: dict) -> dict:
+    """Session fields the restoration prompt is built from."""
+    return {
         "summary": session.get("context", {}).get("summary", "unknown"),
         "hypothesis": session.get("context", {}).get("hypothesis"),
         "files": session.get("context", {}).get("files", []),
@@ -239,12 +271,6 @@ def generate_restoration_message(session: dict, changes: dict) -> str:
         ],
     }
 
-    try:
-        return cerebras_client.generate_restoration_message(context, changes)
-    except cerebras_client.CerebrasError:
-        # Fallback message
-        return _build_fallback_message(session, changes)
-
 
 def _build_fallback_message(session: dict, changes: dict) -> str:
     """
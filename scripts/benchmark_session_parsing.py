@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: session transcript decoding
+
+Parses a synthetic Claude Code transcript (default 100k lines, with large
+tool results like real sessions) two ways:
+1. stdlib: json.loads on every line (the original parse path)
+2. fast: session_parser.parse_session_messages (byte pre-check plus the
+   fastest installed decoder: msgspec, orjson or json)
+
+Both must produce identical messages.
+
+Usage:
+    cd flow-guardian && .venv/bin/python scripts/benchmark_session_parsing.py [--lines 100000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+PROJECT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import session_parser
+
+
+def make_transcript(path: Path, lines: int, seed: int = 7) -> None:
+    """Write a synthetic transcript with a realistic mix of entry types."""
+    rng = random.Random(seed)
+    words = "the auth flow token cache retry index session daemon query backoff".split()
+    base = {"cwd": "/home/dev/app", "gitBranch": "main", "sessionId": "bench-session",
+            "userType": "external", "version": "1.0.0"}
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    with open(path, "w") as f:
+        for i in range(lines):
+            roll = rng.random()
+            if roll < 0.25:
+                entry = {"type": "user", "message": {"role": "user", "content": sentence(30)}}
+            elif roll < 0.55:
+                entry = {"type": "assistant", "message": {"role": "assistant", "content": [
+                    {"type": "text", "text": sentence(60)},
+                    {"type": "tool_use", "id": f"tool_{i}", "name": "Read", "input": {"file_path": "/x.py"}},
+                ]}}
+            elif roll < 0.90:
+                entry = {"type": "user", "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": f"tool_{i}", "content": sentence(rng.randint(200, 2000))},
+                ]}}
+            else:
+                entry = {"type": "file-history-snapshot", "snapshot": {"files": [sentence(5)] * 20}}
+            f.write(json.dumps({**base, "uuid": f"uuid-{i}", **entry}, separators=(",", ":")) + "\n")
+
+
+def parse_stdlib(path: Path) -> list[dict]:
+    """The original path: json.loads every line."""
+    messages = []
+    with open(path) as f:
+        for i, line in enumerate(f):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            message = session_parser._message_from_entry(entry, i)
+            if message:
+                messages.append(message)
+    return messages
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "transcript.jsonl"
+        make_transcript(path, args.lines)
+        size_mb = path.stat().st_size / 1e6
+
+        print(f"Transcript: {args.lines:,} lines, {size_mb:.1f} MB")
+        print(f"Fast decoder backend: {session_parser.JSON_BACKEND}")
+        print()
+
+        stdlib_s, expected = timed(parse_stdlib, path, repeat=args.repeat)
+        rows = [("stdlib json.loads", stdlib_s)]
+        for name, decoder in session_parser._DECODERS.items():
+            session_parser._decode = decoder
+            seconds, messages = timed(lambda p: list(session_parser.parse_session_messages(p)), path,
+                                      repeat=args.repeat)
+            assert messages == expected, f"{name} output differs from stdlib"
+            rows.append((f"pre-check + {name}", seconds))
+        session_parser._decode = session_parser._DECODERS[session_parser.JSON_BACKEND]
+
+        print(f"{'Path':<24} {'Seconds':>8} {'MB/s':>8} {'Speedup':>8}")
+        for label, seconds in rows:
+            print(f"{label:<24} {seconds:>8.3f} {size_mb / seconds:>8.1f} {stdlib_s / seconds:>7.1f}x")
+        print(f"\n{len(expected):,} messages, identical across all paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ Usage:
 """
 
 import os
+import subprocess
 import sys
 from pathlib import Path
 
@@ -22,25 +23,8 @@ sys.path.insert(0, str(PROJECT_DIR))
 from dotenv import load_dotenv
 load_dotenv()
 
-import subprocess
-
-# Try to import tiktoken for accurate token counting
-try:
-    import tiktoken
-    enc = tiktoken.get_encoding("cl100k_base")  # Claude's encoding
-    def count_tokens(text: str) -> int:
-        if not text:
-            return 0
-        return len(enc.encode(text))
-except ImportError:
-    print("Installing tiktoken...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "tiktoken", "-q"])
-    import tiktoken
-    enc = tiktoken.get_encoding("cl100k_base")
-    def count_tokens(text: str) -> int:
-        if not text:
-            return 0
-        return len(enc.encode(text))
+# Exact counts when tiktoken is installed, the calibrated estimate otherwise
+from tokens import count_tokens, get_tokenizer
 
 from tldr import summarize_handoff, summarize_recall, summarize_context
 from handoff import load_handoff
@@ -102,7 +86,7 @@ def main():
     print("TOKEN SAVINGS BENCHMARK: Raw Files vs Flow Guardian TLDR")
     print("=" * 70)
     print(f"Project: {PROJECT_DIR}")
-    print(f"Encoder: cl100k_base (Claude)")
+    print(f"Tokenizer: {get_tokenizer().name}")
     print()
 
     results = []
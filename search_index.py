@@ -0,0 +1,382 @@
+"""Inverted full-text index for local recall.
+
+Keeps a persistent term -> document posting list in SQLite so keyword recall
+only touches the postings for the query terms instead of scanning every
+learning and session. Documents are ranked with BM25.
+
+Indexed fields:
+- Learnings: insight/text and tags
+- Sessions: summary, branch, decisions, blockers, next_steps
+
+The index is updated incrementally by memory.save_learning/save_session and
+rebuilt from the store when its document counts drift (e.g. data written by
+an older version).
+"""
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+
+# ============ CONFIGURATION ============
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Query terms at least this long also match indexed terms they prefix
+# ("auth" -> "authentication"), mirroring the old substring search
+PREFIX_MIN_LENGTH = 3
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'what', 'how', 'why',
+    'when', 'where', 'who', 'which', 'this', 'that', 'these', 'those',
+    'can', 'could', 'would', 'should', 'will', 'did', 'does', 'do',
+    'have', 'has', 'had', 'been', 'being', 'for', 'with', 'about',
+    'into', 'from', 'our', 'your', 'their', 'its', 'and', 'but', 'or',
+    'to', 'of', 'in', 'on', 'at', 'by', 'it', 'be', 'as',
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    timestamp TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_kind ON docs(kind);
+
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_key TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_key);
+
+CREATE TABLE IF NOT EXISTS stats (
+    kind TEXT PRIMARY KEY,
+    doc_count INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+"""
+
+
+# ============ TOKENIZATION ============
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens with stop words removed."""
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def learning_text(learning: dict) -> str:
+    """Searchable text of a learning (insight/text plus tags)."""
+    text = learning.get("insight", "") or learning.get("text", "")
+    tags = " ".join(t for t in learning.get("tags", []) if isinstance(t, str))
+    return f"{text} {tags}"
+
+
+def session_text(session: dict) -> str:
+    """Searchable text of a session (summary, branch, decisions, blockers, next steps)."""
+    context = session.get("context", {}) or {}
+    parts = [
+        context.get("summary") or session.get("summary", ""),
+        session.get("git", {}).get("branch") or session.get("branch", ""),
+    ]
+    for key in ("decisions", "blockers", "next_steps"):
+        items = context.get(key) or session.get(key) or []
+        if key == "blockers" and not items:
+            items = session.get("metadata", {}).get("blockers", [])
+        parts.extend(str(item) for item in items)
+    return " ".join(p for p in parts if p)
+
+
+def _session_payload(session: dict) -> dict:
+    """Compact session record returned by searches."""
+    context = session.get("context", {}) or {}
+    blockers = context.get("blockers") or session.get("metadata", {}).get("blockers", [])
+    return {
+        "id": session.get("id"),
+        "timestamp": session.get("timestamp"),
+        "branch": session.get("git", {}).get("branch") or session.get("branch", "unknown"),
+        "summary": context.get("summary") or session.get("summary", ""),
+        "context": {
+            "decisions": context.get("decisions") or session.get("decisions", []),
+            "blockers": blockers,
+            "next_steps": context.get("next_steps", []),
+        },
+    }
+
+
+# ============ INDEX ============
+
+_local = threading.local()
+
+
+class SearchIndex:
+    """Persistent BM25 index over learnings and sessions."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the schema on first use."""
+        conns = getattr(_local, "conns", None)
+        if conns is None:
+            conns = _local.conns = {}
+        key = str(self.db_path)
+        conn = conns.get(key)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(key, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conns[key] = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conns = getattr(_local, "conns", {})
+        conn = conns.pop(str(self.db_path), None)
+        if conn is not None:
+            conn.close()
+
+    # ---- Writes ----
+
+    def _remove(self, conn: sqlite3.Connection, doc_key: str) -> None:
+        row = conn.execute("SELECT kind, length FROM docs WHERE doc_key = ?", (doc_key,)).fetchone()
+        if row is None:
+            return
+        kind, length = row
+        conn.execute("DELETE FROM postings WHERE doc_key = ?", (doc_key,))
+        conn.execute("DELETE FROM docs WHERE doc_key = ?", (doc_key,))
+        conn.execute(
+            "UPDATE stats SET doc_count = doc_count - 1, total_length = total_length - ? WHERE kind = ?",
+            (length, kind),
+        )
+
+    def _add(self, conn: sqlite3.Connection, doc_key: str, kind: str, text: str,
+             timestamp: Optional[str], payload: dict) -> None:
+        tokens = tokenize(text)
+        conn.execute(
+            "INSERT INTO docs (doc_key, kind, length, timestamp, data) VALUES (?, ?, ?, ?, ?)",
+            (doc_key, kind, len(tokens), timestamp, json.dumps(payload, default=str)),
+        )
+        conn.executemany(
+            "INSERT INTO postings (term, doc_key, tf) VALUES (?, ?, ?)",
+            [(term, doc_key, tf) for term, tf in Counter(tokens).items()],
+        )
+        conn.execute(
+            "INSERT INTO stats (kind, doc_count, total_length) VALUES (?, 1, ?) "
+            "ON CONFLICT(kind) DO UPDATE SET doc_count = doc_count + 1, "
+            "total_length = total_length + excluded.total_length",
+            (kind, len(tokens)),
+        )
+
+    def _add_learning(self, conn: sqlite3.Connection, learning: dict) -> None:
+        base_key = f"learning:{learning.get('id')}"
+        doc_key = base_key
+        n = 1
+        while conn.execute("SELECT 1 FROM docs WHERE doc_key = ?", (doc_key,)).fetchone():
+            n += 1
+            doc_key = f"{base_key}#{n}"
+        self._add(conn, doc_key, "learning", learning_text(learning),
+                  learning.get("timestamp"), learning)
+
+    def _add_session(self, conn: sqlite3.Connection, session: dict) -> None:
+        doc_key = f"session:{session.get('id')}"
+        self._remove(conn, doc_key)
+        self._add(conn, doc_key, "session", session_text(session),
+                  session.get("timestamp"), _session_payload(session))
+
+    def add_learning(self, learning: dict) -> None:
+        """Index a newly saved learning. Duplicate ids get distinct keys."""
+        conn = self._conn()
+        with conn:
+            self._add_learning(conn, learning)
+
+    def add_learnings(self, learnings: list[dict]) -> None:
+        """Index a batch of saved learnings in one transaction."""
+        conn = self._conn()
+        with conn:
+            for learning in learnings:
+                self._add_learning(conn, learning)
+
+    def add_session(self, session: dict) -> None:
+        """Index a saved session, replacing any previous version of it."""
+        conn = self._conn()
+        with conn:
+            self._add_session(conn, session)
+
+    def rebuild(self, learnings: Iterable[dict], sessions: Iterable[dict]) -> None:
+        """
+        Replace the whole index in one transaction.
+
+        Args:
+            learnings: Learnings, newest first (as returned by the store)
+            sessions: Full session records, newest first
+        """
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM docs")
+            conn.execute("DELETE FROM stats")
+            for learning in reversed(list(learnings)):
+                self._add_learning(conn, learning)
+            for session in reversed(list(sessions)):
+                self._add_session(conn, session)
+
+    def upsert_documents(self, kind: str, docs: Iterable[tuple[str, str, Optional[str], dict]]) -> None:
+        """
+        Index documents of another kind (e.g. mirrored Linear documents).
+
+        Args:
+            kind: Document kind to search by
+            docs: (doc_key, text, timestamp, payload) tuples; a key that is
+                  already indexed is replaced
+        """
+        conn = self._conn()
+        with conn:
+            for doc_key, text, timestamp, payload in docs:
+                self._remove(conn, doc_key)
+                self._add(conn, doc_key, kind, text, timestamp, payload)
+
+    def remove_documents(self, doc_keys: Iterable[str]) -> None:
+        """Drop documents from the index in one transaction."""
+        conn = self._conn()
+        with conn:
+            for doc_key in doc_keys:
+                self._remove(conn, doc_key)
+
+    def clear(self, kind: str) -> None:
+        """Drop every document of one kind."""
+        self.remove_documents(self.doc_keys(kind))
+
+    # ---- Reads ----
+
+    def doc_keys(self, kind: str) -> list[str]:
+        """Keys of the indexed documents of one kind."""
+        return [key for (key,) in self._conn().execute("SELECT doc_key FROM docs WHERE kind = ?", (kind,))]
+
+    def get(self, doc_key: str) -> Optional[dict]:
+        """Stored payload of a document, or None if it is not indexed."""
+        row = self._conn().execute("SELECT data FROM docs WHERE doc_key = ?", (doc_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def doc_count(self, kind: str) -> int:
+        row = self._conn().execute("SELECT doc_count FROM stats WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row else 0
+
+    def _expand(self, conn: sqlite3.Connection, term: str) -> list[str]:
+        """Indexed terms matching a query term (exact, plus prefix for longer terms)."""
+        if len(term) < PREFIX_MIN_LENGTH:
+            return [term]
+        rows = conn.execute(
+            "SELECT DISTINCT term FROM postings WHERE term >= ? AND term < ?",
+            (term, term + "\uffff"),
+        ).fetchall()
+        return [r[0] for r in rows] or [term]
+
+    def _payloads(self, conn: sqlite3.Connection, doc_keys: list[str]) -> dict[str, dict]:
+        """Stored payloads of several documents, in one query per 500 keys."""
+        payloads = {}
+        for start in range(0, len(doc_keys), 500):
+            batch = doc_keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT doc_key, data FROM docs WHERE doc_key IN ({','.join('?' * len(batch))})",
+                batch,
+            )
+            payloads.update((doc_key, json.loads(data)) for doc_key, data in rows)
+        return payloads
+
+    def search(
+        self,
+        query: str,
+        kind: str,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[dict], bool]] = None,
+    ) -> list[tuple[float, dict]]:
+        """
+        Rank documents of one kind against a query with BM25.
+
+        Ties are broken by timestamp, newest first. Only the payloads of
+        the returned documents are decoded.
+
+        Args:
+            query: Free-text query
+            kind: "learning" or "session"
+            limit: Maximum results (None for all matches)
+            where: Keep only documents whose payload passes this filter
+
+        Returns:
+            List of (score, record) tuples, best first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT doc_count, total_length FROM stats WHERE kind = ?", (kind,)
+        ).fetchone()
+        if not row or not row[0]:
+            return []
+        n_docs, total_length = row
+        avgdl = (total_length / n_docs) or 1.0
+
+        scores: dict[str, float] = {}
+        timestamps: dict[str, str] = {}
+        for query_term in terms:
+            # A doc scores its best expansion of the term, not their sum, so
+            # a prefix matching several words can't outrank an exact match
+            term_scores: dict[str, float] = {}
+            for term in self._expand(conn, query_term):
+                postings = conn.execute(
+                    "SELECT p.doc_key, p.tf, d.length, d.timestamp FROM postings p "
+                    "JOIN docs d ON d.doc_key = p.doc_key "
+                    "WHERE p.term = ? AND d.kind = ?",
+                    (term, kind),
+                ).fetchall()
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_key, tf, length, timestamp in postings:
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl)
+                    score = idf * tf * (BM25_K1 + 1) / norm
+                    term_scores[doc_key] = max(term_scores.get(doc_key, 0.0), score)
+                    timestamps[doc_key] = timestamp or ""
+            for doc_key, score in term_scores.items():
+                scores[doc_key] = scores.get(doc_key, 0.0) + score
+
+        if not scores:
+            return []
+
+        ranked = sorted(scores, key=lambda key: (scores[key], timestamps[key]), reverse=True)
+        if limit is None:
+            limit = len(ranked)
+
+        # Decode payloads a page at a time; a filter may need more than one page
+        results = []
+        page = max(limit, 1)
+        for start in range(0, len(ranked), page):
+            keys = ranked[start:start + page]
+            payloads = self._payloads(conn, keys)
+            for doc_key in keys:
+                payload = payloads.get(doc_key)
+                if payload is None or (where is not None and not where(payload)):
+                    continue
+                results.append((scores[doc_key], payload))
+                if len(results) >= limit:
+                    return results
+        return results
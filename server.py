@@ -22,6 +22,7 @@ import re
 import signal
 import sys
 import threading
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
@@ -43,7 +44,13 @@ STATE_FILE = DAEMON_DIR / "state.json"
 POLL_INTERVAL = 10
 MIN_MESSAGES_BATCH = 5
 MAX_EXTRACTION_INTERVAL = 300
-MAX_CHUNK_CHARS = 30000
+MAX_CHUNK_TOKENS = int(os.environ.get("FLOW_GUARDIAN_CHUNK_TOKENS", "7500"))
+
+# Dashboard payloads (/graph, /stats) kept per parameter combination
+PAYLOAD_CACHE_SIZE = 64
+
+# Seconds each remote recall tier (Backboard, Linear) may take before it is dropped
+RECALL_TIER_TIMEOUT = float(os.environ.get("FLOW_GUARDIAN_RECALL_TIER_TIMEOUT", "8"))
 
 
 # ============ LOGGING ============
@@ -68,6 +75,9 @@ class FlowService:
         self._backboard = None
         self._cerebras = None
         self._memory = None
+        self._outbox_worker = None
+        # (name, params) -> (data version, etag, payload) for dashboard endpoints, oldest first
+        self._payloads: OrderedDict[tuple, tuple[str, str, dict]] = OrderedDict()
 
     @property
     def backboard(self):
@@ -96,6 +106,30 @@ class FlowService:
     def team_available(self) -> bool:
         return bool(os.environ.get("BACKBOARD_TEAM_THREAD_ID"))
 
+    # ---- Outbox ----
+    @property
+    def outbox_worker(self):
+        if self._outbox_worker is None:
+            import outbox
+            self._outbox_worker = outbox.OutboxWorker()
+        return self._outbox_worker
+
+    def start_outbox(self):
+        """Start draining queued remote writes on the running event loop."""
+        self.outbox_worker.start()
+
+    async def stop_outbox(self):
+        await self.outbox_worker.stop()
+
+    def _enqueue_remote(self, jobs: list[dict]) -> int:
+        """Queue remote writes and nudge the worker; returns the job count."""
+        import outbox
+
+        outbox.enqueue_many(jobs)
+        if jobs:
+            self.outbox_worker.wake()
+        return len(jobs)
+
     # ---- Capture ----
     async def capture_context(
         self,
@@ -127,15 +161,19 @@ class FlowService:
             "summary": summary,
         })
 
-        # Save to Backboard if available
+        # Queue for Backboard if available (sent by the outbox worker)
         if self.backboard_available():
             thread_id = os.environ.get("BACKBOARD_PERSONAL_THREAD_ID")
             if thread_id:
-                content = self._format_context_for_storage(context)
-                await self.backboard.store_message(thread_id, content, {
-                    "type": "context_capture",
-                    "cwd": os.getcwd(),
-                })
+                import outbox
+                self._enqueue_remote([{
+                    "kind": outbox.BACKBOARD_MESSAGE,
+                    "target": thread_id,
+                    "payload": {
+                        "content": self._format_context_for_storage(context),
+                        "metadata": {"type": "context_capture", "cwd": os.getcwd()},
+                    },
+                }])
 
         return {
             "saved": True,
@@ -161,10 +199,10 @@ class FlowService:
         return "\n".join(lines)
 
     # ---- Recall ----
-    def _extract_search_terms(self, query: str) -> list[str]:
+    async def _extract_search_terms(self, query: str) -> list[str]:
         """Use Cerebras to extract search terms from user query."""
         try:
-            response = self.cerebras.complete(
+            response = await self.cerebras.acomplete(
                 prompt=f"""Extract 3-5 key search terms from this question. Return only a JSON array of strings.
 Question: {query}
 
@@ -182,187 +220,250 @@ Example output: ["auth", "jwt", "token", "refresh"]""",
         # Fallback: split query into words
         return [w.lower() for w in query.split() if len(w) > 2][:5]
 
-    async def recall_context(self, query: str, local_only: bool = False) -> dict:
-        """Search memory for relevant context.
-
-        Args:
-            query: The search query
-            local_only: If True, skip Backboard (fast path)
-        """
-        results = []
+    _STOP_WORDS = frozenset({
+        'the', 'a', 'an', 'is', 'are', 'was', 'were', 'what', 'how', 'why',
+        'when', 'where', 'who', 'which', 'this', 'that', 'these', 'those',
+        'can', 'could', 'would', 'should', 'will', 'did', 'does', 'do',
+        'have', 'has', 'had', 'been', 'being', 'for', 'with', 'about',
+        'into', 'from', 'our', 'your', 'their', 'its', 'and', 'but', 'or',
+    })
 
-        # Fast keyword extraction - no API call needed
+    def _enhanced_query(self, query: str) -> str:
+        """Fast keyword extraction for remote search - no API call needed."""
         # Filter out stop words and clean punctuation
-        stop_words = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'what', 'how', 'why',
-                      'when', 'where', 'who', 'which', 'this', 'that', 'these', 'those',
-                      'can', 'could', 'would', 'should', 'will', 'did', 'does', 'do',
-                      'have', 'has', 'had', 'been', 'being', 'for', 'with', 'about',
-                      'into', 'from', 'our', 'your', 'their', 'its', 'and', 'but', 'or'}
-
-        # Clean and filter words
         words = re.findall(r'\b[a-zA-Z0-9]+\b', query.lower())
-        search_terms = [w for w in words if len(w) > 2 and w not in stop_words][:8]
+        search_terms = [w for w in words if len(w) > 2 and w not in self._STOP_WORDS][:8]
         log(f"Search terms for '{query}': {search_terms}", "INFO")
+        return " ".join(search_terms) if search_terms else query
 
-        # ALWAYS include recent learnings first (active knowledge cache)
-        recent_learnings = self.memory.get_all_learnings()[:10]
-        seen_learnings = set()
-        for learning in recent_learnings:
-            learning_id = learning.get("id") or learning.get("timestamp", "")
-            insight = learning.get("insight") or learning.get("text", "")
-            if learning_id and insight:
-                seen_learnings.add(learning_id)
-                # Check if this learning matches the query for scoring
-                insight_lower = insight.lower()
-                match_score = 1  # Base score for recent
-                for term in search_terms:
-                    if term in insight_lower:
-                        match_score += 3  # Boost for matching
-                results.append({
-                    "content": insight,
-                    "source": "learning",
-                    "timestamp": learning.get("timestamp"),
-                    "tags": learning.get("tags", []),
-                    "score": match_score,
-                })
+    async def _code_candidates(self, query: str) -> list[dict]:
+        """Code symbols named in the query, from the project's code index."""
+        try:
+            import code_index
+            return await asyncio.to_thread(code_index.code_candidates, query)
+        except Exception as e:
+            log(f"Code index search error: {e}", "DEBUG")
+            return []
+
+    async def _backboard_candidates(self, enhanced_query: str) -> list[dict]:
+        """Backboard's answer for the personal thread, as one candidate."""
+        thread_id = os.environ.get("BACKBOARD_PERSONAL_THREAD_ID")
+        log("Querying Backboard...", "INFO")
+        cloud_response = await self.backboard.recall(thread_id, enhanced_query)
+        if not cloud_response or len(cloud_response) <= 20:
+            return []
+        return [{
+            "key": "backboard",
+            "kind": "backboard",
+            "content": cloud_response,
+            "timestamp": datetime.now().isoformat(),
+        }]
+
+    async def _linear_candidates(self, enhanced_query: str) -> list[dict]:
+        """Linear documents matching the query (Phase 3: Project docs).
+
+        Served from the local mirror (linear_docs.py) once it has synced.
+        """
+        import linear_docs
+        docs = await linear_docs.search_documents(enhanced_query, limit=5)
+        if docs:
+            log(f"Found {len(docs)} Linear documents matching query", "INFO")
+        return [
+            {
+                "key": f"linear:{doc.get('id') or doc.get('url') or i}",
+                "kind": "linear",
+                "content": f"**Linear Doc:** {doc.get('title', 'Untitled')}\n{doc.get('content', '')}",
+                "url": doc.get("url"),
+                "timestamp": doc.get("updated_at"),
+            }
+            for i, doc in enumerate(docs)
+        ]
+
+    def _remote_tiers(self, local_only: bool) -> dict:
+        """Remote recall tiers that are configured, by name."""
+        tiers = {}
+        if local_only:
+            return tiers
+        # Always query Backboard when local_only=False - the frontend already did the intelligence check
+        if not self.backboard_available():
+            log("Backboard not available (BACKBOARD_API_KEY not set)", "DEBUG")
+        elif not os.environ.get("BACKBOARD_PERSONAL_THREAD_ID"):
+            log("Backboard available but BACKBOARD_PERSONAL_THREAD_ID not set", "WARN")
+        else:
+            tiers["backboard"] = self._backboard_candidates
+        if os.environ.get("LINEAR_API_KEY"):
+            tiers["linear"] = self._linear_candidates
+        return tiers
+
+    @staticmethod
+    async def _run_tier(name: str, search, enhanced_query: str, timeout: float) -> tuple[str, str, list[dict]]:
+        """Run one remote tier, cancelling it after timeout seconds; never raises."""
+        try:
+            candidates = await asyncio.wait_for(search(enhanced_query), timeout)
+            return name, "ok", candidates
+        except asyncio.TimeoutError:
+            log(f"{name} recall timed out after {timeout:g}s", "WARN")
+            return name, "timeout", []
+        except Exception as e:
+            log(f"{name} search error: {e}", "WARN")
+            return name, "error", []
 
-        # Search local sessions by keyword
-        all_sessions = self.memory.list_sessions(limit=50)
-        for session in all_sessions:
+    def _recent_session_results(self) -> list[dict]:
+        """Recent sessions as fallback context when nothing matched."""
+        results = []
+        for session in self.memory.list_sessions(limit=5):
             summary = session.get("summary", "")
             branch = session.get("branch", "")
             context = session.get("context", {})
-            summary_lower = summary.lower()
-            branch_lower = branch.lower()
-
-            # Check if any search term matches summary, branch, or context
-            match_score = 0
-            for term in search_terms:
-                if term in summary_lower:
-                    match_score += 3
-                if term in branch_lower:
-                    match_score += 2
-
-                # Check in decisions, blockers, next_steps
-                for key in ["decisions", "blockers", "next_steps"]:
-                    items = context.get(key, [])
-                    for item in items:
-                        if term in item.lower():
-                            match_score += 2
-
-            if match_score > 0:
-                content_parts = [f"**Session:** {summary}"]
-                content_parts.append(f"Branch: {branch}")
-                if context.get("decisions"):
-                    content_parts.append(f"Decisions: {', '.join(context['decisions'][:3])}")
-                if context.get("blockers"):
-                    content_parts.append(f"Blockers: {', '.join(context['blockers'][:3])}")
-                if context.get("next_steps"):
-                    content_parts.append(f"Next steps: {', '.join(context['next_steps'][:3])}")
-
-                results.append({
-                    "content": "\n".join(content_parts),
-                    "source": "session",
-                    "timestamp": session.get("timestamp"),
-                    "score": match_score,
-                })
 
-        # Search ALL learnings (not just recent) with each search term
-        for term in search_terms:
-            local_results = self.memory.search_learnings(term)
-            for learning in local_results:
-                learning_id = learning.get("id") or learning.get("timestamp", "")
-                if learning_id not in seen_learnings:
-                    seen_learnings.add(learning_id)
-                    results.append({
-                        "content": learning.get("insight") or learning.get("text", ""),
-                        "source": "learning",
-                        "timestamp": learning.get("timestamp"),
-                        "tags": learning.get("tags", []),
-                        "score": 4,  # High score - actually matched query!
-                    })
+            content_parts = [f"**Recent Session:** {summary}"]
+            content_parts.append(f"Branch: {branch}")
+            if context.get("decisions"):
+                content_parts.append(f"Decisions: {', '.join(context['decisions'][:3])}")
+            if context.get("blockers"):
+                content_parts.append(f"Blockers: {', '.join(context['blockers'][:3])}")
+
+            results.append({
+                "content": "\n".join(content_parts),
+                "source": "recent-session",
+                "timestamp": session.get("timestamp"),
+            })
+        return results
+
+    async def recall_stream(self, query: str, local_only: bool = False, deadline_ms: Optional[int] = None):
+        """Search memory, yielding results tier by tier as they complete.
+
+        Remote tiers (Backboard, Linear) start first and run concurrently,
+        each within RECALL_TIER_TIMEOUT (and deadline_ms, if shorter), while
+        local candidates are ranked. Tiers still running when their budget
+        expires are cancelled and reported as timed out. Events, in order:
+
+        - {"tier": "local", "results": [...]}: local and code hits, ranked
+        - {"tier": "backboard" | "linear", "status": "ok" | "timeout" | "error",
+          "results": [...]}: one per remote tier, in completion order
+        - {"tier": "final", ...}: everything fused by the shared ranking
+          pipeline, shaped like recall_context(), plus "timed_out" and
+          "partial" (True when a tier timed out)
 
-        # Search Backboard when:
-        # 1. local_only=False (frontend explicitly requested full search)
-        # 2. OR local results are insufficient (score < 3)
-        # When frontend passes local_only=False, it already determined local is insufficient
-        local_has_good_results = any(r.get("score", 0) >= 3 for r in results)
+        Args:
+            query: The search query
+            local_only: If True, skip Backboard and Linear (fast path)
+            deadline_ms: Budget for the remote tiers, from the start of the
+                call (default: RECALL_TIER_TIMEOUT per tier)
+        """
+        import ranking
+
+        timeout = RECALL_TIER_TIMEOUT
+        if deadline_ms is not None:
+            timeout = min(timeout, max(deadline_ms, 0) / 1000)
+        enhanced_query = self._enhanced_query(query)
+        tasks = [
+            asyncio.create_task(self._run_tier(name, search, enhanced_query, timeout))
+            for name, search in self._remote_tiers(local_only).items()
+        ]
+        try:
+            # git runs a subprocess; keep it off the loop
+            branch = await asyncio.to_thread(self._current_branch)
+            # External candidate lists, fused with local ones
+            extra = {}
+            code = await self._code_candidates(query)
+            if code:
+                extra["code"] = code
+            local = await asyncio.to_thread(ranking.local_candidates, query, self.memory)
+            ranked = ranking.rank(query, store=self.memory, branch=branch, limit=10, extra=extra, local=local)
+            yield {
+                "tier": "local",
+                "results": [self._recall_result(candidate) for candidate in ranked["results"]],
+                "timings_ms": ranked["timings_ms"],
+            }
 
-        # Always query Backboard when local_only=False - the frontend already did the intelligence check
-        if not local_only:
-            if not self.backboard_available():
-                log("Backboard not available (BACKBOARD_API_KEY not set)", "DEBUG")
-            else:
-                thread_id = os.environ.get("BACKBOARD_PERSONAL_THREAD_ID")
-                if not thread_id:
-                    log("Backboard available but BACKBOARD_PERSONAL_THREAD_ID not set", "WARN")
-                else:
-                    try:
-                        log(f"Querying Backboard (local_only={local_only}, local_results={len(results)}, has_good={local_has_good_results})...", "INFO")
-                        enhanced_query = " ".join(search_terms) if search_terms else query
-                        cloud_response = await self.backboard.recall(thread_id, enhanced_query)
-                        if cloud_response and len(cloud_response) > 20:
-                            results.append({
-                                "content": cloud_response,
-                                "source": "backboard",
-                                "timestamp": datetime.now().isoformat(),
-                                "score": 2,  # Lower than good local matches
-                            })
-                    except Exception as e:
-                        log(f"Backboard search error: {e}", "WARN")
+            timed_out = []
+            for next_tier in asyncio.as_completed(tasks):
+                name, status, candidates = await next_tier
+                if candidates:
+                    extra[name] = candidates
+                if status == "timeout":
+                    timed_out.append(name)
+                yield {
+                    "tier": name,
+                    "status": status,
+                    "results": [self._recall_result(candidate) for candidate in candidates],
+                }
 
-        # Also search Linear documents if available (Phase 3: Project docs)
-        if not local_only and os.environ.get("LINEAR_API_KEY"):
-            try:
-                import linear_client
-                enhanced_query = " ".join(search_terms) if search_terms else query
-                linear_docs = await linear_client.search_documents(enhanced_query, limit=5)
-                for doc in linear_docs:
-                    results.append({
-                        "content": f"**Linear Doc:** {doc.get('title', 'Untitled')}\n{doc.get('content', '')}",
-                        "source": "linear",
-                        "url": doc.get("url"),
-                        "timestamp": doc.get("updated_at"),
-                        "score": 3,  # Higher score - project documentation
-                    })
-                if linear_docs:
-                    log(f"Found {len(linear_docs)} Linear documents matching query", "INFO")
-            except Exception as e:
-                log(f"Linear document search error: {e}", "DEBUG")
+            if tasks:
+                ranked = ranking.rank(query, store=self.memory, branch=branch, limit=10, extra=extra, local=local)
+            results = [self._recall_result(candidate) for candidate in ranked["results"]]
+            # If no results, include recent sessions as fallback context
+            if not results:
+                results = self._recent_session_results()
 
-        # Sort by score (higher first) and limit
-        results.sort(key=lambda x: x.get("score", 0), reverse=True)
-        results = results[:10]  # Limit to top 10 results
+            yield {
+                "tier": "final",
+                "query": query,
+                "results": results,
+                "sources": {
+                    "local": True,
+                    "cloud": self.backboard_available(),
+                },
+                "timed_out": timed_out,
+                "partial": bool(timed_out),
+                "timings_ms": ranked["timings_ms"],
+            }
+        finally:
+            # Client went away mid-stream: don't leave remote calls running
+            for task in tasks:
+                task.cancel()
 
-        # If no results, include recent sessions as fallback context
-        if not results:
-            recent_sessions = self.memory.list_sessions(limit=5)
-            for session in recent_sessions:
-                summary = session.get("summary", "")
-                branch = session.get("branch", "")
-                context = session.get("context", {})
-
-                content_parts = [f"**Recent Session:** {summary}"]
-                content_parts.append(f"Branch: {branch}")
-                if context.get("decisions"):
-                    content_parts.append(f"Decisions: {', '.join(context['decisions'][:3])}")
-                if context.get("blockers"):
-                    content_parts.append(f"Blockers: {', '.join(context['blockers'][:3])}")
-
-                results.append({
-                    "content": "\n".join(content_parts),
-                    "source": "recent-session",
-                    "timestamp": session.get("timestamp"),
-                })
+    async def recall_context(
+        self,
+        query: str,
+        local_only: bool = False,
+        deadline_ms: Optional[int] = None,
+    ) -> dict:
+        """Search memory for relevant context.
 
-        return {
-            "query": query,
-            "results": results,
-            "sources": {
-                "local": True,
-                "cloud": self.backboard_available(),
-            }
+        Local keyword, semantic and recent-learning candidates are fused
+        with any Backboard / Linear results by the shared ranking pipeline
+        (ranking.py), then boosted for recency and the current branch.
+        Remote tiers run concurrently (see recall_stream()); with a
+        deadline, results are partial if a tier missed it.
+
+        Args:
+            query: The search query
+            local_only: If True, skip Backboard (fast path)
+            deadline_ms: Latency budget for the remote tiers in milliseconds
+        """
+        async for event in self.recall_stream(query, local_only=local_only, deadline_ms=deadline_ms):
+            if event["tier"] == "final":
+                result = dict(event)
+                del result["tier"]
+                return result
+
+    @staticmethod
+    def _current_branch() -> Optional[str]:
+        """Current git branch of the working directory, for branch-aware ranking."""
+        try:
+            from git_utils import get_current_branch
+            return get_current_branch()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _recall_result(candidate: dict) -> dict:
+        """Shape a ranked candidate as a recall result."""
+        result = {
+            "content": candidate["content"],
+            "source": candidate.get("kind", "learning"),
+            "timestamp": candidate.get("timestamp"),
         }
+        # Unranked tier results (recall_stream) have no score yet
+        if "score" in candidate:
+            result["score"] = candidate["score"]
+        if candidate.get("kind") == "learning":
+            result["tags"] = candidate.get("tags", [])
+        if candidate.get("url"):
+            result["url"] = candidate["url"]
+        return result
 
     # ---- Learn ----
     async def store_learning(
@@ -371,46 +472,72 @@ Example output: ["auth", "jwt", "token", "refresh"]""",
         tags: list[str] = None,
         share_with_team: bool = False,
     ) -> dict:
-        """Store a learning or insight."""
-        learning = {
-            "insight": insight,
-            "tags": tags or [],
-            "timestamp": datetime.now().isoformat(),
-            "shared": share_with_team,
+        """Store a learning or insight.
+
+        The learning is saved locally; Backboard writes are queued in the
+        outbox, so "personal" and "team" report what was queued.
+        """
+        result = await self.store_learnings([
+            {"insight": insight, "tags": tags, "share_with_team": share_with_team}
+        ])
+        return {
+            "stored": True,
+            "personal": bool(result["personal"]),
+            "team": bool(result["team"]),
         }
 
-        # Save locally
-        self.memory.save_learning(learning)
+    async def store_learnings(self, items: list[dict]) -> dict:
+        """Store a batch of learnings: one local write, queued Backboard writes.
+
+        Args:
+            items: Dicts with "insight", optional "tags" and "share_with_team"
 
-        # Save to Backboard
-        stored_personal = False
-        stored_team = False
+        Returns:
+            Dictionary with stored (local) and personal/team (queued) counts
+        """
+        now = datetime.now().isoformat()
+        learnings = [
+            {
+                "insight": item["insight"],
+                "tags": item.get("tags") or [],
+                "timestamp": now,
+                "shared": item.get("share_with_team", False),
+            }
+            for item in items
+            if item.get("insight")
+        ]
+        if not learnings:
+            return {"stored": 0, "personal": 0, "team": 0}
 
+        # Save locally in one write, off the event loop
+        learning_ids = await asyncio.to_thread(self.memory.save_learnings, learnings)
+
+        # Queue the Backboard fan-out; the outbox worker sends it in batches
+        import outbox
+        jobs = []
+        counts = {"personal": 0, "team": 0}
         if self.backboard_available():
             thread_id = os.environ.get("BACKBOARD_PERSONAL_THREAD_ID")
-            if thread_id:
-                tag_str = " ".join(f"#{t}" for t in (tags or []))
-                content = f"**Learning**: {insight}\n{tag_str}"
-                await self.backboard.store_message(thread_id, content, {
-                    "type": "learning",
-                    "tags": tags or [],
-                })
-                stored_personal = True
-
-            if share_with_team and self.team_available():
-                team_thread = os.environ.get("BACKBOARD_TEAM_THREAD_ID")
-                if team_thread:
-                    await self.backboard.store_message(team_thread, content, {
-                        "type": "team_learning",
-                        "tags": tags or [],
+            team_thread = os.environ.get("BACKBOARD_TEAM_THREAD_ID") if self.team_available() else None
+            for learning, learning_id in zip(learnings, learning_ids):
+                tag_str = " ".join(f"#{t}" for t in learning["tags"])
+                content = f"**Learning**: {learning['insight']}\n{tag_str}"
+                targets = [("personal", thread_id, "learning")]
+                if learning["shared"]:
+                    targets.append(("team", team_thread, "team_learning"))
+                for kind, target, message_type in targets:
+                    if not target:
+                        continue
+                    jobs.append({
+                        "kind": outbox.BACKBOARD_MESSAGE,
+                        "target": target,
+                        "payload": {"content": content, "metadata": {"type": message_type, "tags": learning["tags"]}},
+                        "learning_id": learning_id,
                     })
-                    stored_team = True
+                    counts[kind] += 1
+        self._enqueue_remote(jobs)
 
-        return {
-            "stored": True,
-            "personal": stored_personal,
-            "team": stored_team,
-        }
+        return {"stored": len(learnings), **counts}
 
     # ---- Team ----
     async def query_team(self, query: str) -> dict:
@@ -440,6 +567,10 @@ Example output: ["auth", "jwt", "token", "refresh"]""",
     # ---- Status ----
     async def get_status(self) -> dict:
         """Get Flow Guardian status."""
+        import completion_cache
+        import outbox
+        import recall_cache
+
         # Check last session
         last_session = self.memory.get_latest_session()
 
@@ -450,8 +581,197 @@ Example output: ["auth", "jwt", "token", "refresh"]""",
             "last_summary": last_session.get("summary") or (
                 last_session.get("context", {}).get("summary") if last_session else None
             ),
+            "read_cache": self.memory.get_cache_stats(),
+            "recall_cache": recall_cache.get_stats(),
+            "completion_cache": completion_cache.get_stats(),
+            "backboard_pool": self.backboard.get_pool_stats(),
+            "outbox": {**outbox.get_stats(), "worker_running": self.outbox_worker.running},
+        }
+
+    # ---- Dashboard ----
+    def cached_payload(self, name: str, params: tuple, build) -> tuple[str, dict]:
+        """
+        Serve a dashboard payload from cache until the store changes.
+
+        Args:
+            name: Endpoint name
+            params: Request parameters the payload depends on
+            build: Called to compute the payload on a miss
+
+        Returns:
+            (etag, payload); the ETag only changes when the data does
+        """
+        import hashlib
+
+        version = self.memory.data_version()
+        key = (name, params)
+        cached = self._payloads.get(key)
+        if cached and cached[0] == version:
+            self._payloads.move_to_end(key)
+            return cached[1], cached[2]
+
+        payload = build()
+        digest = hashlib.sha1(json.dumps([name, list(params), version]).encode("utf-8")).hexdigest()
+        etag = f'"{digest[:20]}"'
+        self._payloads.pop(key, None)
+        while len(self._payloads) >= PAYLOAD_CACHE_SIZE:
+            self._payloads.popitem(last=False)
+        self._payloads[key] = (version, etag, payload)
+        return etag, payload
+
+    def knowledge_graph(self, limit: int = 100, include_sessions: bool = True,
+                        include_learnings: bool = True) -> dict:
+        """
+        Knowledge graph of sessions, learnings and their tags.
+
+        Tags and their edges come from the tag index rather than from
+        comparing learnings: tag nodes are the most used tags, "tagged"
+        edges follow each tag's postings, learnings sharing a tag carried
+        by at most 5 learnings are linked by "related" edges, and tags
+        used together are linked by "cooccurs" edges.
+
+        Args:
+            limit: Maximum sessions, learnings and tags (each)
+            include_sessions: Add session nodes
+            include_learnings: Add learning and tag nodes
+
+        Returns:
+            Dictionary with nodes, edges and stats
+        """
+        nodes = []
+        edges = []
+        node_ids = set()
+
+        if include_sessions:
+            for session in self.memory.list_sessions(limit=limit):
+                session_id = session.get("id", f"session_{session.get('timestamp', '')}")
+                if session_id not in node_ids:
+                    nodes.append({
+                        "id": session_id,
+                        "type": "session",
+                        "label": session.get("summary", "Untitled Session")[:50],
+                        "data": {
+                            "summary": session.get("summary", ""),
+                            "branch": session.get("branch", ""),
+                            "timestamp": session.get("timestamp", ""),
+                        }
+                    })
+                    node_ids.add(session_id)
+
+        if include_learnings:
+            learning_ids = set()
+            for learning in self.memory.get_recent_learnings(limit):
+                learning_id = learning.get("id", f"learning_{learning.get('timestamp', '')}")
+                if learning_id in node_ids:
+                    continue
+                insight = learning.get("insight") or learning.get("text", "")
+                nodes.append({
+                    "id": learning_id,
+                    "type": "learning",
+                    "label": insight[:50] + ("..." if len(insight) > 50 else ""),
+                    "data": {
+                        "insight": insight,
+                        "tags": learning.get("tags", []),
+                        "timestamp": learning.get("timestamp", ""),
+                        "shared": learning.get("shared", False),
+                    }
+                })
+                node_ids.add(learning_id)
+                learning_ids.add(learning_id)
+
+            edge_set = set()
+            for tag, count in self.memory.get_top_tags(limit):
+                tag_id = f"tag_{tag}"
+                nodes.append({
+                    "id": tag_id,
+                    "type": "tag",
+                    "label": f"#{tag}",
+                    "data": {"tag": tag, "count": count}
+                })
+                node_ids.add(tag_id)
+
+                # Postings are newest first, like the learning nodes
+                tagged = [
+                    learning_id for learning_id in self.memory.get_tag_learning_ids(tag, limit)
+                    if learning_id in learning_ids
+                ]
+                for learning_id in tagged:
+                    edges.append({
+                        "id": f"e_{learning_id}_{tag_id}",
+                        "source": learning_id,
+                        "target": tag_id,
+                        "type": "tagged",
+                    })
+
+                # Link learnings that share a rare tag (small groups bound the edges)
+                if count > 5:
+                    continue
+                for i, lid1 in enumerate(tagged):
+                    for lid2 in tagged[i + 1:]:
+                        edge_key = tuple(sorted([lid1, lid2]))
+                        if edge_key not in edge_set:
+                            edges.append({
+                                "id": f"e_shared_{lid1}_{lid2}",
+                                "source": lid1,
+                                "target": lid2,
+                                "type": "related",
+                                "label": f"#{tag}",
+                            })
+                            edge_set.add(edge_key)
+
+            for tag_a, tag_b, count in self.memory.get_top_tag_pairs(limit):
+                source, target = f"tag_{tag_a}", f"tag_{tag_b}"
+                if source in node_ids and target in node_ids:
+                    edges.append({
+                        "id": f"e_{source}_{target}",
+                        "source": source,
+                        "target": target,
+                        "type": "cooccurs",
+                        "label": str(count),
+                    })
+
+        counts = {"session": 0, "learning": 0, "tag": 0}
+        for node in nodes:
+            counts[node["type"]] += 1
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "stats": {
+                "total_nodes": len(nodes),
+                "total_edges": len(edges),
+                "sessions": counts["session"],
+                "learnings": counts["learning"],
+                "tags": counts["tag"],
+            }
         }
 
+    def dashboard_stats(self) -> dict:
+        """
+        Counts and tag statistics for the dashboard, from the store's indexes.
+
+        Returns:
+            Dictionary with sessions_count, learnings_count, team_learnings,
+            top_tags and top_tag_pairs
+        """
+        stats = self.memory.get_stats()
+        return {
+            "sessions_count": stats.get("sessions_count", 0),
+            "learnings_count": stats.get("total_learnings", 0),
+            "team_learnings": stats.get("team_learnings", 0),
+            "top_tags": [{"tag": tag, "count": count} for tag, count in self.memory.get_top_tags(10)],
+            "top_tag_pairs": [
+                {"tags": [a, b], "count": count} for a, b, count in self.memory.get_top_tag_pairs(10)
+            ],
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
 
 # Global service instance
 _service: Optional[FlowService] = None
@@ -472,6 +792,7 @@ class DaemonMode:
         self.service = service
         self.state = self._load_state()
         self.running = False
+        self.pool = None
 
     def _load_state(self) -> dict:
         if STATE_FILE.exists():
@@ -485,6 +806,17 @@ class DaemonMode:
         DAEMON_DIR.mkdir(parents=True, exist_ok=True)
         STATE_FILE.write_text(json.dumps(self.state, indent=2, default=str))
 
+    async def _save_state_async(self):
+        """Save state without blocking the loop the API shares in combined mode."""
+        # Serialize on the loop so other workers can't change state mid-dump
+        data = json.dumps(self.state, indent=2, default=str)
+
+        def write():
+            DAEMON_DIR.mkdir(parents=True, exist_ok=True)
+            STATE_FILE.write_text(data)
+
+        await asyncio.to_thread(write)
+
     async def _maybe_generate_docs(self, new_insights_count: int):
         """Check if we should generate documentation based on activity.
 
@@ -536,12 +868,9 @@ class DaemonMode:
                 reports_dir = STATE_DIR / "reports"
                 reports_dir.mkdir(parents=True, exist_ok=True)
 
-                # Import Linear client for document storage
-                try:
-                    import linear_client
-                    linear_available = bool(os.environ.get("LINEAR_API_KEY"))
-                except ImportError:
-                    linear_available = False
+                # Linear documents are written through the outbox
+                import outbox
+                linear_available = bool(os.environ.get("LINEAR_API_KEY"))
 
                 # Generate FAQ from learnings
                 try:
@@ -550,14 +879,14 @@ class DaemonMode:
                     faq_path.write_text(faq)
                     log(f"[AutoDocs] Generated FAQ: {faq_path.name}")
 
-                    # Store in Linear Docs
+                    # Queue for Linear Docs
                     if linear_available:
-                        doc = await linear_client.create_or_update_document(
-                            title="Flow Guardian FAQ",
-                            content=faq
-                        )
-                        if doc:
-                            log(f"[AutoDocs] Stored FAQ in Linear: {doc.get('url', doc.get('id'))}")
+                        self.service._enqueue_remote([{
+                            "kind": outbox.LINEAR_DOCUMENT,
+                            "target": None,
+                            "payload": {"title": "Flow Guardian FAQ", "content": faq},
+                        }])
+                        log("[AutoDocs] Queued FAQ for Linear")
                 except Exception as e:
                     log(f"[AutoDocs] FAQ generation failed: {e}", "WARN")
 
@@ -568,21 +897,21 @@ class DaemonMode:
                     summary_path.write_text(summary)
                     log(f"[AutoDocs] Generated weekly summary: {summary_path.name}")
 
-                    # Store in Linear Docs
+                    # Queue for Linear Docs
                     if linear_available:
-                        doc = await linear_client.create_or_update_document(
-                            title="Flow Guardian Weekly Summary",
-                            content=summary
-                        )
-                        if doc:
-                            log(f"[AutoDocs] Stored weekly summary in Linear: {doc.get('url', doc.get('id'))}")
+                        self.service._enqueue_remote([{
+                            "kind": outbox.LINEAR_DOCUMENT,
+                            "target": None,
+                            "payload": {"title": "Flow Guardian Weekly Summary", "content": summary},
+                        }])
+                        log("[AutoDocs] Queued weekly summary for Linear")
                 except Exception as e:
                     log(f"[AutoDocs] Weekly summary failed: {e}", "WARN")
 
                 # Update state
                 self.state["last_report_time"] = datetime.now().isoformat()
                 self.state["extractions_since_report"] = 0
-                self._save_state()
+                await self._save_state_async()
 
         except ImportError:
             pass  # report_generator not available
@@ -591,6 +920,8 @@ class DaemonMode:
 
     async def extract_insights(self, conversation: str) -> list[dict]:
         """Use Cerebras to extract insights from conversation."""
+        import tokens
+
         if not conversation.strip():
             return []
 
@@ -607,14 +938,16 @@ Format as JSON array:
 Only extract genuinely useful insights. If none, return [].
 
 CONVERSATION:
-{conversation[:MAX_CHUNK_CHARS]}"""
+{tokens.truncate_to_tokens(conversation, MAX_CHUNK_TOKENS)}"""
 
         try:
-            response = self.service.cerebras.complete(
+            response = await self.service.cerebras.acomplete(
                 prompt=prompt,
                 system="Extract technical insights as JSON only.",
                 json_mode=True,
-                max_tokens=2000
+                max_tokens=2000,
+                # Every chunk is new conversation text; caching it would never hit
+                use_cache=False,
             )
 
             # Parse response
@@ -663,22 +996,19 @@ CONVERSATION:
             "pending_messages": 0,
         })
 
-        # Get new conversation
-        conversation, new_line = session_parser.get_conversation_text(
-            session_path,
-            since_line=session_state.get("last_line", 0),
-            max_chars=MAX_CHUNK_CHARS
-        )
+        # Read only what was appended since the saved byte offset (off the
+        # loop, which the API shares in combined mode)
+        tailer = session_parser.tail_session(session_path, session_state)
+        new_messages = await asyncio.to_thread(tailer.read_new)
+        session_state.update(tailer.position())
+        self.state["sessions"][session_id] = session_state
 
-        if new_line <= session_state.get("last_line", 0):
+        if not new_messages:
             return 0
 
         # Update pending count
-        new_messages = new_line - session_state.get("last_line", 0)
-        pending = session_state.get("pending_messages", 0) + new_messages
-        session_state["last_line"] = new_line
+        pending = session_state.get("pending_messages", 0) + len(new_messages)
         session_state["pending_messages"] = pending
-        self.state["sessions"][session_id] = session_state
 
         # Check if we should extract
         time_since = float("inf")
@@ -695,34 +1025,28 @@ CONVERSATION:
         )
 
         if not should_extract:
-            self._save_state()
+            await self._save_state_async()
             return 0
 
         log(f"Extracting from {session_id[:8]}... ({pending} messages)")
 
-        # Get more context for extraction
-        full_conv, _ = session_parser.get_conversation_text(
-            session_path,
-            since_line=max(0, new_line - 50),
-            max_chars=MAX_CHUNK_CHARS
-        )
+        # Context for extraction: the tailer's window of recent messages
+        full_conv = tailer.context.text(max_tokens=MAX_CHUNK_TOKENS)
 
         insights = await self.extract_insights(full_conv)
 
         if insights:
-            # Get cwd
-            cwd = "unknown"
-            for msg in session_parser.parse_session_messages(session_path, 0):
-                if msg.get("cwd"):
-                    cwd = msg["cwd"]
-                    break
-
-            # Store insights
-            for insight in insights:
-                await self.service.store_learning(
-                    insight=insight.get("insight", ""),
-                    tags=[insight.get("category", "learning"), "auto-captured"],
-                )
+            # cwd was captured by the tailer
+            cwd = tailer.metadata.get("cwd", "unknown")
+
+            # Store insights: one local write, parallel Backboard writes
+            await self.service.store_learnings([
+                {
+                    "insight": insight.get("insight", ""),
+                    "tags": [insight.get("category", "learning"), "auto-captured"],
+                }
+                for insight in insights
+            ])
 
             log(f"Stored {len(insights)} insights from {session_id[:8]}")
             self.state["extractions_count"] = self.state.get("extractions_count", 0) + 1
@@ -733,39 +1057,76 @@ CONVERSATION:
         session_state["last_extraction"] = datetime.now().isoformat()
         session_state["pending_messages"] = 0
         self.state["sessions"][session_id] = session_state
-        self._save_state()
+        await self._save_state_async()
 
         return len(insights)
 
     async def watch_loop(self):
         """Main daemon loop."""
-        import session_parser
-
         self.running = True
         self.state["started_at"] = datetime.now().isoformat()
         self._save_state()
 
         log("Daemon started, watching for sessions...")
 
-        while self.running:
-            try:
-                if session_parser.CLAUDE_PROJECTS_DIR.exists():
-                    for project_dir in session_parser.CLAUDE_PROJECTS_DIR.iterdir():
-                        if not project_dir.is_dir():
-                            continue
+        # Keep Backboard and Cerebras connections alive between extraction bursts
+        await self.service.backboard.open_client()
+        await self.service.cerebras.open_client()
+        self.service.start_outbox()
+        linear_sync = None
+        if os.environ.get("LINEAR_API_KEY"):
+            linear_sync = asyncio.create_task(self._sync_linear_docs())
+        try:
+            await self._watch()
+        finally:
+            if linear_sync is not None:
+                linear_sync.cancel()
+            await self.service.stop_outbox()
+            await self.service.cerebras.close_client()
+            await self.service.backboard.close_client()
+
+    async def _watch(self):
+        """Process Claude Code sessions as they are appended to, until stopped."""
+        import session_watcher
+        import worker_pool
+
+        watcher = session_watcher.SessionWatcher(poll_interval=POLL_INTERVAL)
+        backend = await watcher.start()
+        self.pool = worker_pool.SessionWorkerPool(
+            self.process_session,
+            on_error=lambda path, e: log(f"Error processing {path.stem[:8]}: {e}", "ERROR"),
+        )
+        self.pool.start()
+        log(f"Watching sessions with {backend} ({self.pool.concurrency} extraction workers)")
 
-                        session_id = session_parser.get_active_session(project_dir)
-                        if not session_id:
-                            continue
+        # Catch up on sessions written to while the daemon was down
+        changed = watcher.recent_sessions()
+        try:
+            while self.running:
+                for session_path in sorted(changed):
+                    self.pool.submit(session_path)
 
-                        session_path = session_parser.get_session_path(project_dir, session_id)
-                        if session_path.exists():
-                            await self.process_session(session_path)
+                changed = await watcher.changes(timeout=POLL_INTERVAL)
+        finally:
+            await self.pool.stop()
+            await watcher.stop()
 
-            except Exception as e:
-                log(f"Watch loop error: {e}", "ERROR")
+    async def _sync_linear_docs(self):
+        """Keep the local mirror of Linear documents fresh for recall."""
+        import linear_docs
 
-            await asyncio.sleep(POLL_INTERVAL)
+        mirror = linear_docs.get_mirror()
+        while True:
+            try:
+                stats = await mirror.sync()
+                if stats["updated"] or stats["removed"]:
+                    log(
+                        f"Linear docs synced: {stats['updated']} updated, {stats['removed']} removed, "
+                        f"{stats['documents']} mirrored" + (" (full)" if stats["full"] else "")
+                    )
+            except Exception as e:
+                log(f"Linear document sync failed: {e}", "WARN")
+            await asyncio.sleep(linear_docs.SYNC_INTERVAL)
 
     def stop(self):
         self.running = False
@@ -775,16 +1136,31 @@ CONVERSATION:
 
 def create_api_app(service: FlowService):
     """Create FastAPI application."""
-    from fastapi import FastAPI, HTTPException, Query, UploadFile, File, Form, BackgroundTasks
+    from fastapi import FastAPI, HTTPException, Query, Request, Response, UploadFile, File, Form, BackgroundTasks
     from fastapi.middleware.cors import CORSMiddleware
-    from fastapi.responses import StreamingResponse
-    from pydantic import BaseModel
+    from fastapi.responses import JSONResponse, StreamingResponse
+    from pydantic import BaseModel, Field
     from typing import List
 
+    @asynccontextmanager
+    async def lifespan(app):
+        # One pooled Backboard and Cerebras client for all requests;
+        # queued writes drain in the background
+        await service.backboard.open_client()
+        await service.cerebras.open_client()
+        service.start_outbox()
+        try:
+            yield
+        finally:
+            await service.stop_outbox()
+            await service.cerebras.close_client()
+            await service.backboard.close_client()
+
     app = FastAPI(
         title="Flow Guardian API",
         description="Persistent memory for AI coding sessions",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -804,6 +1180,9 @@ def create_api_app(service: FlowService):
     class RecallRequest(BaseModel):
         query: str
         local_only: bool = False  # Skip Backboard for faster responses
+        # Latency budget for Backboard/Linear; slower tiers are cancelled
+        # and listed in timed_out
+        deadline_ms: Optional[int] = Field(default=None, ge=0)
 
     class LearnRequest(BaseModel):
         insight: str
@@ -815,115 +1194,27 @@ def create_api_app(service: FlowService):
 
     # Routes
     # ---- Knowledge Graph Endpoints ----
+    def conditional_json(request: Request, etag: str, payload: dict):
+        """Serve a payload with its ETag, or 304 if the client already has it."""
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(payload, headers=headers)
+
     @app.get("/graph")
     async def get_knowledge_graph(
+        request: Request,
         limit: int = Query(default=100, ge=1, le=500),
         include_sessions: bool = Query(default=True),
         include_learnings: bool = Query(default=True),
     ):
         """Get knowledge graph data with nodes and edges for visualization."""
-        nodes = []
-        edges = []
-        node_ids = set()
-        tag_nodes = {}  # Track tag nodes to create edges
-
-        # Get sessions
-        if include_sessions:
-            sessions = service.memory.list_sessions(limit=limit)
-            for session in sessions:
-                session_id = session.get("id", f"session_{session.get('timestamp', '')}")
-                if session_id not in node_ids:
-                    nodes.append({
-                        "id": session_id,
-                        "type": "session",
-                        "label": session.get("summary", "Untitled Session")[:50],
-                        "data": {
-                            "summary": session.get("summary", ""),
-                            "branch": session.get("branch", ""),
-                            "timestamp": session.get("timestamp", ""),
-                        }
-                    })
-                    node_ids.add(session_id)
-
-        # Get learnings
-        if include_learnings:
-            learnings = service.memory.get_all_learnings()[:limit]
-            for learning in learnings:
-                learning_id = learning.get("id", f"learning_{learning.get('timestamp', '')}")
-                if learning_id not in node_ids:
-                    insight = learning.get("insight") or learning.get("text", "")
-                    nodes.append({
-                        "id": learning_id,
-                        "type": "learning",
-                        "label": insight[:50] + ("..." if len(insight) > 50 else ""),
-                        "data": {
-                            "insight": insight,
-                            "tags": learning.get("tags", []),
-                            "timestamp": learning.get("timestamp", ""),
-                            "shared": learning.get("shared", False),
-                        }
-                    })
-                    node_ids.add(learning_id)
-
-                    # Create tag nodes and edges
-                    for tag in learning.get("tags", []):
-                        tag_id = f"tag_{tag}"
-                        if tag_id not in node_ids:
-                            nodes.append({
-                                "id": tag_id,
-                                "type": "tag",
-                                "label": f"#{tag}",
-                                "data": {"tag": tag}
-                            })
-                            node_ids.add(tag_id)
-                            tag_nodes[tag] = tag_id
-
-                        # Edge from learning to tag
-                        edges.append({
-                            "id": f"e_{learning_id}_{tag_id}",
-                            "source": learning_id,
-                            "target": tag_id,
-                            "type": "tagged",
-                        })
-
-        # Create edges between learnings with shared tags
-        learnings_by_tag = {}
-        if include_learnings:
-            for learning in learnings:  # Reuse learnings from earlier fetch
-                learning_id = learning.get("id", f"learning_{learning.get('timestamp', '')}")
-                for tag in learning.get("tags", []):
-                    if tag not in learnings_by_tag:
-                        learnings_by_tag[tag] = []
-                    learnings_by_tag[tag].append(learning_id)
-
-            # Create edges between learnings that share tags (limit to prevent too many edges)
-            edge_set = set()
-            for tag, learning_ids in learnings_by_tag.items():
-                if len(learning_ids) > 1 and len(learning_ids) <= 5:  # Only connect if reasonable number
-                    for i, lid1 in enumerate(learning_ids):
-                        for lid2 in learning_ids[i+1:]:
-                            edge_key = tuple(sorted([lid1, lid2]))
-                            if edge_key not in edge_set:
-                                edges.append({
-                                    "id": f"e_shared_{lid1}_{lid2}",
-                                    "source": lid1,
-                                    "target": lid2,
-                                    "type": "related",
-                                    "label": f"#{tag}",
-                                })
-                                edge_set.add(edge_key)
-
-        return {
-            "nodes": nodes,
-            "edges": edges,
-            "stats": {
-                "total_nodes": len(nodes),
-                "total_edges": len(edges),
-                "sessions": len([n for n in nodes if n["type"] == "session"]),
-                "learnings": len([n for n in nodes if n["type"] == "learning"]),
-                "tags": len([n for n in nodes if n["type"] == "tag"]),
-            }
-        }
+        etag, payload = service.cached_payload(
+            "graph",
+            (limit, include_sessions, include_learnings),
+            lambda: service.knowledge_graph(limit, include_sessions, include_learnings),
+        )
+        return conditional_json(request, etag, payload)
 
     @app.get("/suggestions")
     async def get_suggestions(limit: int = Query(default=5, ge=1, le=10)):
@@ -980,7 +1271,7 @@ Example:
 Return ONLY the JSON array."""
 
             try:
-                response = service.cerebras.complete(
+                response = await service.cerebras.acomplete(
                     prompt=prompt,
                     system="You are a helpful AI assistant that provides proactive suggestions to developers based on their activity. Be concise and actionable.",
                     json_mode=True,
@@ -1055,7 +1346,25 @@ Return ONLY the JSON array."""
 
     @app.post("/recall")
     async def recall(req: RecallRequest):
-        return await service.recall_context(req.query, local_only=req.local_only)
+        return await service.recall_context(req.query, local_only=req.local_only, deadline_ms=req.deadline_ms)
+
+    @app.post("/recall/stream")
+    async def recall_stream(req: RecallRequest, request: Request):
+        """Recall results tier by tier: NDJSON, or SSE if the client accepts text/event-stream."""
+        sse = "text/event-stream" in request.headers.get("accept", "")
+
+        async def events():
+            async for event in service.recall_stream(
+                req.query, local_only=req.local_only, deadline_ms=req.deadline_ms,
+            ):
+                data = json.dumps(event, default=str)
+                yield f"event: {event['tier']}\ndata: {data}\n\n" if sse else f"{data}\n"
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream" if sse else "application/x-ndjson",
+            headers={"Cache-Control": "no-cache"},
+        )
 
     @app.post("/learn")
     async def learn(req: LearnRequest, background_tasks: BackgroundTasks):
@@ -1103,34 +1412,29 @@ Return ONLY the JSON array."""
         limit: int = Query(default=10, ge=1, le=100),
         branch: Optional[str] = Query(default=None),
         full: bool = Query(default=True),
+        cursor: Optional[str] = Query(default=None),
     ):
-        """List sessions with pagination."""
-        # Get all session summaries first for counting
-        all_summaries = service.memory.list_sessions(limit=1000, branch=branch, full=False)
-        total = len(all_summaries)
-
-        # Apply pagination to summaries
-        start = (page - 1) * limit
-        end = start + limit
-        paginated_summaries = all_summaries[start:end]
-
-        # If full data requested, load full sessions for the paginated set
-        if full and paginated_summaries:
-            sessions = []
-            for summary in paginated_summaries:
-                session_id = summary.get("id", "")
-                full_data = service.memory.load_session(session_id)
-                if full_data:
-                    sessions.append(full_data)
-                else:
-                    sessions.append(summary)
-        else:
-            sessions = paginated_summaries
+        """List sessions, newest first.
+
+        Pass the returned next_cursor to get the following page; page numbers
+        still work but skip records, so deep pages are slower.
+        """
+        try:
+            result = service.memory.page_sessions(
+                limit=limit,
+                branch=branch,
+                cursor=cursor,
+                offset=0 if cursor else (page - 1) * limit,
+                full=full,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         return {
-            "sessions": sessions,
-            "total": total,
+            "sessions": result["items"],
+            "total": result["total"],
             "page": page,
+            "next_cursor": result["next_cursor"],
         }
 
     @app.get("/learnings")
@@ -1139,51 +1443,31 @@ Return ONLY the JSON array."""
         limit: int = Query(default=10, ge=1, le=100),
         tag: Optional[str] = Query(default=None),
         team: Optional[bool] = Query(default=None),
+        cursor: Optional[str] = Query(default=None),
     ):
-        """List learnings with pagination."""
-        # Get all learnings filtered by team flag
-        all_learnings = service.memory.get_all_learnings(team=team)
-
-        # Filter by tag if specified
-        if tag:
-            all_learnings = [
-                l for l in all_learnings
-                if tag in l.get("tags", [])
-            ]
-
-        total = len(all_learnings)
-
-        # Apply pagination
-        start = (page - 1) * limit
-        end = start + limit
-        learnings = all_learnings[start:end]
+        """List learnings, newest first (see /sessions for cursor paging)."""
+        try:
+            result = service.memory.page_learnings(
+                limit=limit,
+                team=team,
+                tag=tag,
+                cursor=cursor,
+                offset=0 if cursor else (page - 1) * limit,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         return {
-            "learnings": learnings,
-            "total": total,
+            "learnings": result["items"],
+            "total": result["total"],
+            "next_cursor": result["next_cursor"],
         }
 
     @app.get("/stats")
-    async def get_stats():
+    async def get_stats(request: Request):
         """Get dashboard statistics."""
-        stats = service.memory.get_stats()
-
-        # Calculate top tags
-        all_learnings = service.memory.get_all_learnings()
-        tag_counts = {}
-        for learning in all_learnings:
-            for tag in learning.get("tags", []):
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
-        # Sort by count and get top 10
-        top_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-
-        return {
-            "sessions_count": stats.get("sessions_count", 0),
-            "learnings_count": stats.get("total_learnings", 0),
-            "team_learnings": stats.get("team_learnings", 0),
-            "top_tags": [{"tag": tag, "count": count} for tag, count in top_tags],
-        }
+        etag, payload = service.cached_payload("stats", (), service.dashboard_stats)
+        return conditional_json(request, etag, payload)
 
     @app.post("/documents")
     async def upload_document(
@@ -1463,6 +1747,41 @@ async def run_api(service: FlowService, port: int = 8090):
 
 # ============ MCP MODE ============
 
+def _format_recall_results(header: str, results: list[dict]) -> str:
+    """Render recall results as text for an MCP client."""
+    text = f"{header}:\n"
+    for r in results[:7]:
+        source = r.get("source", "unknown")
+        content = r.get("content", str(r))[:400]
+        url = r.get("url", "")
+        text += f"\n[{source}] {content}"
+        if url:
+            text += f"\n  Link: {url}"
+        text += "\n"
+    return text
+
+
+def _progress_token(server):
+    """Progress token of the MCP request being handled, if the client sent one."""
+    try:
+        meta = server.request_context.meta
+        return meta.progressToken if meta else None
+    except (AttributeError, LookupError):
+        return None
+
+
+async def _send_progress(server, token, progress: float, message: str) -> None:
+    """Send a progress notification; partial results must never fail the tool."""
+    try:
+        session = server.request_context.session
+        try:
+            await session.send_progress_notification(token, progress, message=message)
+        except TypeError:
+            # Older mcp releases have no message field
+            await session.send_progress_notification(token, progress)
+    except Exception as e:
+        log(f"MCP progress notification failed: {e}", "DEBUG")
+
 def create_mcp_server(service: FlowService):
     """Create MCP server with tools configured."""
     from mcp.server import Server
@@ -1479,7 +1798,11 @@ def create_mcp_server(service: FlowService):
                 inputSchema={
                     "type": "object",
                     "properties": {
-                        "query": {"type": "string", "description": "What to search for"}
+                        "query": {"type": "string", "description": "What to search for"},
+                        "deadline_ms": {
+                            "type": "integer",
+                            "description": "Latency budget for cloud and Linear results; slower sources are skipped",
+                        },
                     },
                     "required": ["query"]
                 }
@@ -1564,22 +1887,34 @@ def create_mcp_server(service: FlowService):
     async def call_tool(name: str, arguments: dict):
         try:
             if name == "flow_recall":
-                result = await service.recall_context(arguments["query"])
+                # Local hits arrive first; remote tiers follow as progress
+                # notifications when the client asked for progress
+                progress_token = _progress_token(server)
+                result = None
+                tiers_done = 0
+                async for event in service.recall_stream(
+                    arguments["query"], deadline_ms=arguments.get("deadline_ms"),
+                ):
+                    if event["tier"] == "final":
+                        result = event
+                    elif progress_token is not None:
+                        tiers_done += 1
+                        header = f"{event['tier']}: {len(event['results'])} results"
+                        if event.get("status", "ok") != "ok":
+                            header += f" ({event['status']})"
+                        await _send_progress(
+                            server, progress_token, tiers_done,
+                            _format_recall_results(header, event["results"]),
+                        )
                 sources = {}
                 for r in result["results"]:
                     src = r.get("source", "unknown")
                     sources[src] = sources.get(src, 0) + 1
                 source_summary = ", ".join(f"{v} from {k}" for k, v in sources.items())
-                text = f"Found {len(result['results'])} results for '{result['query']}' ({source_summary}):\n"
-                for r in result["results"][:7]:
-                    source = r.get("source", "unknown")
-                    content = r.get("content", str(r))[:400]
-                    url = r.get("url", "")
-                    text += f"\n[{source}] {content}"
-                    if url:
-                        text += f"\n  Link: {url}"
-                    text += "\n"
-                return [TextContent(type="text", text=text)]
+                header = f"Found {len(result['results'])} results for '{result['query']}' ({source_summary})"
+                if result["timed_out"]:
+                    header += f" [timed out: {', '.join(result['timed_out'])}]"
+                return [TextContent(type="text", text=_format_recall_results(header, result["results"]))]
 
             elif name == "flow_capture":
                 result = await service.capture_context(
@@ -1699,8 +2034,12 @@ async def run_mcp(service: FlowService):
 
     server = create_mcp_server(service)
 
-    async with stdio_server() as (read, write):
-        await server.run(read, write, server.create_initialization_options())
+    service.start_outbox()
+    try:
+        async with stdio_server() as (read, write):
+            await server.run(read, write, server.create_initialization_options())
+    finally:
+        await service.stop_outbox()
 
 
 async def run_mcp_http(service: FlowService, port: int = 8091):
@@ -1742,7 +2081,11 @@ async def run_mcp_http(service: FlowService, port: int = 8091):
 
     config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="info")
     server_instance = uvicorn.Server(config)
-    await server_instance.serve()
+    service.start_outbox()
+    try:
+        await server_instance.serve()
+    finally:
+        await service.stop_outbox()
 
 
 # ============ COMBINED MODE ============
@@ -1751,11 +2094,16 @@ async def run_combined(service: FlowService, port: int = 8090):
     """Run daemon + HTTP API together."""
     daemon = DaemonMode(service)
 
-    # Run both concurrently
-    await asyncio.gather(
-        daemon.watch_loop(),
-        run_api(service, port),
-    )
+    # Daemon and API share one pooled Backboard client
+    await service.backboard.open_client()
+    try:
+        # Run both concurrently
+        await asyncio.gather(
+            daemon.watch_loop(),
+            run_api(service, port),
+        )
+    finally:
+        await service.backboard.close_client()
 
 
 # ============ PROCESS MANAGEMENT ============
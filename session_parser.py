@@ -2,17 +2,146 @@
 
 Reads JSONL session transcripts and extracts conversation content
 for analysis by Cerebras.
+
+Transcript lines are decoded with the fastest available backend: msgspec
+typed structs (fields the parser never reads, such as tool-result bodies,
+are skipped without being materialized), then orjson, then the stdlib.
+Lines without a "user"/"assistant" value are rejected by a byte-level
+pre-check before any decoding. See scripts/benchmark_session_parsing.py.
 """
 import json
 import os
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
 from datetime import datetime
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, Optional, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    msgspec = None
+    HAS_MSGSPEC = False
 
 
 # Claude Code stores sessions here
 CLAUDE_PROJECTS_DIR = Path.home() / ".claude" / "projects"
 
+# Bytes read per chunk when tailing a transcript
+TAIL_CHUNK_BYTES = 1 << 20
+
+# In-memory context window kept per tailed session (for extraction prompts)
+CONTEXT_MESSAGES = int(os.environ.get("FLOW_GUARDIAN_CONTEXT_MESSAGES", "50"))
+CONTEXT_CHARS = int(os.environ.get("FLOW_GUARDIAN_CONTEXT_CHARS", "30000"))
+
+# Characters kept per message in conversation text
+MESSAGE_CHARS = 2000
+
+# Bytes read back from the saved offset to refill the window after a restart
+CONTEXT_PRIME_BYTES = 256 * 1024
+
+# Cached tailers (each holds a context window): at most MAX_TAILERS, and
+# dropped after TAILER_IDLE_SECONDS unused or once their file is rotated
+# or deleted
+MAX_TAILERS = int(os.environ.get("FLOW_GUARDIAN_MAX_TAILERS", "32"))
+TAILER_IDLE_SECONDS = float(os.environ.get("FLOW_GUARDIAN_TAILER_IDLE_SECONDS", "3600"))
+
+
+# ============ DECODING ============
+
+def _skippable(raw: bytes) -> bool:
+    """
+    Cheap check for lines that cannot yield a message.
+
+    A message needs a "user" or "assistant" type or role. Quotes inside
+    JSON strings are escaped, so a substring search on the raw bytes only
+    matches real keys and values; on message lines it stops within the
+    first few hundred bytes. Non-message lines (snapshots, summaries,
+    progress events) are rejected without being decoded.
+    """
+    return b'"user"' not in raw and b'"assistant"' not in raw
+
+
+def _decode_stdlib(raw: bytes) -> Optional[dict]:
+    try:
+        entry = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _decode_orjson(raw: bytes) -> Optional[dict]:
+    try:
+        entry = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+if HAS_MSGSPEC:
+    class _Block(msgspec.Struct, omit_defaults=True):
+        type: Optional[str] = None
+        text: Optional[str] = None
+        name: Optional[str] = None
+
+    class _Message(msgspec.Struct, omit_defaults=True):
+        role: Optional[str] = None
+        content: Union[str, list[Union[str, _Block]], None] = None
+
+    class _Entry(msgspec.Struct, omit_defaults=True):
+        type: Optional[str] = None
+        message: Optional[_Message] = None
+        cwd: Optional[str] = None
+        gitBranch: Optional[str] = None
+        sessionId: Optional[str] = None
+
+    _entry_decoder = msgspec.json.Decoder(_Entry)
+
+    def _decode_msgspec(raw: bytes) -> Optional[dict]:
+        try:
+            entry = msgspec.to_builtins(_entry_decoder.decode(raw))
+        except msgspec.ValidationError:
+            # Valid JSON in an unexpected shape: decode it generically
+            return _decode_orjson(raw) if HAS_ORJSON else _decode_stdlib(raw)
+        except msgspec.DecodeError:
+            return None
+        # Blocks without a type decode to {}; the parser ignores them either way
+        return entry
+
+
+_DECODERS = {"json": _decode_stdlib}
+if HAS_ORJSON:
+    _DECODERS["orjson"] = _decode_orjson
+if HAS_MSGSPEC:
+    _DECODERS["msgspec"] = _decode_msgspec
+
+JSON_BACKEND = next(name for name in ("msgspec", "orjson", "json") if name in _DECODERS)
+_decode = _DECODERS[JSON_BACKEND]
+
+
+def decode_entry(raw: bytes) -> Optional[dict]:
+    """
+    Decode one transcript line for message extraction.
+
+    Args:
+        raw: Line bytes
+
+    Returns:
+        Entry dict, or None for invalid JSON and lines that cannot yield a
+        message (rejected before decoding)
+    """
+    if _skippable(raw):
+        return None
+    return _decode(raw)
+
 
 def get_project_dir(cwd: str) -> Path:
     """Convert a working directory to its Claude Code project path."""
@@ -47,6 +176,53 @@ def get_session_path(project_dir: Path, session_id: str) -> Path:
     return project_dir / f"{session_id}.jsonl"
 
 
+def _message_from_entry(entry: dict, line: int) -> Optional[dict]:
+    """Convert a transcript entry to a message dict, or None if it has no text."""
+    # Skip non-message entries
+    if entry.get("type") not in ("user", "assistant"):
+        # Check if it has a message field
+        if "message" not in entry:
+            return None
+
+    message = entry.get("message", {})
+    role = message.get("role") or entry.get("type")
+
+    if role not in ("user", "assistant"):
+        return None
+
+    # Extract content
+    content = message.get("content", "")
+    if isinstance(content, list):
+        # Handle structured content (text blocks, tool_use, etc.)
+        text_parts = []
+        for block in content:
+            if isinstance(block, dict):
+                if block.get("type") == "text":
+                    text_parts.append(block.get("text", ""))
+                elif block.get("type") == "tool_use":
+                    # Summarize tool use
+                    tool_name = block.get("name", "unknown")
+                    text_parts.append(f"[Used tool: {tool_name}]")
+                elif block.get("type") == "tool_result":
+                    # Skip detailed tool results
+                    pass
+            elif isinstance(block, str):
+                text_parts.append(block)
+        content = "\n".join(text_parts)
+
+    if not isinstance(content, str) or not content.strip():
+        return None
+
+    return {
+        "line": line,
+        "role": role,
+        "content": content,
+        "session_id": entry.get("sessionId"),
+        "cwd": entry.get("cwd"),
+        "branch": entry.get("gitBranch"),
+    }
+
+
 def parse_session_messages(session_path: Path, since_line: int = 0) -> Iterator[dict]:
     """
     Parse messages from a session file.
@@ -61,80 +237,42 @@ def parse_session_messages(session_path: Path, since_line: int = 0) -> Iterator[
     if not session_path.exists():
         return
 
-    with open(session_path) as f:
+    with open(session_path, "rb") as f:
         for i, line in enumerate(f):
             if i < since_line:
                 continue
 
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
+            entry = decode_entry(line)
+            if entry is None:
                 continue
 
-            # Skip non-message entries
-            if entry.get("type") not in ("user", "assistant"):
-                # Check if it has a message field
-                if "message" not in entry:
-                    continue
+            message = _message_from_entry(entry, i)
+            if message:
+                yield message
 
-            message = entry.get("message", {})
-            role = message.get("role") or entry.get("type")
 
-            if role not in ("user", "assistant"):
-                continue
+def _format_message(msg: dict) -> str:
+    role = "Human" if msg["role"] == "user" else "Assistant"
+    return f"{role}: {msg['content'][:MESSAGE_CHARS]}"  # Truncate long messages
 
-            # Extract content
-            content = message.get("content", "")
-            if isinstance(content, list):
-                # Handle structured content (text blocks, tool_use, etc.)
-                text_parts = []
-                for block in content:
-                    if isinstance(block, dict):
-                        if block.get("type") == "text":
-                            text_parts.append(block.get("text", ""))
-                        elif block.get("type") == "tool_use":
-                            # Summarize tool use
-                            tool_name = block.get("name", "unknown")
-                            text_parts.append(f"[Used tool: {tool_name}]")
-                        elif block.get("type") == "tool_result":
-                            # Skip detailed tool results
-                            pass
-                    elif isinstance(block, str):
-                        text_parts.append(block)
-                content = "\n".join(text_parts)
-
-            if not content or not content.strip():
-                continue
 
-            yield {
-                "line": i,
-                "role": role,
-                "content": content,
-                "session_id": entry.get("sessionId"),
-                "cwd": entry.get("cwd"),
-                "branch": entry.get("gitBranch"),
-            }
-
-
-def get_conversation_text(session_path: Path, since_line: int = 0, max_chars: int = 50000) -> tuple[str, int]:
+def format_conversation(messages: Iterable[dict], max_chars: int = 50000) -> tuple[str, int]:
     """
-    Get conversation as plain text for analysis.
+    Format parsed messages as plain text for analysis.
 
     Args:
-        session_path: Path to session JSONL
-        since_line: Start from this line
+        messages: Message dicts from parse_session_messages or SessionTailer
         max_chars: Maximum characters to return
 
     Returns:
-        Tuple of (conversation_text, last_line_processed)
+        Tuple of (conversation_text, line of the last message included)
     """
     lines = []
-    last_line = since_line
+    last_line = None
     total_chars = 0
 
-    for msg in parse_session_messages(session_path, since_line):
-        role = "Human" if msg["role"] == "user" else "Assistant"
-        text = f"{role}: {msg['content'][:2000]}"  # Truncate long messages
+    for msg in messages:
+        text = _format_message(msg)
 
         if total_chars + len(text) > max_chars:
             break
@@ -146,6 +284,276 @@ def get_conversation_text(session_path: Path, since_line: int = 0, max_chars: in
     return "\n\n".join(lines), last_line
 
 
+def get_conversation_text(session_path: Path, since_line: int = 0, max_chars: int = 50000) -> tuple[str, int]:
+    """
+    Get conversation as plain text for analysis.
+
+    Args:
+        session_path: Path to session JSONL
+        since_line: Start from this line
+        max_chars: Maximum characters to return
+
+    Returns:
+        Tuple of (conversation_text, last_line_processed)
+    """
+    text, last_line = format_conversation(parse_session_messages(session_path, since_line), max_chars)
+    return text, since_line if last_line is None else last_line
+
+
+# ============ INCREMENTAL TAILING ============
+
+class ContextWindow:
+    """Ring buffer of the most recent messages of a session.
+
+    Bounded both by message count and by formatted characters; the oldest
+    messages fall out first. Messages are stored formatted (role prefix,
+    content truncated to MESSAGE_CHARS), ready for a prompt.
+    """
+
+    def __init__(self, max_messages: int = CONTEXT_MESSAGES, max_chars: int = CONTEXT_CHARS):
+        self.max_messages = max_messages
+        self.max_chars = max_chars
+        self.chars = 0
+        self._texts: deque[str] = deque()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def append(self, message: dict) -> None:
+        text = _format_message(message)
+        self._texts.append(text)
+        self.chars += len(text)
+        # Always keep the newest message, even if it alone exceeds max_chars
+        while len(self._texts) > 1 and (len(self._texts) > self.max_messages or self.chars > self.max_chars):
+            self.chars -= len(self._texts.popleft())
+
+    def extend(self, messages: Iterable[dict]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def clear(self) -> None:
+        self._texts.clear()
+        self.chars = 0
+
+    def text(self, max_chars: Optional[int] = None, max_tokens: Optional[int] = None) -> str:
+        """
+        The window as conversation text, oldest first.
+
+        Args:
+            max_chars: Tighter character budget; the newest messages are kept
+            max_tokens: Token budget (see tokens.py); the newest messages are kept
+
+        Returns:
+            Messages joined by blank lines
+        """
+        if max_tokens is not None:
+            import tokens
+            size = tokens.count_tokens
+            budget = max_tokens
+        elif max_chars is not None and self.chars > max_chars:
+            size = len
+            budget = max_chars
+        else:
+            return "\n\n".join(self._texts)
+        kept, total = [], 0
+        for text in reversed(self._texts):
+            cost = size(text)
+            if kept and total + cost > budget:
+                break
+            kept.append(text)
+            total += cost
+        return "\n\n".join(reversed(kept))
+
+
+class SessionTailer:
+    """Incremental reader for one growing session transcript.
+
+    Remembers the byte offset and line number it has consumed, so each call
+    to read_new() seeks straight to data appended since the previous call.
+    A partially written last line is left for the next call. If the file is
+    replaced (new inode) or truncated below the saved offset, reading
+    restarts from the beginning.
+
+    Session metadata (cwd, branch, session_id) is captured from message
+    entries as they stream past, and the newest messages are kept in a
+    ContextWindow, so callers never rescan the file for either.
+    """
+
+    def __init__(self, session_path: Path, context: Optional[ContextWindow] = None):
+        self.path = Path(session_path)
+        self.offset = 0
+        self.line = 0
+        self.inode: Optional[int] = None
+        self.metadata: dict = {}
+        self.resets = 0
+        self.context = context if context is not None else ContextWindow()
+        self.last_used = time.monotonic()
+
+    def position(self) -> dict:
+        """Resumable position, for persisting in daemon state."""
+        return {
+            "offset": self.offset,
+            "last_line": self.line,
+            "inode": self.inode,
+            "metadata": dict(self.metadata),
+        }
+
+    def restore(self, state: dict) -> None:
+        """
+        Resume from a saved position.
+
+        State written before byte offsets were tracked only has "last_line";
+        those lines are skipped once to recover the offset.
+        """
+        self.metadata = dict(state.get("metadata") or {})
+        self.inode = state.get("inode")
+        if state.get("offset") is not None:
+            self.offset = state["offset"]
+            self.line = state.get("last_line", 0)
+            self._prime_context()
+        elif state.get("last_line"):
+            self._skip_lines(state["last_line"])
+
+    def _prime_context(self) -> None:
+        """Refill the context window from the data just before the offset."""
+        if not self.offset or not self.path.exists():
+            return
+        start = max(0, self.offset - CONTEXT_PRIME_BYTES)
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(self.offset - start)
+        lines = data.split(b"\n")[:-1]
+        if start > 0:
+            lines = lines[1:]  # first line is cut off
+        for raw in lines:
+            entry = decode_entry(raw)
+            message = _message_from_entry(entry, None) if entry else None
+            if message:
+                self.context.append(message)
+
+    def _skip_lines(self, count: int) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if self.line >= count or not raw.endswith(b"\n"):
+                    break
+                entry = decode_entry(raw)
+                if entry:
+                    self._note_metadata(entry)
+                    message = _message_from_entry(entry, self.line)
+                    if message:
+                        self.context.append(message)
+                self.offset += len(raw)
+                self.line += 1
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.line = 0
+        self.metadata = {}
+        self.context.clear()
+        self.resets += 1
+
+    def _note_metadata(self, entry: dict) -> None:
+        for key, field in (("cwd", "cwd"), ("branch", "gitBranch"), ("session_id", "sessionId")):
+            if entry.get(field):
+                self.metadata[key] = entry[field]
+
+    def read_new(self) -> list[dict]:
+        """
+        Read messages appended since the last call.
+
+        Returns:
+            Message dicts (same shape as parse_session_messages), oldest first
+        """
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return []
+
+        if (self.inode is not None and stat.st_ino != self.inode) or stat.st_size < self.offset:
+            self._reset()  # rotated or truncated
+        self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return []
+
+        messages = []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            pending = b""
+            while True:
+                chunk = f.read(TAIL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                pending += chunk
+                end = pending.rfind(b"\n")
+                if end < 0:
+                    continue
+                complete, pending = pending[:end + 1], pending[end + 1:]
+                for raw in complete.split(b"\n")[:-1]:
+                    line = self.line
+                    self.line += 1
+                    entry = decode_entry(raw)
+                    if entry is None:
+                        continue
+                    self._note_metadata(entry)
+                    message = _message_from_entry(entry, line)
+                    if message:
+                        messages.append(message)
+                        self.context.append(message)
+                self.offset += len(complete)
+        return messages
+
+
+# Least recently used first
+_tailers: OrderedDict[Path, SessionTailer] = OrderedDict()
+
+
+def _is_stale(tailer: SessionTailer, now: float) -> bool:
+    """True if a cached tailer's file is gone or replaced, or it sat idle too long."""
+    if now - tailer.last_used > TAILER_IDLE_SECONDS:
+        return True
+    try:
+        inode = tailer.path.stat().st_ino
+    except OSError:
+        return True
+    return tailer.inode is not None and inode != tailer.inode
+
+
+def _evict_stale_tailers(now: float) -> None:
+    for path in [path for path, tailer in _tailers.items() if _is_stale(tailer, now)]:
+        del _tailers[path]
+
+
+def tail_session(session_path: Path, state: Optional[dict] = None) -> SessionTailer:
+    """
+    Get the tailer for a session, reusing the one from the previous pass.
+
+    Args:
+        session_path: Path to the session JSONL
+        state: Saved position (from SessionTailer.position()); a cached
+               tailer that disagrees with it is replaced
+
+    Returns:
+        SessionTailer positioned after the data already processed
+    """
+    session_path = Path(session_path)
+    state = state or {}
+    now = time.monotonic()
+    _evict_stale_tailers(now)
+    tailer = _tailers.get(session_path)
+    saved_offset = state.get("offset")
+    if tailer is None or (saved_offset is not None and saved_offset != tailer.offset) \
+            or (saved_offset is None and state.get("last_line", 0) != tailer.line):
+        tailer = _tailers[session_path] = SessionTailer(session_path)
+        tailer.restore(state)
+    tailer.last_used = now
+    _tailers.move_to_end(session_path)
+    while len(_tailers) > MAX_TAILERS:
+        _tailers.popitem(last=False)
+    return tailer
+
+
 def find_all_sessions(cwd: str) -> list[dict]:
     """Find all sessions for a project directory."""
     project_dir = get_project_dir(cwd)
@@ -0,0 +1,331 @@
+"""Event-driven watcher for Claude Code session transcripts.
+
+The daemon used to walk every project under ~/.claude/projects every
+POLL_INTERVAL seconds, globbing and stat-ing every transcript just to find
+the newest one per project. SessionWatcher instead reports which session
+files were appended to, as soon as it happens, for every session that is
+active at the same time.
+
+Backends, picked in this order (FLOW_GUARDIAN_WATCHER forces one):
+- inotify: Linux kernel notifications read on the asyncio loop (no
+  dependencies); a watch per project directory
+- watchdog: the watchdog package's native observer (macOS, Windows), if
+  installed
+- poll: compare file sizes and mtimes every poll interval (the fallback when
+  neither is available or the projects directory does not exist yet)
+"""
+import asyncio
+import ctypes
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    HAS_WATCHDOG = False
+
+
+# ============ CONFIGURATION ============
+
+POLL_INTERVAL = 10
+
+# Appends arriving within this window are reported together
+DEBOUNCE_SECONDS = 0.2
+
+# Sessions modified this recently count as active at startup
+ACTIVE_WINDOW = 3600
+
+# auto, inotify, watchdog or poll
+BACKEND = os.environ.get("FLOW_GUARDIAN_WATCHER", "auto")
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_ROOT_MASK = _IN_CREATE | _IN_MOVED_TO | _IN_ONLYDIR
+_PROJECT_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_CREATE | _IN_MOVED_TO
+_EVENT = struct.Struct("iIII")
+
+
+# ============ HELPERS ============
+
+def is_session_file(path: Path, root: Path) -> bool:
+    """True for <root>/<project>/<session>.jsonl."""
+    return path.suffix == ".jsonl" and path.parent.parent == root
+
+
+def list_session_files(root: Path) -> list[Path]:
+    """All session transcripts under the projects directory."""
+    if not root.is_dir():
+        return []
+    return [
+        path
+        for project_dir in root.iterdir() if project_dir.is_dir()
+        for path in project_dir.glob("*.jsonl")
+    ]
+
+
+def _snapshot(root: Path) -> dict[Path, tuple[int, int]]:
+    """(size, mtime_ns) of every session file."""
+    snapshot = {}
+    for path in list_session_files(root):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    """Forwards watchdog events from its observer thread to the event loop."""
+
+    def __init__(self, watcher: "SessionWatcher", loop: asyncio.AbstractEventLoop):
+        self.watcher = watcher
+        self.loop = loop
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        path = Path(getattr(event, "dest_path", "") or event.src_path)
+        if is_session_file(path, self.watcher.root):
+            self.loop.call_soon_threadsafe(self.watcher._notify, path)
+
+
+# ============ WATCHER ============
+
+class SessionWatcher:
+    """Reports session files that changed since the last call to changes()."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        poll_interval: float = POLL_INTERVAL,
+        debounce: float = DEBOUNCE_SECONDS,
+        backend: Optional[str] = None,
+    ):
+        """
+        Args:
+            root: Claude Code projects directory (default: session_parser.CLAUDE_PROJECTS_DIR)
+            poll_interval: Seconds between scans for the poll backend
+            debounce: Seconds to wait for more appends after the first event
+            backend: Force a backend (default: BACKEND)
+        """
+        if root is None:
+            import session_parser
+            root = session_parser.CLAUDE_PROJECTS_DIR
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.requested = backend or BACKEND
+        self.backend: Optional[str] = None
+        self.stats = {"events": 0, "scans": 0}
+
+        self._changed: set[Path] = set()
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._snapshot: dict[Path, tuple[int, int]] = {}
+        self._fd: Optional[int] = None
+        self._wds: dict[int, Path] = {}
+        self._libc = None
+        self._observer = None
+
+    # ---- Lifecycle ----
+
+    async def start(self) -> str:
+        """
+        Start watching with the best available backend.
+
+        Returns:
+            Name of the backend in use
+        """
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+        candidates = ["inotify", "watchdog", "poll"] if self.requested == "auto" else [self.requested, "poll"]
+        for name in candidates:
+            if name != "poll" and not self.root.is_dir():
+                continue
+            try:
+                if name == "inotify" and sys.platform.startswith("linux"):
+                    self._start_inotify()
+                elif name == "watchdog" and HAS_WATCHDOG:
+                    self._start_watchdog()
+                elif name == "poll":
+                    self._snapshot = _snapshot(self.root)
+                else:
+                    continue
+            except OSError as e:
+                self.stats["fallback_reason"] = f"{name}: {e}"
+                self._close_inotify()
+                continue
+            self.backend = name
+            break
+        return self.backend
+
+    async def stop(self) -> None:
+        """Release the kernel watches / observer thread."""
+        self._close_inotify()
+        if self._observer is not None:
+            self._observer.stop()
+            await asyncio.to_thread(self._observer.join, 5)
+            self._observer = None
+
+    async def __aenter__(self) -> "SessionWatcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    # ---- Queries ----
+
+    def recent_sessions(self, window: float = ACTIVE_WINDOW) -> set[Path]:
+        """
+        Session files modified within the last `window` seconds.
+
+        Used once at startup to pick up sessions that were active while
+        the watcher was not running.
+        """
+        cutoff = time.time() - window
+        recent = set()
+        for path in list_session_files(self.root):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    recent.add(path)
+            except OSError:
+                continue
+        return recent
+
+    async def changes(self, timeout: Optional[float] = None) -> set[Path]:
+        """
+        Wait for session files to change.
+
+        Args:
+            timeout: Maximum seconds to wait (default: poll_interval)
+
+        Returns:
+            Session files appended to or created since the previous call
+            (empty if nothing changed before the timeout)
+        """
+        timeout = self.poll_interval if timeout is None else timeout
+        if self.backend == "poll":
+            await asyncio.sleep(timeout)
+            self._poll()
+        else:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # A turn is written as several appends; report it once
+                await asyncio.sleep(self.debounce)
+
+        changed, self._changed = self._changed, set()
+        self._event.clear()
+        return {path for path in changed if path.exists()}
+
+    # ---- Backends ----
+
+    def _notify(self, path: Path) -> None:
+        self.stats["events"] += 1
+        self._changed.add(path)
+        self._event.set()
+
+    def _poll(self) -> None:
+        self.stats["scans"] += 1
+        snapshot = _snapshot(self.root)
+        for path, signature in snapshot.items():
+            if self._snapshot.get(path) != signature:
+                self._notify(path)
+        self._snapshot = snapshot
+
+    def _start_watchdog(self) -> None:
+        self._observer = Observer()
+        self._observer.schedule(_WatchdogHandler(self, self._loop), str(self.root), recursive=True)
+        self._observer.start()
+
+    def _start_inotify(self) -> None:
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+        self._add_watch(self.root, _ROOT_MASK)
+        for project_dir in self.root.iterdir():
+            if project_dir.is_dir():
+                self._add_watch(project_dir, _PROJECT_MASK)
+        self._loop.add_reader(fd, self._read_inotify)
+
+    def _add_watch(self, path: Path, mask: int) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        self._wds[wd] = path
+
+    def _close_inotify(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            self._loop.remove_reader(self._fd)
+        except (ValueError, RuntimeError):
+            pass
+        os.close(self._fd)
+        self._fd = None
+        self._wds.clear()
+
+    def _read_inotify(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except (BlockingIOError, OSError):
+            return
+
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0"))
+            offset += _EVENT.size + length
+
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped: treat every recently active session as changed
+                for path in self.recent_sessions():
+                    self._notify(path)
+                continue
+            if mask & _IN_IGNORED:
+                self._wds.pop(wd, None)
+                continue
+
+            directory = self._wds.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+
+            if mask & _IN_ISDIR:
+                if directory == self.root:
+                    # New project: watch it, and report sessions written before the watch existed
+                    try:
+                        self._add_watch(path, _PROJECT_MASK)
+                    except OSError:
+                        continue
+                    for session in path.glob("*.jsonl"):
+                        self._notify(session)
+            elif is_session_file(path, self.root):
+                self._notify(path)
@@ -0,0 +1,111 @@
+"""Shared SQLite plumbing for the on-disk response caches.
+
+completion_cache and recall_cache each keep their entries in a SQLite file
+shared by every process (CLI hooks, daemon, API), with persistent hit/miss
+counters so /status can report a cross-process hit rate. This module holds
+the parts they have in common:
+
+- One connection per thread and database, opened (and the schema created)
+  on first use instead of on every lookup
+- run(): one transaction on that connection, with SQLite errors turned
+  into a default value so a broken cache never fails the caller
+- The counters table and the clear/stats helpers
+
+The connections block, so async code calls the caches through
+asyncio.to_thread().
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+
+COUNTERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_local = threading.local()
+
+
+def _conns() -> dict[str, sqlite3.Connection]:
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    return conns
+
+
+def connect(path: Path, schema: str) -> sqlite3.Connection:
+    """
+    Get this thread's connection to a cache database.
+
+    Args:
+        path: Database file (created on first use)
+        schema: Entry table DDL, run once per connection with the counters table
+
+    Returns:
+        Open connection, reused by later calls on this thread
+    """
+    conns = _conns()
+    key = str(path)
+    conn = conns.get(key)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(key, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(schema + COUNTERS_SCHEMA)
+        conns[key] = conn
+    return conn
+
+
+def run(path: Path, schema: str, operation: Callable[[sqlite3.Connection], Any], default: Any = None) -> Any:
+    """
+    Run operation(conn) in one transaction on this thread's connection.
+
+    Args:
+        path: Database file
+        schema: Entry table DDL (see connect())
+        operation: Called with the connection; its result is returned
+        default: Returned instead when SQLite raises
+
+    Returns:
+        The operation's result, or default on a SQLite error
+    """
+    try:
+        conn = connect(path, schema)
+        with conn:
+            return operation(conn)
+    except sqlite3.Error:
+        # Reconnect next time in case the connection itself is broken
+        conn = _conns().pop(str(path), None)
+        if conn is not None:
+            conn.close()
+        return default
+
+
+def bump(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+    """Add to a persistent counter."""
+    conn.execute(
+        "INSERT INTO counters (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        (name, amount),
+    )
+
+
+def clear(conn: sqlite3.Connection) -> None:
+    """Remove all entries and reset counters."""
+    conn.execute("DELETE FROM entries")
+    conn.execute("DELETE FROM counters")
+
+
+def counters(conn: sqlite3.Connection) -> dict[str, int]:
+    """All persistent counters by name."""
+    return dict(conn.execute("SELECT name, value FROM counters"))
+
+
+def hit_rate(stats: dict) -> float:
+    """Share of lookups that were hits, from "hits" and "misses" counts."""
+    lookups = stats["hits"] + stats["misses"]
+    return round(stats["hits"] / lookups, 3) if lookups else 0.0
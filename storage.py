@@ -0,0 +1,620 @@
+"""Storage backends for Flow Guardian's local memory.
+
+memory.py is the public API; this module holds the engines behind it.
+
+Backends:
+- JSONBackend: the original layout (learnings.json + sessions/index.json),
+  rewritten atomically on every insert. Default for compatibility.
+- SQLiteBackend: a single WAL-mode database with O(1) appends and indexed
+  lookups by id, branch, timestamp and tag.
+
+Both backends return records newest-first, matching the JSON layout.
+Paging is keyset-based on each record's insertion sequence (seq): a page
+holds the records with seq below the cursor, so deep pages cost the same as
+the first one (in SQLite every filter has a (filter, seq) index). In the
+JSON layout seq is a record's position counted from the oldest entry.
+
+The JSON backend keeps a process-wide cache of parsed files keyed on
+(mtime, size, inode), so repeated reads skip json.load until some process
+(daemon, CLI, API) rewrites the file. Cached records are never handed out:
+callers get copies of the records they read, and writes cache a copy of
+what they were given.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+# ============ JSON HELPERS ============
+
+def atomic_write_json(filepath: Path, data: dict | list) -> None:
+    """
+    Atomically write data to a JSON file.
+    Writes to a temp file first, then renames to prevent corruption.
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to temp file in same directory (ensures same filesystem for rename)
+    fd, temp_path = tempfile.mkstemp(
+        dir=filepath.parent,
+        prefix=".tmp_",
+        suffix=".json"
+    )
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+        # Atomic rename
+        shutil.move(temp_path, filepath)
+    except Exception:
+        # Clean up temp file on error
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def safe_read_json(filepath: Path, default: dict | list) -> dict | list:
+    """
+    Safely read a JSON file, returning default on error.
+    """
+    try:
+        if filepath.exists():
+            with open(filepath, 'r') as f:
+                return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        # Log warning but don't crash
+        print(f"Warning: Could not read {filepath}: {e}")
+    return default
+
+
+# ============ READ CACHE ============
+
+# path -> (stat key, snapshot of the file's records)
+_read_cache: dict[str, tuple[tuple, tuple]] = {}
+_cache_lock = threading.Lock()
+_cache_counters = {"hits": 0, "misses": 0}
+
+
+def _stat_key(filepath: Path) -> Optional[tuple]:
+    """Identity of a file's current contents: (mtime_ns, size, inode)."""
+    try:
+        st = filepath.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _copy_record(record):
+    """Copy of a record down to its list and dict fields (tags, context)."""
+    if not isinstance(record, dict):
+        return record
+    return {k: v.copy() if isinstance(v, (list, dict)) else v for k, v in record.items()}
+
+
+def _copy_records(records) -> list:
+    return [_copy_record(record) for record in records]
+
+
+def _snapshot(filepath: Path) -> tuple:
+    """
+    Records of a JSON array through the process-wide cache.
+
+    The parsed snapshot is reused while the file's (mtime, size, inode) is
+    unchanged. Atomic writes always replace the inode, so a write from any
+    process invalidates the entry. The records are shared with the cache:
+    copy any that leave this module (_copy_record).
+    """
+    key = _stat_key(filepath)
+    cache_key = str(filepath)
+    with _cache_lock:
+        cached = _read_cache.get(cache_key)
+        if key is not None and cached is not None and cached[0] == key:
+            _cache_counters["hits"] += 1
+            return cached[1]
+        _cache_counters["misses"] += 1
+
+    data = safe_read_json(filepath, [])
+    snapshot = tuple(data) if isinstance(data, list) else ()
+    if key is not None:
+        with _cache_lock:
+            _read_cache[cache_key] = (key, snapshot)
+    return snapshot
+
+
+def cached_read_list(filepath: Path) -> list:
+    """Read a JSON array through the process-wide cache, as copied records."""
+    return _copy_records(_snapshot(filepath))
+
+
+def write_cached_list(filepath: Path, data: list) -> None:
+    """Atomically write a JSON array and prime the cache with a copy of it."""
+    atomic_write_json(filepath, data)
+    key = _stat_key(filepath)
+    with _cache_lock:
+        if key is None:
+            _read_cache.pop(str(filepath), None)
+        else:
+            _read_cache[str(filepath)] = (key, tuple(_copy_records(data)))
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters for the JSON read cache."""
+    with _cache_lock:
+        hits = _cache_counters["hits"]
+        misses = _cache_counters["misses"]
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "entries": len(_read_cache),
+        }
+
+
+def clear_read_cache() -> None:
+    """Drop all cached files and reset counters."""
+    with _cache_lock:
+        _read_cache.clear()
+        _cache_counters["hits"] = 0
+        _cache_counters["misses"] = 0
+
+
+def _index_entry(session: dict) -> dict:
+    """Build the sessions index entry for a full session record."""
+    return {
+        "id": session["id"],
+        "timestamp": session["timestamp"],
+        "branch": session.get("git", {}).get("branch") or session.get("branch", "unknown"),
+        "summary": session.get("context", {}).get("summary") or session.get("summary", ""),
+        "file": f"{session['id']}.json"
+    }
+
+
+def _matches(learning: dict, team: Optional[bool], tag: Optional[str], since: Optional[str]) -> bool:
+    """Check a learning against the optional team/tag/since filters."""
+    if team is not None and learning.get("team", False) != team:
+        return False
+    if tag is not None and tag not in learning.get("tags", []):
+        return False
+    if since is not None and (learning.get("timestamp") or "") < since:
+        return False
+    return True
+
+
+def _page(records: list[dict], limit: int, before: Optional[int], offset: int,
+          predicate=None) -> list[tuple[int, dict]]:
+    """
+    One keyset page of a newest-first JSON array.
+
+    The record at position i has seq len(records) - i, so without a filter
+    the page is a direct slice.
+    """
+    total = len(records)
+    start = 0 if before is None else max(total - before + 1, 0)
+    if predicate is None:
+        start += offset
+        return [(total - i, records[i]) for i in range(start, min(start + limit, total))]
+
+    page = []
+    for i in range(start, total):
+        if predicate(records[i]):
+            if offset:
+                offset -= 1
+                continue
+            page.append((total - i, records[i]))
+            if len(page) == limit:
+                break
+    return page
+
+
+# ============ JSON BACKEND ============
+
+class JSONBackend:
+    """Original file layout: whole-file JSON arrays rewritten on each insert."""
+
+    name = "json"
+
+    def __init__(self, sessions_dir: Path, sessions_index: Path, learnings_file: Path):
+        self.sessions_dir = sessions_dir
+        self.sessions_index = sessions_index
+        self.learnings_file = learnings_file
+
+    def init(self) -> None:
+        """Create the index and learnings files if missing."""
+        if not self.sessions_index.exists():
+            atomic_write_json(self.sessions_index, [])
+        if not self.learnings_file.exists():
+            atomic_write_json(self.learnings_file, [])
+
+    # ---- Sessions ----
+
+    def _read_index(self) -> tuple:
+        return _snapshot(self.sessions_index)
+
+    def save_session(self, session: dict) -> None:
+        atomic_write_json(self.sessions_dir / f"{session['id']}.json", session)
+
+        index = [s for s in self._read_index() if s.get("id") != session["id"]]
+        index.insert(0, _index_entry(session))
+        write_cached_list(self.sessions_index, index)
+
+    def load_session(self, session_id: str) -> Optional[dict]:
+        session_file = self.sessions_dir / f"{session_id}.json"
+        if session_file.exists():
+            result = safe_read_json(session_file, {})
+            if isinstance(result, dict) and result:
+                return result
+        return None
+
+    def list_sessions(self, limit: Optional[int] = None, branch: Optional[str] = None,
+                      since: Optional[str] = None) -> list[dict]:
+        index = self._read_index()
+        if branch:
+            index = [s for s in index if s.get("branch") == branch]
+        if since:
+            index = [s for s in index if (s.get("timestamp") or "") >= since]
+        return _copy_records(index[:limit] if limit is not None else index)
+
+    def count_sessions(self, branch: Optional[str] = None) -> int:
+        index = self._read_index()
+        if branch:
+            return sum(1 for s in index if s.get("branch") == branch)
+        return len(index)
+
+    def page_sessions(self, limit: int, branch: Optional[str] = None,
+                      before: Optional[int] = None, offset: int = 0) -> list[tuple[int, dict]]:
+        page = _page(self._read_index(), limit, before, offset,
+                     (lambda s: s.get("branch") == branch) if branch else None)
+        return [(seq, _copy_record(record)) for seq, record in page]
+
+    def load_sessions(self, session_ids: list[str]) -> dict[str, dict]:
+        sessions = {}
+        for session_id in session_ids:
+            session = self.load_session(session_id)
+            if session:
+                sessions[session_id] = session
+        return sessions
+
+    # ---- Learnings ----
+
+    def _read_learnings(self) -> tuple:
+        return _snapshot(self.learnings_file)
+
+    def save_learning(self, learning: dict) -> None:
+        write_cached_list(self.learnings_file, [learning, *self._read_learnings()])
+
+    def save_learnings(self, batch: list[dict]) -> None:
+        # One rewrite for the whole batch; the last item ends up newest
+        write_cached_list(self.learnings_file, [*reversed(batch), *self._read_learnings()])
+
+    def get_learning(self, learning_id: str) -> Optional[dict]:
+        for learning in self._read_learnings():
+            if learning.get("id") == learning_id:
+                return _copy_record(learning)
+        return None
+
+    def _filtered_learnings(self, team: Optional[bool], tag: Optional[str], since: Optional[str]):
+        learnings = self._read_learnings()
+        if team is not None or tag is not None or since is not None:
+            learnings = [item for item in learnings if _matches(item, team, tag, since)]
+        return learnings
+
+    def get_learnings(self, team: Optional[bool] = None, tag: Optional[str] = None,
+                      since: Optional[str] = None, limit: Optional[int] = None) -> list[dict]:
+        learnings = self._filtered_learnings(team, tag, since)
+        return _copy_records(learnings[:limit] if limit is not None else learnings)
+
+    def count_learnings(self, team: Optional[bool] = None, tag: Optional[str] = None) -> int:
+        return len(self._filtered_learnings(team, tag, None))
+
+    def page_learnings(self, limit: int, team: Optional[bool] = None, tag: Optional[str] = None,
+                       before: Optional[int] = None, offset: int = 0) -> list[tuple[int, dict]]:
+        predicate = None
+        if team is not None or tag is not None:
+            predicate = lambda item: _matches(item, team, tag, None)  # noqa: E731
+        page = _page(self._read_learnings(), limit, before, offset, predicate)
+        return [(seq, _copy_record(record)) for seq, record in page]
+
+    def mark_learnings_synced(self, learning_ids: list[str]) -> int:
+        wanted = set(learning_ids)
+        learnings = list(self._read_learnings())
+        updated = 0
+        for i, learning in enumerate(learnings):
+            if learning.get("id") in wanted and not learning.get("synced"):
+                learnings[i] = {**learning, "synced": True}
+                updated += 1
+        if updated:
+            write_cached_list(self.learnings_file, learnings)
+        return updated
+
+
+# ============ SQLITE BACKEND ============
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS learnings (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    timestamp TEXT,
+    team INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_learnings_id ON learnings(id);
+CREATE INDEX IF NOT EXISTS idx_learnings_timestamp ON learnings(timestamp);
+CREATE INDEX IF NOT EXISTS idx_learnings_team ON learnings(team, seq);
+
+CREATE TABLE IF NOT EXISTS learning_tags (
+    tag TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (tag, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sessions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    timestamp TEXT,
+    branch TEXT,
+    summary TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_branch ON sessions(branch, seq);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp);
+"""
+
+_local = threading.local()
+
+
+class SQLiteBackend:
+    """WAL-mode SQLite store: appends are O(1), lookups go through indexes.
+
+    Learnings keep an insertion sequence so duplicate ids (two learnings saved
+    within the same second) are preserved, exactly as in the JSON layout.
+    Sessions are keyed by id; re-saving replaces the row and moves it to the front.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening and migrating on first use."""
+        conns = getattr(_local, "conns", None)
+        if conns is None:
+            conns = _local.conns = {}
+        key = str(self.db_path)
+        conn = conns.get(key)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(key, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conns[key] = conn
+        return conn
+
+    def init(self) -> None:
+        self._conn()
+
+    def close(self) -> None:
+        """Close this thread's connection (used by tests and the migrator)."""
+        conns = getattr(_local, "conns", {})
+        conn = conns.pop(str(self.db_path), None)
+        if conn is not None:
+            conn.close()
+
+    # ---- Sessions ----
+
+    def save_session(self, session: dict) -> None:
+        entry = _index_entry(session)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, timestamp, branch, summary, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (entry["id"], entry["timestamp"], entry["branch"], entry["summary"],
+                 json.dumps(session, default=str)),
+            )
+
+    def load_session(self, session_id: str) -> Optional[dict]:
+        row = self._conn().execute(
+            "SELECT data FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_sessions(self, limit: Optional[int] = None, branch: Optional[str] = None,
+                      since: Optional[str] = None) -> list[dict]:
+        sql = "SELECT id, timestamp, branch, summary FROM sessions"
+        clauses, params = [], []
+        if branch:
+            clauses.append("branch = ?")
+            params.append(branch)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            {"id": sid, "timestamp": ts, "branch": br, "summary": summary, "file": f"{sid}.json"}
+            for sid, ts, br, summary in self._conn().execute(sql, params)
+        ]
+
+    def count_sessions(self, branch: Optional[str] = None) -> int:
+        if branch:
+            return self._conn().execute(
+                "SELECT COUNT(*) FROM sessions WHERE branch = ?", (branch,)
+            ).fetchone()[0]
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def page_sessions(self, limit: int, branch: Optional[str] = None,
+                      before: Optional[int] = None, offset: int = 0) -> list[tuple[int, dict]]:
+        sql = "SELECT seq, id, timestamp, branch, summary FROM sessions"
+        clauses, params = [], []
+        if branch:
+            clauses.append("branch = ?")
+            params.append(branch)
+        if before is not None:
+            clauses.append("seq < ?")
+            params.append(before)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        return [
+            (seq, {"id": sid, "timestamp": ts, "branch": br, "summary": summary, "file": f"{sid}.json"})
+            for seq, sid, ts, br, summary in self._conn().execute(sql, params)
+        ]
+
+    def load_sessions(self, session_ids: list[str]) -> dict[str, dict]:
+        sessions = {}
+        conn = self._conn()
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(session_ids), 500):
+            chunk = session_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for sid, data in conn.execute(
+                f"SELECT id, data FROM sessions WHERE id IN ({placeholders})", chunk
+            ):
+                sessions[sid] = json.loads(data)
+        return sessions
+
+    # ---- Learnings ----
+
+    def _insert_learning(self, conn: sqlite3.Connection, learning: dict) -> None:
+        cur = conn.execute(
+            "INSERT INTO learnings (id, timestamp, team, data) VALUES (?, ?, ?, ?)",
+            (learning["id"], learning.get("timestamp"), int(bool(learning.get("team", False))),
+             json.dumps(learning, default=str)),
+        )
+        tags = {t for t in learning.get("tags", []) if isinstance(t, str)}
+        conn.executemany(
+            "INSERT OR IGNORE INTO learning_tags (tag, seq) VALUES (?, ?)",
+            [(tag, cur.lastrowid) for tag in tags],
+        )
+
+    def save_learning(self, learning: dict) -> None:
+        conn = self._conn()
+        with conn:
+            self._insert_learning(conn, learning)
+
+    def save_learnings(self, batch: list[dict]) -> None:
+        # One transaction for the whole batch; the last item ends up newest
+        conn = self._conn()
+        with conn:
+            for learning in batch:
+                self._insert_learning(conn, learning)
+
+    def get_learning(self, learning_id: str) -> Optional[dict]:
+        row = self._conn().execute(
+            "SELECT data FROM learnings WHERE id = ? ORDER BY seq DESC LIMIT 1", (learning_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _learnings_query(columns: str, team: Optional[bool], tag: Optional[str],
+                         since: Optional[str] = None, before: Optional[int] = None) -> tuple[str, list]:
+        sql = f"SELECT {columns} FROM learnings l"
+        clauses, params = [], []
+        if tag is not None:
+            sql += " JOIN learning_tags t ON t.seq = l.seq AND t.tag = ?"
+            params.append(tag)
+        if team is not None:
+            clauses.append("l.team = ?")
+            params.append(int(team))
+        if since is not None:
+            clauses.append("l.timestamp >= ?")
+            params.append(since)
+        if before is not None:
+            clauses.append("l.seq < ?")
+            params.append(before)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql, params
+
+    def get_learnings(self, team: Optional[bool] = None, tag: Optional[str] = None,
+                      since: Optional[str] = None, limit: Optional[int] = None) -> list[dict]:
+        sql, params = self._learnings_query("l.data", team, tag, since)
+        sql += " ORDER BY l.seq DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [json.loads(data) for (data,) in self._conn().execute(sql, params)]
+
+    def count_learnings(self, team: Optional[bool] = None, tag: Optional[str] = None) -> int:
+        sql, params = self._learnings_query("COUNT(*)", team, tag)
+        return self._conn().execute(sql, params).fetchone()[0]
+
+    def page_learnings(self, limit: int, team: Optional[bool] = None, tag: Optional[str] = None,
+                       before: Optional[int] = None, offset: int = 0) -> list[tuple[int, dict]]:
+        sql, params = self._learnings_query("l.seq, l.data", team, tag, before=before)
+        sql += " ORDER BY l.seq DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        return [(seq, json.loads(data)) for seq, data in self._conn().execute(sql, params)]
+
+    def mark_learnings_synced(self, learning_ids: list[str]) -> int:
+        conn = self._conn()
+        placeholders = ",".join("?" * len(learning_ids))
+        with conn:
+            rows = conn.execute(
+                f"SELECT seq, data FROM learnings WHERE id IN ({placeholders})", list(learning_ids)
+            ).fetchall() if learning_ids else []
+            updates = []
+            for seq, data in rows:
+                learning = json.loads(data)
+                if not learning.get("synced"):
+                    learning["synced"] = True
+                    updates.append((json.dumps(learning, default=str), seq))
+            conn.executemany("UPDATE learnings SET data = ? WHERE seq = ?", updates)
+        return len(updates)
+
+
+# ============ MIGRATION ============
+
+def migrate_json_to_sqlite(source: JSONBackend, target: SQLiteBackend) -> dict:
+    """
+    Copy an existing JSON store into an empty SQLite store.
+
+    Records are inserted oldest-first so the newest-first ordering is preserved.
+    Refuses to run against a target that already holds data, so it is safe to
+    call more than once.
+
+    Returns:
+        Dictionary with migrated session and learning counts
+    """
+    target.init()
+    if target.count_sessions() or target.count_learnings():
+        return {"sessions": 0, "learnings": 0, "skipped": True}
+
+    sessions = 0
+    for entry in reversed(source.list_sessions()):
+        session = source.load_session(entry.get("id", ""))
+        if session is None:
+            # Index entry without a session file: keep what the index knows
+            session = dict(entry)
+        session.setdefault("id", entry.get("id"))
+        session.setdefault("timestamp", entry.get("timestamp"))
+        if "branch" not in session and not session.get("git", {}).get("branch"):
+            session["branch"] = entry.get("branch", "unknown")
+        if "summary" not in session and not session.get("context", {}).get("summary"):
+            session["summary"] = entry.get("summary", "")
+        target.save_session(session)
+        sessions += 1
+
+    batch = []
+    for learning in reversed(source.get_learnings()):
+        learning = dict(learning)
+        learning.setdefault("id", f"learning_{learning.get('timestamp') or len(batch)}")
+        batch.append(learning)
+    target.save_learnings(batch)
+
+    return {"sessions": sessions, "learnings": len(batch), "skipped": False}
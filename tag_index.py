@@ -0,0 +1,244 @@
+"""Tag index for the dashboard endpoints.
+
+/graph and /stats used to load every learning and recount tags on each
+request. This index keeps, in SQLite next to the store:
+
+- postings: tag -> learnings carrying it (newest first)
+- counts: learnings per tag, indexed by count for top-k queries
+- pairs: tag co-occurrence matrix (learnings carrying both tags)
+- generation: a counter bumped on every write to the store, so API
+  payloads can be cached and served with an ETag until something changes
+
+It is updated incrementally by memory.save_learning(s) and rebuilt from the
+store when its learning count drifts (e.g. data written by an older
+version), like the full-text index.
+"""
+import sqlite3
+import threading
+from itertools import combinations
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+# ============ CONFIGURATION ============
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tag_postings (
+    tag TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    learning_id TEXT NOT NULL,
+    PRIMARY KEY (tag, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS tag_counts (
+    tag TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tag_counts_count ON tag_counts(count DESC, tag);
+
+CREATE TABLE IF NOT EXISTS tag_pairs (
+    tag_a TEXT NOT NULL,
+    tag_b TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (tag_a, tag_b)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tag_pairs_b ON tag_pairs(tag_b);
+CREATE INDEX IF NOT EXISTS idx_tag_pairs_count ON tag_pairs(count DESC);
+
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _tags(learning: dict) -> list[str]:
+    """Distinct string tags of a learning, sorted."""
+    return sorted({tag for tag in learning.get("tags", []) or [] if isinstance(tag, str) and tag})
+
+
+# ============ INDEX ============
+
+_local = threading.local()
+
+
+class TagIndex:
+    """Persistent tag postings, counts and co-occurrence matrix."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the schema on first use."""
+        conns = getattr(_local, "conns", None)
+        if conns is None:
+            conns = _local.conns = {}
+        key = str(self.db_path)
+        conn = conns.get(key)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(key, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conns[key] = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conns = getattr(_local, "conns", {})
+        conn = conns.pop(str(self.db_path), None)
+        if conn is not None:
+            conn.close()
+
+    # ---- Writes ----
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, amount: int = 1) -> int:
+        conn.execute(
+            "INSERT INTO meta (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+        return conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()[0]
+
+    def _add_learnings(self, conn: sqlite3.Connection, learnings: Iterable[dict]) -> None:
+        for learning in learnings:
+            seq = self._bump(conn, "learnings")
+            tags = _tags(learning)
+            conn.executemany(
+                "INSERT OR IGNORE INTO tag_postings (tag, seq, learning_id) VALUES (?, ?, ?)",
+                [(tag, seq, str(learning.get("id"))) for tag in tags],
+            )
+            conn.executemany(
+                "INSERT INTO tag_counts (tag, count) VALUES (?, 1) "
+                "ON CONFLICT(tag) DO UPDATE SET count = count + 1",
+                [(tag,) for tag in tags],
+            )
+            conn.executemany(
+                "INSERT INTO tag_pairs (tag_a, tag_b, count) VALUES (?, ?, 1) "
+                "ON CONFLICT(tag_a, tag_b) DO UPDATE SET count = count + 1",
+                list(combinations(tags, 2)),
+            )
+
+    def add_learning(self, learning: dict) -> None:
+        """Index a newly saved learning."""
+        self.add_learnings([learning])
+
+    def add_learnings(self, learnings: list[dict]) -> None:
+        """Index a batch of saved learnings (oldest first) in one transaction."""
+        conn = self._conn()
+        with conn:
+            self._add_learnings(conn, learnings)
+            self._bump(conn, "generation")
+
+    def touch(self) -> None:
+        """Record a store change that does not affect tags (sessions, sync flags)."""
+        conn = self._conn()
+        with conn:
+            self._bump(conn, "generation")
+
+    def rebuild(self, learnings: Iterable[dict]) -> None:
+        """
+        Replace the whole index in one transaction.
+
+        Args:
+            learnings: Learnings, newest first (as returned by the store)
+        """
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM tag_postings")
+            conn.execute("DELETE FROM tag_counts")
+            conn.execute("DELETE FROM tag_pairs")
+            conn.execute("DELETE FROM meta WHERE name = 'learnings'")
+            self._add_learnings(conn, reversed(list(learnings)))
+            self._bump(conn, "generation")
+
+    # ---- Reads ----
+
+    def _meta(self, name: str) -> int:
+        row = self._conn().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def doc_count(self) -> int:
+        """Learnings indexed."""
+        return self._meta("learnings")
+
+    def generation(self) -> int:
+        """Counter that changes whenever the store was written."""
+        return self._meta("generation")
+
+    def top_tags(self, limit: Optional[int] = None) -> list[tuple[str, int]]:
+        """
+        Most used tags.
+
+        Args:
+            limit: Maximum tags (default: all)
+
+        Returns:
+            (tag, learning count) pairs, most used first
+        """
+        sql = "SELECT tag, count FROM tag_counts ORDER BY count DESC, tag"
+        params: list = []
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [(tag, count) for tag, count in self._conn().execute(sql, params)]
+
+    def tag_count(self, tag: str) -> int:
+        """Learnings carrying a tag."""
+        row = self._conn().execute("SELECT count FROM tag_counts WHERE tag = ?", (tag,)).fetchone()
+        return row[0] if row else 0
+
+    def learning_ids(self, tag: str, limit: Optional[int] = None) -> list[str]:
+        """
+        Learnings carrying a tag.
+
+        Args:
+            tag: Tag to look up
+            limit: Maximum ids (default: all)
+
+        Returns:
+            Learning ids, newest first
+        """
+        sql = "SELECT learning_id FROM tag_postings WHERE tag = ? ORDER BY seq DESC"
+        params: list = [tag]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [learning_id for (learning_id,) in self._conn().execute(sql, params)]
+
+    def related_tags(self, tag: str, limit: int = 10) -> list[tuple[str, int]]:
+        """
+        Tags that co-occur with a tag.
+
+        Args:
+            tag: Tag to look up
+            limit: Maximum tags
+
+        Returns:
+            (tag, learnings carrying both) pairs, most frequent first
+        """
+        rows = self._conn().execute(
+            "SELECT tag_b, count FROM tag_pairs WHERE tag_a = ? "
+            "UNION ALL SELECT tag_a, count FROM tag_pairs WHERE tag_b = ? "
+            "ORDER BY 2 DESC, 1 LIMIT ?",
+            (tag, tag, limit),
+        )
+        return [(other, count) for other, count in rows]
+
+    def top_pairs(self, limit: int = 10) -> list[tuple[str, str, int]]:
+        """
+        Most frequent tag pairs.
+
+        Args:
+            limit: Maximum pairs
+
+        Returns:
+            (tag, tag, learnings carrying both), most frequent first
+        """
+        rows = self._conn().execute(
+            "SELECT tag_a, tag_b, count FROM tag_pairs ORDER BY count DESC, tag_a, tag_b LIMIT ?",
+            (limit,),
+        )
+        return [(a, b, count) for a, b, count in rows]
@@ -0,0 +1,146 @@
+"""Tests for the web dashboard endpoints in server.py."""
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import memory
+import server
+
+
+@pytest.fixture
+def client(tmp_path):
+    """API client over an empty temporary store."""
+    with mock.patch.object(memory, 'STORAGE_DIR', tmp_path), \
+         mock.patch.object(memory, 'SESSIONS_DIR', tmp_path / "sessions"), \
+         mock.patch.object(memory, 'CONFIG_FILE', tmp_path / "config.json"), \
+         mock.patch.object(memory, 'SESSIONS_INDEX', tmp_path / "sessions" / "index.json"), \
+         mock.patch.object(memory, 'LEARNINGS_FILE', tmp_path / "learnings.json"):
+        yield TestClient(server.create_api_app(server.FlowService()))
+
+
+class TestDashboardEndpoints:
+    """Tests for precomputed payloads and conditional requests."""
+
+    def test_stats_from_tag_index(self, client):
+        memory.save_learnings([
+            {"text": "One", "tags": ["redis", "cache"]},
+            {"text": "Two", "tags": ["redis"]},
+        ])
+
+        data = client.get("/stats").json()
+
+        assert data["learnings_count"] == 2
+        assert data["top_tags"] == [{"tag": "redis", "count": 2}, {"tag": "cache", "count": 1}]
+        assert data["top_tag_pairs"] == [{"tags": ["cache", "redis"], "count": 1}]
+
+    def test_graph_nodes_and_edges(self, client):
+        memory.save_session({"id": "session_1", "context": {"summary": "Caching work"}})
+        memory.save_learnings([
+            {"id": "learning_1", "text": "One", "tags": ["redis"]},
+            {"id": "learning_2", "text": "Two", "tags": ["redis"]},
+        ])
+
+        data = client.get("/graph").json()
+
+        assert data["stats"] == {
+            "total_nodes": 4, "total_edges": 3, "sessions": 1, "learnings": 2, "tags": 1,
+        }
+        related = [edge for edge in data["edges"] if edge["type"] == "related"]
+        assert related[0]["source"] == "learning_2"
+        assert related[0]["target"] == "learning_1"
+
+    def test_graph_edges_from_tag_index(self, client):
+        memory.save_learnings([
+            {"id": "learning_1", "text": "One", "tags": ["redis", "cache"]},
+            {"id": "learning_2", "text": "Two", "tags": ["redis"]},
+        ])
+
+        with mock.patch.object(memory, "get_tag_learning_ids", wraps=memory.get_tag_learning_ids) as postings:
+            data = client.get("/graph").json()
+
+        assert {call.args[0] for call in postings.call_args_list} == {"redis", "cache"}
+        tags = {node["id"]: node["data"]["count"] for node in data["nodes"] if node["type"] == "tag"}
+        assert tags == {"tag_redis": 2, "tag_cache": 1}
+        cooccurs = [(e["source"], e["target"]) for e in data["edges"] if e["type"] == "cooccurs"]
+        assert cooccurs == [("tag_cache", "tag_redis")]
+
+    def test_payload_cache_evicts_oldest(self, monkeypatch):
+        monkeypatch.setattr(server, "PAYLOAD_CACHE_SIZE", 2)
+        service = server.FlowService()
+        service._memory = mock.Mock(data_version=mock.Mock(return_value="1"))
+        build = mock.Mock(side_effect=lambda: {})
+
+        service.cached_payload("graph", (1,), build)
+        service.cached_payload("graph", (2,), build)
+        service.cached_payload("graph", (1,), build)  # hit: now the newest
+        service.cached_payload("graph", (3,), build)  # evicts (2,)
+
+        assert list(service._payloads) == [("graph", (1,)), ("graph", (3,))]
+        assert build.call_count == 3
+
+    @pytest.mark.parametrize("path", ["/graph", "/stats"])
+    def test_etag_not_modified(self, client, path):
+        memory.save_learning({"text": "One", "tags": ["redis"]})
+        first = client.get(path)
+        etag = first.headers["etag"]
+
+        again = client.get(path, headers={"If-None-Match": etag})
+
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert client.get(path, headers={"If-None-Match": f'W/{etag}'}).status_code == 304
+
+    @pytest.mark.parametrize("path", ["/graph", "/stats"])
+    def test_etag_changes_after_write(self, client, path):
+        etag = client.get(path).headers["etag"]
+        memory.save_learning({"text": "New", "tags": ["fresh"]})
+
+        response = client.get(path, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_graph_etag_depends_on_params(self, client):
+        assert client.get("/graph?limit=5").headers["etag"] != client.get("/graph?limit=6").headers["etag"]
+
+
+class TestPaginationEndpoints:
+    """Tests for cursor pagination of /sessions and /learnings."""
+
+    def test_learnings_cursor(self, client):
+        memory.save_learnings([{"id": f"learning_{i}", "text": str(i), "tags": ["t"]} for i in range(3)])
+
+        first = client.get("/learnings?limit=2&tag=t").json()
+        second = client.get(f"/learnings?limit=2&tag=t&cursor={first['next_cursor']}").json()
+
+        assert [item["id"] for item in first["learnings"]] == ["learning_2", "learning_1"]
+        assert [item["id"] for item in second["learnings"]] == ["learning_0"]
+        assert second["next_cursor"] is None
+        assert first["total"] == 3
+
+    def test_sessions_page_numbers_still_work(self, client):
+        for i in range(3):
+            memory.save_session({"id": f"session_{i}", "context": {"summary": str(i)}})
+
+        data = client.get("/sessions?limit=2&page=2").json()
+
+        assert [item["id"] for item in data["sessions"]] == ["session_0"]
+        assert data["total"] == 3
+        assert data["page"] == 2
+
+    def test_invalid_cursor_is_rejected(self, client):
+        assert client.get("/sessions?cursor=nope").status_code == 400
+        assert client.get("/learnings?cursor=-1").status_code == 400
+
+
+class TestEtagMatches:
+    """Tests for If-None-Match parsing."""
+
+    def test_matches(self):
+        assert server.etag_matches('"a", "b"', '"b"')
+        assert server.etag_matches("*", '"b"')
+
+    def test_no_match(self):
+        assert not server.etag_matches(None, '"b"')
+        assert not server.etag_matches('"a"', '"b"')
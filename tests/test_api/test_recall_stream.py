@@ -0,0 +1,246 @@
+"""Tests for tiered recall (FlowService.recall_stream and POST /recall/stream)."""
+import asyncio
+import json
+import threading
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import linear_client
+import linear_docs
+import memory
+import server
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty temporary store with one learning about redis."""
+    with mock.patch.object(memory, 'STORAGE_DIR', tmp_path), \
+         mock.patch.object(memory, 'SESSIONS_DIR', tmp_path / "sessions"), \
+         mock.patch.object(memory, 'CONFIG_FILE', tmp_path / "config.json"), \
+         mock.patch.object(memory, 'SESSIONS_INDEX', tmp_path / "sessions" / "index.json"), \
+         mock.patch.object(memory, 'LEARNINGS_FILE', tmp_path / "learnings.json"):
+        memory.save_learning({"text": "Redis cache keys expire after an hour", "tags": ["redis"]})
+        yield tmp_path
+
+
+@pytest.fixture
+def remote(monkeypatch, tmp_path):
+    """Backboard and Linear configured; returns the service and its fake tiers."""
+    monkeypatch.setattr(linear_docs, "LINEAR_DIR", tmp_path / "linear")
+    monkeypatch.setenv("BACKBOARD_API_KEY", "key")
+    monkeypatch.setenv("BACKBOARD_PERSONAL_THREAD_ID", "thread")
+    monkeypatch.setenv("LINEAR_API_KEY", "key")
+    service = server.FlowService()
+    service._backboard = mock.Mock()
+    service._backboard.recall = mock.AsyncMock(
+        return_value="Backboard remembers that redis keys expire hourly."
+    )
+    search = mock.AsyncMock(return_value=[
+        {"id": "doc1", "title": "Cache design", "content": "Redis layout", "url": "https://linear.app/doc1"},
+    ])
+    monkeypatch.setattr(linear_client, "search_documents", search)
+    monkeypatch.setattr(server.FlowService, "_current_branch", staticmethod(lambda: None))
+    return service, search
+
+
+async def collect(service, query, **kwargs):
+    return [event async for event in service.recall_stream(query, **kwargs)]
+
+
+class TestRecallStream:
+    """Tests for tier-by-tier recall events."""
+
+    async def test_local_tier_comes_first(self, store, remote):
+        service, _ = remote
+
+        events = await collect(service, "redis cache")
+
+        assert events[0]["tier"] == "local"
+        assert "Redis cache keys" in events[0]["results"][0]["content"]
+        assert sorted(e["tier"] for e in events[1:-1]) == ["backboard", "linear"]
+        assert events[-1]["tier"] == "final"
+
+    async def test_final_fuses_all_tiers(self, store, remote):
+        service, _ = remote
+
+        final = (await collect(service, "redis cache"))[-1]
+
+        sources = {r["source"] for r in final["results"]}
+        assert {"learning", "backboard", "linear"} <= sources
+        assert final["timed_out"] == []
+
+    async def test_remote_tiers_run_concurrently(self, store, remote):
+        """The slow tier should not delay the fast one."""
+        service, search = remote
+
+        async def slow_recall(thread_id, query):
+            await asyncio.sleep(0.2)
+            return "Backboard remembers that redis keys expire hourly."
+
+        service._backboard.recall = slow_recall
+
+        events = await collect(service, "redis cache")
+
+        assert [e["tier"] for e in events] == ["local", "linear", "backboard", "final"]
+
+    async def test_slow_tier_times_out(self, store, remote, monkeypatch):
+        service, _ = remote
+        monkeypatch.setattr(server, "RECALL_TIER_TIMEOUT", 0.05)
+
+        async def hung_recall(thread_id, query):
+            await asyncio.sleep(10)
+
+        service._backboard.recall = hung_recall
+
+        events = await collect(service, "redis cache")
+
+        backboard = next(e for e in events if e["tier"] == "backboard")
+        assert backboard["status"] == "timeout"
+        assert events[-1]["timed_out"] == ["backboard"]
+        assert "linear" in {r["source"] for r in events[-1]["results"]}
+
+    async def test_failing_tier_is_reported(self, store, remote, monkeypatch):
+        service, search = remote
+        search.side_effect = RuntimeError("linear down")
+
+        events = await collect(service, "redis cache")
+
+        linear = next(e for e in events if e["tier"] == "linear")
+        assert linear["status"] == "error"
+        assert events[-1]["tier"] == "final"
+
+    async def test_local_only_skips_remote(self, store, remote):
+        service, search = remote
+
+        events = await collect(service, "redis cache", local_only=True)
+
+        assert [e["tier"] for e in events] == ["local", "final"]
+        search.assert_not_called()
+        service._backboard.recall.assert_not_called()
+
+    async def test_branch_lookup_runs_off_the_loop(self, store, remote, monkeypatch):
+        """The git subprocess for the current branch should not block the loop."""
+        service, _ = remote
+        loop_thread = threading.get_ident()
+        lookup_threads = []
+
+        def current_branch():
+            lookup_threads.append(threading.get_ident())
+            return "main"
+
+        monkeypatch.setattr(server.FlowService, "_current_branch", staticmethod(current_branch))
+
+        await collect(service, "redis cache", local_only=True)
+
+        assert len(lookup_threads) == 1
+        assert lookup_threads[0] != loop_thread
+
+    async def test_recall_context_returns_final(self, store, remote):
+        service, _ = remote
+
+        result = await service.recall_context("redis cache")
+
+        assert "tier" not in result
+        assert result["query"] == "redis cache"
+        assert result["timed_out"] == []
+
+
+class TestRecallStreamEndpoint:
+    """Tests for POST /recall/stream."""
+
+    def test_ndjson(self, store, remote):
+        service, _ = remote
+        client = TestClient(server.create_api_app(service))
+
+        response = client.post("/recall/stream", json={"query": "redis cache"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events[0]["tier"] == "local"
+        assert events[-1]["tier"] == "final"
+
+    def test_sse(self, store, remote):
+        service, _ = remote
+        client = TestClient(server.create_api_app(service))
+
+        response = client.post(
+            "/recall/stream",
+            json={"query": "redis cache", "local_only": True},
+            headers={"Accept": "text/event-stream"},
+        )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = [b for b in response.text.split("\n\n") if b]
+        assert [b.splitlines()[0] for b in blocks] == ["event: local", "event: final"]
+        assert json.loads(blocks[0].splitlines()[1][len("data: "):])["tier"] == "local"
+
+
+class TestRecallDeadline:
+    """Tests for deadline_ms budgets on recall."""
+
+    async def test_deadline_cancels_stragglers(self, store, remote):
+        service, _ = remote
+        cancelled = asyncio.Event()
+
+        async def hung_recall(thread_id, query):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        service._backboard.recall = hung_recall
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        result = await service.recall_context("redis cache", deadline_ms=50)
+
+        assert loop.time() - started < 1
+        assert cancelled.is_set()
+        assert result["partial"] is True
+        assert result["timed_out"] == ["backboard"]
+        assert {"learning", "linear"} <= {r["source"] for r in result["results"]}
+
+    async def test_fast_tiers_within_deadline(self, store, remote):
+        service, _ = remote
+
+        result = await service.recall_context("redis cache", deadline_ms=5000)
+
+        assert result["partial"] is False
+        assert "backboard" in {r["source"] for r in result["results"]}
+
+    def test_endpoint_accepts_deadline(self, store, remote):
+        service, _ = remote
+
+        async def hung_recall(thread_id, query):
+            await asyncio.sleep(10)
+
+        service._backboard.recall = hung_recall
+        client = TestClient(server.create_api_app(service))
+
+        data = client.post("/recall", json={"query": "redis cache", "deadline_ms": 50}).json()
+
+        assert data["timed_out"] == ["backboard"]
+        assert client.post("/recall", json={"query": "x", "deadline_ms": -1}).status_code == 422
+
+
+class TestExtractSearchTerms:
+    """Tests for FlowService._extract_search_terms."""
+
+    async def test_awaits_async_completion(self):
+        service = server.FlowService()
+        service._cerebras = mock.Mock()
+        service._cerebras.acomplete = mock.AsyncMock(return_value='["Redis", "TTL"]')
+
+        assert await service._extract_search_terms("how long do redis keys live") == ["redis", "ttl"]
+        service._cerebras.complete.assert_not_called()
+
+    async def test_falls_back_to_words(self):
+        service = server.FlowService()
+        service._cerebras = mock.Mock()
+        service._cerebras.acomplete = mock.AsyncMock(side_effect=RuntimeError("down"))
+
+        assert await service._extract_search_terms("redis key ttl") == ["redis", "key", "ttl"]
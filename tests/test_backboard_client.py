@@ -6,6 +6,13 @@ import httpx
 import pytest
 
 import backboard_client
+import recall_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_recall_cache(tmp_path, monkeypatch):
+    """Keep the recall cache out of the real home directory."""
+    monkeypatch.setattr(recall_cache, 'CACHE_FILE', tmp_path / "recall_cache.db")
 
 
 class TestExceptions:
@@ -265,6 +272,53 @@ class TestStoreFunctions:
             assert metadata["author"] == "testuser"
 
 
+class TestStoreMessages:
+    """Tests for the concurrent batch writer."""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self, monkeypatch):
+        """No more than `concurrency` messages should be in flight."""
+        import asyncio
+        in_flight = 0
+        peak = 0
+
+        async def fake_store(thread_id, content, metadata=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"id": content}
+
+        monkeypatch.setattr(backboard_client, 'store_message', fake_store)
+
+        results = await backboard_client.store_messages(
+            [("thread_1", f"msg {i}", None) for i in range(10)],
+            concurrency=3,
+        )
+
+        assert peak == 3
+        assert [r["id"] for r in results] == [f"msg {i}" for i in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_failures_isolated(self, monkeypatch):
+        """One failed message should not fail the batch."""
+        async def fake_store(thread_id, content, metadata=None):
+            if content == "bad":
+                raise backboard_client.BackboardConnectionError("down")
+            return {"id": content}
+
+        monkeypatch.setattr(backboard_client, 'store_message', fake_store)
+
+        results = await backboard_client.store_messages([
+            ("thread_1", "good", None),
+            ("thread_1", "bad", None),
+        ])
+
+        assert results[0] == {"id": "good"}
+        assert isinstance(results[1], backboard_client.BackboardConnectionError)
+
+
 class TestRecallFunctions:
     """Tests for recall functions."""
 
@@ -293,6 +347,44 @@ class TestRecallFunctions:
             assert call_args.kwargs["data"]["send_to_llm"] == "true"
             assert result == "Search results"
 
+    @pytest.mark.asyncio
+    async def test_recall_served_from_cache(self, monkeypatch):
+        """A repeated recall should not hit the network."""
+        monkeypatch.setattr(backboard_client, 'API_KEY', "test-key")
+
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"content": "Search results"}
+
+        with mock.patch.object(
+            backboard_client, '_request_with_retry',
+            return_value=mock_response
+        ) as mock_request:
+            await backboard_client.recall("thread_123", "Authentication ")
+            result = await backboard_client.recall("thread_123", "authentication")
+
+            mock_request.assert_called_once()
+            assert result == "Search results"
+
+    @pytest.mark.asyncio
+    async def test_store_message_invalidates_recall_cache(self, monkeypatch):
+        """Storing to a thread should force the next recall to the network."""
+        monkeypatch.setattr(backboard_client, 'API_KEY', "test-key")
+
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"content": "Search results"}
+
+        with mock.patch.object(
+            backboard_client, '_request_with_retry',
+            return_value=mock_response
+        ) as mock_request:
+            await backboard_client.recall("thread_123", "authentication")
+            await backboard_client.store_message("thread_123", "New learning")
+            await backboard_client.recall("thread_123", "authentication")
+
+            assert mock_request.call_count == 3
+
     @pytest.mark.asyncio
     async def test_get_restoration_context(self, monkeypatch):
         """get_restoration_context should call recall with formatted query."""
@@ -459,3 +551,76 @@ class TestRunAsync:
         result = backboard_client.run_async(async_func())
 
         assert result == "async result"
+
+
+class TestClientPool:
+    """Tests for the shared pooled client."""
+
+    @pytest.mark.asyncio
+    async def test_client_shared_within_loop(self):
+        """Requests on one loop should share a client."""
+        first = backboard_client.get_client()
+        second = backboard_client.get_client()
+
+        assert first is second
+        await backboard_client.close_client()
+        assert first.is_closed
+
+    @pytest.mark.asyncio
+    async def test_open_close_nest(self):
+        """The client should stay open until every opener has closed it."""
+        client = await backboard_client.open_client()
+        await backboard_client.open_client()
+
+        await backboard_client.close_client()
+        assert not client.is_closed
+        assert backboard_client.get_client() is client
+
+        await backboard_client.close_client()
+        assert client.is_closed
+
+    def test_new_loop_gets_new_client(self):
+        """Each event loop should get its own client."""
+        async def grab():
+            return backboard_client.get_client()
+
+        first = backboard_client.run_async(grab())
+        second = backboard_client.run_async(grab())
+
+        assert first is not second
+        assert first.is_closed  # run_async closes the loop's client
+
+    @pytest.mark.asyncio
+    async def test_connection_reuse_metrics(self, monkeypatch):
+        """Keep-alive requests should be counted as reused connections."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        monkeypatch.setattr(backboard_client, '_pool_stats',
+                            {"requests": 0, "connections_opened": 0, "clients_created": 0})
+        try:
+            await backboard_client.open_client()
+            for _ in range(3):
+                await backboard_client._request_with_retry("get", f"http://127.0.0.1:{server.server_port}/")
+            await backboard_client.close_client()
+        finally:
+            server.shutdown()
+
+        stats = backboard_client.get_pool_stats()
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["reused"] == 2
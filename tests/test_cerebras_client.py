@@ -2,9 +2,19 @@
 import json
 from unittest import mock
 
+import httpx
 import pytest
 
 import cerebras_client
+import completion_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch, tmp_path):
+    """Don't let a cached client or completion from one test leak into the next."""
+    monkeypatch.setattr(cerebras_client, '_sync_client', None)
+    monkeypatch.setattr(cerebras_client, '_pools', cerebras_client.weakref.WeakKeyDictionary())
+    monkeypatch.setattr(completion_cache, 'CACHE_FILE', tmp_path / "completion_cache.db")
 
 
 class TestExceptions:
@@ -143,6 +153,274 @@ class TestComplete:
                 cerebras_client.complete("Test prompt")
 
 
+def _response(text):
+    response = mock.MagicMock()
+    response.choices = [mock.MagicMock(message=mock.MagicMock(content=text))]
+    return response
+
+
+def _rate_limit(headers=None):
+    request = httpx.Request("POST", "https://api.cerebras.ai/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return cerebras_client.RateLimitError("429 Too Many Requests", response=response, body=None)
+
+
+def _async_client(create):
+    """A mock AsyncCerebras whose completions.create is `create`."""
+    client = mock.MagicMock()
+    client.is_closed.return_value = False
+    client.close = mock.AsyncMock()
+    client.chat.completions.create = create
+    return client
+
+
+class TestRetry:
+    """Tests for rate-limit-aware retry and client reuse on the sync path."""
+
+    def test_complete_reuses_client(self, monkeypatch):
+        """Successive complete() calls should share one client (and its connections)."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            mock_cerebras.return_value.chat.completions.create.return_value = _response("ok")
+
+            cerebras_client.complete("one")
+            cerebras_client.complete("two")
+
+            assert mock_cerebras.call_count == 1
+
+    def test_complete_retries_rate_limit_after_retry_after(self, monkeypatch):
+        """A 429 should be retried after the server's Retry-After."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+        sleeps = []
+        monkeypatch.setattr(cerebras_client.time, 'sleep', sleeps.append)
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            mock_cerebras.return_value.chat.completions.create.side_effect = [
+                _rate_limit({"retry-after": "2"}),
+                _response("after retry"),
+            ]
+
+            assert cerebras_client.complete("Prompt") == "after retry"
+
+        assert sleeps == [2.0]
+
+    def test_complete_gives_up_on_long_rate_limit(self, monkeypatch):
+        """A Retry-After beyond MAX_RETRY_WAIT (e.g. daily quota) should fail fast."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+        monkeypatch.setattr(cerebras_client.time, 'sleep', mock.MagicMock())
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            create = mock_cerebras.return_value.chat.completions.create
+            create.side_effect = _rate_limit({"retry-after": "3600"})
+
+            with pytest.raises(cerebras_client.CerebrasRateLimitError):
+                cerebras_client.complete("Prompt")
+
+            assert create.call_count == 1
+
+    def test_complete_passes_timeout(self, monkeypatch):
+        """complete should send a per-call timeout."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            create = mock_cerebras.return_value.chat.completions.create
+            create.return_value = _response("ok")
+
+            cerebras_client.complete("Prompt", timeout=5)
+
+            assert create.call_args.kwargs["timeout"] == 5
+
+
+class TestCompletionCache:
+    """Tests for serving repeated prompts from the completion cache."""
+
+    def test_repeat_prompt_served_from_cache(self, monkeypatch):
+        """The same request should reach the API only once."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            create = mock_cerebras.return_value.chat.completions.create
+            create.return_value = _response("cached answer")
+
+            assert cerebras_client.complete("Prompt", system="S") == "cached answer"
+            assert cerebras_client.complete("Prompt", system="S") == "cached answer"
+
+            assert create.call_count == 1
+        assert completion_cache.get_stats()["hits"] == 1
+
+    def test_key_covers_request_options(self, monkeypatch):
+        """A different system, max_tokens or json_mode should not share an entry."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            create = mock_cerebras.return_value.chat.completions.create
+            create.return_value = _response("{}")
+
+            cerebras_client.complete("Prompt")
+            cerebras_client.complete("Prompt", system="S")
+            cerebras_client.complete("Prompt", max_tokens=10)
+            cerebras_client.complete("Prompt", json_mode=True)
+
+            assert create.call_count == 4
+
+    def test_opt_out(self, monkeypatch):
+        """use_cache=False should always call the API and store nothing."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            create = mock_cerebras.return_value.chat.completions.create
+            create.return_value = _response("fresh")
+
+            cerebras_client.complete("Prompt", use_cache=False)
+            cerebras_client.complete("Prompt", use_cache=False)
+
+            assert create.call_count == 2
+        assert completion_cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_acomplete_reads_cache_off_the_loop(self, monkeypatch):
+        """Cache lookups in acomplete should run in a worker thread."""
+        import threading
+        loop_thread = threading.current_thread()
+        threads = []
+
+        def fake_get(key):
+            threads.append(threading.current_thread())
+            return "cached"
+
+        monkeypatch.setattr(completion_cache, 'get', fake_get)
+
+        assert await cerebras_client.acomplete("Prompt") == "cached"
+        assert threads and threads[0] is not loop_thread
+
+    @pytest.mark.asyncio
+    async def test_acomplete_shares_cache_with_complete(self, monkeypatch):
+        """A completion cached by the sync path should serve the async path."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            mock_cerebras.return_value.chat.completions.create.return_value = _response("shared")
+            cerebras_client.complete("Prompt")
+
+        create = mock.AsyncMock()
+        with mock.patch('cerebras_client.AsyncCerebras', return_value=_async_client(create)):
+            assert await cerebras_client.acomplete("Prompt") == "shared"
+        create.assert_not_called()
+
+
+class TestAsyncClient:
+    """Tests for acomplete, astream and the pooled async client."""
+
+    @pytest.mark.asyncio
+    async def test_acomplete_shares_pooled_client(self, monkeypatch):
+        """acomplete calls on one loop should share one AsyncCerebras."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+        create = mock.AsyncMock(return_value=_response("async answer"))
+
+        with mock.patch('cerebras_client.AsyncCerebras', return_value=_async_client(create)) as mock_async:
+            assert await cerebras_client.acomplete("one") == "async answer"
+            assert await cerebras_client.acomplete("two", json_mode=True) == "async answer"
+
+            assert mock_async.call_count == 1
+            assert mock_async.call_args.kwargs["max_retries"] == 0
+        assert create.call_args.kwargs["response_format"] == {"type": "json_object"}
+
+    @pytest.mark.asyncio
+    async def test_acomplete_retries_timeouts(self, monkeypatch):
+        """A timed-out attempt should be retried with backoff."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+        monkeypatch.setattr(cerebras_client, 'BACKOFF_MULTIPLIER', 0)
+        request = httpx.Request("POST", "https://api.cerebras.ai/v1/chat/completions")
+        create = mock.AsyncMock(side_effect=[
+            cerebras_client.APITimeoutError(request=request),
+            _response("second try"),
+        ])
+
+        with mock.patch('cerebras_client.AsyncCerebras', return_value=_async_client(create)):
+            assert await cerebras_client.acomplete("Prompt", timeout=3) == "second try"
+
+        assert create.call_count == 2
+        assert create.call_args.kwargs["timeout"] == 3
+
+    @pytest.mark.asyncio
+    async def test_acomplete_maps_auth_error(self, monkeypatch):
+        """acomplete should raise CerebrasAuthError on 401."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "bad-key")
+        create = mock.AsyncMock(side_effect=Exception("401 Unauthorized"))
+
+        with mock.patch('cerebras_client.AsyncCerebras', return_value=_async_client(create)):
+            with pytest.raises(cerebras_client.CerebrasAuthError):
+                await cerebras_client.acomplete("Prompt")
+
+    @pytest.mark.asyncio
+    async def test_astream_yields_tokens(self, monkeypatch):
+        """astream should yield content deltas as they arrive."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+
+        async def chunks():
+            for text in ["Hel", "lo", None, "!"]:
+                yield mock.MagicMock(choices=[mock.MagicMock(delta=mock.MagicMock(content=text))])
+
+        create = mock.AsyncMock(return_value=chunks())
+
+        with mock.patch('cerebras_client.AsyncCerebras', return_value=_async_client(create)):
+            tokens = [token async for token in cerebras_client.astream("Prompt")]
+
+        assert tokens == ["Hel", "lo", "!"]
+        assert create.call_args.kwargs["stream"] is True
+
+    def test_stream_retries_before_first_token(self, monkeypatch):
+        """The sync stream should retry a failed attempt and yield content deltas."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+        monkeypatch.setattr(cerebras_client, 'BACKOFF_MULTIPLIER', 0)
+        request = httpx.Request("POST", "https://api.cerebras.ai/v1/chat/completions")
+        chunks = [mock.MagicMock(choices=[mock.MagicMock(delta=mock.MagicMock(content=text))])
+                  for text in ["Wel", None, "come"]]
+
+        with mock.patch('cerebras_client.Cerebras') as mock_cerebras:
+            create = mock_cerebras.return_value.chat.completions.create
+            create.side_effect = [cerebras_client.APITimeoutError(request=request), iter(chunks)]
+
+            assert list(cerebras_client.stream("Prompt")) == ["Wel", "come"]
+
+        assert create.call_count == 2
+        assert create.call_args.kwargs["stream"] is True
+
+    def test_stream_restoration_message(self, monkeypatch):
+        """The welcome-back message should stream with the restoration prompt."""
+        stream = mock.Mock(return_value=iter(["Welcome ", "back"]))
+        monkeypatch.setattr(cerebras_client, 'stream', stream)
+
+        text = "".join(cerebras_client.stream_restoration_message({"summary": "Auth refactor"}, {}))
+
+        assert text == "Welcome back"
+        assert "Auth refactor" in stream.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_open_close_client_nests(self, monkeypatch):
+        """The shared client should close only when the last opener releases it."""
+        monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+        client = _async_client(mock.AsyncMock())
+
+        with mock.patch('cerebras_client.AsyncCerebras', return_value=client):
+            await cerebras_client.open_client()
+            await cerebras_client.open_client()
+            await cerebras_client.close_client()
+            client.close.assert_not_called()
+            await cerebras_client.close_client()
+            client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_quick_answer_uses_async_client(self, monkeypatch):
+        """quick_answer should await acomplete rather than a thread."""
+        acomplete = mock.AsyncMock(return_value="answer")
+        monkeypatch.setattr(cerebras_client, 'acomplete', acomplete)
+
+        assert await cerebras_client.quick_answer("Prompt", system="Be brief") == "answer"
+        acomplete.assert_awaited_once_with("Prompt", system="Be brief", max_tokens=2000, use_cache=True)
+
+
 class TestAnalyzeSessionContext:
     """Tests for analyze_session_context function."""
 
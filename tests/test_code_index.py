@@ -0,0 +1,285 @@
+"""Tests for the incremental repository code index (code_index.py)."""
+import os
+
+import pytest
+
+import code_index
+from code_index import CodeIndex
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A small repository with Python and TypeScript files."""
+    root = tmp_path / "repo"
+    write(root / "app.py", 'def main():\n    """Entry point."""\n    helper()\n\n\ndef helper():\n    pass\n')
+    write(root / "pkg" / "models.py", "class User:\n    def save(self):\n        pass\n")
+    write(root / "web" / "index.ts", "export function render(): void {}\n")
+    write(root / "node_modules" / "dep" / "index.js", "function vendored() {}\n")
+    write(root / ".git" / "hooks" / "hook.py", "def hidden():\n    pass\n")
+    write(root / "README.md", "# Not code\n")
+    return root
+
+
+@pytest.fixture
+def index(repo, tmp_path):
+    return CodeIndex(repo, index_file=tmp_path / "index.json")
+
+
+class TestRefresh:
+    """Tests for incremental refresh."""
+
+    def test_cold_refresh_parses_code_files_only(self, index):
+        """Vendored, hidden and non-code files should be skipped."""
+        stats = index.refresh()
+
+        assert sorted(index.files) == ["app.py", "pkg/models.py", "web/index.ts"]
+        assert stats["parsed"] == 3
+        assert stats["reused"] == 0
+
+    def test_second_refresh_reuses_everything(self, index):
+        """Unchanged files should not be read again."""
+        index.refresh()
+        stats = index.refresh()
+
+        assert stats["parsed"] == 0
+        assert stats["reused"] == 3
+
+    def test_only_changed_files_are_parsed(self, index, repo):
+        """Editing one file should re-parse just that file."""
+        index.refresh()
+        write(repo / "app.py", "def main():\n    pass\n\n\ndef added():\n    pass\n")
+
+        stats = index.refresh()
+
+        assert stats["parsed"] == 1
+        assert stats["reused"] == 2
+        assert "added()" in index.file_tldr("app.py")
+
+    def test_touched_file_is_rehashed_not_parsed(self, index, repo):
+        """A new mtime with identical content should only be hashed."""
+        index.refresh()
+        path = repo / "pkg" / "models.py"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        stats = index.refresh()
+
+        assert stats["parsed"] == 0
+        assert stats["rehashed"] == 1
+        assert index.refresh()["reused"] == 3
+
+    def test_removed_and_new_files(self, index, repo):
+        """Deleted files should leave the index; new ones should be parsed."""
+        index.refresh()
+        (repo / "web" / "index.ts").unlink()
+        write(repo / "pkg" / "views.py", "def show():\n    pass\n")
+
+        stats = index.refresh()
+
+        assert stats["removed"] == 1
+        assert stats["parsed"] == 1
+        assert sorted(index.files) == ["app.py", "pkg/models.py", "pkg/views.py"]
+
+    def test_persists_across_instances(self, index, repo, tmp_path):
+        """A new process should reuse the saved index."""
+        index.refresh()
+
+        fresh = CodeIndex(repo, index_file=tmp_path / "index.json")
+        stats = fresh.refresh()
+
+        assert stats["parsed"] == 0
+        assert stats["reused"] == 3
+
+    def test_outdated_index_is_rebuilt(self, index, repo, tmp_path, monkeypatch):
+        """An index written by another format version should be ignored."""
+        index.refresh()
+        monkeypatch.setattr(code_index, "INDEX_VERSION", code_index.INDEX_VERSION + 1)
+
+        stats = CodeIndex(repo, index_file=tmp_path / "index.json").refresh()
+
+        assert stats["parsed"] == 3
+
+    def test_process_pool_for_large_batches(self, index, repo, monkeypatch):
+        """Many files to parse should go through worker processes."""
+        monkeypatch.setattr(code_index, "PARALLEL_THRESHOLD", 2)
+
+        stats = index.refresh(workers=2)
+
+        assert stats["workers"] == 2
+        assert stats["parsed"] == 3
+        assert "`User`" in index.file_tldr("pkg/models.py")
+
+    def test_syntax_error_is_indexed(self, index, repo):
+        """Unparseable files should be indexed with their error."""
+        write(repo / "broken.py", "def broken(:\n")
+
+        index.refresh()
+
+        assert "Syntax error" in index.file_tldr("broken.py")
+
+
+class TestRepoMap:
+    """Tests for rendered file and repository maps."""
+
+    def test_l0_lists_paths(self, index):
+        assert index.repo_map("L0") == "app.py\npkg/models.py\nweb/index.ts"
+
+    def test_levels_add_detail(self, index):
+        l1 = index.repo_map("L1")
+        l2 = index.repo_map("L2")
+        l3 = index.repo_map("L3")
+
+        assert "## app.py" in l1
+        assert "## pkg/models.py" in l1
+        assert "## web/index.ts" in l1
+        assert "Entry point." not in l1
+        assert "Entry point." in l2
+        assert "main -> helper" in l3
+
+    def test_map_is_rebuilt_after_change(self, index, repo):
+        """The memoized map should not outlive a file change."""
+        assert "renamed" not in index.repo_map("L1")
+        write(repo / "app.py", "def renamed():\n    pass\n")
+
+        assert "renamed()" in index.repo_map("L1")
+
+    def test_file_tldr_unknown_file(self, index):
+        index.refresh()
+        assert index.file_tldr("missing.py") is None
+
+    def test_get_index_is_shared(self, repo, monkeypatch):
+        monkeypatch.setattr(code_index, "_indexes", {})
+        assert code_index.get_index(repo) is code_index.get_index(repo / ".")
+
+
+@pytest.fixture
+def package_repo(tmp_path):
+    """A repository whose modules call each other through various imports."""
+    root = tmp_path / "pkgrepo"
+    write(root / "cli.py", (
+        "import engine\n"
+        "from store import save as persist\n"
+        "from store import Store\n\n\n"
+        "def main():\n"
+        "    engine.run()\n"
+        "    persist()\n"
+        "    Store().flush()\n"
+        "    print('done')\n"
+    ))
+    write(root / "engine.py", (
+        "class Runner:\n"
+        "    def start(self):\n"
+        "        self.step()\n\n"
+        "    def step(self):\n"
+        "        pass\n\n\n"
+        "def run():\n"
+        "    Runner().start()\n"
+    ))
+    write(root / "store" / "__init__.py", "from .backend import save, Store\n")
+    write(root / "store" / "backend.py", (
+        "from ..engine import run\n\n\n"
+        "class Store:\n"
+        "    def flush(self):\n"
+        "        pass\n\n\n"
+        "def save():\n"
+        "    pass\n"
+    ))
+    return root
+
+
+@pytest.fixture
+def graph_index(package_repo, tmp_path):
+    return CodeIndex(package_repo, index_file=tmp_path / "graph.json")
+
+
+class TestCallGraph:
+    """Tests for the repo-wide symbol table and call graph."""
+
+    def test_module_name(self):
+        assert code_index.module_name("pkg/mod.py") == "pkg.mod"
+        assert code_index.module_name("pkg/__init__.py") == "pkg"
+        assert code_index.module_name("src/pkg/mod.py") == "pkg.mod"
+
+    def test_symbol_table(self, graph_index):
+        graph = graph_index.call_graph()
+
+        assert graph.symbols["engine.Runner.start"]["kind"] == "method"
+        assert graph.symbols["engine.Runner.start"]["line"] == 2
+        assert graph.symbols["store.backend.save"]["file"] == "store/backend.py"
+
+    def test_resolves_calls_through_imports(self, graph_index):
+        """Module, aliased, re-exported and class imports should all resolve."""
+        graph = graph_index.call_graph()
+
+        assert graph.callees("cli.main") == [
+            "engine.run",
+            "store.backend.Store",
+            "store.backend.save",
+        ]
+
+    def test_resolves_self_calls_and_callers(self, graph_index):
+        graph = graph_index.call_graph()
+
+        assert graph.callees("engine.Runner.start") == ["engine.Runner.step"]
+        assert graph.callers("engine.run") == ["cli.main"]
+        assert graph.callers("engine.Runner") == ["engine.run"]
+
+    def test_lookup(self, graph_index):
+        graph = graph_index.call_graph()
+
+        assert graph.lookup("run") == ["engine.run"]
+        assert graph.lookup("Runner.step") == ["engine.Runner.step"]
+        assert graph.lookup("SAVE") == ["store.backend.save"]
+        assert graph.lookup("missing") == []
+
+    def test_graph_rebuilt_after_change(self, graph_index, package_repo):
+        graph_index.call_graph()
+        write(package_repo / "engine.py", "def run():\n    helper()\n\n\ndef helper():\n    pass\n")
+
+        graph = graph_index.call_graph()
+
+        assert "engine.Runner" not in graph.symbols
+        assert graph.callees("engine.run") == ["engine.helper"]
+
+    def test_l3_map_shows_cross_module_calls(self, graph_index):
+        text = graph_index.repo_map("L3")
+
+        assert "- main -> engine.run, store.backend.Store, store.backend.save" in text
+        assert "- run <- cli.main" in text
+
+    def test_l3_file_tldr_updates_when_caller_changes(self, graph_index, package_repo):
+        """Callers live in other files, so their changes must reach L3."""
+        graph_index.refresh()
+        assert "cli.main" in graph_index.file_tldr("engine.py", "L3")
+        write(package_repo / "cli.py", "def main():\n    pass\n")
+
+        graph_index.refresh()
+
+        assert "cli.main" not in graph_index.file_tldr("engine.py", "L3")
+
+
+class TestCodeCandidates:
+    """Tests for code symbols in recall."""
+
+    def test_unindexed_repo_returns_nothing(self, package_repo, monkeypatch, tmp_path):
+        monkeypatch.setattr(code_index, "INDEX_DIR", tmp_path / "indexes")
+        monkeypatch.setattr(code_index, "_indexes", {})
+
+        assert code_index.code_candidates("where is run defined", root=package_repo) == []
+
+    def test_finds_symbols_named_in_query(self, package_repo, monkeypatch, tmp_path):
+        monkeypatch.setattr(code_index, "INDEX_DIR", tmp_path / "indexes")
+        monkeypatch.setattr(code_index, "_indexes", {})
+        code_index.get_index(package_repo).refresh()
+
+        candidates = code_index.code_candidates("why does Runner.step fail?", root=package_repo)
+
+        assert [c["key"] for c in candidates] == ["code:engine.Runner.step"]
+        assert candidates[0]["kind"] == "code"
+        assert candidates[0]["files"] == ["engine.py"]
+        assert "Called by: engine.Runner.start" in candidates[0]["content"]
@@ -0,0 +1,132 @@
+"""Tests for the completion_cache.py Cerebras completion cache."""
+import pytest
+
+import completion_cache
+
+
+@pytest.fixture(autouse=True)
+def temp_cache(tmp_path, monkeypatch):
+    """Use a temporary cache database during tests."""
+    monkeypatch.setattr(completion_cache, 'CACHE_FILE', tmp_path / "completion_cache.db")
+    monkeypatch.setattr(completion_cache, 'TTL_SECONDS', 3600)
+    yield tmp_path / "completion_cache.db"
+
+
+def _key(prompt="Summarize", **overrides):
+    request = {"model": "m", "system": None, "prompt": prompt, "max_tokens": 100, "json_mode": False}
+    request.update(overrides)
+    return completion_cache.make_key(**request)
+
+
+class TestMakeKey:
+    """Tests for request content addressing."""
+
+    def test_stable(self):
+        """The same request should always produce the same key."""
+        assert _key() == _key()
+
+    def test_every_field_matters(self):
+        """Changing any request field should change the key."""
+        base = _key()
+        assert _key(prompt="Other") != base
+        assert _key(model="other") != base
+        assert _key(system="Be brief") != base
+        assert _key(max_tokens=200) != base
+        assert _key(json_mode=True) != base
+
+    def test_empty_system_same_as_none(self):
+        """No system message and an empty one are the same request."""
+        assert _key(system="") == _key(system=None)
+
+
+class TestCompletionCache:
+    """Tests for get/put and eviction."""
+
+    def test_miss_then_hit(self):
+        """A stored completion should be returned for the same key."""
+        assert completion_cache.get(_key()) is None
+
+        completion_cache.put(_key(), "Short summary")
+
+        assert completion_cache.get(_key()) == "Short summary"
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Expired entries should miss."""
+        now = [1000.0]
+        monkeypatch.setattr(completion_cache.time, 'time', lambda: now[0])
+        completion_cache.put(_key(), "Short summary")
+
+        now[0] += completion_cache.TTL_SECONDS + 1
+
+        assert completion_cache.get(_key()) is None
+
+    def test_size_bounded_lru_eviction(self, monkeypatch):
+        """Least recently used entries should go once the byte budget is exceeded."""
+        monkeypatch.setattr(completion_cache, 'MAX_BYTES', 25)
+        now = [1000.0]
+        monkeypatch.setattr(completion_cache.time, 'time', lambda: now[0])
+
+        completion_cache.put(_key("a"), "A" * 10)
+        now[0] += 1
+        completion_cache.put(_key("b"), "B" * 10)
+        now[0] += 1
+        completion_cache.get(_key("a"))  # a is now more recent than b
+        now[0] += 1
+        completion_cache.put(_key("c"), "C" * 10)
+
+        assert completion_cache.get(_key("a")) == "A" * 10
+        assert completion_cache.get(_key("b")) is None
+        assert completion_cache.get(_key("c")) == "C" * 10
+        stats = completion_cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] == 20
+
+    def test_oversized_response_not_cached(self, monkeypatch):
+        """A response larger than the whole budget should not flush the cache."""
+        monkeypatch.setattr(completion_cache, 'MAX_BYTES', 25)
+        completion_cache.put(_key("a"), "A" * 10)
+
+        completion_cache.put(_key("big"), "X" * 100)
+
+        assert completion_cache.get(_key("a")) == "A" * 10
+        assert completion_cache.get(_key("big")) is None
+
+    def test_empty_response_not_cached(self):
+        """Empty responses should not be cached."""
+        completion_cache.put(_key(), "")
+
+        assert completion_cache.get(_key()) is None
+
+    def test_disabled_with_zero_ttl(self, monkeypatch):
+        """TTL 0 should disable the cache."""
+        monkeypatch.setattr(completion_cache, 'TTL_SECONDS', 0)
+        completion_cache.put(_key(), "Short summary")
+
+        assert completion_cache.get(_key()) is None
+
+
+class TestStats:
+    """Tests for get_stats."""
+
+    def test_hit_rate(self):
+        """Stats should count hits, misses and stored bytes."""
+        completion_cache.get(_key())
+        completion_cache.put(_key(), "Summary")
+        completion_cache.get(_key())
+        completion_cache.get(_key())
+
+        stats = completion_cache.get_stats()
+
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.667)
+        assert stats["entries"] == 1
+        assert stats["bytes"] == len("Summary")
+
+    def test_survives_corrupt_db(self, temp_cache):
+        """A corrupt cache file should degrade to misses, not errors."""
+        temp_cache.write_bytes(b"not a database" * 100)
+
+        assert completion_cache.get(_key()) is None
+        completion_cache.put(_key(), "Summary")
+        assert completion_cache.get_stats()["hits"] == 0
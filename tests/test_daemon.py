@@ -4,12 +4,14 @@ import json
 import os
 import signal
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
+import backboard_client
 import daemon
 
 
@@ -150,22 +152,22 @@ class TestExtractInsights:
     @pytest.mark.asyncio
     async def test_calls_cerebras_and_parses_response(self, monkeypatch):
         """Should call Cerebras and parse response."""
-        mock_complete = mock.MagicMock(return_value='[{"category": "learning", "insight": "test insight"}]')
-        monkeypatch.setattr(daemon.cerebras_client, 'complete', mock_complete)
+        mock_complete = mock.AsyncMock(return_value='[{"category": "learning", "insight": "test insight"}]')
+        monkeypatch.setattr(daemon.cerebras_client, 'acomplete', mock_complete)
 
         result = await daemon.extract_insights("Human: How do I test?\nAssistant: Use pytest.")
 
         assert len(result) == 1
         assert result[0]["category"] == "learning"
         assert result[0]["insight"] == "test insight"
-        mock_complete.assert_called_once()
+        mock_complete.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_handles_cerebras_error(self, monkeypatch, tmp_path):
         """Should handle Cerebras errors gracefully."""
         monkeypatch.setattr(daemon, 'DAEMON_STATE_DIR', tmp_path)
         monkeypatch.setattr(daemon, 'LOG_FILE', tmp_path / "daemon.log")
-        monkeypatch.setattr(daemon.cerebras_client, 'complete', mock.MagicMock(side_effect=Exception("API Error")))
+        monkeypatch.setattr(daemon.cerebras_client, 'acomplete', mock.AsyncMock(side_effect=Exception("API Error")))
 
         result = await daemon.extract_insights("Some conversation")
 
@@ -174,8 +176,8 @@ class TestExtractInsights:
     @pytest.mark.asyncio
     async def test_validates_insights_have_required_fields(self, monkeypatch):
         """Should filter out insights without required fields."""
-        mock_complete = mock.MagicMock(return_value='[{"category": "learning"}, {"insight": "valid"}]')
-        monkeypatch.setattr(daemon.cerebras_client, 'complete', mock_complete)
+        mock_complete = mock.AsyncMock(return_value='[{"category": "learning"}, {"insight": "valid"}]')
+        monkeypatch.setattr(daemon.cerebras_client, 'acomplete', mock_complete)
 
         result = await daemon.extract_insights("Some conversation")
 
@@ -245,7 +247,7 @@ class TestStoreInsights:
         monkeypatch.setattr(daemon, 'DAEMON_STATE_DIR', tmp_path)
         monkeypatch.setattr(daemon, 'LOG_FILE', tmp_path / "daemon.log")
 
-        mock_store = mock.AsyncMock(side_effect=daemon.BackboardError("Connection failed"))
+        mock_store = mock.AsyncMock(side_effect=backboard_client.BackboardError("Connection failed"))
         monkeypatch.setattr(daemon.backboard_client, 'store_message', mock_store)
 
         insights = [{"category": "learning", "insight": "test"}]
@@ -376,15 +378,10 @@ class TestProcessSession:
         monkeypatch.delenv("BACKBOARD_PERSONAL_THREAD_ID", raising=False)
 
         session_file = tmp_path / "test.jsonl"
-        session_file.write_text("")
-
-        # Simulate having new messages
-        mock_get_conv = mock.MagicMock(side_effect=[
-            ("Human: Test\nAssistant: Response", 5),  # First call (incremental)
-            ("Human: Test\nAssistant: Response", 5),  # Second call (full context)
-        ])
-        monkeypatch.setattr(daemon.session_parser, 'get_conversation_text', mock_get_conv)
-        monkeypatch.setattr(daemon.session_parser, 'parse_session_messages', mock.MagicMock(return_value=iter([])))
+        session_file.write_text(
+            '{"type": "user", "message": {"role": "user", "content": "Test"}}\n'
+            '{"type": "assistant", "message": {"role": "assistant", "content": "Response"}}\n'
+        )
 
         mock_extract = mock.AsyncMock(return_value=[{"category": "learning", "insight": "test"}])
         monkeypatch.setattr(daemon, 'extract_insights', mock_extract)
@@ -393,4 +390,72 @@ class TestProcessSession:
         result = await daemon.process_session(session_file, state)
 
         assert result is True
-        mock_extract.assert_called_once()
+        mock_extract.assert_called_once_with("Human: Test\n\nAssistant: Response")
+
+    @pytest.mark.asyncio
+    async def test_reads_new_messages_off_the_event_loop(self, tmp_path, monkeypatch):
+        """The session tail should be read in a worker thread, not on the loop."""
+        monkeypatch.setattr(daemon, 'DAEMON_STATE_DIR', tmp_path)
+        monkeypatch.setattr(daemon, 'STATE_FILE', tmp_path / "state.json")
+        monkeypatch.setattr(daemon, 'LOG_FILE', tmp_path / "daemon.log")
+
+        session_file = tmp_path / "offloop.jsonl"
+        session_file.write_text('{"type": "user", "message": {"role": "user", "content": "Test"}}\n')
+
+        loop_thread = threading.get_ident()
+        read_threads = []
+        read_new = daemon.session_parser.SessionTailer.read_new
+
+        def recording_read_new(tailer):
+            read_threads.append(threading.get_ident())
+            return read_new(tailer)
+
+        monkeypatch.setattr(daemon.session_parser.SessionTailer, 'read_new', recording_read_new)
+
+        state = {"sessions": {}, "extractions_count": 0}
+        await daemon.process_session(session_file, state)
+
+        assert read_threads and loop_thread not in read_threads
+
+
+class TestServerDaemonMode:
+    """Tests for the server's daemon mode sharing the API's event loop."""
+
+    @pytest.mark.asyncio
+    async def test_process_session_blocking_io_runs_off_the_loop(self, tmp_path, monkeypatch):
+        """Tail reads and state writes should happen in worker threads."""
+        import server
+
+        monkeypatch.setattr(server, 'DAEMON_DIR', tmp_path)
+        monkeypatch.setattr(server, 'STATE_FILE', tmp_path / "state.json")
+        monkeypatch.setattr(server, 'MIN_MESSAGES_BATCH', 100)
+
+        session_file = tmp_path / "offloop.jsonl"
+        session_file.write_text('{"type": "user", "message": {"role": "user", "content": "Test"}}\n')
+
+        loop_thread = threading.get_ident()
+        io_threads = []
+        read_new = daemon.session_parser.SessionTailer.read_new
+        write_text = Path.write_text
+
+        def recording_read_new(tailer):
+            io_threads.append(threading.get_ident())
+            return read_new(tailer)
+
+        def recording_write_text(path, *args, **kwargs):
+            io_threads.append(threading.get_ident())
+            return write_text(path, *args, **kwargs)
+
+        monkeypatch.setattr(daemon.session_parser.SessionTailer, 'read_new', recording_read_new)
+        monkeypatch.setattr(Path, 'write_text', recording_write_text)
+
+        mode = server.DaemonMode(mock.Mock())
+        mode.state = {
+            "sessions": {"offloop": {"last_extraction": datetime.now().isoformat()}},
+            "extractions_count": 0,
+        }
+        await mode.process_session(session_file)
+
+        assert len(io_threads) == 2
+        assert loop_thread not in io_threads
+        assert json.loads((tmp_path / "state.json").read_text())["sessions"]["offloop"]["pending_messages"] == 1
@@ -164,11 +164,12 @@ class TestResumeCommand:
                 "is_stale": False
             }
             mock_restore.detect_conflicts.return_value = []
-            mock_restore.generate_restoration_message.return_value = "Welcome back!"
+            mock_restore.stream_restoration_message.return_value = iter(["Welcome ", "back!"])
 
             result = cli_runner.invoke(flow.cli, ['resume'])
 
             assert result.exit_code == 0
+            assert "Welcome back!" in result.output
             mock_memory.get_latest_session.assert_called_once()
 
 
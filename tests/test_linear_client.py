@@ -363,3 +363,42 @@ class TestDocuments:
 
                 assert result == existing_doc
                 mock_update.assert_called_once_with("existing-doc", "# Updated")
+
+
+class TestFetchDocuments:
+    """Tests for fetch_documents (used by the local document mirror)."""
+
+    @pytest.mark.asyncio
+    async def test_pages_through_results(self):
+        """fetch_documents should follow endCursor until the last page."""
+        pages = [
+            {"data": {"documents": {
+                "nodes": [{"id": "d1"}],
+                "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+            }}},
+            {"data": {"documents": {
+                "nodes": [{"id": "d2"}],
+                "pageInfo": {"hasNextPage": False, "endCursor": "c2"},
+            }}},
+        ]
+
+        with mock.patch.object(linear_client, 'linear_query', side_effect=pages) as mock_query:
+            docs = await linear_client.fetch_documents(
+                updated_since="2024-01-01T00:00:00.000Z", project_id="proj-123"
+            )
+
+        assert [d["id"] for d in docs] == ["d1", "d2"]
+        first_vars, second_vars = (call.args[1] for call in mock_query.call_args_list)
+        assert first_vars["after"] is None
+        assert second_vars["after"] == "c1"
+        assert first_vars["filter"] == {
+            "updatedAt": {"gte": "2024-01-01T00:00:00.000Z"},
+            "project": {"id": {"eq": "proj-123"}},
+        }
+
+    @pytest.mark.asyncio
+    async def test_raises_on_graphql_errors(self):
+        """GraphQL errors should fail the sync instead of looking like no changes."""
+        with mock.patch.object(linear_client, 'linear_query', return_value={"errors": [{"message": "bad"}]}):
+            with pytest.raises(RuntimeError):
+                await linear_client.fetch_documents()
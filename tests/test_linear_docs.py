@@ -0,0 +1,179 @@
+"""Tests for the local Linear document mirror (linear_docs.py)."""
+from unittest import mock
+
+import pytest
+
+import linear_client
+import linear_docs
+from linear_docs import LinearDocMirror
+
+
+def doc(doc_id, title, content, updated, archived=None):
+    return {
+        "id": doc_id,
+        "title": title,
+        "content": content,
+        "url": f"https://linear.app/doc/{doc_id}",
+        "createdAt": "2024-01-01T00:00:00.000Z",
+        "updatedAt": updated,
+        "archivedAt": archived,
+    }
+
+
+@pytest.fixture
+def fetch(monkeypatch):
+    """Fake linear_client.fetch_documents; set return_value per sync."""
+    monkeypatch.delenv("LINEAR_PROJECT_ID", raising=False)
+    fake = mock.AsyncMock(return_value=[])
+    monkeypatch.setattr(linear_client, "fetch_documents", fake)
+    return fake
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return LinearDocMirror(tmp_path / "linear")
+
+
+# A long document whose relevant section is far past the old 500-char snippet
+LONG_CONTENT = "Intro paragraph.\n" * 100 + "Webhook retries use exponential backoff with jitter."
+
+
+class TestSync:
+    """Tests for incremental and full sync."""
+
+    async def test_first_sync_is_full(self, mirror, fetch):
+        fetch.return_value = [
+            doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z"),
+            doc("d2", "Billing", "Invoices are generated nightly.", "2024-03-02T00:00:00.000Z"),
+        ]
+
+        stats = await mirror.sync()
+
+        assert stats == {"full": True, "fetched": 2, "updated": 2, "removed": 0, "documents": 2}
+        assert fetch.call_args.kwargs["updated_since"] is None
+        assert mirror.state()["cursor"] == "2024-03-02T00:00:00.000Z"
+        assert mirror.is_synced()
+
+    async def test_incremental_sync_uses_cursor(self, mirror, fetch):
+        fetch.return_value = [
+            doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z"),
+            doc("d2", "Billing", "Invoices are generated nightly.", "2024-03-02T00:00:00.000Z"),
+        ]
+        await mirror.sync()
+        fetch.return_value = [
+            doc("d2", "Billing", "Invoices are generated hourly.", "2024-03-05T00:00:00.000Z"),
+            doc("d1", "Webhooks", "", "2024-03-06T00:00:00.000Z", archived="2024-03-06T00:00:00.000Z"),
+        ]
+
+        stats = await mirror.sync()
+
+        assert stats["full"] is False
+        assert fetch.call_args.kwargs["updated_since"] == "2024-03-02T00:00:00.000Z"
+        assert stats["updated"] == 1
+        assert stats["removed"] == 1
+        assert [d["id"] for d in mirror.search("invoices hourly")] == ["d2"]
+        assert "d1" not in [d["id"] for d in mirror.search("webhook retries")]
+        assert mirror.state()["cursor"] == "2024-03-06T00:00:00.000Z"
+
+    async def test_full_sync_drops_deleted_documents(self, mirror, fetch):
+        fetch.return_value = [
+            doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z"),
+            doc("d2", "Billing", "Invoices are generated nightly.", "2024-03-02T00:00:00.000Z"),
+        ]
+        await mirror.sync()
+        fetch.return_value = [doc("d2", "Billing", "Invoices are generated nightly.", "2024-03-02T00:00:00.000Z")]
+
+        stats = await mirror.sync(full=True)
+
+        assert stats["removed"] == 1
+        assert stats["documents"] == 1
+        assert "d1" not in [d["id"] for d in mirror.search("webhook retries")]
+
+    async def test_project_change_resets_mirror(self, mirror, fetch, monkeypatch):
+        fetch.return_value = [doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z")]
+        await mirror.sync()
+        monkeypatch.setenv("LINEAR_PROJECT_ID", "proj-2")
+        assert not mirror.is_synced("proj-2")
+        fetch.return_value = [doc("d9", "Roadmap", "Q3 goals.", "2024-03-01T00:00:00.000Z")]
+
+        stats = await mirror.sync()
+
+        assert stats["full"] is True
+        assert fetch.call_args.kwargs["project_id"] == "proj-2"
+        assert stats["documents"] == 1
+        assert mirror.is_synced("proj-2")
+
+    async def test_unchanged_documents_are_not_reembedded(self, mirror, fetch):
+        """The inclusive cursor refetches the newest document; it should not be re-added."""
+        newest = doc("d2", "Billing", "Invoices are generated nightly.", "2024-03-02T00:00:00.000Z")
+        fetch.return_value = [doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z"), newest]
+        await mirror.sync()
+        fetch.return_value = [newest]
+
+        with mock.patch.object(mirror.vectors, "add_records") as add:
+            stats = await mirror.sync()
+
+        assert stats["updated"] == 0
+        assert add.call_args.args[1] == []
+
+    async def test_metadata_only_update_skips_embedding(self, mirror, fetch):
+        fetch.return_value = [doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z")]
+        await mirror.sync()
+        fetch.return_value = [doc("d1", "Webhooks", LONG_CONTENT, "2024-03-04T00:00:00.000Z")]
+
+        with mock.patch.object(mirror.vectors, "add_records") as add:
+            stats = await mirror.sync()
+
+        assert stats["updated"] == 1
+        assert add.call_args.args[1] == []
+
+    async def test_model_change_forces_full_sync(self, mirror, fetch):
+        pytest.importorskip("numpy")
+        fetch.return_value = [doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z")]
+        await mirror.sync()
+        (mirror.vectors.directory / "meta.json").write_text('{"model": "other-model", "dim": 384}')
+
+        assert mirror.search("webhook retries")[0]["id"] == "d1"
+
+        stats = await mirror.sync()
+
+        assert stats["full"] is True
+        assert fetch.call_args.kwargs["updated_since"] is None
+        assert mirror.vectors.is_current()
+
+
+class TestSearch:
+    """Tests for local document search."""
+
+    async def test_finds_text_deep_in_long_documents(self, mirror, fetch):
+        fetch.return_value = [doc("d1", "Webhooks", LONG_CONTENT, "2024-03-01T00:00:00.000Z")]
+        await mirror.sync()
+
+        results = mirror.search("webhook retries backoff")
+
+        assert results[0]["id"] == "d1"
+        assert results[0]["url"] == "https://linear.app/doc/d1"
+        assert "exponential backoff" in results[0]["content"]
+        assert len(results[0]["content"]) <= linear_docs.SNIPPET_CHARS
+
+    async def test_semantic_match(self, mirror, fetch):
+        """Inflected words should still match through the embedding index."""
+        pytest.importorskip("numpy")
+        fetch.return_value = [doc("d1", "Caching", "We cache rendered pages at the edge.", "2024-03-01T00:00:00.000Z")]
+        await mirror.sync()
+
+        assert [d["id"] for d in mirror.search("caches")] == ["d1"]
+
+    async def test_search_documents_falls_back_until_synced(self, tmp_path, fetch, monkeypatch):
+        monkeypatch.setattr(linear_docs, "LINEAR_DIR", tmp_path / "linear")
+        monkeypatch.setattr(linear_docs, "_mirrors", {})
+        remote = mock.AsyncMock(return_value=[{"id": "remote"}])
+        monkeypatch.setattr(linear_client, "search_documents", remote)
+
+        assert await linear_docs.search_documents("billing") == [{"id": "remote"}]
+
+        fetch.return_value = [doc("d2", "Billing", "Invoices are generated nightly.", "2024-03-02T00:00:00.000Z")]
+        await linear_docs.get_mirror().sync()
+
+        assert [d["id"] for d in await linear_docs.search_documents("billing")] == ["d2"]
+        remote.assert_called_once()
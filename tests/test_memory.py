@@ -246,6 +246,13 @@ class TestLearningsManagement:
 
         assert len(all_learnings) == 2
 
+    def test_mark_synced(self, temp_storage_dir):
+        """mark_synced should set the synced flag on matching learnings."""
+        memory.save_learning({"id": "learning_x", "text": "Sync me"})
+
+        assert memory.mark_synced(["learning_x", "learning_missing"]) == 1
+        assert memory.get_learning("learning_x")["synced"] is True
+
     def test_get_all_learnings_filter_by_team(self, temp_storage_dir):
         """get_all_learnings should filter by team flag."""
         memory.save_learning({"text": "Personal learning", "team": False})
@@ -337,3 +344,492 @@ class TestAtomicWrites:
         result = memory._safe_read(filepath, {"default": True})
 
         assert result == {"default": True}
+
+
+@pytest.fixture
+def sqlite_storage_dir(temp_storage_dir):
+    """Use the SQLite backend inside the temporary storage directory."""
+    with mock.patch.object(memory, 'STORAGE_BACKEND', "sqlite"):
+        yield temp_storage_dir
+    memory.get_backend("sqlite").close()
+
+
+class TestSQLiteBackend:
+    """Tests for the SQLite storage backend behind the memory API."""
+
+    def test_uses_database_file(self, sqlite_storage_dir):
+        """SQLite backend should store data in memory.db, not learnings.json."""
+        memory.save_learning({"text": "Stored in SQLite", "tags": ["db"]})
+
+        assert (sqlite_storage_dir / "memory.db").exists()
+        assert json.loads((sqlite_storage_dir / "learnings.json").read_text()) == []
+
+    def test_learnings_newest_first(self, sqlite_storage_dir):
+        """get_all_learnings should return most recent learning first."""
+        memory.save_learning({"id": "learning_a", "text": "First"})
+        memory.save_learning({"id": "learning_b", "text": "Second"})
+
+        learnings = memory.get_all_learnings()
+
+        assert [item["id"] for item in learnings] == ["learning_b", "learning_a"]
+
+    def test_duplicate_learning_ids_preserved(self, sqlite_storage_dir):
+        """Learnings saved in the same second share an ID and must both be kept."""
+        memory.save_learning({"id": "learning_same", "text": "One"})
+        memory.save_learning({"id": "learning_same", "text": "Two"})
+
+        assert len(memory.get_all_learnings()) == 2
+
+    def test_search_and_team_filter(self, sqlite_storage_dir):
+        """search_learnings and team filters should match the JSON backend."""
+        memory.save_learning({"text": "Learning about auth", "tags": ["auth"], "team": True})
+        memory.save_learning({"text": "Learning about database", "tags": ["database"]})
+
+        results = memory.search_learnings("learning", tags=["auth"])
+
+        assert len(results) == 1
+        assert "auth" in results[0]["tags"]
+        assert len(memory.get_all_learnings(team=True)) == 1
+        assert len(memory.get_all_learnings(team=False)) == 1
+
+    def test_get_learning_by_id(self, sqlite_storage_dir):
+        """get_learning should look up a learning by ID."""
+        memory.save_learning({"id": "learning_x", "text": "Find me"})
+
+        assert memory.get_learning("learning_x")["text"] == "Find me"
+        assert memory.get_learning("learning_missing") is None
+
+    def test_mark_synced(self, sqlite_storage_dir):
+        """mark_synced should flag learnings once their remote write lands."""
+        memory.save_learning({"id": "learning_x", "text": "Sync me"})
+        memory.save_learning({"id": "learning_y", "text": "Not yet"})
+
+        assert memory.mark_synced(["learning_x"]) == 1
+        assert memory.mark_synced(["learning_x"]) == 0
+
+        assert memory.get_learning("learning_x")["synced"] is True
+        assert memory.get_learning("learning_y")["synced"] is False
+
+    def test_sessions_resave_moves_to_front(self, sqlite_storage_dir):
+        """Re-saving a session should replace it and make it the latest."""
+        memory.save_session({"id": "session_1", "context": {"summary": "One"}, "git": {"branch": "main"}})
+        memory.save_session({"id": "session_2", "context": {"summary": "Two"}, "git": {"branch": "dev"}})
+        memory.save_session({"id": "session_1", "context": {"summary": "One again"}, "git": {"branch": "main"}})
+
+        sessions = memory.list_sessions()
+
+        assert [s["id"] for s in sessions] == ["session_1", "session_2"]
+        assert memory.get_latest_session()["context"]["summary"] == "One again"
+        assert len(memory.list_sessions(branch="dev")) == 1
+
+    def test_stats(self, sqlite_storage_dir):
+        """get_stats should count through the database."""
+        memory.save_session({"id": "session_1", "context": {"summary": "S"}})
+        memory.save_learning({"text": "Personal", "team": False})
+        memory.save_learning({"text": "Team", "team": True})
+
+        stats = memory.get_stats()
+
+        assert stats["sessions_count"] == 1
+        assert stats["personal_learnings"] == 1
+        assert stats["team_learnings"] == 1
+        assert stats["total_learnings"] == 2
+
+
+class TestMigration:
+    """Tests for migrating the JSON layout into SQLite."""
+
+    def test_migrate_preserves_order_and_data(self, temp_storage_dir):
+        """migrate_to_sqlite should copy sessions and learnings in order."""
+        memory.save_session({"id": "session_1", "context": {"summary": "Old"}, "git": {"branch": "main"}})
+        memory.save_session({"id": "session_2", "context": {"summary": "New"}, "git": {"branch": "main"}})
+        memory.save_learning({"id": "learning_1", "text": "Old learning", "tags": ["a"]})
+        memory.save_learning({"id": "learning_2", "text": "New learning", "tags": ["b"]})
+
+        result = memory.migrate_to_sqlite()
+
+        assert result == {"sessions": 2, "learnings": 2, "skipped": False}
+        with mock.patch.object(memory, 'STORAGE_BACKEND', "sqlite"):
+            assert [s["id"] for s in memory.list_sessions()] == ["session_2", "session_1"]
+            assert [item["id"] for item in memory.get_all_learnings()] == ["learning_2", "learning_1"]
+            assert memory.load_session("session_1")["context"]["summary"] == "Old"
+        memory.get_backend("sqlite").close()
+
+    def test_migrate_is_one_shot(self, temp_storage_dir):
+        """A second migration should not duplicate records."""
+        memory.save_learning({"id": "learning_1", "text": "Only once"})
+
+        memory.migrate_to_sqlite()
+        result = memory.migrate_to_sqlite()
+
+        assert result["skipped"] is True
+        assert memory.get_backend("sqlite").count_learnings() == 1
+        memory.get_backend("sqlite").close()
+
+
+class TestReadCache:
+    """Tests for the in-process JSON read cache."""
+
+    def test_repeated_reads_hit_cache(self, temp_storage_dir):
+        """Reading unchanged learnings twice should parse the file once."""
+        memory.save_learning({"text": "Cached learning"})
+        before = memory.get_cache_stats()
+
+        memory.get_all_learnings()
+        memory.get_all_learnings()
+
+        after = memory.get_cache_stats()
+        assert after["hits"] - before["hits"] == 2
+        assert after["misses"] == before["misses"]
+
+    def test_external_write_invalidates(self, temp_storage_dir):
+        """A write by another process should be picked up on next read."""
+        memory.save_learning({"text": "Original"})
+        memory.get_all_learnings()
+
+        learnings_file = temp_storage_dir / "learnings.json"
+        memory._atomic_write(learnings_file, [{"id": "learning_ext", "text": "From daemon"}])
+
+        learnings = memory.get_all_learnings()
+        assert [item["id"] for item in learnings] == ["learning_ext"]
+
+    def test_results_are_copies(self, temp_storage_dir):
+        """Mutating a returned list must not corrupt the cache."""
+        memory.save_learning({"text": "Keep me"})
+
+        memory.get_all_learnings().clear()
+
+        assert len(memory.get_all_learnings()) == 1
+
+    def test_returned_records_are_copies(self, temp_storage_dir):
+        """Mutating a returned record, or its tags, must not corrupt the cache."""
+        memory.save_learning({"id": "learning_1", "text": "Keep me", "tags": ["redis"]})
+
+        learning = memory.get_all_learnings()[0]
+        learning["text"] = "Changed"
+        learning["tags"].append("leaked")
+
+        assert memory.get_all_learnings()[0]["text"] == "Keep me"
+        assert memory.get_all_learnings()[0]["tags"] == ["redis"]
+        assert memory.get_recent_learnings(1)[0] is not memory.get_recent_learnings(1)[0]
+
+    def test_saved_dict_is_not_cached(self, temp_storage_dir):
+        """The caller's dict must not become the cached record."""
+        learning = {"id": "learning_1", "text": "Original", "tags": ["redis"]}
+        memory.save_learning(learning)
+
+        learning["text"] = "Changed after save"
+        learning["tags"].append("leaked")
+
+        assert memory.get_all_learnings()[0]["text"] == "Original"
+        assert memory.get_all_learnings()[0]["tags"] == ["redis"]
+
+
+class TestSearchIndex:
+    """Tests for the BM25 full-text index."""
+
+    def test_ranks_by_relevance(self, temp_storage_dir):
+        """Learnings mentioning a term more specifically should rank first."""
+        memory.save_learning({"id": "learning_1", "text": "Deployed the frontend today"})
+        memory.save_learning({"id": "learning_2", "text": "Redis cache eviction uses LRU", "tags": ["redis"]})
+        memory.save_learning({"id": "learning_3", "text": "Unrelated note about Redis and frontend and deploys"})
+
+        results = memory.search_learnings("redis")
+
+        assert [item["id"] for item in results] == ["learning_2", "learning_3"]
+
+    def test_prefix_match(self, temp_storage_dir):
+        """A short query term should match longer indexed words."""
+        memory.save_learning({"text": "Authentication uses JWT tokens"})
+
+        results = memory.search_learnings("auth")
+
+        assert len(results) == 1
+
+    def test_prefix_expansions_do_not_outrank_exact_match(self, temp_storage_dir):
+        """A doc with several words sharing the prefix should not beat an exact hit."""
+        memory.save_learning({"id": "learning_1", "text": "Cache warmed on deploy"})
+        memory.save_learning({"id": "learning_2", "text": "Cached pages, caches and caching layers"})
+
+        results = memory.search_learnings("cache")
+
+        assert [item["id"] for item in results] == ["learning_1", "learning_2"]
+
+    def test_session_replaced_on_resave(self, temp_storage_dir):
+        """Re-saving a session should replace its indexed text."""
+        memory.save_session({"id": "session_1", "context": {"summary": "Working on billing"}})
+        memory.save_session({"id": "session_1", "context": {"summary": "Working on search"}})
+
+        assert memory.search_sessions("billing") == []
+        results = memory.search_sessions("search")
+        assert [s["id"] for s in results] == ["session_1"]
+
+    def test_search_sessions_fields(self, temp_storage_dir):
+        """Session search should cover decisions and return a compact payload."""
+        memory.save_session({
+            "id": "session_1",
+            "context": {"summary": "Refactor", "decisions": ["Use postgres for jobs"]},
+            "git": {"branch": "feature/jobs"},
+        })
+
+        results = memory.search_sessions("postgres")
+
+        assert results[0]["branch"] == "feature/jobs"
+        assert results[0]["context"]["decisions"] == ["Use postgres for jobs"]
+
+    def test_rebuilds_when_out_of_sync(self, temp_storage_dir):
+        """Data written without the index should be indexed on first search."""
+        memory.init_storage()
+        memory._atomic_write(temp_storage_dir / "learnings.json", [
+            {"id": "learning_old", "text": "Kubernetes probes need timeouts", "tags": []},
+        ])
+
+        results = memory.search_learnings("kubernetes")
+
+        assert [item["id"] for item in results] == ["learning_old"]
+
+    def test_duplicate_ids_preserved(self, temp_storage_dir):
+        """Learnings sharing an id (same second) should both be searchable."""
+        memory.save_learning({"id": "learning_same", "text": "First graphql note"})
+        memory.save_learning({"id": "learning_same", "text": "Second graphql note"})
+
+        assert len(memory.search_learnings("graphql")) == 2
+
+    def test_limit_decodes_only_top_results(self, temp_storage_dir):
+        """A limit should return the best matches and decode just those payloads."""
+        memory.save_learnings([{"text": f"Redis note {i}" + " redis" * (i % 3)} for i in range(30)])
+        ranked = memory.search_learnings("redis")
+
+        from search_index import SearchIndex
+        with mock.patch.object(SearchIndex, "_payloads", autospec=True,
+                               side_effect=SearchIndex._payloads) as payloads:
+            top = memory.search_learnings("redis", limit=5)
+
+        assert [item["id"] for item in top] == [item["id"] for item in ranked[:5]]
+        assert payloads.call_count == 1
+        assert len(payloads.call_args.args[2]) == 5
+
+    def test_limit_with_tag_filter(self, temp_storage_dir):
+        """Tag filtering should happen before the limit is applied."""
+        memory.save_learnings(
+            [{"text": "Webhook retries", "tags": ["ops"]}]
+            + [{"text": "Webhook webhook payloads", "tags": ["api"]} for _ in range(10)]
+        )
+
+        results = memory.search_learnings("webhook", tags=["ops"], limit=1)
+
+        assert [item["tags"] for item in results] == [["ops"]]
+
+
+class TestSaveLearnings:
+    """Tests for batch learning ingestion."""
+
+    def test_order_matches_sequential_saves(self, temp_storage_dir):
+        """The last item in a batch should be the most recent."""
+        memory.save_learning({"id": "learning_0", "text": "Existing"})
+
+        ids = memory.save_learnings([
+            {"id": "learning_1", "text": "First"},
+            {"id": "learning_2", "text": "Second"},
+        ])
+
+        assert ids == ["learning_1", "learning_2"]
+        assert [item["id"] for item in memory.get_all_learnings()] == ["learning_2", "learning_1", "learning_0"]
+
+    def test_single_write(self, temp_storage_dir):
+        """A batch should rewrite learnings.json once."""
+        import storage
+        memory.init_storage()
+
+        with mock.patch.object(storage, 'write_cached_list', wraps=storage.write_cached_list) as write:
+            memory.save_learnings([{"text": f"Insight {i}"} for i in range(10)])
+
+        assert write.call_count == 1
+        assert len(memory.get_all_learnings()) == 10
+
+    def test_fields_filled(self, temp_storage_dir):
+        """Batch items should get ids, timestamps and synced flags."""
+        memory.save_learnings([{"text": "No id"}])
+
+        learning = memory.get_all_learnings()[0]
+        assert learning["id"].startswith("learning_")
+        assert learning["timestamp"]
+        assert learning["synced"] is False
+
+    def test_generated_ids_are_unique(self, temp_storage_dir):
+        """Id-less items saved together should not share an id."""
+        ids = memory.save_learnings([{"text": "First"}, {"text": "Second"}])
+
+        assert len(set(ids)) == 2
+        assert {item["id"] for item in memory.get_all_learnings()} == set(ids)
+
+    def test_indexed(self, temp_storage_dir):
+        """Batch learnings should be keyword searchable."""
+        memory.save_learnings([{"text": "Flaky selenium tests"}, {"text": "Cache warmup"}])
+
+        assert [item["text"] for item in memory.search_learnings("selenium")] == ["Flaky selenium tests"]
+
+    def test_sqlite_batch(self, sqlite_storage_dir):
+        """The SQLite backend should store a batch in order."""
+        memory.save_learnings([
+            {"id": "learning_1", "text": "First", "tags": ["a"]},
+            {"id": "learning_2", "text": "Second", "tags": ["a"]},
+        ])
+
+        assert [item["id"] for item in memory.get_all_learnings()] == ["learning_2", "learning_1"]
+        assert len(memory.search_learnings("", tags=["a"])) == 2
+
+    def test_empty_batch(self, temp_storage_dir):
+        """An empty batch should be a no-op."""
+        assert memory.save_learnings([]) == []
+
+
+class TestTagIndex:
+    """Tests for the tag index kept alongside the store."""
+
+    def test_saves_update_top_tags(self, temp_storage_dir):
+        memory.save_learning({"text": "One", "tags": ["redis", "cache"]})
+        memory.save_learnings([{"text": "Two", "tags": ["redis"]}, {"text": "Three", "tags": []}])
+
+        assert memory.get_top_tags() == [("redis", 2), ("cache", 1)]
+        assert memory.get_top_tag_pairs() == [("cache", "redis", 1)]
+
+    def test_rebuilds_when_out_of_sync(self, temp_storage_dir):
+        """Learnings written without the index should be counted."""
+        memory.init_storage()
+        memory._atomic_write(temp_storage_dir / "learnings.json", [
+            {"id": "learning_old", "text": "Old", "tags": ["legacy"]},
+        ])
+
+        assert memory.get_top_tags() == [("legacy", 1)]
+
+    def test_data_version_tracks_writes(self, temp_storage_dir):
+        """Every kind of write should change the data version."""
+        versions = [memory.data_version()]
+        memory.save_learning({"id": "learning_1", "text": "One"})
+        versions.append(memory.data_version())
+        memory.save_session({"id": "session_1", "context": {"summary": "S"}})
+        versions.append(memory.data_version())
+        memory.save_session({"id": "session_1", "context": {"summary": "S2"}})
+        versions.append(memory.data_version())
+        memory.mark_synced(["learning_1"])
+        versions.append(memory.data_version())
+
+        assert len(set(versions)) == len(versions)
+        assert memory.data_version() == versions[-1]
+
+    def test_recent_learnings(self, temp_storage_dir):
+        memory.save_learnings([{"id": f"learning_{i}", "text": str(i)} for i in range(5)])
+
+        assert [item["id"] for item in memory.get_recent_learnings(2)] == ["learning_4", "learning_3"]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def any_storage_dir(request, temp_storage_dir):
+    """Run a test against both storage backends."""
+    with mock.patch.object(memory, 'STORAGE_BACKEND', request.param):
+        yield temp_storage_dir
+    if request.param == "sqlite":
+        memory.get_backend("sqlite").close()
+
+
+class TestPagination:
+    """Tests for keyset pagination of sessions and learnings."""
+
+    def walk(self, fetch, **kwargs):
+        """Follow next_cursor to the end, collecting ids per page."""
+        pages, cursor = [], None
+        while True:
+            result = fetch(cursor=cursor, **kwargs)
+            pages.append([item["id"] for item in result["items"]])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                return pages, result["total"]
+
+    def test_learning_pages_follow_cursor(self, any_storage_dir):
+        memory.save_learnings([{"id": f"learning_{i}", "text": str(i)} for i in range(7)])
+
+        pages, total = self.walk(memory.page_learnings, limit=3)
+
+        assert pages == [
+            ["learning_6", "learning_5", "learning_4"],
+            ["learning_3", "learning_2", "learning_1"],
+            ["learning_0"],
+        ]
+        assert total == 7
+
+    def test_exact_multiple_has_no_empty_page(self, any_storage_dir):
+        memory.save_learnings([{"id": f"learning_{i}", "text": str(i)} for i in range(4)])
+
+        pages, _ = self.walk(memory.page_learnings, limit=2)
+
+        assert len(pages) == 2
+
+    def test_duplicate_ids_are_not_skipped(self, any_storage_dir):
+        """Batch learnings share an id and timestamp; each must appear once."""
+        memory.save_learnings([{"text": str(i)} for i in range(5)])
+
+        pages, _ = self.walk(memory.page_learnings, limit=2)
+
+        assert sum(len(page) for page in pages) == 5
+
+    def test_learning_filters(self, any_storage_dir):
+        memory.save_learnings([
+            {"id": f"learning_{i}", "text": str(i), "tags": ["even"] if i % 2 == 0 else [], "team": i < 3}
+            for i in range(6)
+        ])
+
+        pages, total = self.walk(memory.page_learnings, limit=2, tag="even")
+        assert pages == [["learning_4", "learning_2"], ["learning_0"]]
+        assert total == 3
+
+        result = memory.page_learnings(limit=10, team=True, tag="even")
+        assert [item["id"] for item in result["items"]] == ["learning_2", "learning_0"]
+        assert result["total"] == 2
+
+    def test_new_records_do_not_shift_pages(self, any_storage_dir):
+        """Learnings saved while paging should not repeat or skip records."""
+        memory.save_learnings([{"id": f"learning_{i}", "text": str(i)} for i in range(4)])
+        first = memory.page_learnings(limit=2)
+
+        memory.save_learning({"id": "learning_new", "text": "new"})
+        second = memory.page_learnings(limit=2, cursor=first["next_cursor"])
+
+        assert [item["id"] for item in second["items"]] == ["learning_1", "learning_0"]
+
+    def test_offset_pages(self, any_storage_dir):
+        memory.save_learnings([{"id": f"learning_{i}", "text": str(i)} for i in range(5)])
+
+        result = memory.page_learnings(limit=2, offset=2)
+
+        assert [item["id"] for item in result["items"]] == ["learning_2", "learning_1"]
+
+    def test_session_pages_and_branch_filter(self, any_storage_dir):
+        for i in range(5):
+            memory.save_session({
+                "id": f"session_{i}",
+                "context": {"summary": f"Session {i}"},
+                "git": {"branch": "main" if i % 2 == 0 else "feature"},
+            })
+
+        pages, total = self.walk(memory.page_sessions, limit=2)
+        assert pages == [["session_4", "session_3"], ["session_2", "session_1"], ["session_0"]]
+        assert total == 5
+
+        pages, total = self.walk(memory.page_sessions, limit=2, branch="main")
+        assert pages == [["session_4", "session_2"], ["session_0"]]
+        assert total == 3
+
+    def test_full_sessions_loaded_in_batch(self, any_storage_dir):
+        memory.save_session({"id": "session_1", "context": {"summary": "One", "decisions": ["a"]}})
+
+        result = memory.page_sessions(limit=5, full=True)
+
+        assert result["items"][0]["context"]["decisions"] == ["a"]
+        assert memory.load_sessions(["session_1", "missing"]).keys() == {"session_1"}
+
+    def test_invalid_cursor(self, any_storage_dir):
+        with pytest.raises(ValueError):
+            memory.page_learnings(cursor="abc")
+        with pytest.raises(ValueError):
+            memory.page_sessions(cursor="0")
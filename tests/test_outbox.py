@@ -0,0 +1,229 @@
+"""Tests for the outbox.py durable remote-write queue."""
+import asyncio
+from unittest import mock
+
+import pytest
+
+import backboard_client
+import memory
+import outbox
+
+
+@pytest.fixture(autouse=True)
+def temp_outbox(tmp_path, monkeypatch):
+    """Use a temporary outbox database and local store during tests."""
+    monkeypatch.setattr(outbox, 'OUTBOX_FILE', tmp_path / "outbox.db")
+    with mock.patch.object(memory, 'STORAGE_DIR', tmp_path), \
+         mock.patch.object(memory, 'SESSIONS_DIR', tmp_path / "sessions"), \
+         mock.patch.object(memory, 'CONFIG_FILE', tmp_path / "config.json"), \
+         mock.patch.object(memory, 'SESSIONS_INDEX', tmp_path / "sessions" / "index.json"), \
+         mock.patch.object(memory, 'LEARNINGS_FILE', tmp_path / "learnings.json"):
+        yield tmp_path
+
+
+def _message(thread_id="thread_1", content="hello", learning_id=None):
+    return {
+        "kind": outbox.BACKBOARD_MESSAGE,
+        "target": thread_id,
+        "payload": {"content": content, "metadata": {"type": "learning"}},
+        "learning_id": learning_id,
+    }
+
+
+class TestQueue:
+    """Tests for enqueue/claim/complete/retry."""
+
+    def test_enqueue_and_claim(self):
+        """Claimed jobs should come back oldest first with their payload."""
+        outbox.enqueue_many([_message(content="first"), _message(content="second")])
+
+        jobs = outbox.claim(10)
+
+        assert [job["payload"]["content"] for job in jobs] == ["first", "second"]
+        assert jobs[0]["target"] == "thread_1"
+
+    def test_claim_leases_jobs(self):
+        """A claimed job should not be handed to a second drainer."""
+        outbox.enqueue(**_message())
+
+        assert len(outbox.claim(10)) == 1
+        assert outbox.claim(10) == []
+
+    def test_expired_lease_is_reclaimed(self, monkeypatch):
+        """Jobs from a crashed drainer should become due again."""
+        now = [1000.0]
+        monkeypatch.setattr(outbox.time, "time", lambda: now[0])
+        outbox.enqueue(**_message())
+        outbox.claim(10)
+
+        now[0] += outbox.LEASE_SECONDS + 1
+
+        assert len(outbox.claim(10)) == 1
+
+    def test_complete_removes_jobs(self):
+        """Completed jobs should leave the queue."""
+        outbox.enqueue(**_message())
+        jobs = outbox.claim(10)
+
+        outbox.complete([job["id"] for job in jobs])
+
+        assert outbox.get_stats()["depth"] == 0
+        assert outbox.get_stats()["sent"] == 1
+
+    def test_complete_reports_settled_learnings(self):
+        """A learning settles only when all of its jobs are done."""
+        outbox.enqueue_many([
+            _message("personal", learning_id="learning_1"),
+            _message("team", learning_id="learning_1"),
+        ])
+        first, second = outbox.claim(10)
+
+        assert outbox.complete([first["id"]]) == []
+        assert outbox.complete([second["id"]]) == ["learning_1"]
+
+    def test_retry_backs_off(self, monkeypatch):
+        """A failed job should not be due until its backoff has passed."""
+        now = [1000.0]
+        monkeypatch.setattr(outbox.time, "time", lambda: now[0])
+        outbox.enqueue(**_message())
+        job = outbox.claim(10)[0]
+
+        assert outbox.retry(job, "boom") == "pending"
+        now[0] += outbox.backoff(1) - 0.5
+        assert outbox.claim(10) == []
+        now[0] += 1
+        assert outbox.claim(10)[0]["attempts"] == 1
+
+    def test_retry_gives_up_after_max_attempts(self):
+        """Jobs should be parked as failed instead of retrying forever."""
+        outbox.enqueue(**_message())
+        job = outbox.claim(10)[0]
+        job["attempts"] = outbox.MAX_ATTEMPTS - 1
+
+        assert outbox.retry(job, "boom") == "failed"
+        stats = outbox.get_stats()
+        assert stats["failed"] == 1
+        assert stats["depth"] == 0
+
+    def test_requeue_failed(self):
+        """requeue_failed should make parked jobs pending again."""
+        outbox.enqueue(**_message())
+        job = outbox.claim(10)[0]
+        job["attempts"] = outbox.MAX_ATTEMPTS
+        outbox.retry(job, "boom")
+
+        assert outbox.requeue_failed() == 1
+        assert len(outbox.claim(10)) == 1
+
+    def test_pause_blocks_claims(self):
+        """No jobs should be handed out while paused."""
+        outbox.enqueue(**_message())
+        outbox.pause(60)
+
+        assert outbox.claim(10) == []
+        assert outbox.get_stats()["paused_for_seconds"] > 0
+
+    def test_stats_drain_lag(self, monkeypatch):
+        """Drain lag should be the age of the oldest pending job."""
+        now = [1000.0]
+        monkeypatch.setattr(outbox.time, "time", lambda: now[0])
+        outbox.enqueue(**_message())
+        now[0] += 30
+        outbox.enqueue(**_message())
+
+        stats = outbox.get_stats()
+
+        assert stats["depth"] == 2
+        assert stats["drain_lag_seconds"] == 30.0
+
+
+class TestDrain:
+    """Tests for drain_once and OutboxWorker."""
+
+    @pytest.mark.asyncio
+    async def test_drain_sends_and_marks_synced(self):
+        """Sent learnings should be flagged synced locally."""
+        learning_id = memory.save_learning({"insight": "Use WAL mode", "tags": []})
+        outbox.enqueue(**_message(content="Use WAL mode", learning_id=learning_id))
+
+        with mock.patch.object(backboard_client, "store_message",
+                               mock.AsyncMock(return_value={"id": "msg"})) as store:
+            result = await outbox.drain_once()
+
+        assert result["sent"] == 1
+        store.assert_awaited_once_with("thread_1", "Use WAL mode", {"type": "learning"})
+        assert memory.get_learning(learning_id)["synced"] is True
+
+    @pytest.mark.asyncio
+    async def test_drain_retries_failures(self):
+        """A failed message should stay queued without blocking the rest."""
+        outbox.enqueue_many([_message(content="ok"), _message(content="bad")])
+
+        async def store(thread_id, content, metadata=None):
+            if content == "bad":
+                raise backboard_client.BackboardConnectionError("down")
+            return {"id": "msg"}
+
+        with mock.patch.object(backboard_client, "store_message", side_effect=store):
+            result = await outbox.drain_once()
+
+        assert result == {"claimed": 2, "sent": 1, "retried": 1, "failed": 0}
+        assert outbox.get_stats()["depth"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pauses_queue(self):
+        """A 429 should pause the queue without using up the job's attempts."""
+        outbox.enqueue(**_message())
+
+        with mock.patch.object(backboard_client, "store_message",
+                               side_effect=backboard_client.BackboardRateLimitError("429")):
+            await outbox.drain_once()
+
+        assert outbox.get_stats()["paused_for_seconds"] > 0
+        outbox.clear()
+
+    @pytest.mark.asyncio
+    async def test_drain_linear_document(self):
+        """Linear document jobs should go through create_or_update_document."""
+        import linear_client
+
+        outbox.enqueue(outbox.LINEAR_DOCUMENT, None, {"title": "FAQ", "content": "# FAQ"})
+
+        with mock.patch.object(linear_client, "create_or_update_document",
+                               mock.AsyncMock(return_value={"id": "doc"})) as write:
+            result = await outbox.drain_once()
+
+        assert result["sent"] == 1
+        write.assert_awaited_once_with(title="FAQ", content="# FAQ")
+
+    @pytest.mark.asyncio
+    async def test_worker_drains_on_wake(self):
+        """The worker should send queued jobs promptly after wake()."""
+        worker = outbox.OutboxWorker(interval=60)
+
+        with mock.patch.object(backboard_client, "store_message",
+                               mock.AsyncMock(return_value={"id": "msg"})):
+            worker.start()
+            outbox.enqueue(**_message())
+            worker.wake()
+            for _ in range(100):
+                if outbox.get_stats()["depth"] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            await worker.stop()
+
+        assert outbox.get_stats()["depth"] == 0
+        assert not worker.running
+
+    @pytest.mark.asyncio
+    async def test_worker_start_stop_nest(self):
+        """The worker should keep running until every start() is stopped."""
+        worker = outbox.OutboxWorker(interval=60)
+
+        worker.start()
+        worker.start()
+        await worker.stop()
+        assert worker.running
+
+        await worker.stop()
+        assert not worker.running
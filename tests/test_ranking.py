@@ -0,0 +1,171 @@
+"""Tests for the ranking.py hybrid recall pipeline."""
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+import memory
+import ranking
+
+
+@pytest.fixture
+def temp_storage_dir(tmp_path):
+    """Use a temporary directory for storage during tests."""
+    with mock.patch.object(memory, 'STORAGE_DIR', tmp_path), \
+         mock.patch.object(memory, 'SESSIONS_DIR', tmp_path / "sessions"), \
+         mock.patch.object(memory, 'CONFIG_FILE', tmp_path / "config.json"), \
+         mock.patch.object(memory, 'SESSIONS_INDEX', tmp_path / "sessions" / "index.json"), \
+         mock.patch.object(memory, 'LEARNINGS_FILE', tmp_path / "learnings.json"):
+        yield tmp_path
+
+
+def _candidate(key, **fields):
+    return {"key": key, "kind": "learning", "content": key, **fields}
+
+
+class TestFuse:
+    """Tests for reciprocal-rank fusion."""
+
+    def test_agreement_beats_single_list(self):
+        """A candidate ranked by two lists should beat one ranked first by one list."""
+        fused = ranking.fuse({
+            "keyword": [_candidate("a"), _candidate("b")],
+            "semantic": [_candidate("c"), _candidate("b")],
+        })
+
+        assert fused[0]["key"] == "b"
+        assert fused[0]["signals"] == ["keyword", "semantic"]
+
+    def test_normalized_to_one(self):
+        """The best candidate should have relevance 1.0."""
+        fused = ranking.fuse({"keyword": [_candidate("a"), _candidate("b")]})
+
+        assert fused[0]["relevance"] == 1.0
+        assert 0 < fused[1]["relevance"] < 1.0
+
+    def test_list_weights(self):
+        """Lower-weight lists should contribute less."""
+        fused = ranking.fuse({
+            "recent": [_candidate("old")],
+            "keyword": [_candidate("match")],
+        })
+
+        assert [c["key"] for c in fused] == ["match", "old"]
+
+    def test_empty(self):
+        """No candidates should fuse to an empty list."""
+        assert ranking.fuse({"keyword": []}) == []
+
+
+class TestRescore:
+    """Tests for context boosts."""
+
+    def test_branch_match_boost(self):
+        """Candidates on the current branch should outrank equal ones elsewhere."""
+        candidates = [
+            _candidate("other", relevance=0.5, branch="main"),
+            _candidate("same", relevance=0.5, branch="feature"),
+        ]
+
+        ranked = ranking.rescore(candidates, branch="feature")
+
+        assert ranked[0]["key"] == "same"
+
+    def test_recency_decay(self):
+        """Newer candidates should get a larger boost."""
+        now = datetime.now(timezone.utc)
+        candidates = [
+            _candidate("old", relevance=0.5, timestamp=(now - timedelta(days=30)).isoformat()),
+            _candidate("new", relevance=0.5, timestamp=(now - timedelta(hours=1)).isoformat()),
+        ]
+
+        ranked = ranking.rescore(candidates, now=now)
+
+        assert [c["key"] for c in ranked] == ["new", "old"]
+
+    def test_file_overlap_boost(self):
+        """Candidates touching current files should be boosted."""
+        candidates = [
+            _candidate("none", relevance=0.5, files=["other.py"]),
+            _candidate("overlap", relevance=0.5, files=["auth.py"]),
+        ]
+
+        ranked = ranking.rescore(candidates, files=["auth.py"])
+
+        assert ranked[0]["key"] == "overlap"
+
+    def test_numpy_and_fallback_agree(self):
+        """The pure-Python path should match the numpy path."""
+        now = datetime.now(timezone.utc)
+        candidates = [
+            _candidate("a", relevance=1.0, timestamp=(now - timedelta(hours=5)).isoformat(), branch="main"),
+            _candidate("b", relevance=0.3, files=["x.py", "y.py"]),
+            _candidate("c", relevance=0.7, timestamp="not a date", kind="context"),
+        ]
+
+        with_numpy = [c["score"] for c in ranking.rescore([dict(c) for c in candidates],
+                                                          branch="main", files=["x.py"], now=now)]
+        with mock.patch.object(ranking, 'HAS_NUMPY', False):
+            without = [c["score"] for c in ranking.rescore([dict(c) for c in candidates],
+                                                           branch="main", files=["x.py"], now=now)]
+
+        assert with_numpy == pytest.approx(without, abs=1e-4)
+
+
+class TestRank:
+    """Tests for the full pipeline over local storage."""
+
+    def test_matches_outrank_recent(self, temp_storage_dir):
+        """A keyword match should beat an unrelated newer learning."""
+        memory.save_learning({"text": "Use exponential backoff for webhook retries"})
+        memory.save_learning({"text": "Renamed the settings page"})
+
+        ranked = ranking.rank("webhook retries", store=memory)
+
+        assert ranked["results"][0]["content"] == "Use exponential backoff for webhook retries"
+
+    def test_includes_sessions(self, temp_storage_dir):
+        """Sessions matching the query should be candidates."""
+        memory.save_session({"id": "session_1", "context": {"summary": "Migrating billing to stripe"},
+                             "git": {"branch": "billing"}})
+
+        ranked = ranking.rank("stripe billing", store=memory, include_recent=False)
+
+        assert ranked["results"][0]["kind"] == "session"
+        assert "Migrating billing to stripe" in ranked["results"][0]["content"]
+
+    def test_tag_filter(self, temp_storage_dir):
+        """Tags should restrict results to learnings carrying them."""
+        memory.save_learning({"text": "Token refresh race", "tags": ["auth"]})
+        memory.save_learning({"text": "Token bucket limiter", "tags": ["infra"]})
+
+        ranked = ranking.rank("token", store=memory, tags=["auth"])
+
+        assert [r["content"] for r in ranked["results"]] == ["Token refresh race"]
+
+    def test_extra_lists_fused(self, temp_storage_dir):
+        """External candidate lists should be fused with local ones."""
+        ranked = ranking.rank("anything", store=memory, extra={
+            "backboard": [{"key": "backboard", "kind": "backboard", "content": "Cloud answer"}],
+        })
+
+        assert ranked["results"][0]["content"] == "Cloud answer"
+
+    def test_reports_timings(self, temp_storage_dir):
+        """Each stage should report its timing."""
+        ranked = ranking.rank("query", store=memory)
+
+        assert set(ranked["timings_ms"]) == {"candidates", "fuse", "rescore", "total"}
+        assert all(ms >= 0 for ms in ranked["timings_ms"].values())
+
+    def test_candidates_are_bounded_in_the_store(self, temp_storage_dir):
+        """Keyword and recent lists should be limited by the store, not sliced after loading everything."""
+        memory.save_learnings([{"text": f"Webhook note {i}"} for i in range(ranking.CANDIDATE_LIMIT + 20)])
+
+        with mock.patch.object(memory, "get_all_learnings", side_effect=AssertionError("full scan")), \
+             mock.patch.object(memory, "search_learnings", wraps=memory.search_learnings) as search:
+            lists = ranking.local_candidates("webhook", memory)
+
+        assert search.call_args.kwargs["limit"] == ranking.CANDIDATE_LIMIT
+        assert len(lists["keyword"]) == ranking.CANDIDATE_LIMIT
+        assert len(lists["recent"]) == 10
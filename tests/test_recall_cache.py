@@ -0,0 +1,113 @@
+"""Tests for the recall_cache.py Backboard response cache."""
+import pytest
+
+import recall_cache
+
+
+@pytest.fixture(autouse=True)
+def temp_cache(tmp_path, monkeypatch):
+    """Use a temporary cache database during tests."""
+    monkeypatch.setattr(recall_cache, 'CACHE_FILE', tmp_path / "recall_cache.db")
+    monkeypatch.setattr(recall_cache, 'TTL_SECONDS', 600)
+    yield tmp_path / "recall_cache.db"
+
+
+class TestRecallCache:
+    """Tests for get/put/invalidate."""
+
+    def test_miss_then_hit(self):
+        """A stored response should be returned for the same query."""
+        assert recall_cache.get("thread_1", "auth flow") is None
+
+        recall_cache.put("thread_1", "auth flow", "Use JWT")
+
+        assert recall_cache.get("thread_1", "auth flow") == "Use JWT"
+
+    def test_query_normalization(self):
+        """Case and whitespace differences should share an entry."""
+        recall_cache.put("thread_1", "Auth   Flow", "Use JWT")
+
+        assert recall_cache.get("thread_1", " auth flow ") == "Use JWT"
+
+    def test_scoped_to_thread(self):
+        """Entries should not leak across threads."""
+        recall_cache.put("thread_1", "auth", "Personal answer")
+
+        assert recall_cache.get("thread_2", "auth") is None
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Expired entries should miss."""
+        now = [1000.0]
+        monkeypatch.setattr(recall_cache.time, 'time', lambda: now[0])
+        recall_cache.put("thread_1", "auth", "Use JWT")
+
+        now[0] += recall_cache.TTL_SECONDS + 1
+
+        assert recall_cache.get("thread_1", "auth") is None
+
+    def test_lru_eviction(self, monkeypatch):
+        """The least recently used entry should be evicted first."""
+        monkeypatch.setattr(recall_cache, 'MAX_ENTRIES', 2)
+        now = [1000.0]
+        monkeypatch.setattr(recall_cache.time, 'time', lambda: now[0])
+
+        recall_cache.put("thread_1", "a", "A")
+        now[0] += 1
+        recall_cache.put("thread_1", "b", "B")
+        now[0] += 1
+        recall_cache.get("thread_1", "a")  # a is now more recent than b
+        now[0] += 1
+        recall_cache.put("thread_1", "c", "C")
+
+        assert recall_cache.get("thread_1", "a") == "A"
+        assert recall_cache.get("thread_1", "b") is None
+        assert recall_cache.get("thread_1", "c") == "C"
+
+    def test_invalidate_thread(self):
+        """Invalidation should drop only that thread's entries."""
+        recall_cache.put("thread_1", "a", "A")
+        recall_cache.put("thread_2", "a", "A2")
+
+        assert recall_cache.invalidate("thread_1") == 1
+
+        assert recall_cache.get("thread_1", "a") is None
+        assert recall_cache.get("thread_2", "a") == "A2"
+
+    def test_empty_response_not_cached(self):
+        """Empty responses should not be cached."""
+        recall_cache.put("thread_1", "a", "")
+
+        assert recall_cache.get("thread_1", "a") is None
+
+    def test_disabled_with_zero_ttl(self, monkeypatch):
+        """TTL 0 should disable the cache."""
+        monkeypatch.setattr(recall_cache, 'TTL_SECONDS', 0)
+        recall_cache.put("thread_1", "a", "A")
+
+        assert recall_cache.get("thread_1", "a") is None
+
+
+class TestStats:
+    """Tests for get_stats."""
+
+    def test_hit_rate(self):
+        """Stats should count hits and misses."""
+        recall_cache.get("thread_1", "a")
+        recall_cache.put("thread_1", "a", "A")
+        recall_cache.get("thread_1", "a")
+        recall_cache.get("thread_1", "a")
+
+        stats = recall_cache.get_stats()
+
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.667)
+        assert stats["entries"] == 1
+
+    def test_survives_corrupt_db(self, temp_cache):
+        """A corrupt cache file should degrade to misses, not errors."""
+        temp_cache.write_bytes(b"not a database" * 100)
+
+        assert recall_cache.get("thread_1", "a") is None
+        recall_cache.put("thread_1", "a", "A")
+        assert recall_cache.get_stats()["hits"] == 0
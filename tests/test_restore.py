@@ -350,3 +350,29 @@ class TestBuildRawContext:
         assert "Working" in result
         # Should not have learnings section
         assert "## Previous Learnings" not in result
+
+    def test_stream_restoration_message(self):
+        """stream_restoration_message should pass Cerebras text through as it arrives."""
+        session = {"context": {"summary": "Working on feature"}, "git": {"branch": "main"}}
+
+        with mock.patch.object(
+            cerebras_client, 'stream_restoration_message', return_value=iter(["Welcome ", "back!"])
+        ) as stream:
+            chunks = list(restore.stream_restoration_message(session, {"elapsed": "2h"}))
+
+        assert chunks == ["Welcome ", "back!"]
+        assert stream.call_args.args[0]["summary"] == "Working on feature"
+
+    def test_stream_restoration_message_fallback(self):
+        """A Cerebras failure before any text should stream the fallback message."""
+        session = {"context": {"summary": "Working on feature"}, "git": {"branch": "main"}}
+
+        def failing(context, changes):
+            raise cerebras_client.CerebrasError("API unavailable")
+            yield  # pragma: no cover
+
+        with mock.patch.object(cerebras_client, 'stream_restoration_message', failing):
+            chunks = list(restore.stream_restoration_message(session, {"elapsed": "2h"}))
+
+        assert len(chunks) == 1
+        assert "Welcome back" in chunks[0]
@@ -299,3 +299,290 @@ class TestGetCurrentSessionForCwd:
 
         result = session_parser.get_current_session_for_cwd(None)
         assert result == session_file
+
+
+def _entry(content, role="user", **extra):
+    return json.dumps({"type": role, "message": {"role": role, "content": content}, **extra}) + "\n"
+
+
+class TestSessionTailer:
+    """Tests for SessionTailer incremental reading."""
+
+    def test_reads_only_new_messages(self, tmp_path):
+        """Each read should return only what was appended since the last one."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("First") + _entry("Second", "assistant"))
+        tailer = session_parser.SessionTailer(session_file)
+
+        assert [m["content"] for m in tailer.read_new()] == ["First", "Second"]
+        assert tailer.read_new() == []
+
+        with open(session_file, "a") as f:
+            f.write(_entry("Third"))
+
+        new = tailer.read_new()
+        assert [m["content"] for m in new] == ["Third"]
+        assert new[0]["line"] == 2
+        assert tailer.offset == session_file.stat().st_size
+
+    def test_partial_last_line_waits(self, tmp_path):
+        """A line still being written should be read once it is complete."""
+        session_file = tmp_path / "test.jsonl"
+        line = _entry("Complete me")
+        session_file.write_text(_entry("First") + line[:10])
+        tailer = session_parser.SessionTailer(session_file)
+
+        assert [m["content"] for m in tailer.read_new()] == ["First"]
+
+        with open(session_file, "a") as f:
+            f.write(line[10:])
+
+        assert [m["content"] for m in tailer.read_new()] == ["Complete me"]
+
+    def test_captures_metadata(self, tmp_path):
+        """cwd, branch and session id should come from the streamed entries."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(
+            json.dumps({"type": "summary", "summary": "Earlier work"}) + "\n"
+            + _entry("Hi", cwd="/work/app", gitBranch="feature", sessionId="abc")
+        )
+        tailer = session_parser.SessionTailer(session_file)
+        tailer.read_new()
+
+        assert tailer.metadata == {"session_id": "abc", "cwd": "/work/app", "branch": "feature"}
+
+    def test_truncation_restarts(self, tmp_path):
+        """A file shorter than the saved offset should be reread from the start."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("Old one") + _entry("Old two"))
+        tailer = session_parser.SessionTailer(session_file)
+        tailer.read_new()
+
+        session_file.write_text(_entry("New"))
+
+        assert [m["content"] for m in tailer.read_new()] == ["New"]
+        assert tailer.resets == 1
+        assert tailer.line == 1
+
+    def test_rotation_restarts(self, tmp_path):
+        """A replaced file (new inode) should be reread from the start."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("Old"))
+        tailer = session_parser.SessionTailer(session_file)
+        tailer.read_new()
+
+        replacement = tmp_path / "replacement.jsonl"
+        replacement.write_text(_entry("Rotated") + _entry("Again"))
+        os.replace(replacement, session_file)
+
+        assert [m["content"] for m in tailer.read_new()] == ["Rotated", "Again"]
+        assert tailer.resets == 1
+
+    def test_restore_position(self, tmp_path):
+        """A restored tailer should continue from the saved offset."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("First", cwd="/work"))
+        first = session_parser.SessionTailer(session_file)
+        first.read_new()
+        with open(session_file, "a") as f:
+            f.write(_entry("Second"))
+
+        resumed = session_parser.SessionTailer(session_file)
+        resumed.restore(first.position())
+
+        assert [m["content"] for m in resumed.read_new()] == ["Second"]
+        assert resumed.metadata["cwd"] == "/work"
+
+    def test_restore_legacy_line_state(self, tmp_path):
+        """State with only last_line should skip that many lines once."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("First") + _entry("Second") + _entry("Third"))
+        tailer = session_parser.SessionTailer(session_file)
+        tailer.restore({"last_line": 2})
+
+        assert [m["content"] for m in tailer.read_new()] == ["Third"]
+
+    def test_tail_session_reuses_tailer(self, tmp_path):
+        """tail_session should return the cached tailer while state agrees."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("First"))
+
+        tailer = session_parser.tail_session(session_file, {})
+        tailer.read_new()
+
+        assert session_parser.tail_session(session_file, tailer.position()) is tailer
+        assert session_parser.tail_session(session_file, {"offset": 0}) is not tailer
+
+    def test_tail_session_drops_rotated_and_deleted(self, tmp_path, monkeypatch):
+        """Tailers for replaced or deleted files should not stay cached."""
+        monkeypatch.setattr(session_parser, "_tailers", session_parser.OrderedDict())
+        rotated, deleted, live = (tmp_path / f"{name}.jsonl" for name in ("rotated", "deleted", "live"))
+        for path in (rotated, deleted, live):
+            path.write_text(_entry("First"))
+            session_parser.tail_session(path, {}).read_new()
+
+        replacement = tmp_path / "replacement.jsonl"
+        replacement.write_text(_entry("New"))
+        replacement.replace(rotated)
+        deleted.unlink()
+        session_parser.tail_session(live, {})
+
+        assert list(session_parser._tailers) == [live]
+
+    def test_tail_session_evicts_idle_and_caps(self, tmp_path, monkeypatch):
+        """Idle tailers should expire, and the cache should keep the newest MAX_TAILERS."""
+        monkeypatch.setattr(session_parser, "_tailers", session_parser.OrderedDict())
+        monkeypatch.setattr(session_parser, "MAX_TAILERS", 2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.jsonl"
+            path.write_text(_entry("First"))
+            paths.append(path)
+            session_parser.tail_session(path, {})
+
+        assert list(session_parser._tailers) == paths[1:]
+
+        session_parser._tailers[paths[1]].last_used -= session_parser.TAILER_IDLE_SECONDS + 1
+        session_parser.tail_session(paths[2], {})
+
+        assert list(session_parser._tailers) == [paths[2]]
+
+
+class TestFastDecoding:
+    """Tests for the pre-check and the optional fast JSON decoders."""
+
+    LINES = [
+        _entry("Plain text", cwd="/work", gitBranch="main", sessionId="s1"),
+        json.dumps({"type": "assistant", "message": {"role": "assistant", "content": [
+            {"type": "text", "text": "Reading it"},
+            {"type": "tool_use", "id": "t1", "name": "Read", "input": {"file_path": "/x.py"}},
+            {"type": "thinking", "thinking": "hmm"},
+        ]}}) + "\n",
+        json.dumps({"type": "user", "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": "t1", "content": "x" * 5000},
+        ]}}) + "\n",
+        json.dumps({"type": "file-history-snapshot", "snapshot": {"files": ["a.py"]}}) + "\n",
+        json.dumps({"type": "user", "message": {"role": "user", "content": {"unexpected": "shape"}}}) + "\n",
+        json.dumps({"message": {"role": "assistant", "content": ["bare string block"]}}) + "\n",
+        '{"type": "user", "message": {broken\n',
+        json.dumps({"type": "user", "message": {"role": "user", "content": "Escaped \"user\" quote"}}) + "\n",
+    ]
+
+    def test_skips_non_message_lines(self):
+        """Lines without a user/assistant value should be rejected undecoded."""
+        assert session_parser._skippable(b'{"type": "file-history-snapshot", "snapshot": {}}')
+        assert not session_parser._skippable(self.LINES[0].encode())
+
+    def test_escaped_quotes_do_not_match(self):
+        """A role word inside a JSON string should not pass the pre-check."""
+        line = json.dumps({"type": "summary", "summary": 'the "user" said'}).encode()
+
+        assert session_parser._skippable(line)
+
+    @pytest.mark.parametrize("backend", sorted(session_parser._DECODERS))
+    def test_backends_match_stdlib(self, tmp_path, monkeypatch, backend):
+        """Every decoder should yield exactly what plain json.loads would."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text("".join(self.LINES))
+
+        expected = []
+        for i, line in enumerate(self.LINES):
+            try:
+                message = session_parser._message_from_entry(json.loads(line), i)
+            except json.JSONDecodeError:
+                continue
+            if message:
+                expected.append(message)
+
+        monkeypatch.setattr(session_parser, "_decode", session_parser._DECODERS[backend])
+
+        assert list(session_parser.parse_session_messages(session_file)) == expected
+        assert [m["content"] for m in expected] == [
+            "Plain text", "Reading it\n[Used tool: Read]", "bare string block", 'Escaped "user" quote',
+        ]
+
+    def test_default_backend_is_fastest_available(self):
+        """msgspec is preferred, then orjson, then the stdlib."""
+        if session_parser.HAS_MSGSPEC:
+            assert session_parser.JSON_BACKEND == "msgspec"
+        elif session_parser.HAS_ORJSON:
+            assert session_parser.JSON_BACKEND == "orjson"
+        else:
+            assert session_parser.JSON_BACKEND == "json"
+
+
+class TestContextWindow:
+    """Tests for the per-session ring buffer of recent messages."""
+
+    def _msg(self, content, role="user"):
+        return {"role": role, "content": content, "line": 0}
+
+    def test_message_limit(self):
+        """The oldest messages should fall out past max_messages."""
+        window = session_parser.ContextWindow(max_messages=2, max_chars=10_000)
+        window.extend([self._msg("one"), self._msg("two"), self._msg("three", "assistant")])
+
+        assert len(window) == 2
+        assert window.text() == "Human: two\n\nAssistant: three"
+
+    def test_char_limit(self):
+        """The window should stay within max_chars of formatted text."""
+        window = session_parser.ContextWindow(max_messages=50, max_chars=30)
+        window.extend([self._msg("a" * 10), self._msg("b" * 10), self._msg("c" * 10)])
+
+        assert window.chars <= 30
+        assert window.text().endswith("c" * 10)
+
+    def test_keeps_oversized_newest_message(self):
+        """A single message larger than max_chars should still be kept."""
+        window = session_parser.ContextWindow(max_messages=50, max_chars=10)
+        window.append(self._msg("x" * 100))
+
+        assert len(window) == 1
+
+    def test_text_budget_keeps_newest(self):
+        """A tighter budget in text() should drop the oldest messages."""
+        window = session_parser.ContextWindow()
+        window.extend([self._msg("old " * 10), self._msg("new")])
+
+        assert window.text(max_chars=20) == "Human: new"
+
+    def test_text_token_budget(self):
+        """A token budget should keep the newest messages that fit."""
+        window = session_parser.ContextWindow()
+        window.extend([self._msg("old " * 10), self._msg("middle"), self._msg("new")])
+
+        assert window.text(max_tokens=8) == "Human: middle\n\nHuman: new"
+
+    def test_tailer_fills_window(self, tmp_path):
+        """Messages read by the tailer should land in its window."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("First") + _entry("Second", "assistant"))
+        tailer = session_parser.SessionTailer(session_file)
+        tailer.read_new()
+
+        assert tailer.context.text() == "Human: First\n\nAssistant: Second"
+
+    def test_reset_clears_window(self, tmp_path):
+        """A truncated transcript should not keep the old conversation."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("Old one") + _entry("Old two"))
+        tailer = session_parser.SessionTailer(session_file)
+        tailer.read_new()
+
+        session_file.write_text(_entry("New"))
+        tailer.read_new()
+
+        assert tailer.context.text() == "Human: New"
+
+    def test_restore_primes_window(self, tmp_path):
+        """A tailer resumed from saved state should refill its window."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(_entry("Before restart"))
+        first = session_parser.SessionTailer(session_file)
+        first.read_new()
+
+        resumed = session_parser.SessionTailer(session_file)
+        resumed.restore(first.position())
+
+        assert resumed.context.text() == "Human: Before restart"
@@ -0,0 +1,131 @@
+"""Tests for the session_watcher.py event-driven session watcher."""
+import os
+import sys
+import time
+
+import pytest
+
+import session_watcher
+
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+
+@pytest.fixture
+def projects(tmp_path):
+    """A Claude Code projects directory with one project and session."""
+    root = tmp_path / "projects"
+    (root / "-home-user-app").mkdir(parents=True)
+    (root / "-home-user-app" / "session-a.jsonl").write_text('{"type": "user"}\n')
+    return root
+
+
+def _append(path, line='{"type": "assistant"}\n'):
+    with open(path, "a") as f:
+        f.write(line)
+
+
+class TestHelpers:
+    """Tests for session file discovery."""
+
+    def test_is_session_file(self, projects):
+        """Only <root>/<project>/<id>.jsonl should count as a session."""
+        assert session_watcher.is_session_file(projects / "p" / "s.jsonl", projects)
+        assert not session_watcher.is_session_file(projects / "p" / "index.json", projects)
+        assert not session_watcher.is_session_file(projects / "p" / "sub" / "s.jsonl", projects)
+
+    def test_list_missing_root(self, tmp_path):
+        """A missing projects directory should have no sessions."""
+        assert session_watcher.list_session_files(tmp_path / "missing") == []
+
+    def test_recent_sessions(self, projects):
+        """recent_sessions should skip sessions idle longer than the window."""
+        old = projects / "-home-user-app" / "session-old.jsonl"
+        old.write_text("{}\n")
+        stale = time.time() - 7200
+        os.utime(old, (stale, stale))
+
+        watcher = session_watcher.SessionWatcher(root=projects)
+
+        assert watcher.recent_sessions(window=3600) == {projects / "-home-user-app" / "session-a.jsonl"}
+
+
+class TestInotifyBackend:
+    """Tests for the Linux inotify backend."""
+
+    @linux_only
+    @pytest.mark.asyncio
+    async def test_reports_append(self, projects):
+        """An append should be reported well before the poll interval."""
+        session = projects / "-home-user-app" / "session-a.jsonl"
+        async with session_watcher.SessionWatcher(root=projects, debounce=0.01, backend="inotify") as watcher:
+            assert watcher.backend == "inotify"
+            _append(session)
+
+            started = time.monotonic()
+            changed = await watcher.changes(timeout=5)
+
+        assert changed == {session}
+        assert time.monotonic() - started < 1
+
+    @linux_only
+    @pytest.mark.asyncio
+    async def test_tracks_concurrent_sessions(self, projects):
+        """Every active session should be reported, not just the newest."""
+        first = projects / "-home-user-app" / "session-a.jsonl"
+        second = projects / "-home-user-app" / "session-b.jsonl"
+        async with session_watcher.SessionWatcher(root=projects, debounce=0.05, backend="inotify") as watcher:
+            _append(first)
+            _append(second)
+
+            changed = await watcher.changes(timeout=5)
+
+        assert changed == {first, second}
+
+    @linux_only
+    @pytest.mark.asyncio
+    async def test_watches_new_projects(self, projects):
+        """Sessions in a project created after start should be reported."""
+        async with session_watcher.SessionWatcher(root=projects, debounce=0.05, backend="inotify") as watcher:
+            new_project = projects / "-home-user-other"
+            new_project.mkdir()
+            await watcher.changes(timeout=0.2)
+            session = new_project / "session-c.jsonl"
+            _append(session)
+
+            changed = await watcher.changes(timeout=5)
+
+        assert session in changed
+
+    @linux_only
+    @pytest.mark.asyncio
+    async def test_timeout_without_changes(self, projects):
+        """changes() should return empty after the timeout when idle."""
+        async with session_watcher.SessionWatcher(root=projects, backend="inotify") as watcher:
+            assert await watcher.changes(timeout=0.05) == set()
+
+
+class TestPollBackend:
+    """Tests for the polling fallback."""
+
+    @pytest.mark.asyncio
+    async def test_reports_append(self, projects):
+        """Polling should detect size changes."""
+        session = projects / "-home-user-app" / "session-a.jsonl"
+        async with session_watcher.SessionWatcher(root=projects, backend="poll") as watcher:
+            assert watcher.backend == "poll"
+            _append(session)
+
+            assert await watcher.changes(timeout=0.01) == {session}
+            assert await watcher.changes(timeout=0.01) == set()
+
+    @pytest.mark.asyncio
+    async def test_missing_root_falls_back_to_poll(self, tmp_path):
+        """Without a projects directory, the watcher should poll until it appears."""
+        root = tmp_path / "projects"
+        async with session_watcher.SessionWatcher(root=root) as watcher:
+            assert watcher.backend == "poll"
+            (root / "p").mkdir(parents=True)
+            _append(root / "p" / "s.jsonl")
+
+            assert await watcher.changes(timeout=0.01) == {root / "p" / "s.jsonl"}
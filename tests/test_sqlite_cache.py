@@ -0,0 +1,66 @@
+"""Tests for the sqlite_cache.py shared cache storage."""
+import sqlite3
+import threading
+from unittest import mock
+
+import completion_cache
+import recall_cache
+import sqlite_cache
+
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY);"
+
+
+class TestConnections:
+    """Tests for per-thread persistent connections."""
+
+    def test_connection_reused_across_operations(self, tmp_path, monkeypatch):
+        """Lookups should not reconnect or re-run the schema."""
+        monkeypatch.setattr(recall_cache, 'CACHE_FILE', tmp_path / "recall_cache.db")
+        with mock.patch.object(sqlite_cache.sqlite3, "connect", wraps=sqlite3.connect) as connect:
+            recall_cache.put("thread_1", "auth", "Use JWT")
+            recall_cache.get("thread_1", "auth")
+            recall_cache.invalidate("thread_1")
+            recall_cache.get_stats()
+
+        assert connect.call_count == 1
+
+    def test_one_connection_per_thread(self, tmp_path):
+        path = tmp_path / "cache.db"
+        main = sqlite_cache.connect(path, SCHEMA)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(sqlite_cache.connect(path, SCHEMA)))
+        thread.start()
+        thread.join()
+
+        assert sqlite_cache.connect(path, SCHEMA) is main
+        assert other[0] is not main
+
+    def test_separate_databases(self, tmp_path, monkeypatch):
+        """Both caches keep their own file and counters."""
+        monkeypatch.setattr(completion_cache, 'CACHE_FILE', tmp_path / "completion_cache.db")
+        monkeypatch.setattr(recall_cache, 'CACHE_FILE', tmp_path / "recall_cache.db")
+        completion_cache.get("missing")
+
+        assert completion_cache.get_stats()["misses"] == 1
+        assert recall_cache.get_stats()["misses"] == 0
+
+
+class TestRun:
+    """Tests for run()."""
+
+    def test_returns_result_and_commits(self, tmp_path):
+        path = tmp_path / "cache.db"
+        sqlite_cache.run(path, SCHEMA, lambda conn: conn.execute("INSERT INTO entries VALUES ('a')"))
+
+        assert sqlite3.connect(path).execute("SELECT key FROM entries").fetchall() == [("a",)]
+
+    def test_error_returns_default_and_reconnects(self, tmp_path):
+        path = tmp_path / "cache.db"
+        first = sqlite_cache.connect(path, SCHEMA)
+
+        def broken(conn):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        assert sqlite_cache.run(path, SCHEMA, broken, default=0) == 0
+        assert sqlite_cache.connect(path, SCHEMA) is not first
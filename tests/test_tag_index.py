@@ -0,0 +1,69 @@
+"""Tests for the tag postings / co-occurrence index (tag_index.py)."""
+import pytest
+
+from tag_index import TagIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TagIndex(tmp_path / "tags.db")
+    yield index
+    index.close()
+
+
+class TestTagIndex:
+    """Tests for incremental updates and queries."""
+
+    def test_counts_and_top_tags(self, index):
+        index.add_learnings([
+            {"id": "l1", "tags": ["redis", "cache"]},
+            {"id": "l2", "tags": ["redis"]},
+            {"id": "l3", "tags": ["auth"]},
+        ])
+
+        assert index.top_tags() == [("redis", 2), ("auth", 1), ("cache", 1)]
+        assert index.top_tags(1) == [("redis", 2)]
+        assert index.tag_count("redis") == 2
+        assert index.tag_count("missing") == 0
+        assert index.doc_count() == 3
+
+    def test_postings_newest_first(self, index):
+        index.add_learning({"id": "l1", "tags": ["redis"]})
+        index.add_learning({"id": "l2", "tags": ["redis"]})
+        index.add_learning({"id": "l3", "tags": ["auth"]})
+
+        assert index.learning_ids("redis") == ["l2", "l1"]
+        assert index.learning_ids("redis", limit=1) == ["l2"]
+
+    def test_cooccurrence(self, index):
+        index.add_learnings([
+            {"id": "l1", "tags": ["redis", "cache", "perf"]},
+            {"id": "l2", "tags": ["cache", "redis"]},
+        ])
+
+        assert index.related_tags("redis") == [("cache", 2), ("perf", 1)]
+        assert index.related_tags("perf") == [("cache", 1), ("redis", 1)]
+        assert index.top_pairs(1) == [("cache", "redis", 2)]
+
+    def test_duplicate_and_invalid_tags_ignored(self, index):
+        index.add_learning({"id": "l1", "tags": ["a", "a", "", None, 3]})
+
+        assert index.top_tags() == [("a", 1)]
+        assert index.top_pairs() == []
+
+    def test_generation_changes_on_every_write(self, index):
+        assert index.generation() == 0
+        index.add_learning({"id": "l1", "tags": []})
+        first = index.generation()
+        index.touch()
+
+        assert index.generation() > first > 0
+
+    def test_rebuild_replaces_everything(self, index):
+        index.add_learning({"id": "old", "tags": ["stale"]})
+
+        index.rebuild([{"id": "l2", "tags": ["b"]}, {"id": "l1", "tags": ["b"]}])
+
+        assert index.top_tags() == [("b", 2)]
+        assert index.learning_ids("b") == ["l2", "l1"]
+        assert index.doc_count() == 2
@@ -7,12 +7,15 @@ Tests cover:
 - summarize_recall: Recall results summarization
 - auto_summarize: Automatic level selection
 - Fallback behavior when Cerebras unavailable
+- split_chunks / map-reduce: Chunked summarization of oversized content
 """
 import pytest
 from unittest.mock import patch, MagicMock
 
+import completion_cache
 from tldr import (
     estimate_tokens,
+    split_chunks,
     summarize_context,
     summarize_handoff,
     summarize_recall,
@@ -24,6 +27,12 @@ from tldr import (
 from cerebras_client import CerebrasError
 
 
+@pytest.fixture(autouse=True)
+def temp_completion_cache(tmp_path, monkeypatch):
+    """Keep the completion cache out of the real home directory."""
+    monkeypatch.setattr(completion_cache, 'CACHE_FILE', tmp_path / "completion_cache.db")
+
+
 # ============ estimate_tokens TESTS ============
 
 class TestEstimateTokens:
@@ -38,22 +47,22 @@ class TestEstimateTokens:
         assert estimate_tokens(None) == 0
 
     def test_short_text(self):
-        """Short text estimation (~4 chars per token)."""
-        text = "Hello world"  # 11 chars
+        """Short text: one token per word."""
+        text = "Hello world"
         result = estimate_tokens(text)
-        assert result == 2  # 11 // 4 = 2
+        assert result == 2
 
     def test_longer_text(self):
         """Longer text estimation."""
-        text = "This is a longer piece of text for testing"  # 43 chars
+        text = "This is a longer piece of text for testing"  # 9 words
         result = estimate_tokens(text)
-        assert result == 10  # 43 // 4 = 10
+        assert result == 9
 
     def test_multiline_text(self):
-        """Multiline text estimation."""
-        text = "Line 1\nLine 2\nLine 3\n"  # 21 chars
+        """Newlines, spaces and digits are tokens of their own."""
+        text = "Line 1\nLine 2\nLine 3\n"
         result = estimate_tokens(text)
-        assert result == 5  # 21 // 4 = 5
+        assert result == 12
 
     def test_reasonably_accurate(self):
         """Token estimation is reasonably accurate for typical code."""
@@ -105,7 +114,7 @@ class TestSummarizeContext:
         """Large content gets TLDR via Cerebras."""
         mock_complete.return_value = "Summarized content here."
         # Create content that exceeds threshold
-        large_content = "x" * (THRESHOLD_NO_TLDR * 5)  # > 500 tokens
+        large_content = "x " * (THRESHOLD_NO_TLDR * 2)  # > 500 tokens
 
         result = summarize_context(large_content, "L1")
 
@@ -116,7 +125,7 @@ class TestSummarizeContext:
     def test_l2_prompt_is_detailed(self, mock_complete):
         """L2 prompts for detailed summary."""
         mock_complete.return_value = "Detailed summary."
-        large_content = "x" * (THRESHOLD_NO_TLDR * 5)
+        large_content = "x " * (THRESHOLD_NO_TLDR * 2)
 
         summarize_context(large_content, "L2")
 
@@ -127,7 +136,7 @@ class TestSummarizeContext:
 
     def test_cerebras_fallback(self):
         """Falls back gracefully when Cerebras unavailable."""
-        large_content = "x" * (THRESHOLD_NO_TLDR * 5)
+        large_content = "x " * (THRESHOLD_NO_TLDR * 2)
 
         with patch('tldr.complete') as mock_complete:
             mock_complete.side_effect = CerebrasError("API unavailable")
@@ -301,6 +310,157 @@ class TestSummarizeRecall:
         assert "No metadata item" in result
 
 
+# ============ CHUNKING TESTS ============
+
+def _document(paragraphs: int, marker: str = "") -> str:
+    """A markdown document of distinct paragraphs (~100 tokens each)."""
+    parts = []
+    for i in range(paragraphs):
+        if i % 10 == 0:
+            parts.append(f"## Section {i // 10}\n\n")
+        if marker and i == paragraphs // 2:
+            parts.append(f"{marker}\n\n")
+        parts.append(f"Paragraph {i} about src/module_{i}.py. " + "detail " * 50 + "\n\n")
+    return "".join(parts)
+
+
+class TestSplitChunks:
+    """Tests for structural chunking."""
+
+    def test_lossless_and_bounded(self):
+        """Chunks should reassemble the content and respect the size limit."""
+        content = _document(120)
+
+        chunks = split_chunks(content, chunk_tokens=1000)
+
+        assert "".join(chunks) == content
+        assert len(chunks) > 1
+        assert all(estimate_tokens(chunk) <= 1000 for chunk in chunks)
+
+    def test_splits_on_paragraphs(self):
+        """Chunks should end on paragraph boundaries, not mid-sentence."""
+        chunks = split_chunks(_document(120), chunk_tokens=1000)
+
+        assert all(chunk.endswith("\n\n") for chunk in chunks[:-1])
+
+    def test_unbroken_text_is_hard_split(self):
+        """Text without any boundaries should still be split."""
+        chunks = split_chunks("x" * 10000, chunk_tokens=500)
+
+        assert "".join(chunks) == "x" * 10000
+        assert len(chunks) > 1
+        assert all(estimate_tokens(chunk) <= 500 for chunk in chunks)
+
+    def test_edit_only_changes_nearby_chunks(self):
+        """Inserting a paragraph should leave most chunks byte-identical."""
+        before = split_chunks(_document(200), chunk_tokens=1000)
+        after = split_chunks(_document(200, marker="A new paragraph."), chunk_tokens=1000)
+
+        changed = set(after) - set(before)
+        assert len(changed) <= 2
+        assert len(before) >= 8
+
+
+class TestMapReduce:
+    """Tests for chunked summarization of oversized content."""
+
+    @patch('tldr.complete')
+    def test_oversized_content_is_chunked(self, mock_complete):
+        """Content over THRESHOLD_L2 should be summarized per chunk then reduced."""
+        mock_complete.return_value = "- summary"
+        content = _document(400)  # ~20k tokens
+
+        result = summarize_context(content, "L1", max_tokens=300)
+
+        prompts = [c.kwargs["prompt"] for c in mock_complete.call_args_list]
+        chunk_prompts = [p for p in prompts if "larger document" in p]
+        assert len(chunk_prompts) >= 2
+        # No single prompt carries the whole document
+        assert all(len(p) < len(content) for p in prompts)
+        assert mock_complete.call_args.kwargs["max_tokens"] == 300
+        assert result == "- summary"
+
+    @patch('tldr.complete')
+    def test_large_summaries_reduce_hierarchically(self, mock_complete, monkeypatch):
+        """Chunk summaries too big for one prompt should be reduced in rounds."""
+        import tldr
+        monkeypatch.setattr(tldr, 'CHUNK_TOKENS', 500)
+        mock_complete.side_effect = lambda prompt, **kwargs: (
+            "- long chunk summary " * 40 if "PART" in prompt else "final"
+        )
+
+        result = summarize_context(_document(400), "L2")
+
+        parts = [c.kwargs["prompt"] for c in mock_complete.call_args_list if "PART" in c.kwargs["prompt"]]
+        reduce_parts = [p for p in parts if "long chunk summary" in p]
+        assert reduce_parts
+        assert result == "final"
+
+    def test_unchanged_chunks_come_from_cache(self):
+        """Re-summarizing after a small edit should only call Cerebras for changed chunks."""
+        import cerebras_client
+        calls = []
+
+        def fake_api(**request):
+            calls.append(request)
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=f"- summary {len(calls)}"))]
+            return response
+
+        with patch.object(cerebras_client, '_get_sync_client') as get_client:
+            get_client.return_value.chat.completions.create.side_effect = fake_api
+
+            summarize_context(_document(300), "L1")
+            first = len(calls)
+            summarize_context(_document(300, marker="A new paragraph."), "L1")
+            second = len(calls) - first
+
+        assert first >= 5
+        # Changed chunk(s) plus the reduce step
+        assert second <= 3
+
+    def test_unchanged_chunks_cached_when_chunk_count_changes(self):
+        """An insert that adds a chunk should still reuse every unchanged chunk."""
+        import cerebras_client
+        from tldr import split_chunks
+        calls = []
+
+        def fake_api(**request):
+            calls.append(request)
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=f"- summary {len(calls)}"))]
+            return response
+
+        original = _document(300)
+        edited = _document(300, marker=" ".join(f"Inserted note {k}." for k in range(1500)))
+        old_chunks, new_chunks = split_chunks(original), split_chunks(edited)
+        assert len(new_chunks) > len(old_chunks)
+        changed = len(set(new_chunks) - set(old_chunks))
+
+        with patch.object(cerebras_client, '_get_sync_client') as get_client:
+            get_client.return_value.chat.completions.create.side_effect = fake_api
+
+            summarize_context(original, "L1")
+            first = len(calls)
+            summarize_context(edited, "L1")
+            second = len(calls) - first
+
+        assert changed < len(new_chunks)
+        # Changed chunks plus the final reduce
+        assert second == changed + 1
+
+    @patch('tldr.complete')
+    def test_chunk_failure_falls_back(self, mock_complete):
+        """A Cerebras failure during map-reduce should fall back to truncation."""
+        mock_complete.side_effect = CerebrasError("API unavailable")
+        content = _document(400)
+
+        result = summarize_context(content, "L1")
+
+        assert "truncated" in result
+        assert len(result) < len(content)
+
+
 # ============ auto_summarize TESTS ============
 
 class TestAutoSummarize:
@@ -336,8 +496,9 @@ class TestAutoSummarize:
 
         result = auto_summarize(large)
 
-        mock_complete.assert_called_once()
-        # Check that L2 prompt characteristics were used
+        # Chunks are summarized first; the final reduce uses the L2 prompt
+        assert mock_complete.call_count > 1
+        assert result == "L2 summary"
         call_args = mock_complete.call_args
         prompt = call_args.kwargs.get('prompt') or call_args[0][0]
         assert "bullet points" in prompt.lower()
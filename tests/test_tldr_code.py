@@ -5,6 +5,7 @@ from tldr_code import (
     extract_python_structure,
     generate_code_tldr,
     measure_quality,
+    parse_python_structure,
     _format_function_signature,
     _get_annotation,
     _extract_function_calls,
@@ -263,6 +264,92 @@ def process():
         assert "method" in calls["process"]
         assert "helper" in calls["process"]
 
+    def test_nested_function_calls_count_for_outer(self):
+        import ast
+        code = '''
+def outer():
+    def inner():
+        deep()
+    inner()
+'''
+        calls = _extract_function_calls(ast.parse(code))
+        assert calls["outer"] == ["deep", "inner"]
+        assert calls["inner"] == ["deep"]
+
+    def test_l3_lists_every_caller(self):
+        code = "\n".join(f"def f{i}():\n    g()\n" for i in range(8))
+        result = extract_python_structure(code, "test.py", level="L3")
+        assert all(f"f{i} -> g" in result for i in range(8))
+
+
+class TestParsePythonStructure:
+    """Tests for the single-pass structure parse used by code_index."""
+
+    def test_import_map(self):
+        code = '''
+import os.path
+import numpy as np
+from pkg.mod import helper as h
+from . import sibling
+from ..base import Base
+
+def lazy():
+    import json
+'''
+        structure = parse_python_structure(code)
+        assert structure["import_map"] == {
+            "os": "os",
+            "np": "numpy",
+            "h": "pkg.mod.helper",
+            "sibling": ".sibling",
+            "Base": "..base.Base",
+            "json": "json",
+        }
+        # Module-level imports are listed before lazy ones
+        assert structure["imports"][-1] == "json"
+
+    def test_call_refs_are_qualified_and_dotted(self):
+        code = '''
+class Service:
+    def run(self):
+        self.load()
+        client.fetch()
+        def retry():
+            backoff()
+        retry()
+
+def main():
+    Service().run()
+'''
+        structure = parse_python_structure(code)
+        assert structure["call_refs"] == {
+            "Service.run": ["backoff", "client.fetch", "retry", "self.load"],
+            "main": ["Service"],
+        }
+
+    def test_records_definition_lines(self):
+        structure = parse_python_structure("\n\nclass A:\n    def m(self):\n        pass\n\ndef f():\n    pass\n")
+        assert structure["classes"][0]["line"] == 3
+        assert structure["classes"][0]["methods"][0]["line"] == 4
+        assert structure["functions"][0]["line"] == 7
+
+    def test_only_top_level_constants_and_functions(self):
+        code = '''
+LIMIT = 5
+if True:
+    HIDDEN = 1
+    def conditional():
+        pass
+def top():
+    INNER = 2
+'''
+        structure = parse_python_structure(code)
+        assert structure["constants"] == ["LIMIT"]
+        assert [f["name"] for f in structure["functions"]] == ["top"]
+
+    def test_syntax_error(self):
+        assert "error" in parse_python_structure("def broken(:")
+
 
 class TestRealCodeQuality:
     """Test quality on actual project files."""
@@ -0,0 +1,135 @@
+"""Tests for the tokens.py token counting module."""
+import pytest
+
+import tokens
+
+
+@pytest.fixture(autouse=True)
+def heuristic(monkeypatch):
+    """Count with the dependency-free tokenizer and an empty memo."""
+    monkeypatch.setattr(tokens, '_tokenizer', tokens.HeuristicTokenizer())
+    monkeypatch.setattr(tokens, '_memo', tokens.OrderedDict())
+    monkeypatch.setattr(tokens, '_stats', {"hits": 0, "misses": 0})
+
+
+class TestHeuristicTokenizer:
+    """Tests for the calibrated fallback estimator."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("Hello world", 2),
+        ("This is a longer piece of text for testing", 9),
+        ("Line 1\nLine 2\nLine 3\n", 12),
+    ])
+    def test_matches_cl100k_on_simple_text(self, text, expected):
+        """Simple prose should count like the cl100k pre-tokenizer."""
+        assert tokens.count_tokens(text) == expected
+
+    def test_code_counts_more_than_chars_over_four(self):
+        """Punctuation-heavy code should not be undercounted like len // 4."""
+        code = 'if (x[i] != y[j]) { return f(a, b) + g(c); }\n' * 10
+
+        assert tokens.count_tokens(code) > len(code) // 4
+
+    def test_non_latin_text(self):
+        """CJK text should count about one token per character."""
+        assert tokens.count_tokens("こんにちは世界") == 7
+
+    def test_empty(self):
+        """Empty and None inputs should be zero tokens."""
+        assert tokens.count_tokens("") == 0
+        assert tokens.count_tokens(None) == 0
+
+
+class TestTokenizerSelection:
+    """Tests for pluggable, lazily loaded tokenizers."""
+
+    def test_custom_tokenizer(self, monkeypatch):
+        """A registered tokenizer should be used once selected."""
+        class Chars:
+            name = "chars"
+
+            def count(self, text):
+                return len(text)
+
+        monkeypatch.setattr(tokens, '_FACTORIES', dict(tokens._FACTORIES))
+        tokens.register_tokenizer("chars", Chars)
+
+        assert tokens.set_tokenizer("chars").name == "chars"
+        assert tokens.count_tokens("abcdef") == 6
+
+    def test_falls_back_when_unavailable(self, monkeypatch):
+        """A tokenizer that fails to load (e.g. no tiktoken) should fall back to the heuristic."""
+        def broken():
+            raise ImportError("No module named 'tiktoken'")
+
+        monkeypatch.setattr(tokens, '_FACTORIES', {**tokens._FACTORIES, "tiktoken": broken})
+
+        assert tokens.set_tokenizer("auto").name == "heuristic"
+
+    def test_loaded_once(self, monkeypatch):
+        """The tokenizer should be built on first use only."""
+        built = []
+
+        def factory():
+            built.append(1)
+            return tokens.HeuristicTokenizer()
+
+        monkeypatch.setattr(tokens, '_FACTORIES', {**tokens._FACTORIES, "counting": factory})
+        monkeypatch.setattr(tokens, 'TOKENIZER', "counting")
+        monkeypatch.setattr(tokens, '_tokenizer', None)
+
+        tokens.count_tokens("one")
+        tokens.count_tokens("two")
+
+        assert built == [1]
+
+
+class TestMemo:
+    """Tests for the count cache."""
+
+    def test_repeated_strings_hit(self):
+        """Counting the same text again should come from the memo."""
+        text = "the same handoff block " * 50
+
+        first = tokens.count_tokens(text)
+        second = tokens.count_tokens(text)
+
+        assert first == second
+        assert tokens.get_stats()["hits"] == 1
+        assert tokens.get_stats()["misses"] == 1
+
+    def test_bounded(self, monkeypatch):
+        """The memo should evict the oldest counts beyond COUNT_CACHE_SIZE."""
+        monkeypatch.setattr(tokens, 'COUNT_CACHE_SIZE', 2)
+
+        for text in ("a", "b", "c"):
+            tokens.count_tokens(text)
+
+        assert tokens.get_stats()["cached"] == 2
+
+
+class TestTruncate:
+    """Tests for truncate_to_tokens."""
+
+    def test_keeps_head_within_budget(self):
+        """The longest prefix within the budget should be kept."""
+        text = "word " * 100
+
+        head = tokens.truncate_to_tokens(text, 10)
+
+        assert text.startswith(head)
+        assert tokens.count_tokens(head) == 10
+
+    def test_keeps_tail(self):
+        """keep='tail' should keep the end of the text."""
+        text = "".join(f"line {i}\n" for i in range(100))
+
+        tail = tokens.truncate_to_tokens(text, 12, keep="tail")
+
+        assert text.endswith(tail)
+        assert "line 99" in tail
+        assert tokens.count_tokens(tail) <= 12
+
+    def test_short_text_unchanged(self):
+        """Text within the budget should be returned as-is."""
+        assert tokens.truncate_to_tokens("Hello world", 10) == "Hello world"
@@ -0,0 +1,184 @@
+"""Tests for the vector_index.py local semantic index."""
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import memory
+import vector_index
+from vector_index import VectorIndex
+
+
+@pytest.fixture
+def temp_storage_dir(tmp_path):
+    """Use a temporary directory for storage during tests."""
+    with mock.patch.object(memory, 'STORAGE_DIR', tmp_path), \
+         mock.patch.object(memory, 'SESSIONS_DIR', tmp_path / "sessions"), \
+         mock.patch.object(memory, 'CONFIG_FILE', tmp_path / "config.json"), \
+         mock.patch.object(memory, 'SESSIONS_INDEX', tmp_path / "sessions" / "index.json"), \
+         mock.patch.object(memory, 'LEARNINGS_FILE', tmp_path / "learnings.json"):
+        yield tmp_path
+
+
+class TestEmbed:
+    """Tests for the hashing embedder."""
+
+    def test_rows_are_normalized(self):
+        """Embeddings should be unit length."""
+        vectors = vector_index.embed(["database connection pooling", "retry logic"])
+
+        norms = (vectors ** 2).sum(axis=1)
+        assert norms == pytest.approx([1.0, 1.0], abs=1e-5)
+
+    def test_inflections_are_similar(self):
+        """Word variants should embed closer than unrelated text."""
+        query, related, unrelated = vector_index.embed([
+            "caching strategy", "cached strategies", "frontend styling",
+        ])
+
+        assert query @ related > query @ unrelated
+
+    def test_empty_text(self):
+        """Empty text should embed to a zero vector, not NaN."""
+        vector = vector_index.embed([""])[0]
+
+        assert not vector.any()
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex storage and search."""
+
+    def test_search_top_k(self, tmp_path):
+        """Search should return the most similar records first."""
+        index = VectorIndex(tmp_path)
+        index.add_learning({"id": "l1", "text": "Postgres connection pool exhausted under load"})
+        index.add_learning({"id": "l2", "text": "Button colors use the design tokens"})
+        index.add_learning({"id": "l3", "text": "Raise pool size for postgres connections"})
+
+        results = index.search("postgres connections", limit=2)
+
+        assert {record["id"] for _, record in results} == {"l1", "l3"}
+        assert results[0][0] >= results[1][0]
+
+    def test_session_resave_supersedes(self, tmp_path):
+        """Only the newest version of a session should be searchable."""
+        index = VectorIndex(tmp_path)
+        index.add_session({"id": "s1", "context": {"summary": "Billing invoices"}})
+        index.add_session({"id": "s1", "context": {"summary": "Search relevance"}})
+
+        results = index.search("billing invoices", kind="session", min_similarity=0.0)
+
+        assert len(results) == 1
+        assert results[0][1]["summary"] == "Search relevance"
+        assert index.counts() == {"learning": 0, "session": 1}
+
+    def test_kind_filter(self, tmp_path):
+        """kind should restrict results to learnings or sessions."""
+        index = VectorIndex(tmp_path)
+        index.add_learning({"id": "l1", "text": "Webhook retries"})
+        index.add_session({"id": "s1", "context": {"summary": "Webhook retries"}})
+
+        results = index.search("webhook", kind="learning")
+
+        assert [record["id"] for _, record in results] == ["l1"]
+
+    def test_other_kinds_supersede_by_id(self, tmp_path):
+        """Records added with add_records should behave like sessions."""
+        index = VectorIndex(tmp_path)
+        index.add_learning({"id": "l1", "text": "Webhook retries"})
+        index.add_records("linear", [({"id": "d1"}, "Webhook design doc")])
+        index.add_records("linear", [({"id": "d1"}, "Billing design doc")])
+
+        results = index.search("design doc", kind="linear", min_similarity=0.0)
+
+        assert len(results) == 1
+        assert index.search("webhook", kind="linear") == []
+        assert index.counts() == {"learning": 1, "session": 0, "linear": 1}
+        assert index.search("webhook", kind="missing") == []
+
+    def test_ignores_torn_append(self, tmp_path):
+        """A vector row without a record line should be ignored."""
+        index = VectorIndex(tmp_path)
+        index.add_learning({"id": "l1", "text": "Kafka consumer lag"})
+        with open(tmp_path / vector_index.VECTORS_FILE, "ab") as f:
+            f.write(vector_index.embed(["orphan"]).tobytes())
+
+        assert index.counts()["learning"] == 1
+
+    def test_picks_up_external_appends(self, tmp_path):
+        """Writes through another instance should be visible on next search."""
+        reader = VectorIndex(tmp_path)
+        VectorIndex(tmp_path).add_learning({"id": "l1", "text": "Redis eviction policy"})
+        assert reader.search("redis eviction")
+
+        VectorIndex(tmp_path).add_learning({"id": "l2", "text": "Redis cluster failover"})
+
+        ids = [record["id"] for _, record in reader.search("redis", min_similarity=0.0)]
+        assert "l2" in ids
+
+
+    def test_load_parses_only_appended_records(self, tmp_path):
+        """Reloading after an append should parse just the new lines."""
+        reader = VectorIndex(tmp_path)
+        VectorIndex(tmp_path).add_learning({"id": "l1", "text": "Redis eviction policy"})
+        assert reader.counts()["learning"] == 1
+
+        VectorIndex(tmp_path).add_session({"id": "s1", "context": {"summary": "Redis"}})
+        VectorIndex(tmp_path).add_session({"id": "s1", "context": {"summary": "Redis cluster"}})
+        with mock.patch.object(vector_index.json, "loads", wraps=vector_index.json.loads) as loads:
+            assert reader.counts() == {"learning": 1, "session": 1}
+
+        parsed = [call.args[0] for call in loads.call_args_list if isinstance(call.args[0], bytes)]
+        assert len(parsed) == 2
+
+    def test_reload_after_rebuild(self, tmp_path):
+        """A replaced records file should be re-read from the start."""
+        reader = VectorIndex(tmp_path)
+        VectorIndex(tmp_path).add_learning({"id": "l1", "text": "Redis eviction policy"})
+        assert reader.counts()["learning"] == 1
+
+        VectorIndex(tmp_path).rebuild([{"id": "l2", "text": "Kafka consumer lag"}], [])
+
+        assert [record["id"] for _, record in reader.search("kafka consumer")] == ["l2"]
+        assert reader.counts()["learning"] == 1
+
+    def test_hashed_embeddings_use_higher_threshold(self, tmp_path):
+        """Weak lexical overlap should not count as a match for hashed embeddings."""
+        index = VectorIndex(tmp_path)
+        index.add_learning({"id": "l1", "text": "Postgres connection pool exhausted under load"})
+
+        assert not vector_index.is_semantic()
+        assert vector_index.default_min_similarity() == vector_index.HASH_MIN_SIMILARITY
+        assert index.search("unrelated frontend styling tokens") == []
+
+
+class TestSemanticSearch:
+    """Tests for memory.semantic_search integration."""
+
+    def test_fed_from_save_learning(self, temp_storage_dir):
+        """Saved learnings should be semantically searchable."""
+        memory.save_learning({"text": "Rate limiter rejects bursts above 100 rps"})
+
+        results = memory.semantic_search("rate limiter bursts", kind="learning")
+
+        assert len(results) == 1
+        assert 0 < results[0]["similarity"] <= 1
+
+    def test_rebuilds_for_existing_data(self, temp_storage_dir):
+        """Learnings written before the index existed should be embedded."""
+        memory.init_storage()
+        memory._atomic_write(temp_storage_dir / "learnings.json", [
+            {"id": "learning_old", "text": "Terraform state locking with dynamodb", "tags": []},
+        ])
+
+        results = memory.semantic_search("terraform locking")
+
+        assert [item["id"] for item in results] == ["learning_old"]
+
+    def test_disabled_without_numpy(self, temp_storage_dir):
+        """Without numpy the semantic tier should return nothing."""
+        memory.save_learning({"text": "Anything"})
+
+        with mock.patch.object(vector_index, 'HAS_NUMPY', False):
+            assert memory.semantic_search("anything") == []
@@ -0,0 +1,108 @@
+"""Tests for the worker_pool.py per-session extraction pool."""
+import asyncio
+
+import pytest
+
+import worker_pool
+
+
+class TestSessionWorkerPool:
+    """Tests for concurrency, ordering and coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_processes_sessions_concurrently(self):
+        """Different sessions should run in parallel, up to the limit."""
+        active = 0
+        peak = 0
+
+        async def handler(key):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+        async with worker_pool.SessionWorkerPool(handler, concurrency=3) as pool:
+            for key in range(6):
+                pool.submit(key)
+            await pool.join()
+
+        assert peak == 3
+        assert pool.stats["processed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_session_never_runs_twice_at_once(self):
+        """A session submitted mid-run should run again afterwards, not in parallel."""
+        runs = []
+        running = set()
+        started = asyncio.Event()
+
+        async def handler(key):
+            assert key not in running
+            running.add(key)
+            runs.append(key)
+            started.set()
+            await asyncio.sleep(0.02)
+            running.discard(key)
+
+        async with worker_pool.SessionWorkerPool(handler, concurrency=4) as pool:
+            pool.submit("a")
+            await started.wait()
+            pool.submit("a")
+            pool.submit("a")
+            await pool.join()
+
+        assert runs == ["a", "a"]
+        assert pool.stats["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queued_duplicates_coalesce(self):
+        """Repeated submissions of a waiting session should run it once."""
+        runs = []
+
+        async def handler(key):
+            runs.append(key)
+
+        async with worker_pool.SessionWorkerPool(handler, concurrency=1) as pool:
+            pool.submit("a")
+            pool.submit("b")
+            pool.submit("b")
+            await pool.join()
+
+        assert runs == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_errors_do_not_stop_the_pool(self):
+        """A failing session should be reported and the rest still processed."""
+        errors = []
+
+        async def handler(key):
+            if key == "bad":
+                raise RuntimeError("boom")
+
+        async with worker_pool.SessionWorkerPool(
+            handler, concurrency=1, on_error=lambda key, e: errors.append((key, str(e)))
+        ) as pool:
+            pool.submit("bad")
+            pool.submit("good")
+            await pool.join()
+
+        assert errors == [("bad", "boom")]
+        assert pool.get_stats()["processed"] == 1
+        assert pool.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_blocking_work_off_loop_overlaps(self):
+        """Handlers that push blocking calls to threads should overlap."""
+        import time
+
+        async def handler(key):
+            await asyncio.to_thread(time.sleep, 0.1)
+
+        started = time.perf_counter()
+        async with worker_pool.SessionWorkerPool(handler, concurrency=4) as pool:
+            for key in range(4):
+                pool.submit(key)
+            await pool.join()
+
+        assert time.perf_counter() - started < 0.3
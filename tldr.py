@@ -15,10 +15,23 @@ Token Thresholds:
 - 500-2000 tokens: L1 summary
 - 2000-5000 tokens: L2 summary
 - > 5000 tokens: L2 summary with chunking
+
+Chunking is map-reduce: content is split on structural boundaries
+(headings, paragraphs, lines, sentences), chunks are summarized in
+parallel, and the summaries are reduced, in rounds if they are still too
+big, into one summary at the requested level. Chunk boundaries depend on
+the content around them, not on absolute offsets, so an edit only changes
+the chunks it touches; the other chunk prompts are unchanged and are
+served from the completion cache (see completion_cache.py).
 """
 import logging
+import os
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import tokens
 from cerebras_client import complete, CerebrasError
 
 
@@ -39,6 +52,21 @@ MAX_TOKENS_L1 = 300
 MAX_TOKENS_L2 = 600
 MAX_TOKENS_L3 = 1500
 
+# Map-reduce chunking for content above THRESHOLD_L2
+CHUNK_TOKENS = int(os.environ.get("FLOW_GUARDIAN_TLDR_CHUNK_TOKENS", "3000"))
+CHUNK_SUMMARY_TOKENS = 400   # Output tokens per chunk (map) or group (reduce) summary
+TLDR_CONCURRENCY = int(os.environ.get("FLOW_GUARDIAN_TLDR_CONCURRENCY", "4"))
+MAX_REDUCE_ROUNDS = 4
+
+# Split points, coarsest first; each boundary is the end of a match
+_BOUNDARIES = [
+    re.compile(r"(?m)^(?=#{1,6} )"),     # Markdown headings
+    re.compile(r"\n[ \t]*\n+"),          # Blank lines (paragraphs)
+    re.compile(r"\n"),                   # Lines
+    re.compile(r"(?<=[.!?])\s+"),        # Sentences
+    re.compile(r"\s+"),                  # Words
+]
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,19 +74,16 @@ logger = logging.getLogger(__name__)
 
 def estimate_tokens(text: str) -> int:
     """
-    Rough token estimation (4 chars = 1 token).
+    Token count of text (see tokens.py).
     Used to decide if TLDR is needed.
 
     Args:
-        text: Input text to estimate
+        text: Input text to measure
 
     Returns:
-        Estimated token count
+        Token count
     """
-    if not text:
-        return 0
-    # Simple heuristic: ~4 characters per token (accounts for whitespace)
-    return len(text) // 4
+    return tokens.count_tokens(text)
 
 
 # ============ SUMMARIZATION FUNCTIONS ============
@@ -109,10 +134,12 @@ def summarize_context(
             "L3": MAX_TOKENS_L3,
         }.get(level, MAX_TOKENS_L1)
 
-    # Build prompt based on level
-    prompt = _build_summarize_prompt(content, level)
-
     try:
+        if estimated > THRESHOLD_L2:
+            return _map_reduce(content, level, max_tokens)
+
+        # Build prompt based on level
+        prompt = _build_summarize_prompt(content, level)
         result = complete(
             prompt=prompt,
             system="You are a concise technical summarizer. Preserve key details, remove fluff.",
@@ -122,7 +149,147 @@ def summarize_context(
     except CerebrasError as e:
         logger.warning(f"Cerebras unavailable for TLDR: {e}")
         # Fallback: truncate if too long
-        return _truncate_fallback(content, max_tokens * 4)
+        return _truncate_fallback(content, max_tokens)
+
+
+# ============ CHUNKING ============
+
+def _split(text: str, max_tokens: int, depth: int = 0) -> list[str]:
+    """Split text into pieces of at most max_tokens at the coarsest boundary that works."""
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    if depth >= len(_BOUNDARIES):
+        pieces = []
+        while text:
+            head = tokens.truncate_to_tokens(text, max_tokens) or text[:1]
+            pieces.append(head)
+            text = text[len(head):]
+        return pieces
+
+    cuts = [m.end() for m in _BOUNDARIES[depth].finditer(text) if 0 < m.end() < len(text)]
+    if not cuts:
+        return _split(text, max_tokens, depth + 1)
+
+    pieces = []
+    start = 0
+    for end in cuts + [len(text)]:
+        if end > start:
+            pieces.extend(_split(text[start:end], max_tokens, depth + 1))
+            start = end
+    return pieces
+
+
+def split_chunks(content: str, chunk_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """
+    Split content into chunks of about chunk_tokens on structural boundaries.
+
+    Pieces are packed into a chunk until it is at least half full and a
+    piece whose content hash selects it as a cut point ends it (or the
+    next piece would overflow it). Cut points therefore move with the
+    text: inserting a paragraph only changes the chunks around it.
+
+    Args:
+        content: Text to split
+        chunk_tokens: Maximum chunk size in tokens
+
+    Returns:
+        Chunks that concatenate back to content
+    """
+    chunk_tokens = max(chunk_tokens, 1)
+    chunks = []
+    current, size = "", 0
+    for piece in _split(content, chunk_tokens):
+        piece_tokens = estimate_tokens(piece)
+        if current and size + piece_tokens > chunk_tokens:
+            chunks.append(current)
+            current, size = "", 0
+        current += piece
+        size += piece_tokens
+        if size >= chunk_tokens // 2 and zlib.crc32(piece.encode("utf-8")) % 4 == 0:
+            chunks.append(current)
+            current, size = "", 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _summarize_all(prompts: list[str], max_tokens: int) -> list[str]:
+    """Run summarization prompts concurrently (bounded), in order."""
+    system = "You are a concise technical summarizer. Preserve key details, remove fluff."
+
+    def run(prompt: str) -> str:
+        return complete(prompt=prompt, system=system, max_tokens=max_tokens).strip()
+
+    if len(prompts) == 1:
+        return [run(prompts[0])]
+    with ThreadPoolExecutor(max_workers=max(1, min(TLDR_CONCURRENCY, len(prompts)))) as pool:
+        return list(pool.map(run, prompts))
+
+
+def _map_reduce(content: str, level: str, max_tokens: int) -> str:
+    """
+    Summarize oversized content chunk by chunk, then combine.
+
+    Args:
+        content: Content larger than THRESHOLD_L2
+        level: Target TLDR level
+        max_tokens: Output token budget of the final summary
+
+    Returns:
+        Summary at the requested level
+
+    Raises:
+        CerebrasError: If any Cerebras call fails
+    """
+    chunks = split_chunks(content)
+    logger.debug(f"TLDR map-reduce: {len(chunks)} chunks")
+    summaries = _summarize_all(
+        [_build_chunk_prompt(chunk, level) for chunk in chunks],
+        CHUNK_SUMMARY_TOKENS,
+    )
+
+    # Reduce in rounds until the summaries fit in one prompt
+    for _ in range(MAX_REDUCE_ROUNDS):
+        combined = "\n\n".join(summaries)
+        if estimate_tokens(combined) <= CHUNK_TOKENS or len(summaries) == 1:
+            break
+        groups = split_chunks(combined)
+        if len(groups) >= len(summaries):
+            break
+        summaries = _summarize_all(
+            [_build_chunk_prompt(group, level) for group in groups],
+            CHUNK_SUMMARY_TOKENS,
+        )
+
+    combined = "\n\n".join(summaries)
+    return _summarize_all([_build_summarize_prompt(combined, level)], max_tokens)[0]
+
+
+def _build_chunk_prompt(chunk: str, level: str) -> str:
+    """Build the map prompt for one chunk of a larger document.
+
+    The prompt depends only on the chunk (not its position or the chunk
+    count), so unchanged chunks hit the completion cache after an edit.
+    """
+    if level == "L0":
+        return f"""Extract ONLY the file paths mentioned in this part of a larger document.
+Return them as a simple list, one per line.
+If no file paths, return "No files mentioned."
+
+CONTENT:
+{chunk}"""
+
+    return f"""This is one part of a larger document. Summarize it so the parts
+can be combined later. Keep:
+1. Goals, current state and progress
+2. Technical details and decisions
+3. Blockers, hypotheses and insights
+4. File and function references
+
+Format as bullet points. Do not add an introduction.
+
+PART:
+{chunk}"""
 
 
 def _build_summarize_prompt(content: str, level: str) -> str:
@@ -170,11 +337,11 @@ CONTEXT:
 {content}"""
 
 
-def _truncate_fallback(content: str, max_chars: int) -> str:
+def _truncate_fallback(content: str, max_tokens: int) -> str:
     """Fallback when Cerebras unavailable: truncate with ellipsis."""
-    if len(content) <= max_chars:
+    if estimate_tokens(content) <= max_tokens:
         return content
-    return content[:max_chars - 20] + "\n...[truncated]..."
+    return tokens.truncate_to_tokens(content, max_tokens - 8) + "\n...[truncated]..."
 
 
 def summarize_handoff(handoff: dict, level: str = "L1") -> str:
@@ -31,104 +31,260 @@ def extract_python_structure(content: str, filename: str = "file.py", level: str
     Returns:
         Structured summary preserving exact symbols
     """
+    return format_python_structure(parse_python_structure(content), filename, level)
+
+
+def parse_python_structure(content: str) -> dict:
+    """
+    Parse Python source into a level-independent, JSON-serializable structure.
+
+    This is what code_index.py stores per file; format_python_structure()
+    renders it at any level without re-parsing.
+
+    Args:
+        content: Python source code
+
+    Returns:
+        Dictionary with imports, import_map, constants, classes, functions,
+        calls and call_refs (or error for unparseable source)
+    """
     try:
         tree = ast.parse(content)
+        visitor = _StructureVisitor()
+        visitor.visit(tree)
     except SyntaxError as e:
-        return f"## {filename}\n[Syntax error: {e}]\n"
+        return {"error": f"Syntax error: {e}"}
+    except RecursionError:
+        return {"error": "Syntax error: nested too deeply to parse"}
+    return visitor.structure()
+
+
+class _StructureVisitor(ast.NodeVisitor):
+    """
+    Collects everything parse_python_structure() needs in one traversal.
+
+    calls maps every function name (methods and nested functions included)
+    to the bare names it calls, counting calls made by functions nested in
+    it. call_refs is what code_index resolves across files: it maps each
+    module-level symbol ("func", "Class.method") to the dotted names it
+    calls ("helper", "self.save", "cerebras_client.complete").
+    """
+
+    def __init__(self):
+        self.imports: list[str] = []
+        self.nested_imports: list[str] = []
+        self.import_map: dict[str, str] = {}
+        self.constants: list[str] = []
+        self.classes: list[dict] = []
+        self.functions: list[dict] = []
+        self.calls: dict[str, set] = {}
+        self.call_refs: dict[str, set] = {}
+        self._top: set[int] = set()
+        self._scope: list[str] = []
+        self._function_depth = 0
+        self._symbol: Optional[str] = None
+        self._callers: list[str] = []
+
+    def structure(self) -> dict:
+        return {
+            # Module-level imports first, then lazy imports inside functions
+            "imports": self.imports + self.nested_imports,
+            "import_map": self.import_map,
+            "constants": self.constants,
+            "classes": self.classes,
+            "functions": self.functions,
+            "calls": {name: sorted(callees) for name, callees in self.calls.items() if callees},
+            "call_refs": {name: sorted(callees) for name, callees in self.call_refs.items() if callees},
+        }
+
+    def visit_Module(self, node: ast.Module) -> None:
+        self._top = {id(child) for child in node.body}
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        imports = self.imports if id(node) in self._top else self.nested_imports
+        for alias in node.names:
+            imports.append(alias.name)
+            if alias.asname:
+                self.import_map[alias.asname] = alias.name
+            else:
+                head = alias.name.split(".")[0]
+                self.import_map[head] = head
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        prefix = "." * node.level + module
+        imports = self.imports if id(node) in self._top else self.nested_imports
+        for alias in node.names:
+            imports.append(f"{module}.{alias.name}")
+            if alias.name != "*":
+                target = f"{prefix}.{alias.name}" if module else f"{prefix}{alias.name}"
+                self.import_map[alias.asname or alias.name] = target
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if id(node) in self._top:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id.isupper():
+                    self.constants.append(target.id)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        if id(node) in self._top:
+            self.classes.append({
+                "name": node.name,
+                "line": node.lineno,
+                "bases": [_get_name(base) for base in node.bases],
+                "doc": _first_doc_line(node),
+                "methods": [
+                    {
+                        "name": method.name,
+                        "line": method.lineno,
+                        "signature": _format_function_signature(method, include_types=True),
+                        "short": _format_function_signature(method, include_types=False),
+                    }
+                    for method in node.body
+                    if isinstance(method, (ast.FunctionDef, ast.AsyncFunctionDef))
+                ],
+            })
+        self._scope.append(node.name)
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        if id(node) in self._top:
+            self.functions.append({
+                "name": node.name,
+                "line": node.lineno,
+                "signature": _format_function_signature(node, include_types=True),
+                "doc": _first_doc_line(node),
+            })
+
+        outermost = self._function_depth == 0
+        if outermost:
+            # Calls from nested functions count towards the enclosing symbol
+            self._symbol = ".".join(self._scope + [node.name])
+            self.call_refs.setdefault(self._symbol, set())
+        self.calls.setdefault(node.name, set())
+        self._callers.append(node.name)
+        self._scope.append(node.name)
+        self._function_depth += 1
+        self.generic_visit(node)
+        self._function_depth -= 1
+        self._scope.pop()
+        self._callers.pop()
+        if outermost:
+            self._symbol = None
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if self._callers:
+            if isinstance(node.func, ast.Name):
+                name = node.func.id
+            elif isinstance(node.func, ast.Attribute):
+                name = node.func.attr
+            else:
+                name = None
+            if name:
+                for caller in set(self._callers):
+                    self.calls[caller].add(name)
+            dotted = _dotted_name(node.func)
+            if dotted and self._symbol:
+                self.call_refs[self._symbol].add(dotted)
+        self.generic_visit(node)
+
+
+def _dotted_name(node) -> Optional[str]:
+    """"a.b.c" for a Name/Attribute chain, None for anything else."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def format_python_structure(structure: dict, filename: str = "file.py", level: str = "L1") -> str:
+    """
+    Render a parsed structure as a code TLDR.
+
+    Args:
+        structure: Output of parse_python_structure()
+        filename: Name for header
+        level: L1 (signatures), L2 (+docstrings), L3 (+call graph)
+
+    Returns:
+        Structured summary preserving exact symbols
+    """
+    if "error" in structure:
+        return f"## {filename}\n[{structure['error']}]\n"
 
     lines = []
     lines.append(f"## {filename}")
     lines.append("")
 
-    # Extract imports
-    imports = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                imports.append(alias.name)
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module or ""
-            for alias in node.names:
-                imports.append(f"{module}.{alias.name}")
-
+    imports = structure["imports"]
     if imports:
         lines.append(f"**Imports:** {', '.join(imports[:10])}")
         if len(imports) > 10:
             lines.append(f"  (+{len(imports) - 10} more)")
         lines.append("")
 
-    # Extract top-level constants
-    constants = []
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id.isupper():
-                    constants.append(target.id)
-
-    if constants:
-        lines.append(f"**Constants:** {', '.join(constants)}")
+    if structure["constants"]:
+        lines.append(f"**Constants:** {', '.join(structure['constants'])}")
         lines.append("")
 
-    # Extract classes
-    classes = [node for node in ast.iter_child_nodes(tree) if isinstance(node, ast.ClassDef)]
-    if classes:
+    if structure["classes"]:
         lines.append("**Classes:**")
-        for cls in classes:
-            # Get base classes
-            bases = [_get_name(base) for base in cls.bases]
-            base_str = f"({', '.join(bases)})" if bases else ""
-
-            lines.append(f"- `{cls.name}{base_str}`")
+        for cls in structure["classes"]:
+            base_str = f"({', '.join(cls['bases'])})" if cls["bases"] else ""
+            lines.append(f"- `{cls['name']}{base_str}`")
 
             # Get docstring if L2+
-            if level in ("L2", "L3"):
-                docstring = ast.get_docstring(cls)
-                if docstring:
-                    first_line = docstring.split('\n')[0][:80]
-                    lines.append(f"  {first_line}")
-
-            # Get methods
-            methods = [n for n in cls.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            if level in ("L2", "L3") and cls["doc"]:
+                lines.append(f"  {cls['doc']}")
+
+            methods = cls["methods"]
             if methods:
-                method_sigs = []
-                for method in methods[:10]:  # Limit to 10 methods
-                    sig = _format_function_signature(method, include_types=level != "L1")
-                    method_sigs.append(sig)
-                lines.append(f"  Methods: {', '.join(method_sigs)}")
+                key = "short" if level == "L1" else "signature"
+                lines.append(f"  Methods: {', '.join(m[key] for m in methods[:10])}")  # Limit to 10 methods
                 if len(methods) > 10:
                     lines.append(f"  (+{len(methods) - 10} more methods)")
         lines.append("")
 
-    # Extract top-level functions
-    functions = [node for node in ast.iter_child_nodes(tree)
-                 if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
-
-    if functions:
+    if structure["functions"]:
         lines.append("**Functions:**")
-        for func in functions:
-            sig = _format_function_signature(func, include_types=True)
-            lines.append(f"- `{sig}`")
+        for func in structure["functions"]:
+            lines.append(f"- `{func['signature']}`")
 
             # Get docstring if L2+
-            if level in ("L2", "L3"):
-                docstring = ast.get_docstring(func)
-                if docstring:
-                    first_line = docstring.split('\n')[0][:80]
-                    lines.append(f"  {first_line}")
+            if level in ("L2", "L3") and func["doc"]:
+                lines.append(f"  {func['doc']}")
         lines.append("")
 
     # For L3, add call graph hints
     if level == "L3":
-        calls = _extract_function_calls(tree)
+        calls = structure["calls"]
         if calls:
             lines.append("**Internal Calls:**")
-            for caller, callees in list(calls.items())[:5]:
-                lines.append(f"- {caller} -> {', '.join(callees[:5])}")
+            for caller, callees in calls.items():
+                more = f" (+{len(callees) - 8} more)" if len(callees) > 8 else ""
+                lines.append(f"- {caller} -> {', '.join(callees[:8])}{more}")
             lines.append("")
 
     return '\n'.join(lines)
 
 
+def _first_doc_line(node) -> Optional[str]:
+    """First line of a docstring, capped at 80 characters."""
+    docstring = ast.get_docstring(node)
+    if not docstring:
+        return None
+    return docstring.split('\n')[0][:80]
+
+
 def _format_function_signature(node: ast.FunctionDef, include_types: bool = True) -> str:
     """Format a function signature from AST node."""
     name = node.name
@@ -199,24 +355,9 @@ def _get_name(node) -> str:
 
 def _extract_function_calls(tree: ast.AST) -> dict:
     """Extract function call graph (caller -> callees)."""
-    calls = {}
-
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            caller = node.name
-            callees = set()
-
-            for child in ast.walk(node):
-                if isinstance(child, ast.Call):
-                    if isinstance(child.func, ast.Name):
-                        callees.add(child.func.id)
-                    elif isinstance(child.func, ast.Attribute):
-                        callees.add(child.func.attr)
-
-            if callees:
-                calls[caller] = list(callees)
-
-    return calls
+    visitor = _StructureVisitor()
+    visitor.visit(tree)
+    return visitor.structure()["calls"]
 
 
 def generate_code_tldr(
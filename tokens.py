@@ -0,0 +1,231 @@
+"""Token counting for Flow Guardian.
+
+Every token budget (TLDR thresholds, injection size, daemon extraction
+chunks) is measured here, so they agree with each other and with what the
+model actually sees.
+
+Tokenizers are pluggable and loaded lazily, once per process
+(FLOW_GUARDIAN_TOKENIZER picks one):
+- tiktoken: exact BPE counts with the cl100k_base encoding, if the
+  tiktoken package and its encoding file are available
+- heuristic: no dependencies; mirrors the cl100k pre-tokenizer (words,
+  numbers, punctuation runs, newlines) and charges long words extra, which
+  tracks real counts far better than len(text) // 4 on code and non-English
+  text
+
+Counts are memoized by content digest, so the same handoff, recall block or
+conversation window is only tokenized once.
+"""
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol
+
+
+# ============ CONFIGURATION ============
+
+# auto (tiktoken, else heuristic), tiktoken or heuristic
+TOKENIZER = os.environ.get("FLOW_GUARDIAN_TOKENIZER", "auto")
+TIKTOKEN_ENCODING = os.environ.get("FLOW_GUARDIAN_TIKTOKEN_ENCODING", "cl100k_base")
+
+# Memoized counts kept (by content digest)
+COUNT_CACHE_SIZE = 4096
+
+logger = logging.getLogger(__name__)
+
+
+# ============ TOKENIZERS ============
+
+class Tokenizer(Protocol):
+    """Anything that can count the tokens of a string."""
+
+    name: str
+
+    def count(self, text: str) -> int:
+        ...
+
+
+# cl100k_base's pre-tokenization pattern, with \p{L} / \p{N} spelled for `re`
+_PIECES = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+# Characters per BPE token within one word / punctuation run
+_WORD_CHARS = 8
+_SYMBOL_CHARS = 3
+
+
+class HeuristicTokenizer:
+    """Dependency-free estimate calibrated on the cl100k pre-tokenizer."""
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        total = 0
+        for piece in _PIECES.findall(text):
+            if piece.isspace():
+                total += 1
+            elif piece.isascii():
+                if piece[-1].isalpha():
+                    total += math.ceil(len(piece) / _WORD_CHARS)
+                elif piece[-1].isdigit():
+                    total += 1
+                else:
+                    total += math.ceil(len(piece.strip()) / _SYMBOL_CHARS)
+            else:
+                # Non-Latin scripts are roughly one token per character
+                wide = sum(1 for ch in piece if not ch.isascii())
+                total += wide + math.ceil((len(piece) - wide) / _WORD_CHARS)
+        return total
+
+
+class TiktokenTokenizer:
+    """Exact counts with a tiktoken encoding."""
+
+    def __init__(self, encoding: str = TIKTOKEN_ENCODING):
+        import tiktoken
+        self.encoding = tiktoken.get_encoding(encoding)
+        self.name = f"tiktoken:{encoding}"
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+_FACTORIES: dict[str, Callable[[], Tokenizer]] = {
+    "tiktoken": TiktokenTokenizer,
+    "heuristic": HeuristicTokenizer,
+}
+
+_tokenizer: Optional[Tokenizer] = None
+_lock = threading.Lock()
+_memo: "OrderedDict[bytes, int]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+def register_tokenizer(name: str, factory: Callable[[], Tokenizer]) -> None:
+    """
+    Make a tokenizer selectable by name.
+
+    Args:
+        name: Value for FLOW_GUARDIAN_TOKENIZER / set_tokenizer()
+        factory: Called once to build the tokenizer; may raise to fall back
+    """
+    _FACTORIES[name] = factory
+
+
+def set_tokenizer(name: Optional[str] = None) -> Tokenizer:
+    """
+    Load a tokenizer and make it the process-wide default.
+
+    Args:
+        name: Registered tokenizer, or "auto" (default: TOKENIZER)
+
+    Returns:
+        The tokenizer now in use (heuristic if the requested one fails to load)
+    """
+    global _tokenizer
+    name = name or TOKENIZER
+    candidates = ["tiktoken", "heuristic"] if name == "auto" else [name, "heuristic"]
+    with _lock:
+        for candidate in candidates:
+            try:
+                tokenizer = _FACTORIES[candidate]()
+            except Exception as e:
+                # Missing package, unknown name, or the encoding file can't be fetched
+                logger.debug(f"Tokenizer {candidate} unavailable: {e}")
+                continue
+            _tokenizer = tokenizer
+            _memo.clear()
+            return tokenizer
+    raise RuntimeError("No tokenizer available")
+
+
+def get_tokenizer() -> Tokenizer:
+    """The process-wide tokenizer, loaded on first use."""
+    return _tokenizer or set_tokenizer()
+
+
+# ============ COUNTING ============
+
+def count_tokens(text: Optional[str]) -> int:
+    """
+    Count the tokens of a string (memoized).
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count (0 for empty or None)
+    """
+    if not text:
+        return 0
+    tokenizer = get_tokenizer()
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _lock:
+        count = _memo.get(key)
+        if count is not None:
+            _memo.move_to_end(key)
+            _stats["hits"] += 1
+            return count
+    count = tokenizer.count(text)
+    with _lock:
+        _stats["misses"] += 1
+        _memo[key] = count
+        if len(_memo) > COUNT_CACHE_SIZE:
+            _memo.popitem(last=False)
+    return count
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    """
+    Cut text to at most max_tokens tokens.
+
+    Args:
+        text: Text to cut
+        max_tokens: Token budget
+        keep: "head" keeps the beginning, "tail" keeps the end
+
+    Returns:
+        The longest prefix (or suffix) within the budget
+    """
+    if not text or count_tokens(text) <= max_tokens:
+        return text or ""
+    if max_tokens <= 0:
+        return ""
+
+    def part(n: int) -> str:
+        return text[:n] if keep == "head" else text[len(text) - n:]
+
+    # Binary search on characters; counts are monotonic in length
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if get_tokenizer().count(part(mid)) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return part(low)
+
+
+def get_stats() -> dict:
+    """
+    Tokenizer in use and memo statistics.
+
+    Returns:
+        Dictionary with tokenizer, hits, misses and cached
+    """
+    return {
+        "tokenizer": get_tokenizer().name,
+        **_stats,
+        "cached": len(_memo),
+    }
@@ -0,0 +1,376 @@
+"""Local vector index for offline recall.
+
+Gives recall an embedding tier that works offline, without a Backboard
+round-trip. Learnings and sessions are embedded on save and appended to a
+memory-mapped float32 matrix; queries run a brute-force cosine top-k over it
+(one matrix-vector product, a few milliseconds for 100k rows).
+
+Embeddings:
+- Default: a hashed bag of words and character trigrams. Deterministic and
+  needs no model download, but it is fuzzy-lexical, not semantic: it
+  matches shared spellings and inflections ("caching" ~ "cache"), never
+  synonyms, and unrelated words collide in the hashed slots. Its matches
+  get a higher similarity threshold and a lower fusion weight (see
+  ranking.semantic_weight()).
+- Semantic: a sentence-transformers model, selected with
+  FLOW_GUARDIAN_EMBED_MODEL (e.g. "all-MiniLM-L6-v2") when installed.
+
+Requires numpy. Without it the tier is disabled and search() returns no
+results.
+
+Files (under ~/.flow-guardian/vectors/):
+- vectors.f32: row-major float32 matrix, one row per record (append-only)
+- records.jsonl: one JSON line per row (kind, id, payload); only lines
+  appended since the last load are parsed
+- meta.json: embedding model name and dimension
+"""
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterable, Optional
+
+from search_index import _session_payload, learning_text, session_text, tokenize
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+# ============ CONFIGURATION ============
+
+# 256 dims keeps hash collisions between unrelated words rare while a
+# 100k-row scan stays at ~100 MB, around 10 ms on one core
+HASH_DIM = 256
+HASH_MODEL = f"hash-{HASH_DIM}"
+
+# Weight of character trigram features relative to whole words
+TRIGRAM_WEIGHT = 0.5
+
+# Minimum cosine similarity for a match with a sentence-transformers model,
+# and with the hashed embeddings (higher, since they only match spelling)
+MIN_SIMILARITY = 0.2
+HASH_MIN_SIMILARITY = 0.3
+
+EMBED_MODEL = os.environ.get("FLOW_GUARDIAN_EMBED_MODEL", "")
+
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.jsonl"
+META_FILE = "meta.json"
+
+
+# ============ EMBEDDINGS ============
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def _load_model():
+    """Load the optional sentence-transformers model, or None for hashing."""
+    global _model
+    if not EMBED_MODEL:
+        return None
+    with _model_lock:
+        if _model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(EMBED_MODEL)
+            except ImportError:
+                _model = False
+        return _model or None
+
+
+def model_name() -> str:
+    """Name of the active embedding model (stored with the index)."""
+    return EMBED_MODEL if _load_model() is not None else HASH_MODEL
+
+
+def is_semantic() -> bool:
+    """True if a sentence-transformers model is active (not hashed embeddings)."""
+    return _load_model() is not None
+
+
+def default_min_similarity() -> float:
+    """Similarity threshold for the active embedding model."""
+    return MIN_SIMILARITY if is_semantic() else HASH_MIN_SIMILARITY
+
+
+def _hash_features(text: str) -> dict[int, float]:
+    """Signed hashed features for words and character trigrams."""
+    features: dict[int, float] = {}
+    for token in tokenize(text):
+        grams = [(token, 1.0)]
+        padded = f"<{token}>"
+        grams.extend((padded[i:i + 3], TRIGRAM_WEIGHT) for i in range(len(padded) - 2))
+        for gram, weight in grams:
+            h = zlib.crc32(gram.encode("utf-8"))
+            slot = h % HASH_DIM
+            sign = 1.0 if (h >> 31) & 1 == 0 else -1.0
+            features[slot] = features.get(slot, 0.0) + sign * weight
+    return features
+
+
+def embed(texts: list[str]):
+    """
+    Embed texts as L2-normalized float32 rows.
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        numpy array of shape (len(texts), dim)
+    """
+    model = _load_model()
+    if model is not None:
+        vectors = model.encode(texts, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+    matrix = np.zeros((len(texts), HASH_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for slot, value in _hash_features(text).items():
+            matrix[row, slot] = value
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# ============ INDEX ============
+
+class VectorIndex:
+    """Append-only, memory-mapped embedding store over learnings and sessions."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._lock = threading.Lock()
+        # Loaded view, keyed on the files' size and mtime so appends by other
+        # processes are picked up on the next search
+        self._view_key: Optional[tuple] = None
+        self._matrix = None
+        self._rows = 0
+        self._reset_records()
+
+    def _reset_records(self) -> None:
+        """Forget the parsed records so the next load re-reads the file."""
+        # (inode, bytes parsed) of records.jsonl; later loads parse only the tail
+        self._records_file: Optional[tuple[int, int]] = None
+        self._records: list[dict] = []
+        self._latest: dict[tuple, int] = {}
+        self._live = np.ones(0, dtype=bool) if HAS_NUMPY else None
+        self._kinds = np.array([], dtype=str) if HAS_NUMPY else None
+        self._kind_masks: dict = {}
+
+    @property
+    def available(self) -> bool:
+        return HAS_NUMPY
+
+    def _paths(self) -> tuple[Path, Path, Path]:
+        return (self.directory / VECTORS_FILE,
+                self.directory / RECORDS_FILE,
+                self.directory / META_FILE)
+
+    def _read_meta(self) -> dict:
+        meta_path = self._paths()[2]
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_meta(self, dim: int) -> None:
+        self._paths()[2].write_text(json.dumps({"model": model_name(), "dim": dim}))
+
+    # ---- Writes ----
+
+    def _append(self, items: list[tuple[str, dict, str]]) -> None:
+        """Embed and append (kind, record, text) items."""
+        if not items:
+            return
+        vectors = embed([text for _, _, text in items])
+        vectors_path, records_path, _ = self._paths()
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if not self._read_meta():
+                self._write_meta(vectors.shape[1])
+            # Vectors first: a crash between the writes leaves an extra row,
+            # which _load() ignores by trusting the shorter of the two files
+            with open(vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(records_path, "a") as f:
+                for kind, record, _ in items:
+                    f.write(json.dumps({"kind": kind, "id": record.get("id"), "data": record},
+                                       default=str) + "\n")
+
+    def add_learning(self, learning: dict) -> None:
+        """Embed and store a newly saved learning."""
+        if HAS_NUMPY:
+            self._append([("learning", learning, learning_text(learning))])
+
+    def add_learnings(self, learnings: list[dict]) -> None:
+        """Embed and store a batch of learnings with one embed call and one append."""
+        if HAS_NUMPY:
+            self._append([("learning", item, learning_text(item)) for item in learnings])
+
+    def add_session(self, session: dict) -> None:
+        """Embed and store a saved session (supersedes earlier rows for its id)."""
+        if HAS_NUMPY:
+            self._append([("session", _session_payload(session), session_text(session))])
+
+    def add_records(self, kind: str, items: list[tuple[dict, str]]) -> None:
+        """
+        Embed and store records of another kind (e.g. mirrored documents).
+
+        Like sessions, a record supersedes earlier rows with the same id.
+
+        Args:
+            kind: Record kind, used to filter searches
+            items: (record, searchable text) pairs; records need an "id"
+        """
+        if HAS_NUMPY:
+            self._append([(kind, record, text) for record, text in items])
+
+    def clear(self) -> None:
+        """Remove the index files."""
+        with self._lock:
+            for path in self._paths():
+                path.unlink(missing_ok=True)
+            self._view_key = None
+            self._reset_records()
+
+    def rebuild(self, learnings: Iterable[dict], sessions: Iterable[dict]) -> None:
+        """
+        Re-embed everything from the store, replacing the index files.
+
+        Args:
+            learnings: Learnings, newest first (as returned by the store)
+            sessions: Full session records, newest first
+        """
+        if not HAS_NUMPY:
+            return
+        self.clear()
+        items = [("learning", item, learning_text(item)) for item in reversed(list(learnings))]
+        items += [("session", _session_payload(s), session_text(s)) for s in reversed(list(sessions))]
+        self._append(items)
+
+    # ---- Reads ----
+
+    def _read_new_records(self, records_path: Path, stat) -> None:
+        """Parse the lines appended to records.jsonl since the last load."""
+        if self._records_file is None or self._records_file[0] != stat.st_ino \
+                or stat.st_size < self._records_file[1]:
+            # First load, or the file was replaced (clear/rebuild elsewhere)
+            self._reset_records()
+            self._records_file = (stat.st_ino, 0)
+        offset = self._records_file[1]
+        with open(records_path, "rb") as f:
+            f.seek(offset)
+            tail = f.read()
+        # Stop at the last full line; a line still being written waits
+        end = tail.rfind(b"\n") + 1
+        new = [json.loads(line) for line in tail[:end].splitlines() if line.strip()]
+        self._records_file = (stat.st_ino, offset + end)
+        if not new:
+            return
+
+        # Only the newest row of each session (or other replaceable record) is live
+        start = len(self._records)
+        live = np.ones(len(new), dtype=bool)
+        for i, record in enumerate(new):
+            if record["kind"] == "learning":
+                continue
+            key = (record["kind"], record["id"])
+            previous = self._latest.get(key)
+            if previous is not None:
+                if previous >= start:
+                    live[previous - start] = False
+                else:
+                    self._live[previous] = False
+            self._latest[key] = start + i
+
+        self._records.extend(new)
+        self._live = np.concatenate([self._live, live])
+        self._kinds = np.concatenate([self._kinds, np.array([record["kind"] for record in new])])
+        self._kind_masks = {k: self._kinds == k for k in {"learning", "session", *self._kinds.tolist()}}
+
+    def _load(self) -> bool:
+        """Refresh the memory-mapped view if the files changed. False if empty."""
+        vectors_path, records_path, _ = self._paths()
+        try:
+            vst, rst = vectors_path.stat(), records_path.stat()
+        except OSError:
+            return False
+        key = (vst.st_size, vst.st_mtime_ns, rst.st_ino, rst.st_size, rst.st_mtime_ns)
+        if key == self._view_key:
+            return self._matrix is not None
+
+        meta = self._read_meta()
+        dim = meta.get("dim")
+        if not dim:
+            return False
+
+        with self._lock:
+            self._read_new_records(records_path, rst)
+            rows = min(vst.st_size // (dim * 4), len(self._records))
+            if rows == 0:
+                self._view_key, self._matrix, self._rows = key, None, 0
+                return False
+            matrix = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(rows, dim))
+            self._view_key, self._matrix, self._rows = key, matrix, rows
+        return True
+
+    def counts(self) -> dict:
+        """Live record counts by kind."""
+        if not HAS_NUMPY or not self._load():
+            return {"learning": 0, "session": 0}
+        live = self._live[:self._rows]
+        return {k: int((mask[:self._rows] & live).sum()) for k, mask in self._kind_masks.items()}
+
+    def is_current(self) -> bool:
+        """True if the stored vectors were made by the active embedding model."""
+        meta = self._read_meta()
+        return not meta or meta.get("model") == model_name()
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 10,
+               min_similarity: Optional[float] = None) -> list[tuple[float, dict]]:
+        """
+        Cosine top-k over stored embeddings.
+
+        Args:
+            query: Free-text query
+            kind: "learning", "session", or None for both
+            limit: Maximum results
+            min_similarity: Drop matches below this cosine similarity
+                            (default: default_min_similarity())
+
+        Returns:
+            List of (similarity, record) tuples, best first
+        """
+        if not HAS_NUMPY or not query.strip() or not self._load():
+            return []
+
+        if min_similarity is None:
+            min_similarity = default_min_similarity()
+        query_vector = embed([query])[0]
+        if not query_vector.any():
+            return []
+
+        rows = self._rows
+        scores = np.asarray(self._matrix @ query_vector)
+        mask = self._live[:rows]
+        if kind is not None:
+            if kind not in self._kind_masks:
+                return []
+            mask = mask & self._kind_masks[kind][:rows]
+        scores = np.where(mask, scores, -np.inf)
+
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (float(scores[row]), self._records[row]["data"])
+            for row in top
+            if scores[row] >= min_similarity
+        ]
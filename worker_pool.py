@@ -0,0 +1,137 @@
+"""Bounded async worker pool with per-session ordering.
+
+The daemon used to await process_session for one session at a time, so a
+slow extraction for one session delayed every other active session. The
+pool runs up to `concurrency` sessions at once while guaranteeing that:
+
+- a session is never processed by two workers at the same time
+- a session submitted while it is being processed runs once more afterwards
+  (so appends that arrive mid-extraction are never missed)
+- repeated submissions of a session already waiting in the queue coalesce
+  into a single run
+
+Blocking work inside the handler must run off the event loop (e.g. with
+asyncio.to_thread; LLM calls go through the async Cerebras client) for the
+concurrency to help.
+"""
+import asyncio
+import os
+from typing import Awaitable, Callable, Hashable, Optional
+
+
+# ============ CONFIGURATION ============
+
+# Sessions processed at once
+EXTRACTION_CONCURRENCY = int(os.environ.get("FLOW_GUARDIAN_EXTRACTION_CONCURRENCY", "4"))
+
+
+# ============ POOL ============
+
+class SessionWorkerPool:
+    """Processes submitted keys (session paths) with bounded concurrency."""
+
+    def __init__(
+        self,
+        handler: Callable[[Hashable], Awaitable],
+        concurrency: int = EXTRACTION_CONCURRENCY,
+        on_error: Optional[Callable[[Hashable, Exception], None]] = None,
+    ):
+        """
+        Args:
+            handler: Coroutine function called with each key
+            concurrency: Maximum keys processed at once
+            on_error: Called with (key, exception) when the handler raises
+        """
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.on_error = on_error
+        self.stats = {"processed": 0, "failed": 0, "coalesced": 0}
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: set = set()
+        self._running: set = set()
+        self._rerun: set = set()
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.get_running_loop().create_task(self._worker())
+            for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; sessions still queued are dropped."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queued.clear()
+        self._running.clear()
+        self._rerun.clear()
+
+    async def __aenter__(self) -> "SessionWorkerPool":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def submit(self, key: Hashable) -> None:
+        """
+        Schedule a key for processing.
+
+        Args:
+            key: Session to process (typically its transcript path)
+        """
+        if key in self._queued:
+            self.stats["coalesced"] += 1
+        elif key in self._running:
+            # Process again after the current run finishes, never concurrently
+            if key in self._rerun:
+                self.stats["coalesced"] += 1
+            self._rerun.add(key)
+        else:
+            self._queued.add(key)
+            self._queue.put_nowait(key)
+
+    async def join(self) -> None:
+        """Wait until every submitted key (including reruns) is processed."""
+        await self._queue.join()
+
+    def get_stats(self) -> dict:
+        """
+        Pool statistics.
+
+        Returns:
+            Dictionary with processed, failed, coalesced, queued, running
+            and concurrency
+        """
+        return {
+            **self.stats,
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "concurrency": self.concurrency,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._queue.get()
+            self._queued.discard(key)
+            self._running.add(key)
+            try:
+                await self.handler(key)
+                self.stats["processed"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                if self.on_error:
+                    self.on_error(key, e)
+            finally:
+                self._running.discard(key)
+                if key in self._rerun:
+                    self._rerun.discard(key)
+                    self.submit(key)
+                self._queue.task_done()